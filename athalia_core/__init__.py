@@ -4,41 +4,58 @@ Athalia Dev Setup - Système d'industrialisation et d'intelligence pour projets
 Version 2.0.0
 """
 
-# Analytics et performance
-from .advanced_analytics import AdvancedAnalytics
+from importlib import import_module
 
-# IA et génération
-# from .ai_robust import RobustAI  # Import conditionnel pour éviter les dépendances
-from .auto_cicd import AutoCICD
-from .auto_cleaner import AutoCleaner
-from .auto_documenter import AutoDocumenter
-
-# Modules automatiques
-from .auto_tester import AutoTester
+# Point d'entrée CLI et principal : importés tout de suite car ``cli`` et
+# ``main`` sont aussi des noms de sous-modules (légers, voir lazy_imports)
 from .cli import cli
-from .code_linter import CodeLinter
+from .main import main
 
-# Configuration et utilitaires
-from .config_manager import ConfigManager
-from .correction_optimizer import CorrectionOptimizer
+# Autres exports, importés au premier accès (PEP 562) pour que les commandes
+# courtes ne chargent pas tout le paquet
+_LAZY_EXPORTS = {
+    # Analytics et performance
+    "AdvancedAnalytics": ".advanced_analytics",
+    "PerformanceAnalyzer": ".performance_analyzer",
+    # IA et génération
+    # "RobustAI": ".ai_robust",  # Import conditionnel
+    "generate_project": ".generation",
+    "generate_blueprint_mock": ".generation",
+    # Modules automatiques
+    "AutoCICD": ".auto_cicd",
+    "AutoCleaner": ".auto_cleaner",
+    "AutoDocumenter": ".auto_documenter",
+    "AutoTester": ".auto_tester",
+    # Configuration et utilitaires
+    "ConfigManager": ".config_manager",
+    "CorrectionOptimizer": ".correction_optimizer",
+    # Gestion d'erreurs
+    "ErrorCode": ".error_codes",
+    "ErrorSeverity": ".error_codes",
+    "AthaliaError": ".error_handling",
+    "ErrorHandler": ".error_handling",
+    "handle_error": ".error_handling",
+    "raise_athalia_error": ".error_handling",
+    # Sécurité et qualité
+    "SecurityAuditor": ".security_auditor",
+    "CodeLinter": ".code_linter",
+    # Imports principaux
+    "UnifiedOrchestrator": ".unified_orchestrator",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
-# Gestion d'erreurs
-from .error_codes import ErrorCode, ErrorSeverity
-from .error_handling import (
-    AthaliaError,
-    ErrorHandler,
-    handle_error,
-    raise_athalia_error,
-)
-from .generation import generate_blueprint_mock, generate_project
-from .main import main
-from .performance_analyzer import PerformanceAnalyzer
 
-# Sécurité et qualité
-from .security_auditor import SecurityAuditor
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
-# Imports principaux
-from .unified_orchestrator import UnifiedOrchestrator
 
 # Version
 __version__ = "2.0.0"
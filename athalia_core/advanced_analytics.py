@@ -7,6 +7,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .code_metrics import analyze_files
+from .project_snapshot import ProjectSnapshot, snapshot_for
+
 logger = logging.getLogger(__name__)
 
 """
@@ -18,8 +21,11 @@ Génère des métriques et dashboards pour l'analyse de projets
 class AdvancedAnalytics:
     metrics: dict
 
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, snapshot: ProjectSnapshot = None):
         self.project_path = Path(project_path)
+        # Instantané partagé (orchestrateur) ou propre, reparcouru à chaque run
+        self._owns_snapshot = snapshot is None
+        self.snapshot = snapshot_for(self.project_path, snapshot)
         self.metrics = {
             "complexity": {},
             "coverage": {},
@@ -31,6 +37,8 @@ class AdvancedAnalytics:
     def run(self) -> dict[str, Any]:
         """Lance lanalyse complète du projet"""
         logger.info(f"📊 Analytics avancée pour: {self.project_path.name}")
+        if self._owns_snapshot:
+            self.snapshot.invalidate()
 
         # Calcul des métriques
         self._analyze_complexity()
@@ -54,19 +62,10 @@ class AdvancedAnalytics:
         total_complexity = 0
         file_count = 0
 
-        for py_file in self.project_path.rglob("*.py"):
-            try:
-                with open(py_file) as f:
-                    tree = ast.parse(f.read())
-
-                complexity = self._calculate_complexity(tree)
-                complexity_data["complexity"][
-                    str(py_file.relative_to(self.project_path))
-                ] = complexity
-                total_complexity += complexity
-                file_count += 1
-            except Exception:
-                continue
+        for entry, metrics in analyze_files(self.snapshot.python_files()):
+            complexity_data["complexity"][entry.relative] = metrics.complexity
+            total_complexity += metrics.complexity
+            file_count += 1
 
         if file_count > 0:
             complexity_data["average"] = total_complexity / file_count
@@ -74,20 +73,6 @@ class AdvancedAnalytics:
 
         self.metrics["complexity"] = complexity_data
 
-    def _calculate_complexity(self, tree: ast.AST) -> int:
-        """Calcule la complexité cyclomatique dun fichier"""
-        complexity = 1  # Base complexity
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.If | ast.While | ast.For | ast.AsyncFor):
-                complexity += 1
-            elif isinstance(node, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(node, ast.BoolOp):
-                complexity += len(node.values) - 1
-
-        return complexity
-
     def _analyze_coverage(self):
         """Analyse la couverture du projet"""
         coverage_data = {
@@ -2,13 +2,14 @@
 import json
 import logging
 import os
-import sqlite3
 import sys
 import webbrowser
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from ..sqlite_store import get_sqlite_store
+
 # !/usr/bin/env python3
 """
 Module de dashboard unifié simplifié pour Athalia
@@ -24,11 +25,13 @@ class DashboardUnifieSimple:
 
     def __init__(self, db_path: str = "athalia_analytics.db"):
         self.db_path = db_path
+        # Connexions partagées, métriques et événements écrits par lots
+        self.store = get_sqlite_store(db_path)
         self._init_database()
 
     def _init_database(self):
         """Initialisation de la base de données"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.transaction() as conn:
             cursor = conn.cursor()
 
             # Table des métriques
@@ -76,8 +79,6 @@ class DashboardUnifieSimple:
             """
             )
 
-            conn.commit()
-
     def enregistrer_metrique(
         self,
         type_metrique: str,
@@ -86,22 +87,19 @@ class DashboardUnifieSimple:
         details: dict | None = None,
     ):
         """Enregistrement une métrique"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO metriques (type, valeur, projet, timestamp, details)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    type_metrique,
-                    valeur,
-                    projet,
-                    datetime.now().isoformat(),
-                    json.dumps(details) if details else None,
-                ),
-            )
-            conn.commit()
+        self.store.insert(
+            """
+            INSERT INTO metriques (type, valeur, projet, timestamp, details)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (
+                type_metrique,
+                valeur,
+                projet,
+                datetime.now().isoformat(),
+                json.dumps(details) if details else None,
+            ),
+        )
 
     def enregistrer_evenement(
         self,
@@ -113,25 +111,22 @@ class DashboardUnifieSimple:
         details: dict | None = None,
     ):
         """Enregistrement un événement"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO evenements
-                (type, projet, utilisateur, timestamp, duree, statut, details)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    type_evenement,
-                    projet,
-                    utilisateur,
-                    datetime.now().isoformat(),
-                    duree,
-                    statut,
-                    json.dumps(details) if details else None,
-                ),
-            )
-            conn.commit()
+        self.store.insert(
+            """
+            INSERT INTO evenements
+            (type, projet, utilisateur, timestamp, duree, statut, details)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                type_evenement,
+                projet,
+                utilisateur,
+                datetime.now().isoformat(),
+                duree,
+                statut,
+                json.dumps(details) if details else None,
+            ),
+        )
 
     def enregistrer_rapport(
         self,
@@ -142,28 +137,25 @@ class DashboardUnifieSimple:
         score_securite: int = 0,
     ):
         """Enregistrement un rapport"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO rapports
-                (type, projet, contenu, timestamp, score_qualite, score_securite)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    type_rapport,
-                    projet,
-                    contenu,
-                    datetime.now().isoformat(),
-                    score_qualite,
-                    score_securite,
-                ),
-            )
-            conn.commit()
+        self.store.insert(
+            """
+            INSERT INTO rapports
+            (type, projet, contenu, timestamp, score_qualite, score_securite)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            (
+                type_rapport,
+                projet,
+                contenu,
+                datetime.now().isoformat(),
+                score_qualite,
+                score_securite,
+            ),
+        )
 
     def obtenir_metriques_temps_reel(self) -> dict[str, Any]:
         """Obtention des métriques en temps réel"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.reading() as conn:
             cursor = conn.cursor()
 
             # Métriques des dernières 24h
@@ -225,7 +217,7 @@ class DashboardUnifieSimple:
         """Génération d'un rapport consolidé"""
         metriques = self.obtenir_metriques_temps_reel()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.reading() as conn:
             cursor = conn.cursor()
 
             # Top projets par score
@@ -2,24 +2,13 @@
 import logging
 import os
 import re
-import subprocess
 import sys
 import tempfile
 from datetime import datetime
 
 import yaml
 
-# Import du validateur de sécurité
-try:
-    from athalia_core.security_validator import SecurityError, validate_and_run
-except ImportError:
-    # Fallback pour les tests
-    def validate_and_run(command, **kwargs):
-        return subprocess.run(command, **kwargs)
-
-    class SecurityError(Exception):
-        pass
-
+from athalia_core.model_backend import get_ollama_backend
 
 try:
     import pyperclip
@@ -171,18 +160,14 @@ def detect_prompt_semantic(filepath):
         + "\nLis le contenu suivant et indique le nom du prompt le plus pertinent "
         "pour améliorer ou analyser. Réponds uniquement par le nom exact du prompt."
     )
-    # Appel Ollama / Mistral
+    # Appel Ollama / Mistral (API HTTP : le contenu voyage dans la requête)
     try:
-        ollama_cmd = [
-            "ollama",
-            "run",
+        result = get_ollama_backend().generate(
             "mistral",
             f"[INST] {system_prompt} \n\nContenu:\n{content}\n[/INST]",
-        ]
-        result = validate_and_run(
-            ollama_cmd, capture_output=True, text=True, timeout=20
+            timeout=20,
         )
-        answer = result.stdout.strip().split("\n")[-1].strip()
+        answer = result.strip().split("\n")[-1].strip()
         for p in PROMPTS:
             if p["name"].lower() in answer.lower():
                 return p["file"]
@@ -6,9 +6,22 @@ Gestion des modèles IA avec fallback intelligent
 
 import logging
 import subprocess
+import time
 from enum import Enum
 
-import requests
+from athalia_core.classification.project_classifier import detect_blueprint_type
+from athalia_core.distillation.response_distiller import ResponseDistiller
+from athalia_core.llm_response_cache import (
+    LLMResponseCache,
+    get_llm_response_cache,
+    llm_cache_enabled,
+)
+from athalia_core.model_backend import (
+    ModelBackend,
+    ModelBackendError,
+    get_ollama_backend,
+)
+from athalia_core.model_dispatcher import ModelDispatcher, get_model_dispatcher
 
 # Import du validateur de sécurité
 try:
@@ -52,50 +65,49 @@ class PromptContext(Enum):
 class RobustAI:
     """Gestionnaire IA robuste avec fallback intelligent."""
 
-    def __init__(self):
-        """Initialise le gestionnaire IA."""
+    def __init__(
+        self,
+        response_cache: LLMResponseCache | None = None,
+        use_cache: bool | None = None,
+        backend: ModelBackend | None = None,
+        dispatcher: ModelDispatcher | None = None,
+    ):
+        """Initialise le gestionnaire IA.
+
+        Args:
+            response_cache: cache des réponses (par défaut le cache partagé)
+            use_cache: active le cache (par défaut selon ATHALIA_LLM_CACHE)
+            backend: accès aux modèles (par défaut l'API HTTP d'Ollama)
+            dispatcher: répartition des appels entre modèles (par défaut
+                requêtes couvertes, disjoncteurs partagés)
+        """
+        self.backend = backend or get_ollama_backend()
+        self.dispatcher = dispatcher or get_model_dispatcher()
         self.available_models = self._detect_available_models()
         self.fallback_chain = self._build_fallback_chain()
         self.prompt_templates = self._load_prompt_templates()
+        self.use_cache = llm_cache_enabled() if use_cache is None else use_cache
+        self._response_cache = response_cache
 
-    def generate_blueprint(self, idea: str, **kwargs) -> dict:
-        """Génère un blueprint de projet à partir d'une idée."""
-        # Analyse intelligente de l'idée
-        idea_lower = idea.lower()
-
-        # Détection du type de projet
-        project_type = "generic"
-        api_keywords = [
-            "fastapi",
-            "swagger",
-            "openapi",
-            "api",
-            "rest",
-            "endpoint",
-        ]
-        robotics_keywords = ["robot", "reachy", "ros", "opencv"]
-        desktop_keywords = ["calculatrice", "calculator", "desktop", "tkinter"]
-        web_keywords = [
-            "web",
-            "flask",
-            "django",
-            "interface",
-            "react",
-            "vue",
-            "angular",
-        ]
-        ai_keywords = ["ia", "ai", "machine learning", "ml"]
-
-        if any(word in idea_lower for word in api_keywords):
-            project_type = "api"
-        elif any(word in idea_lower for word in robotics_keywords):
-            project_type = "robotics"
-        elif any(word in idea_lower for word in desktop_keywords):
-            project_type = "desktop"
-        elif any(word in idea_lower for word in web_keywords):
-            project_type = "web"
-        elif any(word in idea_lower for word in ai_keywords):
-            project_type = "ai_application"
+    @property
+    def response_cache(self) -> LLMResponseCache | None:
+        """Cache des réponses IA (ouvert au premier usage)"""
+        if not self.use_cache:
+            return None
+        if self._response_cache is None:
+            self._response_cache = get_llm_response_cache()
+        return self._response_cache
+
+    def generate_blueprint(
+        self, idea: str, project_type: str | None = None, **kwargs
+    ) -> dict:
+        """Génère un blueprint de projet à partir d'une idée.
+
+        ``project_type`` (déjà détecté, par exemple par un lot) évite une
+        nouvelle détection.
+        """
+        # Détection du type de projet (mots-clés notés en un seul passage)
+        project_type = project_type or detect_blueprint_type(idea)
 
         # Extraction du nom de projet
         project_name = self._extract_project_name(idea)
@@ -238,23 +250,18 @@ class RobustAI:
         """Détecte les modèles IA disponibles."""
         available = []
         try:
-            # Utilisation du validateur de sécurité pour l'appel ollama
-            result = validate_and_run(
-                ["ollama", "list"], capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                output = result.stdout.lower()
-                if "qwen" in output:
-                    available.append(AIModel.OLLAMA_QWEN)
-                if "mistral" in output:
-                    available.append(AIModel.OLLAMA_MISTRAL)
-                if "llava" in output:
-                    available.append(AIModel.OLLAMA_LLAVA)
-                if "llama" in output:
-                    available.append(AIModel.OLLAMA_LLAMA)
-                if "codegen" in output:
-                    available.append(AIModel.OLLAMA_CODEGEN)
-        except (Exception, SecurityError) as e:
+            output = " ".join(self.backend.list_models()).lower()
+            if "qwen" in output:
+                available.append(AIModel.OLLAMA_QWEN)
+            if "mistral" in output:
+                available.append(AIModel.OLLAMA_MISTRAL)
+            if "llava" in output:
+                available.append(AIModel.OLLAMA_LLAVA)
+            if "llama" in output:
+                available.append(AIModel.OLLAMA_LLAMA)
+            if "codegen" in output:
+                available.append(AIModel.OLLAMA_CODEGEN)
+        except Exception as e:
             logging.warning(f"Ollama non détecté: {e}")
 
         available.append(AIModel.MOCK)
@@ -310,25 +317,79 @@ class RobustAI:
         }
 
     def generate_response(
-        self, context: PromptContext, distillation: bool = False, **kwargs
+        self,
+        context: PromptContext,
+        distillation: bool = False,
+        bypass_cache: bool = False,
+        strategy: str | None = None,
+        **kwargs,
     ) -> dict:
-        """Génère une réponse IA robuste avec fallback."""
+        """Génère une réponse IA robuste avec fallback.
+
+        Les modèles réels sont interrogés par le répartiteur (``strategy`` :
+        celle du répartiteur par défaut) ; avec ``distillation`` toutes les
+        réponses sont recueillies puis fusionnées. Le mock ne sert qu'en
+        dernier recours. Les réponses des modèles réels sont mises en cache
+        (voir ``response_cache``) ; ``bypass_cache`` force un nouvel appel.
+        """
         prompt = self._get_dynamic_prompt(context.value, **kwargs)
 
-        # Essayer chaque modèle dans la chaîne de fallback
-        for model in self.fallback_chain:
+        models = [model for model in self.fallback_chain if model != AIModel.MOCK]
+        if models:
+            keys = {
+                model: self._response_key(
+                    model, context.value, prompt, kwargs, bypass_cache
+                )
+                for model in models
+            }
+            # Le cache est consulté avant la répartition : seuls les vrais
+            # appels de modèles alimentent les latences des disjoncteurs
+            answers = self._cached_answers(keys, every=distillation)
+            if distillation or not answers:
+                outcome = self.dispatcher.dispatch(
+                    [model for model in models if model not in answers],
+                    lambda model: self._call_model_stored(
+                        model, keys[model], context.value, prompt
+                    ),
+                    strategy="gather" if distillation else strategy,
+                )
+                answers.update(
+                    (model, (response, False)) for model, response in outcome.results
+                )
+            if distillation and len(answers) > 1:
+                responses = [response for response, _ in answers.values()]
+                return {
+                    "model": "distillation",
+                    "models": [model.value for model in answers],
+                    "response": ResponseDistiller().distill(responses),
+                    "success": True,
+                    "context": context.value,
+                    "cached": all(cached for _, cached in answers.values()),
+                }
+            if answers:
+                model, (response, cached) = next(iter(answers.items()))
+                return {
+                    "model": model.value,
+                    "response": response,
+                    "success": True,
+                    "context": context.value,
+                    "cached": cached,
+                }
+
+        # Dernier recours : modèle mock
+        if AIModel.MOCK in self.fallback_chain:
             try:
-                response = self._call_model(model, prompt)
+                response = self._call_model(AIModel.MOCK, prompt)
                 if response:
                     return {
-                        "model": model.value,
+                        "model": AIModel.MOCK.value,
                         "response": response,
                         "success": True,
                         "context": context.value,
+                        "cached": False,
                     }
             except Exception as e:
-                logging.warning(f"Modèle {model.value} échoué: {e}")
-                continue
+                logging.warning(f"Modèle {AIModel.MOCK.value} échoué: {e}")
 
         # Fallback final
         return {
@@ -339,6 +400,60 @@ class RobustAI:
             "error": "Tous les modèles ont échoué",
         }
 
+    def _response_key(
+        self,
+        model: AIModel,
+        context: str,
+        prompt: str,
+        params: dict,
+        bypass_cache: bool = False,
+    ) -> str | None:
+        """Clé de la réponse d'un modèle dans le cache (None : pas de cache).
+
+        Les réponses mock ne sont pas mises en cache.
+        """
+        cache = None if bypass_cache or model == AIModel.MOCK else self.response_cache
+        if cache is None:
+            return None
+        try:
+            template = self.prompt_templates.get(context, prompt)
+            return cache.make_key(model.value, context, template, params)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Paramètres non cachables: {e}")
+            return None
+
+    def _cached_answers(
+        self, keys: dict[AIModel, str | None], every: bool = False
+    ) -> dict[AIModel, tuple[str, bool]]:
+        """Réponses déjà en cache, par ordre de préférence des modèles.
+
+        Sans ``every``, la recherche s'arrête à la première réponse trouvée.
+        """
+        answers = {}
+        for model, key in keys.items():
+            response = None if key is None else self.response_cache.get(key)
+            if response is not None:
+                answers[model] = (response, True)
+                if not every:
+                    break
+        return answers
+
+    def _call_model_stored(
+        self, model: AIModel, key: str | None, context: str, prompt: str
+    ) -> str | None:
+        """Appelle un modèle et met sa réponse en cache sous ``key``."""
+        started = time.perf_counter()
+        response = self._call_model(model, prompt)
+        if response and key is not None:
+            self.response_cache.set(
+                key,
+                response,
+                model=model.value,
+                context=context,
+                latency=time.perf_counter() - started,
+            )
+        return response
+
     def _call_model(self, model: AIModel, prompt: str) -> str | None:
         """Appelle un modèle IA spécifique."""
         if model == AIModel.MOCK:
@@ -355,19 +470,12 @@ class RobustAI:
     ) -> str | None:
         """Appelle Ollama avec un modèle spécifique."""
         try:
-            # Utilisation du validateur de sécurité pour l'appel ollama
-            result = validate_and_run(
-                ["ollama", "run", model_name, prompt],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                logging.error(f"Ollama erreur: {result.stderr}")
-                return None
-        except (Exception, SecurityError) as e:
+            response = self.backend.generate(model_name, prompt, timeout=timeout)
+            return response.strip() or None
+        except ModelBackendError as e:
+            logging.error(f"Ollama erreur: {e}")
+            return None
+        except Exception as e:
             logging.error(f"Erreur Ollama: {e}")
             return None
 
@@ -421,40 +529,22 @@ def fallback_ia(prompt: str, models: list[str] | None = None) -> str:
     return "[Aucune réponse IA]"
 
 
-def query_qwen(prompt: str) -> str:
-    """Appel local à Qwen 7B via Ollama."""
+def _query_ollama(model: str, prompt: str, label: str) -> str:
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={"model": "qwen:7b", "prompt": prompt, "stream": False},
-            timeout=30,
-        )
-        if response.status_code == 200:
-            return response.json().get("response", "")
-        else:
-            logging.error(f"Erreur Qwen: {response.status_code}")
-            return ""
+        return get_ollama_backend().generate(model, prompt, timeout=30)
     except Exception as e:
-        logging.error(f"Erreur Qwen: {e}")
+        logging.error(f"Erreur {label}: {e}")
         return ""
 
 
+def query_qwen(prompt: str) -> str:
+    """Appel local à Qwen 7B via Ollama."""
+    return _query_ollama("qwen:7b", prompt, "Qwen")
+
+
 def query_mistral(prompt: str) -> str:
     """Appel local à Mistral 7B via Ollama."""
-    try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={"model": "mistral:7b", "prompt": prompt, "stream": False},
-            timeout=30,
-        )
-        if response.status_code == 200:
-            return response.json().get("response", "")
-        else:
-            logging.error(f"Erreur Mistral: {response.status_code}")
-            return ""
-    except Exception as e:
-        logging.error(f"Erreur Mistral: {e}")
-        return ""
+    return _query_ollama("mistral:7b", prompt, "Mistral")
 
 
 if __name__ == "__main__":
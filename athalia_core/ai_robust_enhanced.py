@@ -5,21 +5,23 @@ Gestion des modèles IA avec fallback intelligent et gestion d'erreurs avancée
 """
 
 import logging
-import subprocess
+import time
 from enum import Enum
 from typing import Any
 
-# Import du validateur de sécurité
-try:
-    from athalia_core.security_validator import SecurityError, validate_and_run
-except ImportError:
-    # Fallback pour les tests
-    def validate_and_run(command, **kwargs):
-        return subprocess.run(command, **kwargs)
-
-    class SecurityError(Exception):
-        pass
-
+from athalia_core.classification.project_classifier import detect_blueprint_type
+from athalia_core.distillation.response_distiller import ResponseDistiller
+from athalia_core.llm_response_cache import (
+    LLMResponseCache,
+    get_llm_response_cache,
+    llm_cache_enabled,
+)
+from athalia_core.model_backend import (
+    ModelBackend,
+    ModelTimeoutError,
+    get_ollama_backend,
+)
+from athalia_core.model_dispatcher import ModelDispatcher, get_model_dispatcher
 
 # Configuration du logging
 logger = logging.getLogger(__name__)
@@ -49,24 +51,57 @@ class PromptContext(Enum):
 class RobustAI:
     """Gestionnaire IA robuste avec fallback intelligent."""
 
-    def __init__(self):
-        """Initialise le gestionnaire IA."""
+    def __init__(
+        self,
+        response_cache: LLMResponseCache | None = None,
+        use_cache: bool | None = None,
+        backend: ModelBackend | None = None,
+        dispatcher: ModelDispatcher | None = None,
+    ):
+        """Initialise le gestionnaire IA.
+
+        Args:
+            response_cache: cache des réponses (par défaut le cache partagé)
+            use_cache: active le cache (par défaut selon ATHALIA_LLM_CACHE)
+            backend: accès aux modèles (par défaut l'API HTTP d'Ollama)
+            dispatcher: répartition des appels entre modèles (par défaut
+                requêtes couvertes, disjoncteurs partagés)
+        """
+        self.backend = backend or get_ollama_backend()
+        self.dispatcher = dispatcher or get_model_dispatcher()
         self.available_models = self._detect_available_models()
         self.fallback_chain = self._build_fallback_chain()
         self.prompt_templates = self._load_prompt_templates()
+        self.use_cache = llm_cache_enabled() if use_cache is None else use_cache
+        self._response_cache = response_cache
         logger.info(
             f"IA robuste initialisée avec {len(self.available_models)} "
             "modèles disponibles"
         )
 
-    def generate_blueprint(self, idea: str, **kwargs) -> dict[str, Any]:
-        """Génère un blueprint de projet à partir d'une idée."""
+    @property
+    def response_cache(self) -> LLMResponseCache | None:
+        """Cache des réponses IA (ouvert au premier usage)"""
+        if not self.use_cache:
+            return None
+        if self._response_cache is None:
+            self._response_cache = get_llm_response_cache()
+        return self._response_cache
+
+    def generate_blueprint(
+        self, idea: str, project_type: str | None = None, **kwargs
+    ) -> dict[str, Any]:
+        """Génère un blueprint de projet à partir d'une idée.
+
+        ``project_type`` (déjà détecté, par exemple par un lot) évite une
+        nouvelle détection.
+        """
         try:
             # Analyse intelligente de l'idée
             idea_lower = idea.lower()
 
             # Détection du type de projet
-            project_type = self._detect_project_type(idea_lower)
+            project_type = project_type or self._detect_project_type(idea_lower)
 
             # Extraction du nom de projet
             project_name = self._extract_project_name(idea)
@@ -101,34 +136,7 @@ class RobustAI:
 
     def _detect_project_type(self, idea_lower: str) -> str:
         """Détecte le type de projet à partir de l'idée."""
-        if any(word in idea_lower for word in ["fastapi", "swagger", "openapi"]):
-            return "api"
-        elif any(word in idea_lower for word in ["api", "rest", "endpoint"]):
-            return "api"
-        elif any(word in idea_lower for word in ["robot", "reachy", "ros", "opencv"]):
-            return "robotics"
-        elif any(
-            word in idea_lower
-            for word in ["calculatrice", "calculator", "desktop", "tkinter"]
-        ):
-            return "desktop"
-        elif any(
-            word in idea_lower
-            for word in [
-                "web",
-                "flask",
-                "django",
-                "interface",
-                "react",
-                "vue",
-                "angular",
-            ]
-        ):
-            return "web"
-        elif any(word in idea_lower for word in ["ia", "ai", "machine learning", "ml"]):
-            return "ai_application"
-        else:
-            return "generic"
+        return detect_blueprint_type(idea_lower)
 
     def _extract_project_name(self, idea: str) -> str:
         """Extrait un nom de projet de l'idée."""
@@ -339,20 +347,16 @@ class RobustAI:
 
         # Vérifier Ollama
         try:
-            # Utilisation du validateur de sécurité pour l'appel ollama
-            result = validate_and_run(
-                ["ollama", "list"], capture_output=True, text=True, timeout=10
-            )
-            if result.returncode == 0:
-                if "mistral" in result.stdout.lower():
-                    available_models.append(AIModel.OLLAMA_MISTRAL)
-                if "llama" in result.stdout.lower():
-                    available_models.append(AIModel.OLLAMA_LLAMA)
-                if "codegen" in result.stdout.lower():
-                    available_models.append(AIModel.OLLAMA_CODEGEN)
-                if "qwen" in result.stdout.lower():
-                    available_models.append(AIModel.OLLAMA_QWEN)
-        except (Exception, SecurityError) as e:
+            output = " ".join(self.backend.list_models()).lower()
+            if "mistral" in output:
+                available_models.append(AIModel.OLLAMA_MISTRAL)
+            if "llama" in output:
+                available_models.append(AIModel.OLLAMA_LLAMA)
+            if "codegen" in output:
+                available_models.append(AIModel.OLLAMA_CODEGEN)
+            if "qwen" in output:
+                available_models.append(AIModel.OLLAMA_QWEN)
+        except Exception as e:
             logger.warning(f"Impossible de détecter les modèles Ollama: {e}")
 
         return available_models
@@ -413,26 +417,81 @@ Type: {project_type}
         }
 
     def generate_response(
-        self, context: PromptContext, distillation: bool = False, **kwargs
+        self,
+        context: PromptContext,
+        distillation: bool = False,
+        bypass_cache: bool = False,
+        strategy: str | None = None,
+        **kwargs,
     ) -> dict[str, Any]:
-        """Génère une réponse IA avec fallback."""
+        """Génère une réponse IA avec fallback.
+
+        Les modèles réels sont interrogés par le répartiteur (``strategy`` :
+        celle du répartiteur par défaut) ; avec ``distillation`` toutes les
+        réponses sont recueillies puis fusionnées. Le mock ne sert qu'en
+        dernier recours. Les réponses des modèles réels sont mises en cache
+        (voir ``response_cache``) ; ``bypass_cache`` force un nouvel appel.
+        """
         try:
             prompt = self.get_dynamic_prompt(context.value, **kwargs)
 
-            # Essayer chaque modèle dans la chaîne de fallback
-            for model in self.fallback_chain:
+            models = [m for m in self.fallback_chain if m != AIModel.MOCK]
+            if models:
+                keys = {
+                    model: self._response_key(
+                        model, context.value, prompt, kwargs, bypass_cache
+                    )
+                    for model in models
+                }
+                # Le cache est consulté avant la répartition : seuls les vrais
+                # appels de modèles alimentent les latences des disjoncteurs
+                answers = self._cached_answers(keys, every=distillation)
+                if distillation or not answers:
+                    outcome = self.dispatcher.dispatch(
+                        [model for model in models if model not in answers],
+                        lambda model: self._call_model_stored(
+                            model, keys[model], context.value, prompt
+                        ),
+                        strategy="gather" if distillation else strategy,
+                    )
+                    answers.update(
+                        (model, (response, False))
+                        for model, response in outcome.results
+                    )
+                if distillation and len(answers) > 1:
+                    responses = [response for response, _ in answers.values()]
+                    return {
+                        "success": True,
+                        "response": ResponseDistiller().distill(responses),
+                        "model": "distillation",
+                        "models": [model.value for model in answers],
+                        "context": context.value,
+                        "cached": all(cached for _, cached in answers.values()),
+                    }
+                if answers:
+                    model, (response, cached) = next(iter(answers.items()))
+                    return {
+                        "success": True,
+                        "response": response,
+                        "model": model.value,
+                        "context": context.value,
+                        "cached": cached,
+                    }
+
+            # Dernier recours : modèle mock
+            if AIModel.MOCK in self.fallback_chain:
                 try:
-                    response = self._call_model(model, prompt)
+                    response = self._call_model(AIModel.MOCK, prompt)
                     if response:
                         return {
                             "success": True,
                             "response": response,
-                            "model": model.value,
+                            "model": AIModel.MOCK.value,
                             "context": context.value,
+                            "cached": False,
                         }
                 except Exception as e:
-                    logger.warning(f"Modèle {model.value} a échoué: {e}")
-                    continue
+                    logger.warning(f"Modèle {AIModel.MOCK.value} a échoué: {e}")
 
             # Si tous les modèles échouent
             return {
@@ -449,6 +508,60 @@ Type: {project_type}
                 "fallback_response": "Erreur de génération",
             }
 
+    def _response_key(
+        self,
+        model: AIModel,
+        context: str,
+        prompt: str,
+        params: dict[str, Any],
+        bypass_cache: bool = False,
+    ) -> str | None:
+        """Clé de la réponse d'un modèle dans le cache (None : pas de cache).
+
+        Les réponses mock ne sont pas mises en cache.
+        """
+        cache = None if bypass_cache or model == AIModel.MOCK else self.response_cache
+        if cache is None:
+            return None
+        try:
+            template = self.prompt_templates.get(context, prompt)
+            return cache.make_key(model.value, context, template, params)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Paramètres non cachables: {e}")
+            return None
+
+    def _cached_answers(
+        self, keys: dict[AIModel, str | None], every: bool = False
+    ) -> dict[AIModel, tuple[str, bool]]:
+        """Réponses déjà en cache, par ordre de préférence des modèles.
+
+        Sans ``every``, la recherche s'arrête à la première réponse trouvée.
+        """
+        answers = {}
+        for model, key in keys.items():
+            response = None if key is None else self.response_cache.get(key)
+            if response is not None:
+                answers[model] = (response, True)
+                if not every:
+                    break
+        return answers
+
+    def _call_model_stored(
+        self, model: AIModel, key: str | None, context: str, prompt: str
+    ) -> str | None:
+        """Appelle un modèle et met sa réponse en cache sous ``key``."""
+        started = time.perf_counter()
+        response = self._call_model(model, prompt)
+        if response and key is not None:
+            self.response_cache.set(
+                key,
+                response,
+                model=model.value,
+                context=context,
+                latency=time.perf_counter() - started,
+            )
+        return response
+
     def _call_model(self, model: AIModel, prompt: str) -> str | None:
         """Appelle un modèle IA spécifique."""
         if model == AIModel.MOCK:
@@ -464,24 +577,13 @@ Type: {project_type}
     ) -> str | None:
         """Appelle un modèle Ollama."""
         try:
-            # Utilisation du validateur de sécurité pour l'appel ollama
-            result = validate_and_run(
-                ["ollama", "run", model_name, prompt],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
+            response = self.backend.generate(model_name, prompt, timeout=timeout)
+            return response.strip() or None
 
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                logger.error(f"Erreur Ollama: {result.stderr}")
-                return None
-
-        except subprocess.TimeoutExpired:
+        except ModelTimeoutError:
             logger.error(f"Timeout lors de l'appel à Ollama {model_name}")
             return None
-        except (Exception, SecurityError) as e:
+        except Exception as e:
             logger.error(f"Erreur lors de l'appel à Ollama {model_name}: {e}")
             return None
 
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+🚀 MOTEUR D'ANALYSE DE PROJET PARALLÈLE
+=======================================
+Répartit l'analyse AST des fichiers d'un projet sur plusieurs processus et
+renvoie les résultats au fil de l'eau. Utilisé par le détecteur de patterns
+et l'analyseur de performance pour analyser tout le dépôt au lieu d'un
+échantillon.
+"""
+
+import gc
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import psutil
+
+from .ast_analyzer import ASTAnalyzer, FileAnalysis
+
+logger = logging.getLogger(__name__)
+
+# Entrée de cache transmise du worker au processus principal
+CacheEntry = tuple[Path, str, os.stat_result, FileAnalysis, bool]
+
+
+class _RecordingCache:
+    """Cache factice des workers : mémorise les écritures sans toucher au disque
+
+    Le processus principal rejoue ensuite ces écritures par lot dans le vrai
+    cache, ce qui évite que chaque worker verrouille la base SQLite.
+    """
+
+    def __init__(self):
+        self.entries: list[CacheEntry] = []
+
+    def get_fresh(self, *args) -> None:
+        return None
+
+    def get(self, *args) -> None:
+        return None
+
+    def set(self, file_path, digest, stat, analysis, with_content=True) -> bool:
+        self.entries.append((file_path, digest, stat, analysis, with_content))
+        return True
+
+
+# Analyseur propre à chaque processus worker
+_worker_analyzer: ASTAnalyzer | None = None
+
+
+def _init_worker(capture_content: bool, record_cache: bool):
+    """Initialiser l'analyseur AST d'un worker"""
+    global _worker_analyzer
+    _worker_analyzer = ASTAnalyzer(
+        capture_content=capture_content,
+        cache=_RecordingCache() if record_cache else None,
+    )
+
+
+def _analyze_chunk(paths: list[Path]) -> tuple[list[FileAnalysis], list[CacheEntry]]:
+    """Analyser un lot de fichiers dans un worker"""
+    analyzer = _worker_analyzer
+    analyses = []
+    for path in paths:
+        analysis = analyzer.analyze_file(path)
+        if analysis is not None:
+            analyses.append(analysis)
+
+    entries: list[CacheEntry] = []
+    if isinstance(analyzer.cache, _RecordingCache):
+        entries, analyzer.cache.entries = analyzer.cache.entries, []
+    return analyses, entries
+
+
+class ProjectAnalysisEngine:
+    """Moteur d'analyse AST parallèle et en flux
+
+    Args:
+        ast_analyzer: analyseur de référence ; son cache et son mode de
+            capture du contenu sont repris par les workers
+        max_workers: nombre de processus (par défaut : nombre de cœurs)
+        chunk_size: fichiers par tâche envoyée à un worker (par défaut :
+            calculé selon le nombre de fichiers et de workers)
+        max_pending_chunks: lots en cours au maximum (contre-pression)
+        memory_limit_mb: au-delà de cette mémoire résidente, plus aucun lot
+            n'est soumis tant que les résultats en cours n'ont pas été consommés
+        min_parallel_files: en dessous de ce nombre de fichiers, l'analyse
+            reste dans le processus courant (démarrer un pool coûte plus cher)
+    """
+
+    def __init__(
+        self,
+        ast_analyzer: ASTAnalyzer = None,
+        max_workers: int = None,
+        chunk_size: int = None,
+        max_pending_chunks: int = None,
+        memory_limit_mb: int = 2048,
+        min_parallel_files: int = 64,
+    ):
+        self.ast_analyzer = ast_analyzer or ASTAnalyzer()
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks or self.max_workers * 2
+        self.memory_limit_mb = memory_limit_mb
+        self.min_parallel_files = min_parallel_files
+
+    def iter_analyses(self, files: Iterable[Path]) -> Iterator[FileAnalysis]:
+        """Analyser des fichiers et renvoyer chaque résultat dès qu'il est prêt
+
+        L'ordre des résultats n'est pas garanti en mode parallèle. Les fichiers
+        illisibles ou invalides sont ignorés, comme avec ``analyze_file``.
+        """
+        files = list(files)
+
+        # Les fichiers inchangés sont servis par le cache, en une seule lecture
+        cached = self.cached_analyses(files)
+        yield from cached.values()
+        pending_files = [path for path in files if path not in cached]
+
+        if self.max_workers == 1 or len(pending_files) < self.min_parallel_files:
+            yield from self._iter_sequential(pending_files)
+        elif pending_files:
+            yield from self._iter_parallel(pending_files)
+
+    def cached_analyses(self, files: Iterable[Path]) -> dict[Path, FileAnalysis]:
+        """Analyses en cache des fichiers inchangés (mtime et taille)"""
+        cache = self.ast_analyzer.cache
+        if cache is None:
+            return {}
+
+        stats = []
+        for path in files:
+            if path.name.startswith("._"):
+                continue
+            try:
+                stats.append((path, path.stat()))
+            except OSError:
+                continue
+        return cache.get_fresh_many(stats, self.ast_analyzer.capture_content)
+
+    def analyze_files(self, files: Iterable[Path]) -> list[FileAnalysis]:
+        """Analyser des fichiers et renvoyer tous les résultats"""
+        return list(self.iter_analyses(files))
+
+    def _iter_sequential(self, files: list[Path]) -> Iterator[FileAnalysis]:
+        for path in files:
+            analysis = self.ast_analyzer.analyze_file(path)
+            if analysis is not None:
+                yield analysis
+
+    def _chunks(self, files: list[Path]) -> Iterator[list[Path]]:
+        size = self.chunk_size or max(1, min(64, len(files) // (self.max_workers * 4)))
+        for start in range(0, len(files), size):
+            yield files[start : start + size]
+
+    def _memory_exceeded(self) -> bool:
+        rss_mb = psutil.Process().memory_info().rss / 1024 / 1024
+        return rss_mb > self.memory_limit_mb
+
+    def _iter_parallel(self, files: list[Path]) -> Iterator[FileAnalysis]:
+        cache = self.ast_analyzer.cache
+        chunks = self._chunks(files)
+        logger.info(
+            f"🚀 Analyse parallèle de {len(files)} fichiers "
+            f"sur {self.max_workers} processus"
+        )
+
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.ast_analyzer.capture_content, cache is not None),
+            )
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"⚠️ Pool de processus indisponible ({e}), séquentiel")
+            yield from self._iter_sequential(files)
+            return
+
+        pending: dict[Future, list[Path]] = {}
+        exhausted = False
+        try:
+            while pending or not exhausted:
+                # Soumettre de nouveaux lots tant que les bornes le permettent
+                while not exhausted and len(pending) < self.max_pending_chunks:
+                    if pending and self._memory_exceeded():
+                        logger.warning("⚠️ Limite mémoire atteinte, pause")
+                        gc.collect()
+                        break
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    try:
+                        pending[executor.submit(_analyze_chunk, chunk)] = chunk
+                    except RuntimeError as e:
+                        # Pool cassé (BrokenProcessPool) : lot traité ici
+                        logger.warning(f"⚠️ Pool d'analyse indisponible ({e})")
+                        yield from self._iter_sequential(chunk)
+
+                if not pending:
+                    continue
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        analyses, entries = future.result()
+                    except Exception as e:
+                        # Worker tombé : on rejoue le lot dans ce processus
+                        logger.warning(f"⚠️ Échec d'un lot ({e}), reprise locale")
+                        yield from self._iter_sequential(chunk)
+                        continue
+
+                    if cache is not None and entries:
+                        cache.set_many(entries)
+                    yield from analyses
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
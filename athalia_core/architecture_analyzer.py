@@ -8,7 +8,6 @@ du projet, les dépendances et les relations entre modules.
 
 import json
 import logging
-import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +16,7 @@ from typing import Any
 import yaml
 
 from .ast_analyzer import ASTAnalyzer, FileAnalysis
+from .sqlite_store import get_sqlite_store
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +64,7 @@ class ArchitectureMapping:
 class ArchitectureAnalyzer:
     """Analyseur d'architecture pour comprendre la structure du projet"""
 
-    def __init__(self, root_path: str = None):
+    def __init__(self, root_path: str = None, ast_analyzer: ASTAnalyzer = None):
         self.root_path = Path(root_path or Path.cwd())
         self.db_path = self.root_path / "data" / "architecture_analysis.db"
         self.config_path = self.root_path / "config" / "athalia_config.yaml"
@@ -72,11 +72,12 @@ class ArchitectureAnalyzer:
         # Créer les dossiers nécessaires
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialiser la base de données
+        # Initialiser la base de données (connexions partagées, écritures groupées)
+        self.store = get_sqlite_store(self.db_path)
         self._init_database()
 
-        # Analyseur AST
-        self.ast_analyzer = ASTAnalyzer()
+        # Analyseur AST (partagé avec les autres analyseurs si fourni)
+        self.ast_analyzer = ast_analyzer or ASTAnalyzer()
 
         # Charger la configuration
         self.config = self._load_config()
@@ -85,7 +86,7 @@ class ArchitectureAnalyzer:
 
     def _init_database(self):
         """Initialiser la base de données d'architecture"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.transaction() as conn:
             cursor = conn.cursor()
 
             # Table des modules
@@ -140,8 +141,6 @@ class ArchitectureAnalyzer:
             """
             )
 
-            conn.commit()
-
     def _load_config(self) -> dict[str, Any]:
         """Charger la configuration"""
         if self.config_path.exists():
@@ -428,60 +427,58 @@ class ArchitectureAnalyzer:
         return recommendations
 
     def _save_architecture_analysis(self, architecture: ArchitectureMapping):
-        """Sauvegarder l'analyse d'architecture"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Sauvegarder les modules
-            for _module_name, module in architecture.modules.items():
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO modules
-                    (name, path, type, size, functions, classes, imports, dependencies,
-                     complexity, issues, performance_score, last_modified, analyzed_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        module.name,
-                        module.path,
-                        module.type,
-                        module.size,
-                        json.dumps(module.functions),
-                        json.dumps(module.classes),
-                        json.dumps(module.imports),
-                        json.dumps(module.dependencies),
-                        module.complexity,
-                        json.dumps(module.issues),
-                        module.performance_score,
-                        module.last_modified.isoformat(),
-                        datetime.now().isoformat(),
-                    ),
+        """Sauvegarder l'analyse d'architecture (insertions groupées)"""
+        analyzed_at = datetime.now().isoformat()
+        self.store.insert_many(
+            """
+            INSERT OR REPLACE INTO modules
+            (name, path, type, size, functions, classes, imports, dependencies,
+             complexity, issues, performance_score, last_modified, analyzed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    module.name,
+                    module.path,
+                    module.type,
+                    module.size,
+                    json.dumps(module.functions),
+                    json.dumps(module.classes),
+                    json.dumps(module.imports),
+                    json.dumps(module.dependencies),
+                    module.complexity,
+                    json.dumps(module.issues),
+                    module.performance_score,
+                    module.last_modified.isoformat(),
+                    analyzed_at,
                 )
+                for module in architecture.modules.values()
+            ),
+        )
 
-            # Sauvegarder les problèmes de performance
-            for issue in architecture.performance_issues:
-                cursor.execute(
-                    """
-                    INSERT INTO performance_issues
-                    (issue_type, location, description, impact, suggestion, detected_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        issue.type,
-                        issue.location,
-                        issue.description,
-                        issue.impact,
-                        issue.suggestion,
-                        datetime.now().isoformat(),
-                    ),
+        self.store.insert_many(
+            """
+            INSERT INTO performance_issues
+            (issue_type, location, description, impact, suggestion, detected_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    issue.type,
+                    issue.location,
+                    issue.description,
+                    issue.impact,
+                    issue.suggestion,
+                    analyzed_at,
                 )
-
-            conn.commit()
+                for issue in architecture.performance_issues
+            ),
+        )
 
     def get_optimization_plan(self) -> dict[str, Any]:
         """Obtenir un plan d'optimisation basé sur l'analyse"""
         # Charger les données d'analyse
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.reading() as conn:
             cursor = conn.cursor()
 
             # Statistiques des modules
@@ -7,11 +7,18 @@ des fichiers Python. Utilisé par les autres modules d'analyse.
 """
 
 import ast
+import hashlib
 import logging
-import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .code_metrics import decision_points
+from .fingerprints import TokenStream
+
+if TYPE_CHECKING:
+    from .ast_cache import ASTAnalysisCache
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +33,10 @@ class ASTNodeInfo:
     complexity: int
     signature: str
     content: str
+    # Empreinte structurelle 128 bits et échantillon de shingles du nœud
+    # (voir fingerprints.py), disponibles même sans capture du contenu
+    fingerprint: str = ""
+    shingles: tuple[int, ...] = field(default=(), repr=False)
 
 
 @dataclass
@@ -43,11 +54,179 @@ class FileAnalysis:
     last_modified: datetime
 
 
-class ASTAnalyzer:
-    """Analyseur AST de base pour extraire les informations structurelles"""
+class SourceIndex:
+    """Index des débuts de ligne d'un fichier source
+
+    Construit une seule fois par fichier, il permet d'extraire le texte d'un
+    nœud par simple découpage de la chaîne au lieu de re-découper tout le
+    fichier à chaque nœud.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self._offsets = [0]
+        for line in content.splitlines(keepends=True):
+            self._offsets.append(self._offsets[-1] + len(line))
+
+        # Si "\n" est le seul séparateur, un découpage brut suffit
+        trailing = 0 if not content or content.endswith("\n") else 1
+        self._newline_only = content.count("\n") + trailing == self.line_count
+
+    @property
+    def line_count(self) -> int:
+        """Nombre de lignes du fichier"""
+        return len(self._offsets) - 1
+
+    def segment(self, start_line: int, end_line: int) -> str:
+        """Texte des lignes start_line à end_line (1-indexées, incluses)"""
+        start = max(start_line - 1, 0)
+        end = min(end_line, self.line_count)
+        if start >= end:
+            return ""
+
+        text = self.content[self._offsets[start] : self._offsets[end]]
+        if self._newline_only:
+            return text[:-1] if text.endswith("\n") else text
+        return "\n".join(text.splitlines())
+
+    def node_text(self, node: ast.AST) -> str:
+        """Texte source couvert par un nœud AST"""
+        start_line = getattr(node, "lineno", 1)
+        end_line = getattr(node, "end_lineno", None) or start_line
+        return self.segment(start_line, end_line)
+
+
+class _ExtractionVisitor(ast.NodeVisitor):
+    """Parcours unique de l'arbre AST
+
+    Collecte fonctions, classes, conditions, boucles et imports en une seule
+    traversée. La complexité cyclomatique (définition de ``code_metrics``) est
+    cumulée de bas en haut : chaque nœud renvoie le nombre de points de
+    décision de son sous-arbre, ce qui évite de re-parcourir chaque
+    sous-arbre. Le même parcours alimente le flux
+    de tokens structurels dont sont tirées empreintes et signatures.
+    """
+
+    def __init__(self, analyzer: "ASTAnalyzer", source: SourceIndex):
+        self.analyzer = analyzer
+        self.source = source
+        self.functions: list[ASTNodeInfo] = []
+        self.classes: list[ASTNodeInfo] = []
+        self.conditionals: list[ASTNodeInfo] = []
+        self.loops: list[ASTNodeInfo] = []
+        self.imports: list[str] = []
+        self.tokens = TokenStream()
+        self._scored: list[ASTNodeInfo] = []
+        self._spans: list[tuple[ASTNodeInfo, ast.AST, int, int]] = []
+
+    @property
+    def complexity_score(self) -> float:
+        """Complexité moyenne des fonctions, classes, conditions et boucles"""
+        total_complexity = sum(info.complexity for info in self._scored)
+        return total_complexity / max(len(self._scored), 1)
+
+    def visit(self, node: ast.AST) -> int:
+        """Visiter un nœud et renvoyer les points de décision de son sous-arbre"""
+        info = self._register(node)
+        start = len(self.tokens)
+        self.tokens.enter(node)
+
+        decisions = self._own_decisions(node)
+        for _field, value in ast.iter_fields(node):
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        decisions += self.visit(item)
+            elif isinstance(value, ast.AST):
+                decisions += self.visit(value)
+
+        self.tokens.exit(node)
+        if info is not None:
+            info.complexity = 1 + decisions
+            self._spans.append((info, node, start, len(self.tokens)))
+        return decisions
+
+    def finalize(self):
+        """Calculer empreintes et signatures une fois le fichier parcouru"""
+        tokens = self.tokens
+        make_signature = self.analyzer._create_signature
+        for info, node, start, end in self._spans:
+            info.fingerprint = tokens.fingerprint(start, end)
+            info.shingles = tokens.shingles(start, end)
+            info.signature = make_signature(node, info.fingerprint)
+
+    def _own_decisions(self, node: ast.AST) -> int:
+        """Points de décision apportés par le nœud lui-même"""
+        decisions = decision_points(node)
+        if decisions:
+            return decisions
+        if isinstance(node, ast.Import):
+            self.imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            self.imports.extend(f"{module}.{alias.name}" for alias in node.names)
+        return 0
+
+    def _register(self, node: ast.AST) -> ASTNodeInfo | None:
+        """Enregistrer un nœud suivi avant de visiter ses enfants
+
+        La complexité, l'empreinte et la signature sont renseignées une fois
+        le sous-arbre parcouru.
+        """
+        analyzer = self.analyzer
+
+        if isinstance(node, ast.FunctionDef):
+            target = self.functions
+            node_type, name = "function", node.name
+        elif isinstance(node, ast.ClassDef):
+            target = self.classes
+            node_type, name = "class", node.name
+        elif isinstance(node, ast.If):
+            target = self.conditionals
+            node_type, name = "conditional", f"if_{node.lineno}"
+        elif isinstance(node, ast.For | ast.While):
+            target = self.loops
+            node_type = "loop"
+            name = f"{type(node).__name__.lower()}_{node.lineno}"
+        else:
+            return None
 
-    def __init__(self):
-        self._cache = {}
+        info = ASTNodeInfo(
+            node_type=node_type,
+            name=name,
+            line_number=node.lineno,
+            complexity=1,
+            signature="",
+            content=(
+                analyzer._extract_node_content(node, self.source)
+                if analyzer.capture_content
+                else ""
+            ),
+        )
+
+        target.append(info)
+        self._scored.append(info)
+        return info
+
+
+class ASTAnalyzer:
+    """Analyseur AST de base pour extraire les informations structurelles
+
+    Args:
+        capture_content: conserver le code source de chaque nœud dans
+            ``ASTNodeInfo.content``. À désactiver lorsque seules les
+            signatures sont utiles, pour ne pas garder de copies du fichier.
+        cache: cache persistant des analyses (voir ``ast_cache``), partagé
+            entre analyseurs pour ne parser chaque fichier qu'une fois.
+    """
+
+    def __init__(
+        self,
+        capture_content: bool = True,
+        cache: "ASTAnalysisCache | None" = None,
+    ):
+        self.capture_content = capture_content
+        self.cache = cache
 
     def analyze_file(self, file_path: Path) -> FileAnalysis | None:
         """Analyser un fichier Python et extraire toutes les informations"""
@@ -56,145 +235,79 @@ class ASTAnalyzer:
             if file_path.name.startswith("._"):
                 return None
 
+            stat = file_path.stat()
+            if self.cache is not None:
+                cached = self.cache.get_fresh(file_path, stat, self.capture_content)
+                if cached is not None:
+                    return cached
+
             with open(file_path, encoding="utf-8") as f:
                 content = f.read()
 
+            if self.cache is not None:
+                digest = self._stable_hash(content)
+                cached = self.cache.get(file_path, digest, stat, self.capture_content)
+                if cached is not None:
+                    return cached
+
             tree = ast.parse(content)
 
-            functions = self._extract_functions(tree, content, file_path)
-            classes = self._extract_classes(tree, content, file_path)
-            conditionals = self._extract_conditionals(tree, content, file_path)
-            loops = self._extract_loops(tree, content, file_path)
-            imports = self._extract_imports(tree)
+            source = SourceIndex(content)
+            visitor = _ExtractionVisitor(self, source)
+            visitor.visit(tree)
+            visitor.finalize()
 
-            complexity_score = self._calculate_complexity(tree)
-            last_modified = datetime.fromtimestamp(file_path.stat().st_mtime)
+            functions = visitor.functions
+            classes = visitor.classes
+            conditionals = visitor.conditionals
+            loops = visitor.loops
+            imports = visitor.imports
 
-            return FileAnalysis(
+            complexity_score = visitor.complexity_score
+            last_modified = datetime.fromtimestamp(stat.st_mtime)
+
+            analysis = FileAnalysis(
                 file_path=file_path,
                 functions=functions,
                 classes=classes,
                 conditionals=conditionals,
                 loops=loops,
                 imports=imports,
-                total_lines=len(content.splitlines()),
+                total_lines=source.line_count,
                 complexity_score=complexity_score,
                 last_modified=last_modified,
             )
 
+            if self.cache is not None:
+                self.cache.set(file_path, digest, stat, analysis, self.capture_content)
+            return analysis
+
         except Exception as e:
             logger.error(f"Erreur lors de l'analyse AST de {file_path}: {e}")
             return None
 
-    def _extract_functions(
-        self, tree: ast.AST, content: str, file_path: Path
-    ) -> list[ASTNodeInfo]:
-        """Extraire toutes les fonctions du fichier"""
-        functions = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_info = ASTNodeInfo(
-                    node_type="function",
-                    name=node.name,
-                    line_number=node.lineno,
-                    complexity=self._calculate_node_complexity(node),
-                    signature=self._create_function_signature(node, content),
-                    content=self._extract_node_content(node, content),
-                )
-                functions.append(func_info)
-
-        return functions
-
-    def _extract_classes(
-        self, tree: ast.AST, content: str, file_path: Path
-    ) -> list[ASTNodeInfo]:
-        """Extraire toutes les classes du fichier"""
-        classes = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                class_info = ASTNodeInfo(
-                    node_type="class",
-                    name=node.name,
-                    line_number=node.lineno,
-                    complexity=self._calculate_node_complexity(node),
-                    signature=self._create_class_signature(node, content),
-                    content=self._extract_node_content(node, content),
-                )
-                classes.append(class_info)
-
-        return classes
-
-    def _extract_conditionals(
-        self, tree: ast.AST, content: str, file_path: Path
-    ) -> list[ASTNodeInfo]:
-        """Extraire toutes les structures conditionnelles"""
-        conditionals = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.If):
-                cond_info = ASTNodeInfo(
-                    node_type="conditional",
-                    name=f"if_{node.lineno}",
-                    line_number=node.lineno,
-                    complexity=self._calculate_node_complexity(node),
-                    signature=self._create_conditional_signature(node, content),
-                    content=self._extract_node_content(node, content),
-                )
-                conditionals.append(cond_info)
-
-        return conditionals
-
-    def _extract_loops(
-        self, tree: ast.AST, content: str, file_path: Path
-    ) -> list[ASTNodeInfo]:
-        """Extraire toutes les boucles"""
-        loops = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.For | ast.While):
-                loop_info = ASTNodeInfo(
-                    node_type="loop",
-                    name=f"{type(node).__name__.lower()}_{node.lineno}",
-                    line_number=node.lineno,
-                    complexity=self._calculate_node_complexity(node),
-                    signature=self._create_loop_signature(node, content),
-                    content=self._extract_node_content(node, content),
-                )
-                loops.append(loop_info)
-
-        return loops
-
-    def _extract_imports(self, tree: ast.AST) -> list[str]:
-        """Extraire tous les imports"""
-        imports = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                for alias in node.names:
-                    imports.append(f"{module}.{alias.name}")
-
-        return imports
-
-    def _create_function_signature(self, node: ast.FunctionDef, code: str) -> str:
+    def _create_signature(self, node: ast.AST, fingerprint: str) -> str:
+        """Créer la signature d'un nœud suivi"""
+        if isinstance(node, ast.FunctionDef):
+            return self._create_function_signature(node, fingerprint)
+        if isinstance(node, ast.ClassDef):
+            return self._create_class_signature(node, fingerprint)
+        if isinstance(node, ast.If):
+            return self._create_conditional_signature(node, fingerprint)
+        return self._create_loop_signature(node, fingerprint)
+
+    def _create_function_signature(
+        self, node: ast.FunctionDef, fingerprint: str
+    ) -> str:
         """Créer une signature unique pour une fonction"""
         # Extraire les paramètres
         args = []
         for arg in node.args.args:
             args.append(arg.arg)
 
-        # Normaliser le code de la fonction
-        func_code = self._extract_node_content(node, code)
-        normalized = self._normalize_code(func_code)
-
-        return f"function:{node.name}({','.join(args)}):{hash(normalized)}"
+        return f"function:{node.name}({','.join(args)}):{fingerprint[:16]}"
 
-    def _create_class_signature(self, node: ast.ClassDef, code: str) -> str:
+    def _create_class_signature(self, node: ast.ClassDef, fingerprint: str) -> str:
         """Créer une signature unique pour une classe"""
         # Extraire les méthodes
         methods = []
@@ -202,74 +315,20 @@ class ASTAnalyzer:
             if isinstance(child, ast.FunctionDef):
                 methods.append(child.name)
 
-        # Normaliser le code de la classe
-        class_code = self._extract_node_content(node, code)
-        normalized = self._normalize_code(class_code)
+        return f"class:{node.name}:{','.join(methods)}:{fingerprint[:16]}"
 
-        return f"class:{node.name}:{','.join(methods)}:{hash(normalized)}"
-
-    def _create_conditional_signature(self, node: ast.If, code: str) -> str:
+    def _create_conditional_signature(self, node: ast.If, fingerprint: str) -> str:
         """Créer une signature unique pour une condition"""
-        cond_code = self._extract_node_content(node, code)
-        normalized = self._normalize_code(cond_code)
-        return f"conditional:{hash(normalized)}"
+        return f"conditional:{fingerprint[:16]}"
 
-    def _create_loop_signature(self, node: ast.AST, code: str) -> str:
+    def _create_loop_signature(self, node: ast.AST, fingerprint: str) -> str:
         """Créer une signature unique pour une boucle"""
-        loop_code = self._extract_node_content(node, code)
-        normalized = self._normalize_code(loop_code)
-        return f"loop:{type(node).__name__}:{hash(normalized)}"
+        return f"loop:{type(node).__name__}:{fingerprint[:16]}"
 
-    def _extract_node_content(self, node: ast.AST, code: str) -> str:
+    def _extract_node_content(self, node: ast.AST, source: SourceIndex) -> str:
         """Extraire le contenu d'un nœud AST"""
-        lines = code.splitlines()
-        start_line = getattr(node, "lineno", 1) - 1
-        end_line = getattr(node, "end_lineno", start_line + 1)
-
-        if end_line > len(lines):
-            end_line = len(lines)
-
-        return "\n".join(lines[start_line:end_line])
-
-    def _normalize_code(self, code: str) -> str:
-        """Normaliser le code pour la comparaison"""
-        # Supprimer les commentaires
-        code = re.sub(r"#.*$", "", code, flags=re.MULTILINE)
-
-        # Supprimer les espaces en début/fin
-        code = code.strip()
-
-        # Normaliser les espaces
-        code = re.sub(r"\s+", " ", code)
-
-        # Supprimer les lignes vides
-        code = re.sub(r"\n\s*\n", "\n", code)
-
-        return code
-
-    def _calculate_node_complexity(self, node: ast.AST) -> int:
-        """Calculer la complexité cyclomatique d'un nœud"""
-        complexity = 1
-
-        for child in ast.walk(node):
-            if isinstance(child, ast.If | ast.While | ast.For | ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
-
-        return complexity
-
-    def _calculate_complexity(self, tree: ast.AST) -> float:
-        """Calculer la complexité globale d'un arbre AST"""
-        total_complexity = 0
-        node_count = 0
-
-        for node in ast.walk(tree):
-            if isinstance(
-                node,
-                ast.FunctionDef | ast.ClassDef | ast.If | ast.While | ast.For,
-            ):
-                total_complexity += self._calculate_node_complexity(node)
-                node_count += 1
+        return source.node_text(node)
 
-        return total_complexity / max(node_count, 1)
+    def _stable_hash(self, text: str) -> str:
+        """Hash stable entre processus (contrairement à hash())"""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
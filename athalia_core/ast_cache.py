@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+💾 CACHE PERSISTANT DES ANALYSES AST
+====================================
+Cache sur disque des résultats de l'analyseur AST, partagé par tous les
+analyseurs (patterns, performance, architecture). Les entrées sont indexées
+par chemin de fichier et hash du contenu, avec un raccourci mtime+taille
+pour éviter de relire les fichiers inchangés. La base de chaque projet est
+rangée dans ``.athalia_cache/``, hors des fichiers analysés.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .ast_analyzer import ASTNodeInfo, FileAnalysis
+
+logger = logging.getLogger(__name__)
+
+# Version du schéma : à incrémenter dès que FileAnalysis ou les signatures
+# changent, les entrées d'une autre version sont alors purgées.
+SCHEMA_VERSION = 4
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+def _encode_analysis(analysis: FileAnalysis) -> bytes:
+    """Sérialiser une analyse sous forme JSON compacte compressée"""
+
+    def pack(items: list[ASTNodeInfo]) -> list[list[Any]]:
+        return [
+            [
+                n.node_type,
+                n.name,
+                n.line_number,
+                n.complexity,
+                n.signature,
+                n.content,
+                n.fingerprint,
+                n.shingles,
+            ]
+            for n in items
+        ]
+
+    payload = [
+        pack(analysis.functions),
+        pack(analysis.classes),
+        pack(analysis.conditionals),
+        pack(analysis.loops),
+        analysis.imports,
+        analysis.total_lines,
+        analysis.complexity_score,
+        analysis.last_modified.timestamp(),
+    ]
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode_analysis(file_path: Path, blob: bytes) -> FileAnalysis:
+    """Reconstruire une analyse depuis sa forme sérialisée"""
+    (
+        functions,
+        classes,
+        conditionals,
+        loops,
+        imports,
+        total_lines,
+        complexity_score,
+        last_modified,
+    ) = json.loads(zlib.decompress(blob))
+
+    def unpack(items: list[list[Any]]) -> list[ASTNodeInfo]:
+        return [ASTNodeInfo(*item[:7], tuple(item[7])) for item in items]
+
+    return FileAnalysis(
+        file_path=file_path,
+        functions=unpack(functions),
+        classes=unpack(classes),
+        conditionals=unpack(conditionals),
+        loops=unpack(loops),
+        imports=imports,
+        total_lines=total_lines,
+        complexity_score=complexity_score,
+        last_modified=datetime.fromtimestamp(last_modified),
+    )
+
+
+class ASTAnalysisCache:
+    """Cache persistant des analyses AST avec éviction LRU bornée
+
+    Args:
+        db_path: chemin de la base SQLite du cache
+        max_bytes: taille maximale cumulée des entrées sérialisées
+        max_entries: nombre maximal d'entrées conservées
+        memory_entries: taille du cache mémoire placé devant la base
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        memory_entries: int = 2048,
+    ):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self._memory: OrderedDict[str, tuple[int, int, bool, FileAnalysis]] = (
+            OrderedDict()
+        )
+        # Accès servis par le cache mémoire, reportés en base par lot
+        self._touched: dict[str, float] = {}
+        # Absents d'une lecture groupée, déjà comptés : leur raccourci suivant
+        # ne relit pas la base
+        self._missed: set[str] = set()
+        self._lock = threading.Lock()
+        # ``misses`` : échecs du raccourci mtime+taille ; ``revalidated`` :
+        # parmi eux, analyses retrouvées par le hash du contenu
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "saves": 0,
+            "evictions": 0,
+        }
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_database()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connexion d'une opération, validée puis fermée en sortie"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_database(self):
+        """Initialiser la base et purger un schéma obsolète"""
+        with self._connect() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS ast_cache")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ast_cache (
+                    path TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    payload BLOB NOT NULL,
+                    payload_size INTEGER NOT NULL,
+                    with_content INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ast_cache_access "
+                "ON ast_cache(last_access)"
+            )
+            conn.commit()
+
+    def _remember(self, key: str, entry: tuple[int, int, bool, FileAnalysis]):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get_fresh(
+        self, file_path: Path, stat: os.stat_result, with_content: bool = True
+    ) -> FileAnalysis | None:
+        """Raccourci : analyse en cache si mtime et taille n'ont pas changé"""
+        key = str(file_path)
+        with self._lock:
+            entry = self._memory.get(key)
+            if key in self._missed:
+                self._missed.discard(key)
+                return None
+        if (
+            entry
+            and entry[0] == stat.st_mtime_ns
+            and entry[1] == stat.st_size
+            and (entry[2] or not with_content)
+        ):
+            with self._lock:
+                self._touched[key] = time.time()
+            self.stats["hits"] += 1
+            return entry[3]
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT with_content, payload FROM ast_cache "
+                    "WHERE path = ? AND mtime_ns = ? AND size = ? "
+                    "AND with_content >= ?",
+                    (key, stat.st_mtime_ns, stat.st_size, int(with_content)),
+                ).fetchone()
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+                conn.execute(
+                    "UPDATE ast_cache SET last_access = ? WHERE path = ?",
+                    (time.time(), key),
+                )
+            analysis = _decode_analysis(file_path, row[1])
+        except Exception as e:
+            logger.warning(f"⚠️ Lecture du cache AST impossible pour {key}: {e}")
+            self.stats["misses"] += 1
+            return None
+
+        self._remember(key, (stat.st_mtime_ns, stat.st_size, bool(row[0]), analysis))
+        self.stats["hits"] += 1
+        return analysis
+
+    def get_fresh_many(
+        self, files: list[tuple[Path, os.stat_result]], with_content: bool = True
+    ) -> dict[Path, FileAnalysis]:
+        """Raccourci mtime+taille pour un lot de fichiers, en une seule lecture
+
+        Les dates d'accès sont reportées en base lors de la prochaine écriture.
+        Les fichiers absents sont comptés ici : leur ``get_fresh`` suivant
+        répond sans relire la base.
+        """
+        found: dict[Path, FileAnalysis] = {}
+        pending: dict[str, tuple[Path, os.stat_result]] = {}
+        now = time.time()
+        for file_path, stat in files:
+            key = str(file_path)
+            with self._lock:
+                entry = self._memory.get(key)
+            if (
+                entry
+                and entry[0] == stat.st_mtime_ns
+                and entry[1] == stat.st_size
+                and (entry[2] or not with_content)
+            ):
+                found[file_path] = entry[3]
+                with self._lock:
+                    self._touched[key] = now
+            else:
+                pending[key] = (file_path, stat)
+
+        keys = list(pending)
+        try:
+            with self._connect() as conn:
+                for start in range(0, len(keys), 500):
+                    batch = keys[start : start + 500]
+                    rows = conn.execute(
+                        "SELECT path, mtime_ns, size, with_content, payload "
+                        "FROM ast_cache WHERE with_content >= ? AND path IN "
+                        f"({','.join('?' * len(batch))})",
+                        (int(with_content), *batch),
+                    ).fetchall()
+                    for key, mtime_ns, size, stored_content, payload in rows:
+                        file_path, stat = pending[key]
+                        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+                            continue
+                        analysis = _decode_analysis(file_path, payload)
+                        found[file_path] = analysis
+                        self._remember(
+                            key, (mtime_ns, size, bool(stored_content), analysis)
+                        )
+                        with self._lock:
+                            self._touched[key] = now
+        except Exception as e:
+            logger.warning(f"⚠️ Lecture groupée du cache AST impossible: {e}")
+
+        missed = {
+            key for key, (file_path, _) in pending.items() if file_path not in found
+        }
+        with self._lock:
+            self._missed |= missed
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(missed)
+        return found
+
+    def get(
+        self,
+        file_path: Path,
+        digest: str,
+        stat: os.stat_result,
+        with_content: bool = True,
+    ) -> FileAnalysis | None:
+        """Analyse en cache pour un contenu donné (fichier touché mais inchangé)
+
+        Complète un échec de ``get_fresh``, déjà compté parmi les ``misses``.
+        """
+        key = str(file_path)
+        with self._lock:
+            self._missed.discard(key)
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT with_content, payload FROM ast_cache "
+                    "WHERE path = ? AND content_hash = ? AND with_content >= ?",
+                    (key, digest, int(with_content)),
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE ast_cache SET mtime_ns = ?, size = ?, last_access = ? "
+                    "WHERE path = ?",
+                    (stat.st_mtime_ns, stat.st_size, time.time(), key),
+                )
+            analysis = _decode_analysis(file_path, row[1])
+        except Exception as e:
+            logger.warning(f"⚠️ Lecture du cache AST impossible pour {key}: {e}")
+            return None
+
+        self._remember(key, (stat.st_mtime_ns, stat.st_size, bool(row[0]), analysis))
+        self.stats["revalidated"] += 1
+        return analysis
+
+    def set(
+        self,
+        file_path: Path,
+        digest: str,
+        stat: os.stat_result,
+        analysis: FileAnalysis,
+        with_content: bool = True,
+    ) -> bool:
+        """Enregistrer l'analyse d'un fichier"""
+        return self.set_many([(file_path, digest, stat, analysis, with_content)])
+
+    def set_many(
+        self,
+        entries: list[tuple[Path, str, os.stat_result, FileAnalysis, bool]],
+    ) -> bool:
+        """Enregistrer plusieurs analyses dans une seule transaction"""
+        if not entries:
+            return True
+
+        now = time.time()
+        try:
+            rows = []
+            for file_path, digest, stat, analysis, with_content in entries:
+                payload = _encode_analysis(analysis)
+                rows.append(
+                    (
+                        str(file_path),
+                        digest,
+                        stat.st_mtime_ns,
+                        stat.st_size,
+                        payload,
+                        len(payload),
+                        int(with_content),
+                        now,
+                    )
+                )
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO ast_cache "
+                    "(path, content_hash, mtime_ns, size, payload, payload_size, "
+                    "with_content, last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._evict(conn)
+        except Exception as e:
+            logger.warning(f"⚠️ Écriture du cache AST impossible: {e}")
+            return False
+
+        with self._lock:
+            self._missed.difference_update(str(entry[0]) for entry in entries)
+        for file_path, _digest, stat, analysis, with_content in entries:
+            self._remember(
+                str(file_path),
+                (stat.st_mtime_ns, stat.st_size, with_content, analysis),
+            )
+        self.stats["saves"] += len(entries)
+        return True
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Supprimer les entrées les moins récemment utilisées au-delà des bornes"""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn.executemany(
+                "UPDATE ast_cache SET last_access = ? WHERE path = ?",
+                [(accessed, path) for path, accessed in touched.items()],
+            )
+
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(payload_size), 0) FROM ast_cache"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        removed = 0
+        rows = conn.execute(
+            "SELECT path, payload_size FROM ast_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for path, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM ast_cache WHERE path = ?", (path,))
+            with self._lock:
+                self._memory.pop(path, None)
+            count -= 1
+            total -= size
+            removed += 1
+
+        self.stats["evictions"] += removed
+        logger.debug(f"🧹 Cache AST: {removed} entrées évincées")
+
+    def invalidate(self, paths: Iterable[Path]):
+        """Oublier les analyses de certains fichiers (ré-analyse forcée)"""
+        keys = [str(path) for path in paths]
+        if not keys:
+            return
+        with self._lock:
+            for key in keys:
+                self._memory.pop(key, None)
+                self._touched.pop(key, None)
+                self._missed.discard(key)
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "DELETE FROM ast_cache WHERE path = ?", [(key,) for key in keys]
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Invalidation du cache AST impossible: {e}")
+
+    def clear(self):
+        """Vider le cache"""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._missed.clear()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM ast_cache")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Statistiques du cache"""
+        with self._connect() as conn:
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(payload_size), 0) FROM ast_cache"
+            ).fetchone()
+        requests = self.stats["hits"] + self.stats["misses"]
+        served = self.stats["hits"] + self.stats["revalidated"]
+        return {
+            **self.stats,
+            "entries": count,
+            "size_bytes": total,
+            "hit_rate": round(served / max(requests, 1) * 100, 2),
+            "schema_version": SCHEMA_VERSION,
+        }
+
+
+# Caches partagés, un par base
+_shared_caches: dict[Path, ASTAnalysisCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_ast_cache(root_path: str | Path) -> ASTAnalysisCache:
+    """Retourne le cache AST partagé d'un projet (.athalia_cache/ast_cache.db)"""
+    db_path = (Path(root_path) / ".athalia_cache" / "ast_cache.db").resolve()
+    with _shared_lock:
+        cache = _shared_caches.get(db_path)
+        if cache is None:
+            cache = ASTAnalysisCache(db_path)
+            _shared_caches[db_path] = cache
+        return cache
@@ -24,6 +24,7 @@ from .performance_optimizer import (
     memory_efficient,
     performance_monitor,
 )
+from .project_snapshot import ProjectSnapshot, snapshot_for
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +32,11 @@ logger = logging.getLogger(__name__)
 class AutoCleaner:
     """Nettoyeur automatique de projets"""
 
-    def __init__(self, project_path: str = "."):
+    def __init__(self, project_path: str = ".", snapshot: ProjectSnapshot = None):
         self.project_path = Path(project_path)
+        # Instantané partagé (orchestrateur) ou construit au premier scan
+        self._shared_snapshot = snapshot
+        self._snapshot: ProjectSnapshot | None = None
         self.cleanup_config = self.load_cleanup_config()
         self.cleanup_history = []
         self.dry_run = False
@@ -50,6 +54,13 @@ class AutoCleaner:
         self.optimizer = PerformanceOptimizer()
         self.security_validator = SecurityValidator()
 
+    @property
+    def snapshot(self) -> ProjectSnapshot:
+        """Fichiers du projet nettoyé, parcourus une seule fois"""
+        if self._snapshot is None or self._snapshot.root_path != self.project_path:
+            self._snapshot = snapshot_for(self.project_path, self._shared_snapshot)
+        return self._snapshot
+
     def load_cleanup_config(self, config_path: str | None = None) -> dict[str, Any]:
         """Charge la configuration de nettoyage"""
         default_config = {
@@ -127,9 +138,9 @@ class AutoCleaner:
             for pattern in self.cleanup_config["patterns_to_remove"]:
                 if "*" in pattern:
                     # Pattern avec wildcard
-                    for file_path in self.project_path.rglob(pattern):
-                        if file_path.is_file() and not self._is_excluded(file_path):
-                            candidates["files_to_remove"].append(str(file_path))
+                    for entry in self.snapshot.glob(pattern):
+                        if not self._is_excluded(entry.path):
+                            candidates["files_to_remove"].append(str(entry.path))
                 else:
                     # Pattern exact
                     exact_path = self.project_path / pattern
@@ -142,8 +153,8 @@ class AutoCleaner:
             # Scanner les répertoires de nettoyage
             for dir_pattern in self.cleanup_config["cleanup_directories"]:
                 if "*" in dir_pattern:
-                    for dir_path in self.project_path.rglob(dir_pattern):
-                        if dir_path.is_dir() and not self._is_excluded(dir_path):
+                    for dir_path in self.snapshot.glob_dirs(dir_pattern):
+                        if not self._is_excluded(dir_path):
                             candidates["directories_to_remove"].append(str(dir_path))
                 else:
                     exact_dir = self.project_path / dir_pattern
@@ -154,22 +165,19 @@ class AutoCleaner:
                     ):
                         candidates["directories_to_remove"].append(str(exact_dir))
 
-            # Scanner les gros fichiers
+            # Scanner les gros et anciens fichiers (taille et mtime du parcours)
             max_size = self.cleanup_config["max_file_size_mb"] * 1024 * 1024
-            for file_path in self.project_path.rglob("*"):
-                if file_path.is_file() and not self._is_excluded(file_path):
-                    if file_path.stat().st_size > max_size:
-                        candidates["large_files"].append(str(file_path))
-
-            # Scanner les anciens fichiers
             cutoff_date = datetime.now() - timedelta(
                 days=self.cleanup_config["keep_recent_days"]
             )
-            for file_path in self.project_path.rglob("*"):
-                if file_path.is_file() and not self._is_excluded(file_path):
-                    mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if mtime < cutoff_date:
-                        candidates["old_files"].append(str(file_path))
+            cutoff = cutoff_date.timestamp()
+            for entry in self.snapshot:
+                if self._is_excluded(entry.path):
+                    continue
+                if entry.size > max_size:
+                    candidates["large_files"].append(str(entry.path))
+                if entry.mtime < cutoff:
+                    candidates["old_files"].append(str(entry.path))
 
         except Exception as e:
             logger.error(f"Erreur scan candidats: {e}")
@@ -928,6 +936,9 @@ class AutoCleaner:
         results["empty_dirs"] = empty_result
         self.stats["dirs_removed"] += empty_result.get("directories_count", 0)
 
+        if not dry_run:
+            self.snapshot.invalidate()
+
         return {"stats": self.stats, "results": results, "dry_run": dry_run}
 
     def _generate_cleanup_report(self) -> dict[str, Any]:
@@ -1079,6 +1090,7 @@ class AutoCleaner:
             "cleanup_time": (datetime.now() - start_time).total_seconds(),
         }
         self.cleanup_history.append(cleanup_record)
+        self.snapshot.invalidate()
 
         return {
             "total_files_removed": total_files_removed,
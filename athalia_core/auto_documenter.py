@@ -11,6 +11,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .project_snapshot import ProjectSnapshot, snapshot_for
+
 # Import conditionnel pour éviter les dépendances
 try:
     import yaml
@@ -23,11 +25,31 @@ logger = logging.getLogger(__name__)
 class AutoDocumenter:
     """Générateur automatique de documentation"""
 
-    def __init__(self, project_path: str = ".", lang: str = "en"):
+    def __init__(
+        self,
+        project_path: str = ".",
+        lang: str = "en",
+        snapshot: ProjectSnapshot = None,
+    ):
         self.project_path = Path(project_path)
         self.lang = lang
         self.doc_config = self.load_documentation_config()
         self.doc_history = []
+        # Instantané partagé (orchestrateur) ou construit au premier scan
+        self._shared_snapshot = snapshot
+        self._snapshot: ProjectSnapshot | None = None
+
+    @property
+    def snapshot(self) -> ProjectSnapshot:
+        """Fichiers du projet documenté, parcourus une seule fois"""
+        if self._snapshot is None or self._snapshot.root_path != self.project_path:
+            self._snapshot = snapshot_for(self.project_path, self._shared_snapshot)
+        return self._snapshot
+
+    def _project_files(self, suffix: str | None = None):
+        """Fichiers non exclus de l'instantané (d'un suffixe donné)"""
+        entries = self.snapshot.by_suffix(suffix) if suffix else self.snapshot
+        return [entry for entry in entries if not self._is_excluded(entry.path)]
 
     def load_documentation_config(
         self, config_path: str | None = None
@@ -78,26 +100,21 @@ class AutoDocumenter:
         }
 
         try:
-            for file_path in self.project_path.rglob("*"):
-                if file_path.is_file() and not self._is_excluded(file_path):
-                    relative_path = str(file_path.relative_to(self.project_path))
-
-                    if file_path.suffix == ".py":
-                        if "test" in relative_path.lower():
-                            structure["test_files"].append(relative_path)
-                        else:
-                            structure["python_files"].append(relative_path)
-                    elif file_path.suffix in [".md", ".rst", ".txt"]:
-                        structure["documentation_files"].append(relative_path)
-                    elif file_path.suffix in [
-                        ".yaml",
-                        ".yml",
-                        ".json",
-                        ".toml",
-                    ]:
-                        structure["config_files"].append(relative_path)
+            for entry in self._project_files():
+                relative_path = entry.relative
+                suffix = entry.path.suffix
+
+                if suffix == ".py":
+                    if "test" in relative_path.lower():
+                        structure["test_files"].append(relative_path)
                     else:
-                        structure["other_files"].append(relative_path)
+                        structure["python_files"].append(relative_path)
+                elif suffix in [".md", ".rst", ".txt"]:
+                    structure["documentation_files"].append(relative_path)
+                elif suffix in [".yaml", ".yml", ".json", ".toml"]:
+                    structure["config_files"].append(relative_path)
+                else:
+                    structure["other_files"].append(relative_path)
         except Exception as e:
             logger.error(f"Erreur scan structure: {e}")
 
@@ -124,36 +141,29 @@ class AutoDocumenter:
         }
 
         try:
-            for py_file in self.project_path.rglob("*.py"):
-                if py_file.is_file() and not self._is_excluded(py_file):
-                    analysis["total_files"] += 1
-
-                    try:
-                        with open(py_file, encoding="utf-8") as f:
-                            content = f.read()
-
-                        tree = ast.parse(content)
-
-                        for node in ast.walk(tree):
-                            if isinstance(node, ast.FunctionDef):
-                                analysis["total_functions"] += 1
-                                if ast.get_docstring(node):
-                                    analysis["documented_functions"] += 1
-                            elif isinstance(node, ast.ClassDef):
-                                analysis["total_classes"] += 1
-                                if ast.get_docstring(node):
-                                    analysis["documented_classes"] += 1
-                                # Compter les méthodes
-                                for child in ast.walk(node):
-                                    if (
-                                        isinstance(child, ast.FunctionDef)
-                                        and child != node
-                                    ):
-                                        analysis["total_methods"] += 1
-                                        if ast.get_docstring(child):
-                                            analysis["documented_methods"] += 1
-                    except Exception as e:
-                        logger.warning(f"Erreur analyse {py_file}: {e}")
+            for entry in self._project_files(".py"):
+                analysis["total_files"] += 1
+
+                tree = entry.parse()
+                if tree is None:
+                    logger.warning(f"Erreur analyse {entry.path}: fichier invalide")
+                    continue
+
+                for node in ast.walk(tree):
+                    if isinstance(node, ast.FunctionDef):
+                        analysis["total_functions"] += 1
+                        if ast.get_docstring(node):
+                            analysis["documented_functions"] += 1
+                    elif isinstance(node, ast.ClassDef):
+                        analysis["total_classes"] += 1
+                        if ast.get_docstring(node):
+                            analysis["documented_classes"] += 1
+                        # Compter les méthodes
+                        for child in ast.walk(node):
+                            if isinstance(child, ast.FunctionDef) and child != node:
+                                analysis["total_methods"] += 1
+                                if ast.get_docstring(child):
+                                    analysis["documented_methods"] += 1
         except Exception as e:
             logger.error(f"Erreur analyse fichiers Python: {e}")
 
@@ -167,25 +177,36 @@ class AutoDocumenter:
             with open(file_path, encoding="utf-8") as f:
                 content = f.read()
 
-            tree = ast.parse(content)
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef | ast.ClassDef | ast.Module):
-                    docstring = ast.get_docstring(node)
-                    if docstring:
-                        docstrings.append(
-                            {
-                                "type": type(node).__name__,
-                                "name": getattr(node, "name", "module"),
-                                "docstring": docstring,
-                                "line_number": getattr(node, "lineno", 0),
-                            }
-                        )
+            docstrings = self._docstrings_from_tree(ast.parse(content))
         except Exception as e:
             logger.error(f"Erreur extraction docstrings {file_path}: {e}")
 
         return docstrings
 
+    def _docstrings_from_tree(self, tree: ast.AST) -> list[dict[str, Any]]:
+        docstrings = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef | ast.ClassDef | ast.Module):
+                docstring = ast.get_docstring(node)
+                if docstring:
+                    docstrings.append(
+                        {
+                            "type": type(node).__name__,
+                            "name": getattr(node, "name", "module"),
+                            "docstring": docstring,
+                            "line_number": getattr(node, "lineno", 0),
+                        }
+                    )
+        return docstrings
+
+    def _entry_docstrings(self, entry) -> list[dict[str, Any]]:
+        """Docstrings d'un fichier de l'instantané (AST mémorisé)"""
+        tree = entry.parse()
+        if tree is None:
+            logger.error(f"Erreur extraction docstrings {entry.path}")
+            return []
+        return self._docstrings_from_tree(tree)
+
     def generate_readme(self) -> str:
         """Génère un README"""
         project_name = self.project_path.name
@@ -236,27 +257,27 @@ MIT License
         api_docs = {"functions": [], "classes": [], "modules": []}
 
         try:
-            for py_file in self.project_path.rglob("*.py"):
-                if py_file.is_file() and not self._is_excluded(py_file):
-                    docstrings = self.extract_docstrings(str(py_file))
-
-                    for doc in docstrings:
-                        if doc["type"] == "FunctionDef":
-                            api_docs["functions"].append(
-                                {
-                                    "name": doc["name"],
-                                    "docstring": doc["docstring"],
-                                    "file": str(py_file.relative_to(self.project_path)),
-                                }
-                            )
-                        elif doc["type"] == "ClassDef":
-                            api_docs["classes"].append(
-                                {
-                                    "name": doc["name"],
-                                    "docstring": doc["docstring"],
-                                    "file": str(py_file.relative_to(self.project_path)),
-                                }
-                            )
+            for entry in self._project_files(".py"):
+                py_file = entry.path
+                docstrings = self._entry_docstrings(entry)
+
+                for doc in docstrings:
+                    if doc["type"] == "FunctionDef":
+                        api_docs["functions"].append(
+                            {
+                                "name": doc["name"],
+                                "docstring": doc["docstring"],
+                                "file": str(py_file.relative_to(self.project_path)),
+                            }
+                        )
+                    elif doc["type"] == "ClassDef":
+                        api_docs["classes"].append(
+                            {
+                                "name": doc["name"],
+                                "docstring": doc["docstring"],
+                                "file": str(py_file.relative_to(self.project_path)),
+                            }
+                        )
         except Exception as e:
             logger.error(f"Erreur génération API docs: {e}")
 
@@ -538,14 +559,14 @@ SOFTWARE.
                 )
 
             # Vérifier la qualité des docstrings
-            for py_file in self.project_path.rglob("*.py"):
-                if py_file.is_file() and not self._is_excluded(py_file):
-                    docstrings = self.extract_docstrings(str(py_file))
-                    for doc in docstrings:
-                        if len(doc["docstring"]) < 10:
-                            validation["warnings"].append(
-                                f"Docstring trop courte dans {py_file}: {doc['name']}"
-                            )
+            for entry in self._project_files(".py"):
+                py_file = entry.path
+                docstrings = self._entry_docstrings(entry)
+                for doc in docstrings:
+                    if len(doc["docstring"]) < 10:
+                        validation["warnings"].append(
+                            f"Docstring trop courte dans {py_file}: {doc['name']}"
+                        )
 
         except Exception as e:
             logger.error(f"Erreur validation documentation: {e}")
@@ -644,6 +665,8 @@ SOFTWARE.
     def perform_full_documentation(self) -> dict[str, Any]:
         """Effectue une documentation complète du projet"""
         start_time = datetime.now()
+        # Instantané propre reconstruit : le projet a pu changer depuis
+        self._snapshot = None
 
         result = {
             "summary": "",
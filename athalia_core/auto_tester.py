@@ -7,6 +7,8 @@ import subprocess
 from pathlib import Path
 from typing import Any
 
+from .project_snapshot import ProjectSnapshot, snapshot_for
+
 # Import du validateur de sécurité
 try:
     from athalia_core.security_validator import SecurityError, validate_and_run
@@ -27,11 +29,21 @@ logger = logging.getLogger(__name__)
 class AutoTester:
     """Générateur de tests pour Athalia"""
 
-    def __init__(self, project_path: str = None):
+    def __init__(self, project_path: str = None, snapshot: ProjectSnapshot = None):
         self.project_path: Path = Path(project_path) if project_path else Path(".")
+        # Instantané partagé (orchestrateur) ou construit à chaque génération
+        self._shared_snapshot = snapshot
+        self._snapshot: ProjectSnapshot | None = None
         self.test_results = {}
         self.generated_tests = []
 
+    @property
+    def snapshot(self) -> ProjectSnapshot:
+        """Fichiers du projet, parcourus une seule fois par génération"""
+        if self._snapshot is None or self._snapshot.root_path != self.project_path:
+            self._snapshot = snapshot_for(self.project_path, self._shared_snapshot)
+        return self._snapshot
+
     def run(self) -> dict[str, Any]:
         """Méthode run() pour lorchestrateur - exécute les tests"""
         if not self.project_path:
@@ -41,6 +53,7 @@ class AutoTester:
     def generate_tests(self, project_path: str) -> dict[str, Any]:
         """Génération complète de tests pour un projet"""
         self.project_path = Path(project_path)
+        self._snapshot = None
 
         logger.info(f"🧪 Génération de tests pour: {self.project_path.name}")
 
@@ -54,6 +67,7 @@ class AutoTester:
 
         # Sauvegarde des tests
         self._save_tests(unit_tests, integration_tests, performance_tests)
+        self.snapshot.invalidate()
 
         # Exécution des tests
         test_results = self._run_tests()
@@ -70,17 +84,18 @@ class AutoTester:
         """Analyse les modules Python du projet"""
         modules = []
 
-        for py_file in self.project_path.rglob("*.py"):
+        for entry in self.snapshot.python_files():
+            py_file = entry.path
             # Ignorer les fichiers macOS ._*
             if py_file.name.startswith("._"):
                 continue
 
             if py_file.name != "__init__.py" and "test" not in py_file.name.lower():
+                tree = entry.parse()
+                if tree is None:
+                    logger.warning(f"Fichier illisible ou invalide ignoré: {py_file}")
+                    continue
                 try:
-                    with open(py_file, encoding="utf-8") as file_handle:
-                        content = file_handle.read()
-
-                    tree = ast.parse(content)
                     module_info = {
                         "name": py_file.stem,
                         "path": str(py_file),
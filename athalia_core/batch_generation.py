@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+📦 GÉNÉRATION DE PROJETS PAR LOTS
+=================================
+Génère des centaines de projets à partir d'un fichier d'idées (JSONL, YAML
+ou texte, une idée par ligne) dans un seul processus parent :
+
+- les idées identiques (casse et espaces ignorés) ne sont générées qu'une fois
+- le type de chaque idée distincte est détecté dans le processus parent
+  avant le lancement des travaux, puis transmis au blueprint
+- blueprint, projet et étapes complémentaires s'enchaînent par idée dans un
+  pool de workers (processus par défaut) à concurrence bornée
+- chaque résultat, succès ou échec, est écrit dès qu'il est disponible dans
+  un fichier JSONL
+"""
+
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, TextIO
+
+from .classification.project_classifier import detect_blueprint_type
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_SLUG = re.compile(r"[^a-z0-9_]+")
+
+
+@dataclass
+class BatchItem:
+    """Idée à générer"""
+
+    index: int
+    idea: str
+    item_id: str
+    project_type: str = ""
+    duplicates: list[int] = field(default_factory=list)
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BatchSummary:
+    """Bilan d'un lot"""
+
+    total: int = 0
+    unique: int = 0
+    duplicates: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    duration: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def normalize_idea(idea: str) -> str:
+    """Forme servant à repérer les idées identiques"""
+    return _WHITESPACE.sub(" ", idea).strip().casefold()
+
+
+def _idea_entry(raw: Any, position: int) -> dict[str, Any] | None:
+    if isinstance(raw, str):
+        raw = {"idea": raw}
+    if not isinstance(raw, dict):
+        kind = type(raw).__name__
+        raise ValueError(f"Entrée {position}: idée attendue, reçu {kind}")
+    idea = str(raw.get("idea") or raw.get("description") or "").strip()
+    if not idea:
+        return None
+    return {**raw, "idea": idea}
+
+
+def load_ideas(path: str | Path) -> list[dict[str, Any]]:
+    """Lit un fichier d'idées
+
+    Formats : ``.jsonl`` (une chaîne ou un objet ``{"idea": ...}`` par
+    ligne), ``.yaml``/``.yml`` (liste, ou clé ``ideas``), sinon texte brut
+    (une idée par ligne, ``#`` pour les commentaires).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    with open(path, encoding="utf-8") as f:
+        if suffix == ".jsonl":
+            raw_entries = [json.loads(line) for line in f if line.strip()]
+        elif suffix in (".yaml", ".yml"):
+            import yaml
+
+            data = yaml.safe_load(f) or []
+            raw_entries = data.get("ideas", []) if isinstance(data, dict) else data
+        else:
+            raw_entries = [
+                line.strip()
+                for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+
+    entries = []
+    for position, raw in enumerate(raw_entries, 1):
+        entry = _idea_entry(raw, position)
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+def plan_batch(entries: list[dict[str, Any]]) -> tuple[list[BatchItem], int]:
+    """Dédoublonne et classifie les idées ; retourne (items, doublons)
+
+    Un ``project_type`` fourni par l'entrée remplace la détection.
+    """
+    items: list[BatchItem] = []
+    by_idea: dict[str, BatchItem] = {}
+    duplicates = 0
+    for index, entry in enumerate(entries):
+        key = normalize_idea(entry["idea"])
+        first = by_idea.get(key)
+        if first is not None:
+            first.duplicates.append(index)
+            duplicates += 1
+            continue
+        item = BatchItem(
+            index,
+            entry["idea"],
+            str(entry.get("id", index)),
+            project_type=entry.get("project_type")
+            or detect_blueprint_type(entry["idea"]),
+            options={
+                k: v
+                for k, v in entry.items()
+                if k not in ("idea", "id", "project_type")
+            },
+        )
+        by_idea[key] = item
+        items.append(item)
+    return items, duplicates
+
+
+def _slug(text: str) -> str:
+    ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore")
+    return _SLUG.sub("_", ascii_text.decode().casefold()).strip("_")[:48] or "projet"
+
+
+def _audit_step(project_path: Path) -> dict[str, Any]:
+    from .audit import audit_project_intelligent
+
+    results = audit_project_intelligent(str(project_path))
+    return {"global_score": results.get("global_score", 0)}
+
+
+# Étapes complémentaires exécutables sur chaque projet généré
+POST_STEPS: dict[str, Callable[[Path], dict[str, Any]]] = {
+    "audit": _audit_step,
+}
+
+# IA du worker courant (une par processus, réutilisée d'un item à l'autre)
+_worker_ai = None
+
+
+def _robust_ai():
+    global _worker_ai
+    if _worker_ai is None:
+        from .ai_robust import RobustAI
+
+        _worker_ai = RobustAI()
+    return _worker_ai
+
+
+def run_batch_item(
+    item: BatchItem,
+    output_root: str,
+    dry_run: bool = False,
+    post_steps: tuple[str, ...] = (),
+) -> dict[str, Any]:
+    """Pipeline complet d'une idée (exécuté dans un worker)"""
+    started = time.perf_counter()
+    record: dict[str, Any] = {
+        "index": item.index,
+        "id": item.item_id,
+        "idea": item.idea,
+        "project_type": item.project_type,
+        "status": "failed",
+    }
+    try:
+        blueprint = _robust_ai().generate_blueprint(
+            item.idea, project_type=item.project_type, **item.options
+        )
+        if not blueprint:
+            raise ValueError("Blueprint vide")
+        name = blueprint.get("project_name") or item.project_type
+        output = Path(output_root) / f"{item.index:05d}_{_slug(str(name))}"
+        record.update(project_name=name, output=str(output))
+
+        if not dry_run:
+            from .cli import generate_project
+
+            if not generate_project(blueprint, output):
+                raise RuntimeError("Génération du projet échouée")
+            for step in post_steps:
+                record.setdefault("post_steps", {})[step] = POST_STEPS[step](output)
+        record["status"] = "ok"
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["duration"] = round(time.perf_counter() - started, 4)
+    return record
+
+
+class BatchGenerator:
+    """Génération d'un lot d'idées dans un pool de workers
+
+    Args:
+        output_root: dossier recevant un sous-dossier par projet
+        workers: nombre de workers (par défaut le nombre de cœurs)
+        use_processes: processus (cœurs multiples) ou threads
+        max_pending: travaux en cours au plus (par défaut 2 par worker)
+        dry_run: blueprints seulement, aucun fichier de projet
+        post_steps: étapes complémentaires (clés de ``POST_STEPS``)
+    """
+
+    def __init__(
+        self,
+        output_root: str | Path,
+        workers: int | None = None,
+        use_processes: bool = True,
+        max_pending: int | None = None,
+        dry_run: bool = False,
+        post_steps: Iterable[str] = (),
+    ):
+        self.output_root = Path(output_root)
+        self.workers = max(workers or os.cpu_count() or 1, 1)
+        self.use_processes = use_processes
+        self.max_pending = max_pending or self.workers * 2
+        self.dry_run = dry_run
+        self.post_steps = tuple(post_steps)
+        unknown = set(self.post_steps) - set(POST_STEPS)
+        if unknown:
+            raise ValueError(f"Étapes inconnues: {', '.join(sorted(unknown))}")
+
+    def _executor(self) -> Executor:
+        if self.use_processes and self.workers > 1:
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="athalia-batch"
+        )
+
+    def iter_results(self, items: list[BatchItem]) -> Iterator[dict[str, Any]]:
+        """Résultats au fil de l'eau (ordre d'achèvement)"""
+        pending: dict[Future, BatchItem] = {}
+        queue = iter(items)
+        with self._executor() as executor:
+            while True:
+                for item in queue:
+                    future = executor.submit(
+                        run_batch_item,
+                        item,
+                        str(self.output_root),
+                        self.dry_run,
+                        self.post_steps,
+                    )
+                    pending[future] = item
+                    if len(pending) >= self.max_pending:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        # Worker perdu (processus tué...) : l'item seul échoue
+                        record = {
+                            "index": item.index,
+                            "id": item.item_id,
+                            "idea": item.idea,
+                            "project_type": item.project_type,
+                            "status": "failed",
+                            "error": f"{type(e).__name__}: {e}",
+                        }
+                    yield record
+                    for duplicate in item.duplicates:
+                        yield {
+                            "index": duplicate,
+                            "idea": item.idea,
+                            "status": "duplicate",
+                            "duplicate_of": item.index,
+                        }
+
+    def run(
+        self, entries: list[dict[str, Any]], results: TextIO | None = None
+    ) -> BatchSummary:
+        """Génère le lot ; chaque résultat est écrit (JSONL) dès sa fin"""
+        started = time.perf_counter()
+        items, duplicates = plan_batch(entries)
+        summary = BatchSummary(
+            total=len(entries), unique=len(items), duplicates=duplicates
+        )
+        self.output_root.mkdir(parents=True, exist_ok=True)
+
+        for record in self.iter_results(items):
+            if record["status"] == "ok":
+                summary.succeeded += 1
+            elif record["status"] == "failed":
+                summary.failed += 1
+                logger.warning(f"❌ Idée {record['index']}: {record.get('error')}")
+            if results is not None:
+                results.write(json.dumps(record, ensure_ascii=False) + "\n")
+                results.flush()
+
+        summary.duration = round(time.perf_counter() - started, 3)
+        return summary
+
+
+def generate_batch(
+    ideas_file: str | Path,
+    output_root: str | Path,
+    results_file: str | Path | None = None,
+    **options,
+) -> BatchSummary:
+    """Génère tous les projets d'un fichier d'idées"""
+    entries = load_ideas(ideas_file)
+    generator = BatchGenerator(output_root, **options)
+    if results_file is None:
+        return generator.run(entries)
+    with open(results_file, "w", encoding="utf-8") as results:
+        return generator.run(entries, results)
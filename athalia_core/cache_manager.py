@@ -2,118 +2,437 @@
 """
 Système de cache intelligent pour Athalia
 Optimise les performances en mettant en cache les résultats de génération
+
+Deux niveaux :
+- un LRU en mémoire (résultats sérialisés, bornés en nombre et en taille)
+- un stockage disque réparti en sous-répertoires (``ab/abcd….pkl``), écrit
+  de façon atomique (fichier temporaire puis renommage) : plusieurs processus
+  peuvent partager le même répertoire de cache.
+
+La date de modification d'une entrée sur disque est sa date d'expiration :
+expiration et purge ne demandent qu'un ``stat()``.
+
+Les clés sont adressées par le contenu : SHA-256 complet de la forme canonique
+du blueprint entier, préfixée d'un espace de noms (version d'Athalia, empreinte
+des templates de génération, version du format). ``explain_cache_key`` détaille
+ce qui entre dans une clé.
 """
 
+import atexit
+import functools
 import hashlib
+import importlib
 import json
 import logging
+import math
 import os
 import pickle
+import tempfile
+import threading
 import time
+import weakref
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Expiration des entrées sans TTL (limite des horodatages 32 bits)
+NEVER_EXPIRES = 2**31 - 1
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+# Version du format des clés et des entrées
+CACHE_FORMAT_VERSION = 2
+
+# Champs du blueprint sans effet sur le projet généré
+VOLATILE_BLUEPRINT_FIELDS = frozenset(
+    {"timestamp", "created_at", "generated_at", "request_id", "cached", "cache_stats"}
+)
+
+# Sources dont dépend le code généré (templates)
+_TEMPLATE_SOURCES = ("generation.py", "templates")
+
+
+@functools.lru_cache(maxsize=1)
+def template_digest() -> str:
+    """Empreinte des sources de templates (calculée une fois par processus)"""
+    package_dir = Path(__file__).parent
+    digest = hashlib.blake2b(digest_size=16)
+    for source in _TEMPLATE_SOURCES:
+        path = package_dir / source
+        files = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for file in files:
+            if not file.is_file():
+                continue
+            digest.update(file.relative_to(package_dir).as_posix().encode())
+            digest.update(b"\0")
+            digest.update(file.read_bytes())
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cache_namespace(extra: str = "") -> str:
+    """Espace de noms des clés : version d'Athalia, templates, format"""
+    version = getattr(importlib.import_module("athalia_core"), "__version__", "0")
+    namespace = f"athalia-{version}/templates-{template_digest()[:12]}"
+    namespace += f"/v{CACHE_FORMAT_VERSION}"
+    return f"{namespace}/{extra}" if extra else namespace
+
+
+def _canonical_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=lambda item: canonical_json(item))
+    if isinstance(value, Path):
+        return value.as_posix()
+    if isinstance(value, bytes):
+        return value.hex()
+    raise TypeError(f"Valeur non sérialisable dans le blueprint: {type(value)!r}")
+
+
+def canonical_json(value: Any) -> str:
+    """Sérialisation canonique : clés triées, sans espaces, ensembles triés"""
+    return json.dumps(
+        value,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_canonical_default,
+    )
+
+
+def canonical_blueprint(
+    blueprint: dict[str, Any], context: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Champs du blueprint (et du contexte d'exécution) qui entrent dans la clé"""
+    fields = {
+        str(name): value
+        for name, value in blueprint.items()
+        if name not in VOLATILE_BLUEPRINT_FIELDS
+    }
+    if context:
+        fields["__context__"] = dict(context)
+    return fields
+
+
+def explain_cache_key(
+    blueprint: dict[str, Any],
+    context: dict[str, Any] | None = None,
+    namespace: str = "",
+) -> dict[str, Any]:
+    """Détaille la clé d'un blueprint : espace de noms, champs retenus, ignorés"""
+    fields = canonical_blueprint(blueprint, context)
+    full_namespace = cache_namespace(namespace)
+    canonical = canonical_json(fields)
+    key = hashlib.sha256(f"{full_namespace}\n{canonical}".encode()).hexdigest()
+    return {
+        "key": key,
+        "namespace": full_namespace,
+        "template_digest": template_digest(),
+        "fields": sorted(name for name in fields if name != "__context__"),
+        "ignored_fields": sorted(
+            str(name) for name in blueprint if name in VOLATILE_BLUEPRINT_FIELDS
+        ),
+        "context": sorted(context or {}),
+        "canonical": canonical,
+    }
+
+
+def blueprint_cache_key(
+    blueprint: dict[str, Any],
+    context: dict[str, Any] | None = None,
+    namespace: str = "",
+) -> str:
+    """Clé SHA-256 (64 caractères hexadécimaux) d'un blueprint"""
+    return explain_cache_key(blueprint, context, namespace)["key"]
+
+
+# Caches dont les statistiques restent à sauvegarder en fin de processus
+_live_managers: "weakref.WeakSet[CacheManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_stats():
+    for manager in list(_live_managers):
+        manager.flush_stats()
+
+
+def _empty_stats() -> dict[str, int]:
+    return {
+        "hits": 0,
+        "misses": 0,
+        "saves": 0,
+        "total_requests": 0,
+        "evictions": 0,
+    }
 
-class CacheManager:
-    """Gestionnaire de cache intelligent pour Athalia"""
 
-    def __init__(self, cache_dir: str = ".athalia_cache"):
+class CacheManager:
+    """Gestionnaire de cache intelligent pour Athalia
+
+    Args:
+        cache_dir: répertoire du cache disque
+        ttl: durée de vie par défaut d'une entrée en secondes (None : illimitée)
+        max_entries: nombre maximal d'entrées sur disque
+        max_size_mb: taille maximale du cache disque
+        memory_entries: entrées gardées dans le LRU en mémoire
+        memory_size_mb: taille maximale du LRU en mémoire
+        stats_flush_every: opérations entre deux sauvegardes des statistiques
+        stats_flush_interval: délai maximal (s) avant sauvegarde des statistiques
+        evict_every: écritures entre deux contrôles des limites disque
+        namespace: composante ajoutée à l'espace de noms des clés
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = ".athalia_cache",
+        ttl: float | None = 86400,
+        max_entries: int = 10000,
+        max_size_mb: float = 512,
+        memory_entries: int = 256,
+        memory_size_mb: float = 64,
+        stats_flush_every: int = 100,
+        stats_flush_interval: float = 5.0,
+        evict_every: int = 100,
+        namespace: str = "",
+    ):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True, parents=True)
         self.stats_file = self.cache_dir / "cache_stats.json"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.memory_entries = memory_entries
+        self.memory_size_bytes = int(memory_size_mb * 1024 * 1024)
+        self.stats_flush_every = stats_flush_every
+        self.stats_flush_interval = stats_flush_interval
+        self.evict_every = evict_every
+        self.namespace = namespace
+
+        self._lock = threading.RLock()
+        # Niveau mémoire : clé -> (expiration, résultat sérialisé)
+        self._memory: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._memory_bytes = 0
+        self._writes_since_evict = 0
+
+        # Statistiques : totaux connus + variations non encore sauvegardées
         self.stats = self._load_stats()
+        self._pending_stats = _empty_stats()
+        self._pending_ops = 0
+        self._last_flush = time.monotonic()
+        _live_managers.add(self)
+
+    # ------------------------------------------------------------------
+    # Statistiques
+    # ------------------------------------------------------------------
 
     def _load_stats(self) -> dict[str, Any]:
         """Charge les statistiques depuis le fichier"""
-        default_stats = {
-            "hits": 0,
-            "misses": 0,
-            "saves": 0,
-            "total_requests": 0,
-        }
-
+        stats = _empty_stats()
         try:
             if self.stats_file.exists():
                 with open(self.stats_file, encoding="utf-8") as f:
-                    return json.load(f)
+                    stats.update(json.load(f))
         except Exception as e:
             logger.warning(f"⚠️ Erreur lors du chargement des stats: {e}")
-
-        return default_stats
+        return stats
+
+    def _count(self, **increments: int):
+        """Compter des événements ; sauvegarde par lots"""
+        with self._lock:
+            for name, value in increments.items():
+                self.stats[name] = self.stats.get(name, 0) + value
+                self._pending_stats[name] = self._pending_stats.get(name, 0) + value
+            self._pending_ops += 1
+            due = (
+                self._pending_ops >= self.stats_flush_every
+                or time.monotonic() - self._last_flush >= self.stats_flush_interval
+            )
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Sauvegarde les statistiques en fusionnant celles des autres processus"""
+        with self._lock:
+            if not self._pending_ops:
+                return
+            pending, self._pending_stats = self._pending_stats, _empty_stats()
+            self._pending_ops = 0
+            self._last_flush = time.monotonic()
+
+            merged = self._load_stats()
+            for name, value in pending.items():
+                merged[name] = merged.get(name, 0) + value
+            self.stats = merged
+            self._save_stats()
 
     def _save_stats(self):
         """Sauvegarde les statistiques dans le fichier"""
         try:
-            with open(self.stats_file, "w", encoding="utf-8") as f:
-                json.dump(self.stats, f, indent=2)
+            self._atomic_write(
+                self.stats_file, json.dumps(self.stats, indent=2).encode("utf-8")
+            )
         except Exception as e:
             logger.warning(f"⚠️ Erreur lors de la sauvegarde des stats: {e}")
 
-    def _generate_cache_key(self, blueprint: dict[str, Any]) -> str:
-        """Génère une clé de cache unique basée sur le blueprint"""
-        # Créer une version simplifiée du blueprint pour la clé
-        key_data = {
-            "name": blueprint.get("name", ""),
-            "description": blueprint.get("description", ""),
-            "project_type": blueprint.get("project_type", ""),
-            "version": "1.0",  # Version du cache
-        }
-
-        # Générer un hash SHA-256
-        key_string = json.dumps(key_data, sort_keys=True)
-        return hashlib.sha256(key_string.encode()).hexdigest()[:16]
-
-    def get(self, blueprint: dict[str, Any]) -> dict[str, Any] | None:
-        """Récupère un résultat du cache"""
-        self.stats["total_requests"] += 1
-
+    # ------------------------------------------------------------------
+    # Stockage
+    # ------------------------------------------------------------------
+
+    def _generate_cache_key(
+        self, blueprint: dict[str, Any], context: dict[str, Any] | None = None
+    ) -> str:
+        """Génère une clé de cache unique basée sur le blueprint complet"""
+        return blueprint_cache_key(blueprint, context, self.namespace)
+
+    def explain_key(
+        self, blueprint: dict[str, Any], context: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Détaille la clé utilisée pour un blueprint"""
+        return explain_cache_key(blueprint, context, self.namespace)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+
+    def _atomic_write(self, path: Path, data: bytes, expires_at: float = None):
+        """Écrire via un fichier temporaire renommé (jamais de lecture partielle)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
         try:
-            cache_key = self._generate_cache_key(blueprint)
-            cache_file = self.cache_dir / f"{cache_key}.pkl"
-
-            if cache_file.exists():
-                # Vérifier l'âge du cache (max 24h)
-                if time.time() - cache_file.stat().st_mtime < 86400:
-                    with open(cache_file, "rb") as f:
-                        cached_result = pickle.load(f)
-
-                    self.stats["hits"] += 1
-                    self._save_stats()
-                    logger.info(f"✅ Cache hit: {cache_key}")
-                    return cached_result
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(temp_path, 0o644)
+            if expires_at is not None:
+                os.utime(temp_path, (time.time(), expires_at))
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def _expires_at(self, ttl: float | None) -> float:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is None or math.isinf(ttl):
+            return NEVER_EXPIRES
+        return time.time() + ttl
+
+    def _remember(self, key: str, expires_at: float, data: bytes):
+        """Placer une entrée en tête du LRU mémoire"""
+        if len(data) > self.memory_size_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous[1])
+            self._memory[key] = (expires_at, data)
+            self._memory_bytes += len(data)
+            while self._memory and (
+                len(self._memory) > self.memory_entries
+                or self._memory_bytes > self.memory_size_bytes
+            ):
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _forget(self, key: str):
+        with self._lock:
+            entry = self._memory.pop(key, None)
+            if entry is not None:
+                self._memory_bytes -= len(entry[1])
+
+    def get_entry(self, key: str) -> Any | None:
+        """Récupère une entrée par clé (None si absente ou expirée)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
                 else:
-                    # Cache expiré, le supprimer
-                    cache_file.unlink()
-                    logger.info(f"🗑️ Cache expiré supprimé: {cache_key}")
+                    self._forget(key)
+                    entry = None
+
+        if entry is None:
+            path = self._entry_path(key)
+            try:
+                expires_at = path.stat().st_mtime
+                if expires_at <= now:
+                    path.unlink(missing_ok=True)
+                    logger.info(f"🗑️ Cache expiré supprimé: {key}")
+                    return None
+                data = path.read_bytes()
+            except FileNotFoundError:
+                return None
+            entry = (expires_at, data)
+            self._remember(key, *entry)
 
-            self.stats["misses"] += 1
-            self._save_stats()
-            logger.info(f"❌ Cache miss: {cache_key}")
+        try:
+            return pickle.loads(entry[1])
+        except Exception as e:
+            logger.warning(f"⚠️ Entrée de cache illisible {key}: {e}")
+            self.delete_entry(key)
             return None
 
+    def set_entry(self, key: str, value: Any, ttl: float | None = None) -> bool:
+        """Sauvegarde une entrée par clé
+
+        Args:
+            ttl: durée de vie en secondes (None : celle du cache,
+                ``math.inf`` : illimitée)
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires_at = self._expires_at(ttl)
+        self._atomic_write(self._entry_path(key), data, expires_at)
+        self._remember(key, expires_at, data)
+
+        with self._lock:
+            self._writes_since_evict += 1
+            evict = self._writes_since_evict >= self.evict_every
+            if evict:
+                self._writes_since_evict = 0
+        if evict:
+            self._enforce_limits()
+        return True
+
+    def delete_entry(self, key: str):
+        """Supprime une entrée des deux niveaux"""
+        self._forget(key)
+        self._entry_path(key).unlink(missing_ok=True)
+
+    def get(
+        self, blueprint: dict[str, Any], context: dict[str, Any] | None = None
+    ) -> dict[str, Any] | None:
+        """Récupère un résultat du cache
+
+        Args:
+            context: paramètres d'exécution qui changent le résultat
+                (dossier de sortie par exemple), ajoutés à la clé
+        """
+        try:
+            cache_key = self._generate_cache_key(blueprint, context)
+            result = self.get_entry(cache_key)
         except Exception as e:
             logger.warning(f"⚠️ Erreur lors de la récupération du cache: {e}")
-            self.stats["misses"] += 1
-            self._save_stats()
-            return None
+            result, cache_key = None, None
 
-    def set(self, blueprint: dict[str, Any], result: dict[str, Any]) -> bool:
+        if result is not None:
+            self._count(hits=1, total_requests=1)
+            logger.info(f"✅ Cache hit: {cache_key}")
+        else:
+            self._count(misses=1, total_requests=1)
+            logger.info(f"❌ Cache miss: {cache_key}")
+        return result
+
+    def set(
+        self,
+        blueprint: dict[str, Any],
+        result: dict[str, Any],
+        ttl: float = None,
+        context: dict[str, Any] | None = None,
+    ) -> bool:
         """Sauvegarde un résultat dans le cache"""
         try:
-            # S'assurer que le répertoire existe
-            self.cache_dir.mkdir(exist_ok=True, parents=True)
-
-            cache_key = self._generate_cache_key(blueprint)
-            cache_file = self.cache_dir / f"{cache_key}.pkl"
-
-            # Sauvegarder le résultat
-            with open(cache_file, "wb") as f:
-                pickle.dump(result, f)
-
-            self.stats["saves"] += 1
-            self._save_stats()
+            cache_key = self._generate_cache_key(blueprint, context)
+            self.set_entry(cache_key, result, ttl)
+            self._count(saves=1)
             logger.info(f"💾 Cache sauvegardé: {cache_key}")
             return True
 
@@ -121,20 +440,89 @@ class CacheManager:
             logger.warning(f"⚠️ Erreur lors de la sauvegarde du cache: {e}")
             return False
 
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _iter_entries(self):
+        """(chemin, stat) des entrées disque, anciennes entrées à plat comprises"""
+        with os.scandir(self.cache_dir) as top:
+            for item in top:
+                if item.is_file() and item.name.endswith(".pkl"):
+                    yield Path(item.path), item.stat()
+                elif (
+                    item.is_dir()
+                    and len(item.name) == 2
+                    and set(item.name) <= _HEX_DIGITS
+                ):
+                    with os.scandir(item.path) as shard:
+                        for entry in shard:
+                            if entry.is_file() and entry.name.endswith(".pkl"):
+                                try:
+                                    yield Path(entry.path), entry.stat()
+                                except FileNotFoundError:
+                                    continue
+
+    def _remove_empty_shards(self):
+        for shard in self.cache_dir.iterdir():
+            if shard.is_dir() and len(shard.name) == 2:
+                try:
+                    shard.rmdir()
+                except OSError:
+                    continue
+
+    def _enforce_limits(self) -> int:
+        """Purger les entrées expirées puis respecter les limites disque
+
+        Les entrées expirant le plus tôt sont évincées en premier, jusqu'à
+        revenir à 90 % des limites (pour ne pas évincer à chaque écriture).
+        """
+        now = time.time()
+        removed = 0
+        entries = []
+        for path, stat in self._iter_entries():
+            if stat.st_mtime <= now:
+                path.unlink(missing_ok=True)
+                self._forget(path.stem)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        count = len(entries)
+        size = sum(entry[1] for entry in entries)
+        if count > self.max_entries or size > self.max_size_bytes:
+            target_count = int(self.max_entries * 0.9)
+            target_size = int(self.max_size_bytes * 0.9)
+            entries.sort()
+            for _, entry_size, path in entries:
+                if count <= target_count and size <= target_size:
+                    break
+                path.unlink(missing_ok=True)
+                self._forget(path.stem)
+                count -= 1
+                size -= entry_size
+                removed += 1
+
+        if removed:
+            self._remove_empty_shards()
+            self._count(evictions=removed)
+        return removed
+
     def clear(self) -> bool:
         """Vide le cache"""
         try:
-            for cache_file in self.cache_dir.glob("*.pkl"):
-                cache_file.unlink()
-
-            # Réinitialiser les statistiques
-            self.stats = {
-                "hits": 0,
-                "misses": 0,
-                "saves": 0,
-                "total_requests": 0,
-            }
-            self._save_stats()
+            for path, _ in list(self._iter_entries()):
+                path.unlink(missing_ok=True)
+            self._remove_empty_shards()
+            with self._lock:
+                self._memory.clear()
+                self._memory_bytes = 0
+
+                # Réinitialiser les statistiques
+                self.stats = _empty_stats()
+                self._pending_stats = _empty_stats()
+                self._pending_ops = 0
+                self._save_stats()
 
             logger.info("🧹 Cache vidé")
             return True
@@ -146,30 +534,24 @@ class CacheManager:
     def get_stats(self) -> dict[str, Any]:
         """Retourne les statistiques du cache"""
         hit_rate = self.stats["hits"] / max(self.stats["total_requests"], 1) * 100
+        entries = list(self._iter_entries())
 
         return {
             **self.stats,
             "hit_rate": round(hit_rate, 2),
-            "cache_size": len(list(self.cache_dir.glob("*.pkl"))),
+            "cache_size": len(entries),
+            "cache_bytes": sum(stat.st_size for _, stat in entries),
+            "memory_entries": len(self._memory),
             "cache_dir": str(self.cache_dir),
         }
 
     def optimize_cache(self) -> bool:
-        """Optimise le cache en supprimant les entrées expirées"""
+        """Optimise le cache : entrées expirées et limites de taille"""
         try:
-            current_time = time.time()
-            removed_count = 0
-
-            for cache_file in self.cache_dir.glob("*.pkl"):
-                if current_time - cache_file.stat().st_mtime > 86400:  # 24h
-                    cache_file.unlink()
-                    removed_count += 1
-
+            removed_count = self._enforce_limits()
             if removed_count > 0:
-                logger.info(
-                    f"🧹 Cache optimisé: {removed_count} entrées expirées supprimées"
-                )
-
+                logger.info(f"🧹 Cache optimisé: {removed_count} entrées supprimées")
+            self.flush_stats()
             return True
 
         except Exception as e:
@@ -191,14 +573,21 @@ def get_cache_manager() -> CacheManager:
     return _cache_manager
 
 
-def cache_result(blueprint: dict[str, Any], result: dict[str, Any]) -> bool:
+def cache_result(
+    blueprint: dict[str, Any],
+    result: dict[str, Any],
+    ttl: float = None,
+    context: dict[str, Any] | None = None,
+) -> bool:
     """Sauvegarde un résultat dans le cache global"""
-    return get_cache_manager().set(blueprint, result)
+    return get_cache_manager().set(blueprint, result, ttl, context)
 
 
-def get_cached_result(blueprint: dict[str, Any]) -> dict[str, Any] | None:
+def get_cached_result(
+    blueprint: dict[str, Any], context: dict[str, Any] | None = None
+) -> dict[str, Any] | None:
     """Récupère un résultat du cache global"""
-    return get_cache_manager().get(blueprint)
+    return get_cache_manager().get(blueprint, context)
 
 
 def get_cache_stats() -> dict[str, Any]:
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 
 
-from .project_classifier import classify_project
+from .phrase_matcher import KeywordMatcher, RankedLabel
+from .project_classifier import (
+    classify_project,
+    detect_blueprint_type,
+    rank_project_types,
+)
 from .project_types import ProjectType, get_project_config
 
 # Fichier dict_data'initialisation du sous - package classification
@@ -13,4 +18,12 @@ Analyse le contexte et détermine le type de projet approprié.
 """
 
 
-__all__ = ["classify_project", "ProjectType", "get_project_config"]
+__all__ = [
+    "classify_project",
+    "detect_blueprint_type",
+    "rank_project_types",
+    "KeywordMatcher",
+    "RankedLabel",
+    "ProjectType",
+    "get_project_config",
+]
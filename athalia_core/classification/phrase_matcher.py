@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+🔎 RECHERCHE MULTI-MOTS-CLÉS COMPILÉE
+=====================================
+Une table ``{type: {mot-clé: poids}}`` est compilée une fois en une seule
+expression régulière (alternative des mots-clés, du plus long au plus court,
+bornée aux limites de mots). Un texte est ensuite analysé en un seul passage,
+quel que soit le nombre de types et de mots-clés, et tous les types sont
+notés en même temps.
+
+Un mot-clé trouvé crédite aussi les mots-clés qu'il contient (``"application
+web"`` crédite ``"web"``), et les pluriels simples (``s``/``x``) sont
+reconnus.
+"""
+
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+Label = TypeVar("Label")
+
+_PLURAL = r"(?:s|x)?"
+
+
+@dataclass(frozen=True)
+class RankedLabel(Generic[Label]):
+    """Type candidat avec son score et sa part du score total"""
+
+    label: Label
+    score: float
+    confidence: float
+
+
+class KeywordMatcher(Generic[Label]):
+    """Classifieur par mots-clés pondérés compilé en une expression unique
+
+    Args:
+        table: mots-clés par type ; liste (poids 1) ou ``{mot-clé: poids}``.
+            L'ordre des types départage les égalités.
+    """
+
+    def __init__(self, table: Mapping[Label, Iterable[str] | Mapping[str, float]]):
+        self.labels: list[Label] = list(table)
+        self._weights: dict[str, list[tuple[Label, float]]] = {}
+        for label, keywords in table.items():
+            if not isinstance(keywords, Mapping):
+                keywords = dict.fromkeys(keywords, 1.0)
+            for keyword, weight in keywords.items():
+                key = keyword.casefold()
+                self._weights.setdefault(key, []).append((label, weight))
+
+        keywords = sorted(self._weights, key=lambda kw: (-len(kw), kw))
+        alternation = "|".join(re.escape(keyword) for keyword in keywords)
+        self.pattern = re.compile(rf"(?<!\w)({alternation}){_PLURAL}(?!\w)")
+        # Mots-clés contenus dans chaque mot-clé (crédités avec lui)
+        self._contained = {
+            keyword: frozenset(kw for kw in keywords if self._within(kw, keyword))
+            for keyword in keywords
+        }
+
+    @staticmethod
+    def _within(keyword: str, phrase: str) -> bool:
+        if keyword == phrase:
+            return True
+        if len(keyword) >= len(phrase) or keyword not in phrase:
+            return False
+        return re.search(rf"(?<!\w){re.escape(keyword)}(?!\w)", phrase) is not None
+
+    def find(self, text: str) -> set[str]:
+        """Mots-clés présents dans le texte (un seul passage)"""
+        found: set[str] = set()
+        for match in self.pattern.finditer(text.casefold()):
+            found |= self._contained[match.group(1)]
+        return found
+
+    def scores(self, text: str, found: set[str] | None = None) -> dict[Label, float]:
+        """Score de chaque type (somme des poids des mots-clés distincts)"""
+        if found is None:
+            found = self.find(text)
+        scores = dict.fromkeys(self.labels, 0.0)
+        for keyword in found:
+            for label, weight in self._weights[keyword]:
+                scores[label] += weight
+        return scores
+
+    def rank(
+        self, text: str, scores: dict[Label, float] | None = None
+    ) -> list[RankedLabel[Label]]:
+        """Types trouvés, du plus probable au moins probable"""
+        if scores is None:
+            scores = self.scores(text)
+        total = sum(score for score in scores.values() if score > 0)
+        order = {label: position for position, label in enumerate(self.labels)}
+        ranked = sorted(
+            (label for label, score in scores.items() if score > 0),
+            key=lambda label: (-scores[label], order[label]),
+        )
+        return [
+            RankedLabel(label, scores[label], round(scores[label] / total, 3))
+            for label in ranked
+        ]
+
+    def best(self, text: str, default: Any = None) -> Label | Any:
+        """Type le plus probable (``default`` si aucun mot-clé)"""
+        ranked = self.rank(text)
+        return ranked[0].label if ranked else default
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import re
+from functools import lru_cache
 
+from .phrase_matcher import KeywordMatcher, RankedLabel
 from .project_types import ProjectType
 
 """
@@ -9,22 +11,148 @@ Analyse le contexte et détermine le type de projet approprié.
 """
 
 
-def classify_project(idea: str) -> ProjectType:
-    """
-    Analyse l'idée du projet et retourne le type approprié.
-
-    Args:
-        idea: Description du projet en une phrase
-
-    Returns:
-        ProjectType: Type de projet détecté
-    """
-    idea_lower = idea.lower()
-
-    # Ajout détection explicite pour todo-list
-    if any(
-        kw in idea_lower
-        for kw in [
+# Mots-clés par type de projet (poids 1 par défaut). L'ordre des types
+# départage les égalités de score.
+_ARTISTIC_KEYWORDS = [
+    "fleure",
+    "fleur",
+    "danse",
+    "dance",
+    "art",
+    "artistique",
+    "visuel",
+    "animation",
+    "musique",
+    "couleur",
+    "peinture",
+    "dessin",
+    "sculpture",
+    "créatif",
+    "creative",
+    "esthétique",
+    "beauté",
+    "harmonie",
+    "fractal",
+    "interactive",
+]
+
+_API_KEYWORDS = [
+    "api",
+    "service",
+    "backend",
+    "rest",
+    "graphql",
+    "microservice",
+    "endpoint",
+    "webservice",
+    "serveur",
+    "server",
+    "interface",
+]
+
+_GAME_KEYWORDS = [
+    "jeu",
+    "game",
+    "jouer",
+    "play",
+    "score",
+    "niveau",
+    "level",
+    "gagner",
+    "win",
+    "perdre",
+    "lose",
+    "règles",
+    "rules",
+    "plateforme",
+    "platform",
+    "saut",
+    "jump",
+    "obstacle",
+]
+
+_DATA_KEYWORDS = [
+    "data",
+    "données",
+    "analyse",
+    "analysis",
+    "ml",
+    "machine learning",
+    "ai",
+    "intelligence artificielle",
+    "statistiques",
+    "stats",
+    "prédiction",
+    "prediction",
+    "modèle",
+    "model",
+    "visualisation",
+    "visualization",
+    "pandas",
+    "numpy",
+    "matplotlib",
+]
+
+_WEB_KEYWORDS = [
+    "web",
+    "site",
+    "application web",
+    "frontend",
+    "backend",
+    "html",
+    "css",
+    "javascript",
+    "react",
+    "vue",
+    "angular",
+    "flask",
+    "django",
+]
+
+_HARDWARE_KEYWORDS = [
+    "capteur",
+    "sensor",
+    "arduino",
+    "raspberry",
+    "pi",
+    "électronique",
+    "electronic",
+    "hardware",
+    "matériel",
+]
+
+_ROBOTICS_KEYWORDS = [
+    "robot",
+    "robotics",
+    "controle",
+    "control",
+    "automation",
+    "rclpy",
+    "ros",
+    "ros2",
+    "opencv",
+    *_HARDWARE_KEYWORDS,
+]
+
+_MOBILE_KEYWORDS = [
+    "mobile",
+    "app",
+    "application mobile",
+    "smartphone",
+    "tablet",
+    "ios",
+    "android",
+    "touch",
+    "geste",
+    "swipe",
+]
+
+_IOT_KEYWORDS = ["iot", *_HARDWARE_KEYWORDS]
+
+# Expressions décisives : leur poids l'emporte sur tout cumul de mots-clés
+_DECISIVE_KEYWORDS: dict[ProjectType, dict[str, float]] = {
+    ProjectType.API: dict.fromkeys(
+        [
             "todo",
             "tâche",
             "taches",
@@ -33,189 +161,83 @@ def classify_project(idea: str) -> ProjectType:
             "liste de taches",
             "todo-list",
             "todo list",
-        ]
-    ):
-        return ProjectType.API
-
-    # Mots-clés pour chaque type de projet
-    artistic_keywords = [
-        "fleure",
-        "fleur",
-        "danse",
-        "dance",
-        "art",
-        "artistique",
-        "visuel",
-        "animation",
-        "musique",
-        "couleur",
-        "peinture",
-        "dessin",
-        "sculpture",
-        "créatif",
-        "creative",
-        "esthétique",
-        "beauté",
-        "harmonie",
-        "fractale",
-        "fractal",
-        "interactif",
-        "interactive",
-    ]
-
-    api_keywords = [
-        "api",
-        "service",
-        "backend",
-        "rest",
-        "graphql",
-        "microservice",
-        "endpoint",
-        "webservice",
-        "serveur",
-        "server",
-        "interface",
-    ]
-
-    game_keywords = [
-        "jeu",
-        "game",
-        "jouer",
-        "play",
-        "score",
-        "niveau",
-        "level",
-        "gagner",
-        "win",
-        "perdre",
-        "lose",
-        "règles",
-        "rules",
-        "plateforme",
-        "platform",
-        "saut",
-        "jump",
-        "obstacle",
-    ]
-
-    data_keywords = [
-        "data",
-        "données",
-        "analyse",
-        "analysis",
-        "ml",
-        "machine learning",
-        "ai",
-        "intelligence artificielle",
-        "statistiques",
-        "stats",
-        "prédiction",
-        "prediction",
-        "modèle",
-        "model",
-        "visualisation",
-        "visualization",
-        "pandas",
-        "numpy",
-        "matplotlib",
-    ]
-
-    web_keywords = [
-        "web",
-        "site",
-        "application web",
-        "frontend",
-        "backend",
-        "html",
-        "css",
-        "javascript",
-        "react",
-        "vue",
-        "angular",
-        "flask",
-        "django",
-    ]
-
-    robotics_keywords = [
-        "robot",
-        "robotics",
-        "controle",
-        "control",
-        "automation",
-        "capteur",
-        "sensor",
-        "rclpy",
-        "ros",
-        "opencv",
-        "arduino",
-        "raspberry",
-        "pi",
-        "électronique",
-        "electronic",
-        "hardware",
-        "matériel",
-    ]
-
-    mobile_keywords = [
-        "mobile",
-        "app",
-        "application mobile",
-        "smartphone",
-        "tablet",
-        "ios",
-        "android",
-        "touch",
-        "geste",
-        "swipe",
-    ]
-
-    iot_keywords = [
-        "iot",
-        "capteur",
-        "sensor",
-        "arduino",
-        "raspberry",
-        "pi",
-        "électronique",
-        "electronic",
-        "hardware",
-        "matériel",
-    ]
-
-    # Calcul des scores pour chaque type
-    scores = {
-        ProjectType.ARTISTIC: sum(1 for kw in artistic_keywords if kw in idea_lower),
-        ProjectType.API: sum(1 for kw in api_keywords if kw in idea_lower),
-        ProjectType.GAME: sum(1 for kw in game_keywords if kw in idea_lower),
-        ProjectType.DATA: sum(1 for kw in data_keywords if kw in idea_lower),
-        ProjectType.WEB: sum(1 for kw in web_keywords if kw in idea_lower),
-        ProjectType.MOBILE: sum(1 for kw in mobile_keywords if kw in idea_lower),
-        ProjectType.IOT: sum(1 for kw in iot_keywords if kw in idea_lower),
-        ProjectType.ROBOTICS: sum(1 for kw in robotics_keywords if kw in idea_lower),
+        ],
+        100.0,
+    ),
+    ProjectType.ARTISTIC: {
+        "fleure qui danse": 80.0,
+        "fleur qui danse": 80.0,
+        "fractale": 40.0,
+        "interactif": 40.0,
+    },
+    ProjectType.ROBOTICS: {
+        "contrôleur de robot": 60.0,
+        "interface graphique": 60.0,
+    },
+}
+
+# Bonus d'un type quand deux mots-clés apparaissent ensemble
+_KEYWORD_COMBINATIONS: list[tuple[ProjectType, str, frozenset[str], float]] = [
+    (ProjectType.ROBOTICS, "robot", frozenset({"controle", "capteur"}), 20.0),
+]
+
+
+def _keyword_table() -> dict[ProjectType, dict[str, float]]:
+    lists = {
+        ProjectType.ARTISTIC: _ARTISTIC_KEYWORDS,
+        ProjectType.API: _API_KEYWORDS,
+        ProjectType.GAME: _GAME_KEYWORDS,
+        ProjectType.DATA: _DATA_KEYWORDS,
+        ProjectType.WEB: _WEB_KEYWORDS,
+        ProjectType.MOBILE: _MOBILE_KEYWORDS,
+        ProjectType.IOT: _IOT_KEYWORDS,
+        ProjectType.ROBOTICS: _ROBOTICS_KEYWORDS,
     }
+    table = {}
+    for project_type, keywords in lists.items():
+        table[project_type] = dict.fromkeys(keywords, 1.0)
+        table[project_type].update(_DECISIVE_KEYWORDS.get(project_type, {}))
+    return table
 
-    # Règles spéciales pour des cas spécifiques
-    if "fleure qui danse" in idea_lower or "fleur qui danse" in idea_lower:
-        return ProjectType.ARTISTIC
 
-    if "contrôleur de robot" in idea_lower or "interface graphique" in idea_lower:
-        return ProjectType.ROBOTICS
+@lru_cache(maxsize=1)
+def _project_matcher() -> KeywordMatcher[ProjectType]:
+    """Classifieur compilé une seule fois par processus"""
+    return KeywordMatcher(_keyword_table())
 
-    if "fractale" in idea_lower or "interactif" in idea_lower:
-        return ProjectType.ARTISTIC
 
-    if "robot" in idea_lower and ("controle" in idea_lower or "capteur" in idea_lower):
-        return ProjectType.ROBOTICS
+def rank_project_types(idea: str) -> list[RankedLabel[ProjectType]]:
+    """
+    Note tous les types de projet en un seul passage sur l'idée.
 
-    # Retourner le type avec le score le plus élevé
-    max_score = max(scores.values())
-    if max_score > 0:
-        for project_type, score in scores.items():
-            if score == max_score:
-                return project_type
+    Args:
+        idea: Description du projet
+
+    Returns:
+        list[RankedLabel[ProjectType]]: Types trouvés, du plus probable au
+        moins probable, avec leur score et leur confiance (part du score total)
+    """
+    matcher = _project_matcher()
+    found = matcher.find(idea)
+    scores = matcher.scores(idea, found)
+    for project_type, keyword, companions, bonus in _KEYWORD_COMBINATIONS:
+        if keyword in found and found & companions:
+            scores[project_type] += bonus
+    return matcher.rank(idea, scores)
 
-    # Fallback vers générique
-    return ProjectType.GENERIC
+
+def classify_project(idea: str) -> ProjectType:
+    """
+    Analyse l'idée du projet et retourne le type approprié.
+
+    Args:
+        idea: Description du projet en une phrase
+
+    Returns:
+        ProjectType: Type de projet détecté
+    """
+    ranked = rank_project_types(idea)
+    return ranked[0].label if ranked else ProjectType.GENERIC
 
 
 def get_project_name(idea: str, project_type: ProjectType) -> str:
@@ -298,3 +320,31 @@ def classify_project_intelligent(idea: str) -> ProjectType:
 
     # Fallback vers la méthode classique
     return classify_project(idea)
+
+
+# Types de blueprint de RobustAI (ordre de priorité en cas d'égalité)
+BLUEPRINT_TYPE_KEYWORDS: dict[str, list[str]] = {
+    "api": ["fastapi", "swagger", "openapi", "api", "rest", "endpoint"],
+    "robotics": ["robot", "reachy", "ros", "ros2", "opencv"],
+    "desktop": ["calculatrice", "calculator", "desktop", "tkinter"],
+    "web": ["web", "flask", "django", "interface", "react", "vue", "angular"],
+    "ai_application": ["ia", "ai", "machine learning", "ml"],
+}
+
+
+@lru_cache(maxsize=1)
+def _blueprint_matcher() -> KeywordMatcher[str]:
+    return KeywordMatcher(BLUEPRINT_TYPE_KEYWORDS)
+
+
+def detect_blueprint_type(idea: str) -> str:
+    """
+    Type de blueprint (api, robotics, desktop, web, ai_application, generic).
+
+    Args:
+        idea: Description du projet
+
+    Returns:
+        str: Type le mieux noté, ``generic`` si aucun mot-clé
+    """
+    return _blueprint_matcher().best(idea, default="generic")
@@ -9,34 +9,15 @@ import traceback
 from pathlib import Path
 
 import click
-import yaml
 
-# Import des modules avec fallback
-try:
-    from .ai_robust import AIModel, RobustAI
-except ImportError:
-    try:
-        from athalia_core.ai_robust import AIModel, RobustAI
-    except ImportError:
-        # Créer des classes factices si les imports échouent
-        class AIModel:
-            def __init__(self):
-                pass
-
-        class RobustAI:
-            def __init__(self):
-                pass
+from .lazy_imports import lazy_attribute
 
-
-try:
-    from .audit import audit_project_intelligent
-except ImportError:
-    try:
-        from athalia_core.audit import audit_project_intelligent
-    except ImportError:
-        # Créer une fonction factice si l'import échoue
-        def audit_project_intelligent(project_path):
-            return {"status": "audit_not_available"}
+# Modules lourds (IA, audit) chargés à la première commande qui les utilise
+AIModel = lazy_attribute("athalia_core.ai_robust", "AIModel")
+RobustAI = lazy_attribute("athalia_core.ai_robust", "RobustAI")
+audit_project_intelligent = lazy_attribute(
+    "athalia_core.audit", "audit_project_intelligent"
+)
 
 
 # Configuration pour l'internationalisation (i18n) des messages CLI
@@ -164,6 +145,48 @@ def generate(idea, output, dry_run):
         click.echo(f"🔍 Détails: {traceback.format_exc()}")
 
 
+@cli.command()
+@click.argument("ideas_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output-dir", "-o", default="./generated_projects", help="Dossier de sortie"
+)
+@click.option(
+    "--results", "-r", default=None, help="Fichier JSONL des résultats par idée"
+)
+@click.option("--workers", "-w", type=int, default=None, help="Nombre de workers")
+@click.option("--threads", is_flag=True, help="Workers en threads (et non processus)")
+@click.option("--audit", "with_audit", is_flag=True, help="Auditer chaque projet")
+@click.option("--dry-run", is_flag=True, help="Blueprints seulement")
+def batch(ideas_file, output_dir, results, workers, threads, with_audit, dry_run):
+    """Génère un projet par idée d'un fichier JSONL, YAML ou texte."""
+    from .batch_generation import generate_batch
+
+    results = results or str(Path(output_dir) / "batch_results.jsonl")
+    try:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        summary = generate_batch(
+            ideas_file,
+            output_dir,
+            results,
+            workers=workers,
+            use_processes=not threads,
+            dry_run=dry_run,
+            post_steps=("audit",) if with_audit else (),
+        )
+    except Exception as e:
+        click.echo(f"❌ Erreur: {e}")
+        raise SystemExit(1) from e
+
+    click.echo(
+        f"✅ {summary.succeeded}/{summary.unique} projets générés "
+        f"({summary.duplicates} doublons, {summary.failed} échecs) "
+        f"en {summary.duration:.1f}s"
+    )
+    click.echo(f"📄 Résultats: {results}")
+    if summary.failed:
+        raise SystemExit(1)
+
+
 @cli.command()
 @click.argument("project_path")
 def audit(project_path):
@@ -179,6 +202,8 @@ def audit(project_path):
         click.echo(f"💡 Suggestions: {len(results.get('suggestions', []))}")
 
         # Sauvegarder le rapport
+        import yaml
+
         report_path = Path(project_path) / "audit_report.yaml"
         with open(report_path, "w") as f:
             yaml.dump(results, f, default_flow_style=False)
@@ -189,6 +214,37 @@ def audit(project_path):
         click.echo(f"❌ Erreur: {e}")
 
 
+@cli.command()
+@click.argument("project_path", default=".")
+@click.option("--baseline", default=None, help="Baseline des constats acceptés")
+@click.option("--update-baseline", is_flag=True, help="Accepter les constats actuels")
+@click.option("--no-index", is_flag=True, help="Réanalyser tous les fichiers")
+def security(project_path, baseline, update_baseline, no_index):
+    """Détection AST des appels dangereux et secrets (code retour 1 si constats)."""
+    from .security_scanner import SecurityScanner
+
+    scanner = SecurityScanner(
+        project_path, baseline_path=baseline, use_index=not no_index
+    )
+    report = scanner.scan()
+    if update_baseline:
+        path = scanner.write_baseline(report)
+        click.echo(f"📄 {len(report.findings)} constats ajoutés à {path}")
+        return
+
+    for finding in report.findings:
+        click.echo(
+            f"{finding.path}:{finding.line}: [{finding.rule_id}] {finding.message}"
+        )
+    click.echo(
+        f"🛡️ {len(report.findings)} constats ({report.suppressed} supprimés, "
+        f"{report.baselined} en baseline, {report.analyzed} fichiers analysés, "
+        f"{report.reused} repris de l'index)"
+    )
+    if report.findings:
+        raise SystemExit(1)
+
+
 @cli.command()
 def ai_status():
     """Affiche le statut de lIA robuste."""
@@ -4,6 +4,10 @@ import subprocess
 from pathlib import Path
 from typing import Any
 
+from .code_metrics import analyze_files
+from .project_snapshot import ProjectSnapshot
+from .tool_runner import TOOLS, ToolResult, ToolRunner
+
 # Import du validateur de sécurité
 try:
     from athalia_core.security_validator import SecurityError, validate_and_run
@@ -18,6 +22,15 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Outils externes lancés par ``run``
+LINT_TOOLS = ("ruff", "black", "isort", "mypy", "bandit", "coverage")
+
+
+def _run_command(command, **kwargs):
+    # Résolu à chaque appel : le validateur reste remplaçable (tests)
+    return validate_and_run(command, **kwargs)
+
+
 """
 Module de linting de code pour Athalia
 Analyse de qualité et style de code
@@ -27,24 +40,43 @@ Analyse de qualité et style de code
 class CodeLinter:
     """Linter de code pour Athalia"""
 
-    def __init__(self, project_path: str, auto_fix: bool = False):
+    def __init__(
+        self,
+        project_path: str,
+        auto_fix: bool = False,
+        snapshot: ProjectSnapshot = None,
+        use_cache: bool = True,
+    ):
         self.project_path = Path(project_path)
         self.auto_fix = auto_fix
+        self.use_cache = use_cache
+        # Instantané partagé (orchestrateur) ou propre, reparcouru à chaque run
+        self._owns_snapshot = snapshot is None
+        self.snapshot = snapshot or ProjectSnapshot(self.project_path)
         self.report = {"errors": [], "warnings": [], "fixes": [], "score": 0}
+        self._runner = None
 
-    def run(self) -> dict[str, Any]:
-        """Lance l'analyse de qualité renforcée du projet"""
-        logger.info(f"📏 Analyse de qualité renforcée pour: {self.project_path.name}")
+    def run(self, files: list[str] | None = None) -> dict[str, Any]:
+        """Lance l'analyse de qualité renforcée du projet
 
-        # Analyses en séquence
-        self._run_ruff()
-        self._run_black()
-        self._run_isort()
-        self._run_mypy()
-        self._run_bandit()
+        Args:
+            files: fichiers à analyser (par défaut, les fichiers Python
+                modifiés depuis la dernière analyse)
+        """
+        logger.info(f"📏 Analyse de qualité renforcée pour: {self.project_path.name}")
+        if self._owns_snapshot:
+            self.snapshot.invalidate()
+
+        # Outils externes en parallèle, fichiers inchangés repris du cache
+        results = self.runner.run(LINT_TOOLS, files=files)
+        self._run_ruff(results["ruff"])
+        self._run_black(results["black"])
+        self._run_isort(results["isort"])
+        self._run_mypy(results["mypy"])
+        self._run_bandit(results["bandit"])
         self._run_complexity_analysis()
         self._run_documentation_check()
-        self._run_test_coverage()
+        self._run_test_coverage(results["coverage"])
 
         # Calcul du score
         self._calculate_score()
@@ -54,96 +86,64 @@ class CodeLinter:
 
         return self.report
 
-    def _run_ruff(self):
-        """Exécution de Ruff (remplace Flake8)"""
-        try:
-            # Utilisation du validateur de sécurité pour l'appel ruff
-            result = validate_and_run(
-                ["ruff", "check", str(self.project_path), "--output-format=text"],
-                capture_output=True,
-                text=True,
-                timeout=30,
+    @property
+    def runner(self) -> ToolRunner:
+        """Exécuteur des outils externes (créé au premier usage)"""
+        if self._runner is None:
+            self._runner = ToolRunner(
+                self.project_path,
+                snapshot=self.snapshot,
+                run_command=_run_command,
+                use_cache=self.use_cache,
             )
+        return self._runner
 
-            if result.stdout:
-                for line in result.stdout.split("\n"):
-                    if line.strip():
-                        self.report["errors"].append(f"Ruff: {line}")
+    def _run_tool(self, name: str, result: ToolResult | None) -> ToolResult:
+        """Résultat fourni par ``run`` ou exécution sur le projet entier"""
+        return result or self.runner.run_tool(TOOLS[name])
 
-        except (Exception, SecurityError) as e:
-            self.report["errors"].append(f"Ruff non exécuté: {e}")
-
-    def _run_black(self):
+    def _run_ruff(self, result: ToolResult = None):
+        """Exécution de Ruff (remplace Flake8)"""
+        result = self._run_tool("ruff", result)
+        if result.error:
+            self.report["errors"].append(f"Ruff non exécuté: {result.error}")
+            return
+        for issue in result.issues:
+            self.report["errors"].append(f"Ruff: {issue}")
+
+    def _run_black(self, result: ToolResult = None):
         """Exécution de Black"""
-        try:
-            # Utilisation du validateur de sécurité pour l'appel black
-            result = validate_and_run(
-                ["black", str(self.project_path), "--check"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if result.returncode != 0:
-                self.report["warnings"].append("Formatage Black à corriger")
+        result = self._run_tool("black", result)
+        if result.error:
+            self.report["warnings"].append(f"Black non exécuté: {result.error}")
+        elif result.issues:
+            self.report["warnings"].append("Formatage Black à corriger")
 
-        except (Exception, SecurityError) as e:
-            self.report["warnings"].append(f"Black non exécuté: {e}")
-
-    def _run_isort(self):
+    def _run_isort(self, result: ToolResult = None):
         """Exécution de isort"""
-        try:
-            # Utilisation du validateur de sécurité pour l'appel isort
-            result = validate_and_run(
-                ["isort", str(self.project_path), "--check-only"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if result.returncode != 0:
-                self.report["warnings"].append("Tri des imports à corriger")
-
-        except (Exception, SecurityError) as e:
-            self.report["warnings"].append(f"isort non exécuté: {e}")
+        result = self._run_tool("isort", result)
+        if result.error:
+            self.report["warnings"].append(f"isort non exécuté: {result.error}")
+        elif result.issues:
+            self.report["warnings"].append("Tri des imports à corriger")
 
-    def _run_mypy(self):
+    def _run_mypy(self, result: ToolResult = None):
         """Exécution de MyPy"""
-        try:
-            # Utilisation du validateur de sécurité pour l'appel mypy
-            result = validate_and_run(
-                ["mypy", str(self.project_path)],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if result.stdout:
-                for line in result.stdout.split("\n"):
-                    if line.strip():
-                        self.report["warnings"].append(f"MyPy: {line}")
-
-        except (Exception, SecurityError) as e:
-            self.report["warnings"].append(f"Mypy non exécuté: {e}")
-
-    def _run_bandit(self):
+        result = self._run_tool("mypy", result)
+        if result.error:
+            self.report["warnings"].append(f"Mypy non exécuté: {result.error}")
+            return
+        for issue in result.issues:
+            self.report["warnings"].append(f"MyPy: {issue}")
+
+    def _run_bandit(self, result: ToolResult = None):
         """Exécution de Bandit pour la sécurité"""
-        try:
-            # Utilisation du validateur de sécurité pour l'appel bandit
-            result = validate_and_run(
-                ["bandit", "-r", str(self.project_path), "-f", "txt"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if result.stdout:
-                for line in result.stdout.split("\n"):
-                    if line.strip():
-                        self.report["warnings"].append(f"Bandit: {line}")
-
-        except (Exception, SecurityError) as e:
-            self.report["warnings"].append(f"Bandit non exécuté: {e}")
+        result = self._run_tool("bandit", result)
+        if result.error:
+            self.report["warnings"].append(f"Bandit non exécuté: {result.error}")
+            return
+        for issue in result.issues:
+            self.report["warnings"].append(f"Bandit: {issue}")
 
     def _calculate_score(self):
         """Calcul du score de qualité"""
@@ -155,65 +155,30 @@ class CodeLinter:
 
     def _run_complexity_analysis(self):
         """Analyse de la complexité cyclomatique"""
-        try:
-            result = validate_and_run(
-                ["radon", "cc", str(self.project_path), "-a"],
-                capture_output=True,
-                text=True,
-                timeout=30,
+        complex_functions = sorted(
+            (
+                function
+                for _, metrics in analyze_files(self.snapshot.python_files())
+                for function in metrics.complex_functions()
+            ),
+            key=lambda function: -function.complexity,
+        )
+        if complex_functions:
+            names = [
+                f"{function.name} (complexité: {function.complexity})"
+                for function in complex_functions[:3]
+            ]
+            self.report["warnings"].append(
+                f"Fonctions complexes détectées: {', '.join(names)}"
             )
 
-            if result.stdout:
-                lines = result.stdout.split("\n")
-                complex_functions = []
-                for line in lines:
-                    if "F" in line and "(" in line:
-                        parts = line.split()
-                        if len(parts) >= 3:
-                            complexity = int(parts[1])
-                            if complexity > 10:
-                                complex_functions.append(
-                                    f"{parts[0]} (complexité: {complexity})"
-                                )
-
-                if complex_functions:
-                    self.report["warnings"].append(
-                        f"Fonctions complexes détectées: {', '.join(complex_functions[:3])}"
-                    )
-
-        except (Exception, SecurityError) as e:
-            self.report["warnings"].append(f"Analyse de complexité non exécutée: {e}")
-
     def _run_documentation_check(self):
-        """Vérification de la documentation"""
-        doc_patterns = [
-            r'"""[^"]*"""',
-            r"'''[^']*'''",
-            r"#.*",
-        ]
-
+        """Vérification de la documentation (docstrings des fonctions)"""
         total_functions = 0
         documented_functions = 0
-
-        for py_file in self.project_path.rglob("*.py"):
-            try:
-                with open(py_file, encoding="utf-8") as f:
-                    content = f.read()
-
-                # Compter les fonctions
-                import re
-
-                functions = re.findall(r"def\s+\w+", content)
-                total_functions += len(functions)
-
-                # Vérifier la documentation
-                for pattern in doc_patterns:
-                    if re.search(pattern, content):
-                        documented_functions += 1
-                        break
-
-            except (OSError, UnicodeDecodeError):
-                continue
+        for _, metrics in analyze_files(self.snapshot.python_files()):
+            total_functions += len(metrics.functions)
+            documented_functions += metrics.documented_functions
 
         if total_functions > 0:
             doc_coverage = (documented_functions / total_functions) * 100
@@ -222,38 +187,15 @@ class CodeLinter:
                     f"Couverture documentation faible: {doc_coverage:.1f}%"
                 )
 
-    def _run_test_coverage(self):
+    def _run_test_coverage(self, result: ToolResult = None):
         """Vérification de la couverture de tests"""
-        try:
-            result = validate_and_run(
-                ["coverage", "run", "-m", "pytest", str(self.project_path)],
-                capture_output=True,
-                text=True,
-                timeout=60,
+        result = self._run_tool("coverage", result)
+        if result.error:
+            self.report["warnings"].append(
+                f"Vérification couverture non exécutée: {result.error}"
             )
-
-            if result.returncode == 0:
-                result = validate_and_run(
-                    ["coverage", "report"],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                )
-
-                if result.stdout:
-                    for line in result.stdout.split("\n"):
-                        if "TOTAL" in line:
-                            parts = line.split()
-                            if len(parts) >= 4:
-                                coverage = int(parts[3].replace("%", ""))
-                                if coverage < 80:
-                                    self.report["warnings"].append(
-                                        f"Couverture de tests faible: {coverage}%"
-                                    )
-                                break
-
-        except (Exception, SecurityError) as e:
-            self.report["warnings"].append(f"Vérification couverture non exécutée: {e}")
+        elif result.issues:
+            self.report["warnings"].append(str(result.issues[0]))
 
     def _generate_quality_report(self):
         """Génère un rapport de qualité détaillé"""
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+📐 MÉTRIQUES DE CODE EN PROCESSUS
+=================================
+Moteur commun de métriques (linter, auditeur intelligent, analytics,
+analyseur AST) : un seul parcours de l'AST par fichier donne, pour chaque
+fonction, la complexité cyclomatique, la profondeur d'imbrication, le
+nombre de lignes et la présence d'une docstring ; pour le fichier, la
+complexité totale et la documentation des classes et du module.
+
+Complexité cyclomatique (McCabe, règles de radon) : 1 + points de décision
+(``if``/``elif``, expression conditionnelle, ``assert``, boucles et leur
+``else``, ``except`` et ``else`` d'un ``try``, ``case`` d'un ``match`` hors
+``case _``, ``for``/``if`` des compréhensions, opérandes supplémentaires des
+``and``/``or``). Contrairement à radon, la complexité d'une fonction inclut
+celle des fonctions qu'elle imbrique.
+
+Les métriques sont mémorisées par hash du contenu (cache en mémoire
+partagé par tous les modules du processus). Les fichiers non encore
+analysés d'un grand projet sont répartis sur un pool de processus.
+"""
+
+import ast
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from .project_snapshot import FileEntry
+
+logger = logging.getLogger(__name__)
+
+# Complexité au-delà de laquelle une fonction est signalée
+COMPLEXITY_THRESHOLD = 10
+
+DEFAULT_MAX_ENTRIES = 20_000
+
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_BRANCHES = (ast.If, ast.IfExp, ast.Assert, ast.ExceptHandler)
+_LOOPS = (ast.For, ast.AsyncFor, ast.While)
+_TRIES = (ast.Try,) + ((ast.TryStar,) if hasattr(ast, "TryStar") else ())
+# Blocs qui augmentent l'imbrication de leur corps
+_BLOCKS = _LOOPS + _TRIES + (ast.If, ast.With, ast.AsyncWith, ast.Match)
+_BLOCK_FIELDS = frozenset({"body", "orelse", "handlers", "finalbody", "cases"})
+
+
+def decision_points(node: ast.AST) -> int:
+    """Points de décision apportés par le nœud lui-même"""
+    if isinstance(node, _BRANCHES):
+        return 1
+    if isinstance(node, _LOOPS):
+        return 1 + int(bool(node.orelse))
+    if isinstance(node, _TRIES):
+        return int(bool(node.orelse))
+    if isinstance(node, ast.Match):
+        # Un ``case _`` (motif sans sous-motif) est la branche par défaut
+        default = any(
+            getattr(case.pattern, "pattern", False) is None for case in node.cases
+        )
+        return max(0, len(node.cases) - default)
+    if isinstance(node, ast.comprehension):
+        return 1 + len(node.ifs)
+    if isinstance(node, ast.BoolOp):
+        return len(node.values) - 1
+    return 0
+
+
+@dataclass(frozen=True)
+class FunctionMetrics:
+    """Métriques d'une fonction (``name`` qualifié : ``Classe.methode``)"""
+
+    name: str
+    line: int
+    end_line: int
+    complexity: int
+    nesting: int
+    has_docstring: bool
+
+    @property
+    def loc(self) -> int:
+        return self.end_line - self.line + 1
+
+
+@dataclass(frozen=True)
+class FileMetrics:
+    """Métriques d'un fichier"""
+
+    functions: tuple[FunctionMetrics, ...]
+    complexity: int
+    loc: int
+    has_docstring: bool
+    classes: int
+    documented_classes: int
+
+    @property
+    def documented_functions(self) -> int:
+        return sum(function.has_docstring for function in self.functions)
+
+    @property
+    def max_complexity(self) -> int:
+        return max((function.complexity for function in self.functions), default=0)
+
+    @property
+    def max_nesting(self) -> int:
+        return max((function.nesting for function in self.functions), default=0)
+
+    def complex_functions(
+        self, threshold: int = COMPLEXITY_THRESHOLD
+    ) -> list[FunctionMetrics]:
+        """Fonctions dont la complexité dépasse le seuil"""
+        return [f for f in self.functions if f.complexity > threshold]
+
+
+class _MetricsVisitor:
+    """Parcours unique, points de décision et imbrication cumulés de bas en haut"""
+
+    def __init__(self):
+        self.functions: list[FunctionMetrics | None] = []
+        self.classes = 0
+        self.documented_classes = 0
+
+    def visit(self, node: ast.AST, scope: str = "", depth: int = 0) -> tuple[int, int]:
+        """Points de décision et imbrication maximale du sous-arbre"""
+        if isinstance(node, _FUNCTIONS):
+            return self._visit_function(node, scope), depth
+        if isinstance(node, ast.ClassDef):
+            self.classes += 1
+            self.documented_classes += bool(ast.get_docstring(node))
+            scope = f"{scope}{node.name}."
+
+        decisions = decision_points(node)
+        nesting = depth
+        block = isinstance(node, _BLOCKS)
+        for name, value in ast.iter_fields(node):
+            children = value if isinstance(value, list) else (value,)
+            child_depth = depth + 1 if block and name in _BLOCK_FIELDS else depth
+            # ``elif`` : le ``if`` seul dans un ``else`` reste au même niveau
+            if (
+                isinstance(node, ast.If)
+                and name == "orelse"
+                and len(children) == 1
+                and isinstance(children[0], ast.If)
+            ):
+                child_depth = depth
+            for child in children:
+                if isinstance(child, ast.AST):
+                    child_decisions, child_nesting = self.visit(
+                        child, scope, child_depth
+                    )
+                    decisions += child_decisions
+                    nesting = max(nesting, child_nesting)
+        return decisions, nesting
+
+    def _visit_function(self, node: ast.AST, scope: str) -> int:
+        # Emplacement réservé : fonctions dans l'ordre du source
+        index = len(self.functions)
+        self.functions.append(None)
+        decisions = nesting = 0
+        for _name, value in ast.iter_fields(node):
+            children = value if isinstance(value, list) else (value,)
+            for child in children:
+                if isinstance(child, ast.AST):
+                    child_decisions, child_nesting = self.visit(
+                        child, f"{scope}{node.name}.", 0
+                    )
+                    decisions += child_decisions
+                    nesting = max(nesting, child_nesting)
+        self.functions[index] = FunctionMetrics(
+            name=f"{scope}{node.name}",
+            line=node.lineno,
+            end_line=node.end_lineno or node.lineno,
+            complexity=1 + decisions,
+            nesting=nesting,
+            has_docstring=bool(ast.get_docstring(node)),
+        )
+        return decisions
+
+
+def analyze_tree(tree: ast.Module, loc: int = 0) -> FileMetrics:
+    """Métriques d'un AST de module (``loc`` : lignes du fichier)"""
+    visitor = _MetricsVisitor()
+    decisions, _ = visitor.visit(tree)
+    return FileMetrics(
+        functions=tuple(visitor.functions),
+        complexity=1 + decisions,
+        loc=loc,
+        has_docstring=bool(ast.get_docstring(tree)),
+        classes=visitor.classes,
+        documented_classes=visitor.documented_classes,
+    )
+
+
+def _line_count(text: str) -> int:
+    return text.count("\n") + bool(text and not text.endswith("\n"))
+
+
+def analyze_source(text: str) -> FileMetrics | None:
+    """Métriques d'un source Python (None si syntaxe invalide)"""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return None
+    return analyze_tree(tree, _line_count(text))
+
+
+class MetricsCache:
+    """Métriques par hash de contenu, en mémoire (LRU)
+
+    Un fichier à la syntaxe invalide est mémorisé aussi (valeur ``None``).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, FileMetrics | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str) -> str:
+        data = text.encode("utf-8", "surrogatepass")
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def lookup(self, key: str) -> tuple[bool, FileMetrics | None]:
+        """``(trouvé, métriques)``"""
+        with self._lock:
+            if key not in self._entries:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+
+    def store(self, key: str, metrics: FileMetrics | None):
+        with self._lock:
+            self._entries[key] = metrics
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Cache partagé par tous les modules du processus
+METRICS_CACHE = MetricsCache()
+
+
+def metrics_for(entry: FileEntry) -> FileMetrics | None:
+    """Métriques d'un fichier de l'instantané (AST mémorisé réutilisé)"""
+    text = entry.read_text()
+    if text is None:
+        return None
+    key = METRICS_CACHE.key(text)
+    found, metrics = METRICS_CACHE.lookup(key)
+    if not found:
+        tree = entry.parse()
+        metrics = None if tree is None else analyze_tree(tree, _line_count(text))
+        METRICS_CACHE.store(key, metrics)
+    return metrics
+
+
+def analyze_files(
+    entries: Iterable[FileEntry],
+    max_workers: int = None,
+    min_parallel_files: int = 64,
+) -> list[tuple[FileEntry, FileMetrics]]:
+    """Métriques de fichiers de l'instantané
+
+    Les fichiers déjà connus du cache sont repris ; si au moins
+    ``min_parallel_files`` fichiers restent à parser, ils sont répartis sur
+    un pool de processus (le parsing occupe le GIL). Les fichiers illisibles
+    ou à la syntaxe invalide sont ignorés. Retourne ``(fichier, métriques)``
+    dans l'ordre des fichiers.
+    """
+    entries = list(entries)
+    texts = [entry.read_text() for entry in entries]
+    keys = [None if text is None else METRICS_CACHE.key(text) for text in texts]
+
+    pending = {}
+    for entry, text, key in zip(entries, texts, keys, strict=True):
+        if key is None or key in pending:
+            continue
+        if not METRICS_CACHE.lookup(key)[0]:
+            pending[key] = (entry, text)
+
+    if len(pending) >= min_parallel_files:
+        _analyze_in_processes(list(pending.items()), max_workers)
+    for key, (entry, _) in pending.items():
+        if not METRICS_CACHE.lookup(key)[0]:
+            metrics_for(entry)
+
+    results = []
+    for entry, key in zip(entries, keys, strict=True):
+        metrics = None if key is None else METRICS_CACHE.lookup(key)[1]
+        if metrics is not None:
+            results.append((entry, metrics))
+    return results
+
+
+def _analyze_in_processes(
+    pending: list[tuple[str, tuple[FileEntry, str]]], max_workers: int | None
+):
+    workers = max_workers or os.cpu_count() or 1
+    if workers < 2:
+        return
+    texts = [text for _, (_, text) in pending]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(texts) // (workers * 4))
+            results = list(executor.map(analyze_source, texts, chunksize=chunksize))
+    except (BrokenProcessPool, OSError) as e:
+        # Les fichiers restants sont analysés dans le processus courant
+        logger.debug(f"Pool de processus indisponible: {e}")
+        return
+    for (key, _), metrics in zip(pending, results, strict=True):
+        METRICS_CACHE.store(key, metrics)
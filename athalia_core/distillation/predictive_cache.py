@@ -3,10 +3,13 @@ Caching prédictif pour Athalia/Arkalia
 - Anticipation contextuelle, pré-génération, invalidation intelligente, stats
 """
 
+import hashlib
 import time
 from collections.abc import Callable
 from typing import Any
 
+from athalia_core.cache_manager import canonical_json
+
 
 class PredictiveCache:
     def __init__(self, ttl: int = 600):
@@ -34,8 +37,12 @@ class PredictiveCache:
         self.cache[key] = {"value": value, "time": time.time()}
 
     def predict_key(self, context: dict) -> str:
-        # Hash du contexte pour générer une clé unique
-        return str(hash(str(context)))
+        # Hash stable du contexte (hash() varie d'un processus à l'autre)
+        try:
+            serialized = canonical_json(context)
+        except TypeError:
+            serialized = repr(context)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
 
     def pre_generate(self, context: dict, generator: Callable[[dict], Any]):
         """
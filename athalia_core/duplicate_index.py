@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+🧬 INDEX DE DOUBLONS (HACHAGE + LSH)
+====================================
+Détection de doublons en temps quasi linéaire :
+- regroupement exact par empreinte structurelle
+- MinHash à permutation unique + LSH par bandes sur les shingles
+  (voir fingerprints.py) pour les quasi-doublons, vérifiés ensuite par
+  similarité de Jaccard
+"""
+
+from collections import defaultdict
+from collections.abc import Hashable, Iterable
+
+from .fingerprints import SKETCH_SIZE, jaccard
+
+_MASK64 = (1 << 64) - 1
+_EMPTY = _MASK64 + 1
+
+
+def lsh_parameters(threshold: float, num_bins: int) -> tuple[int, int]:
+    """Choisir (bandes, lignes) pour un seuil de similarité donné
+
+    Le seuil effectif de la LSH, (1/b)^(1/r), est pris sous le seuil demandé
+    pour privilégier le rappel : les faux positifs sont éliminés par la
+    vérification exacte.
+    """
+    best = (num_bins, 1)
+    for rows in range(1, num_bins + 1):
+        if num_bins % rows:
+            continue
+        bands = num_bins // rows
+        if (1 / bands) ** (1 / rows) <= threshold * 0.8:
+            best = (bands, rows)
+    return best
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: dict[int, int] = {}
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent.setdefault(root, root) != root:
+            root = self.parent[root]
+        while item != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first: int, second: int):
+        root_first, root_second = self.find(first), self.find(second)
+        if root_first != root_second:
+            self.parent[max(root_first, root_second)] = min(root_first, root_second)
+
+
+class DuplicateIndex:
+    """Index de doublons exacts et approchés
+
+    Args:
+        threshold: similarité de Jaccard minimale entre quasi-doublons
+        num_bins: taille de l'empreinte MinHash
+        sketch_size: taille des échantillons bottom-k de shingles (None pour
+            des ensembles complets)
+    """
+
+    def __init__(
+        self, threshold: float = 0.7, num_bins: int = 64, sketch_size: int = SKETCH_SIZE
+    ):
+        self.threshold = threshold
+        self.num_bins = num_bins
+        self.sketch_size = sketch_size
+        self.bands, self.rows = lsh_parameters(threshold, num_bins)
+
+        self._keys: list[Hashable] = []
+        self._shingles: list[frozenset[int]] = []
+        self._exact: dict[Hashable, list[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Hashable, exact_key: Hashable, shingles: Iterable[int]):
+        """Ajouter un élément
+
+        Args:
+            key: identifiant renvoyé dans les groupes
+            exact_key: empreinte structurelle (doublons exacts)
+            shingles: shingles hachés de l'élément
+        """
+        self._exact[exact_key].append(len(self._keys))
+        self._keys.append(key)
+        self._shingles.append(frozenset(shingles))
+
+    def _sketch(self, shingles: frozenset[int]) -> list[int]:
+        """MinHash à permutation unique avec densification par rotation"""
+        bins = [_EMPTY] * self.num_bins
+        for value in shingles:
+            index = value % self.num_bins
+            if value < bins[index]:
+                bins[index] = value
+
+        if not shingles:
+            return bins
+
+        # Les cases vides empruntent la case pleine suivante (décalée) pour
+        # que deux ensembles petits ne se ressemblent pas par leurs vides
+        filled = list(bins)
+        for index in range(self.num_bins):
+            if filled[index] != _EMPTY:
+                continue
+            offset = 1
+            while filled[(index + offset) % self.num_bins] == _EMPTY:
+                offset += 1
+            source = filled[(index + offset) % self.num_bins]
+            bins[index] = _EMPTY + 1 + (source ^ (offset * 0x9E3779B97F4A7C15))
+        return bins
+
+    def similarity(self, first: int, second: int) -> float:
+        """Similarité de Jaccard entre deux éléments indexés"""
+        return jaccard(self._shingles[first], self._shingles[second], self.sketch_size)
+
+    def clusters(self) -> list[tuple[list[Hashable], float]]:
+        """Groupes de doublons (au moins deux éléments) et leur similarité
+
+        La similarité d'un groupe est la moyenne des similarités de Jaccard
+        entre chaque membre et le représentant du groupe.
+        """
+        union_find = _UnionFind()
+
+        # 1. Doublons exacts : un représentant par hash de corps
+        representatives = []
+        for members in self._exact.values():
+            representatives.append(members[0])
+            for member in members[1:]:
+                union_find.union(members[0], member)
+
+        # 2. Quasi-doublons : LSH par bandes sur les représentants
+        if self.threshold < 1.0:
+            buckets: dict[tuple, int] = {}
+            for item in representatives:
+                if not self._shingles[item]:
+                    continue
+                sketch = self._sketch(self._shingles[item])
+                # Un même ancre partage souvent plusieurs bandes : une seule
+                # vérification par paire
+                checked = {item}
+                for band in range(self.bands):
+                    start = band * self.rows
+                    bucket_key = (band, *sketch[start : start + self.rows])
+                    anchor = buckets.setdefault(bucket_key, item)
+                    if anchor in checked:
+                        continue
+                    checked.add(anchor)
+                    if union_find.find(anchor) == union_find.find(item):
+                        continue
+                    if self.similarity(anchor, item) >= self.threshold:
+                        union_find.union(anchor, item)
+
+        groups: dict[int, list[int]] = defaultdict(list)
+        for item in range(len(self._keys)):
+            groups[union_find.find(item)].append(item)
+
+        result = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            head = members[0]
+            score = sum(self.similarity(head, other) for other in members[1:]) / (
+                len(members) - 1
+            )
+            result.append(([self._keys[m] for m in members], round(score, 4)))
+        return result
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+🧬 EMPREINTES STRUCTURELLES DE CODE
+===================================
+Empreintes stables (identiques d'un processus et d'une exécution à l'autre)
+calculées sur un flux de tokens issu de l'AST, où identifiants et littéraux
+sont abstraits et les docstrings ignorées :
+- hash 128 bits du flux (doublons exacts au renommage près)
+- shingles par hachage glissant, réduits à un échantillon bottom-k borné
+  (estimation de la similarité de Jaccard)
+"""
+
+import ast
+import hashlib
+import heapq
+import re
+import sys
+import textwrap
+from array import array
+from keyword import iskeyword
+
+# Taille des fenêtres de tokens et de l'échantillon de shingles conservé
+SHINGLE_SIZE = 6
+SKETCH_SIZE = 64
+
+_MASK64 = (1 << 64) - 1
+_BASE = 0x100000001B3
+_BASE_POW = pow(_BASE, SHINGLE_SIZE - 1, 1 << 64)
+
+_LEXICAL_RE = re.compile(
+    r"(?P<str>[rbfuRBFU]*(?:\"\"\"[\s\S]*?\"\"\"|'''[\s\S]*?'''|\"[^\"\n]*\"|'[^'\n]*'))"
+    r"|(?P<comment>#[^\n]*)"
+    r"|(?P<num>\d[\w.]*)"
+    r"|(?P<name>[A-Za-z_]\w*)"
+    r"|(?P<op>\S)"
+)
+
+_token_hashes: dict[str, int] = {}
+
+
+def _hash64(text: str) -> int:
+    """Hash 64 bits stable entre processus"""
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def _token_hash(token: str) -> int:
+    value = _token_hashes.get(token)
+    if value is None:
+        value = _token_hashes[token] = _hash64(token)
+    return value
+
+
+def _mix64(value: int) -> int:
+    """Finaliseur splitmix64 : répartit les bits du hash glissant"""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def node_token(node: ast.AST) -> str | None:
+    """Token structurel d'un nœud (identifiants et littéraux abstraits)"""
+    if isinstance(node, ast.expr_context):
+        return None
+    if isinstance(node, ast.Name | ast.arg | ast.alias):
+        return "ID"
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, str | bytes):
+            return "STR"
+        if isinstance(node.value, bool) or node.value is None:
+            return repr(node.value)
+        if isinstance(node.value, int | float | complex):
+            return "NUM"
+        return "CONST"
+    return type(node).__name__
+
+
+def _docstring_node(node: ast.AST) -> ast.AST | None:
+    if not isinstance(
+        node, ast.Module | ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef
+    ):
+        return None
+    body = node.body
+    if (
+        body
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+    ):
+        return body[0]
+    return None
+
+
+class TokenStream:
+    """Flux de tokens structurels d'un fichier
+
+    Alimenté nœud par nœud pendant un parcours en profondeur (``enter`` puis
+    ``exit``), il fournit l'empreinte et les shingles de n'importe quelle
+    tranche ``[start, end)`` : le sous-arbre d'un nœud est toujours contigu.
+    """
+
+    def __init__(self):
+        self.hashes: list[int] = []
+        self._windows: list[int] | None = None
+        self._docstrings: set[int] = set()
+        self._muted: ast.AST | None = None
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def push_token(self, token: str):
+        """Ajouter un token brut"""
+        self.hashes.append(_token_hash(token))
+        self._windows = None
+
+    def enter(self, node: ast.AST):
+        """Émettre le token d'ouverture d'un nœud"""
+        if self._muted is not None:
+            return
+        if id(node) in self._docstrings:
+            self._muted = node
+            return
+
+        docstring = _docstring_node(node)
+        if docstring is not None:
+            self._docstrings.add(id(docstring))
+
+        token = node_token(node)
+        if token is not None:
+            self.push_token(token)
+
+    def exit(self, node: ast.AST):
+        """Émettre le marqueur de fin d'un bloc"""
+        if self._muted is not None:
+            if self._muted is node:
+                self._muted = None
+            return
+        if isinstance(getattr(node, "body", None), list):
+            self.push_token("END")
+
+    def fingerprint(self, start: int = 0, end: int = None) -> str:
+        """Empreinte 128 bits (hexadécimale) d'une tranche du flux"""
+        values = array("Q", self.hashes[start:end])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+
+    def _window_hashes(self) -> list[int]:
+        """Hash glissant de chaque fenêtre de SHINGLE_SIZE tokens"""
+        if self._windows is None:
+            hashes = self.hashes
+            windows = []
+            if len(hashes) >= SHINGLE_SIZE:
+                value = 0
+                for token in hashes[:SHINGLE_SIZE]:
+                    value = (value * _BASE + token) & _MASK64
+                windows.append(_mix64(value))
+                for index in range(SHINGLE_SIZE, len(hashes)):
+                    outgoing = hashes[index - SHINGLE_SIZE] * _BASE_POW
+                    value = ((value - outgoing) * _BASE + hashes[index]) & _MASK64
+                    windows.append(_mix64(value))
+            self._windows = windows
+        return self._windows
+
+    def shingles(self, start: int = 0, end: int = None) -> tuple[int, ...]:
+        """Échantillon bottom-k des shingles d'une tranche du flux"""
+        end = len(self.hashes) if end is None else end
+        if end <= start:
+            return ()
+        if end - start < SHINGLE_SIZE:
+            return (_mix64(int(self.fingerprint(start, end)[:16], 16)),)
+
+        windows = self._window_hashes()[start : end - SHINGLE_SIZE + 1]
+        return tuple(sorted(heapq.nsmallest(SKETCH_SIZE, set(windows))))
+
+
+def _walk(stream: TokenStream, node: ast.AST):
+    stream.enter(node)
+    for _field, value in ast.iter_fields(node):
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, ast.AST):
+                    _walk(stream, item)
+        elif isinstance(value, ast.AST):
+            _walk(stream, value)
+    stream.exit(node)
+
+
+def _lexical_stream(code: str) -> TokenStream:
+    """Flux de repli pour du texte qui n'est pas du Python valide"""
+    stream = TokenStream()
+    for match in _LEXICAL_RE.finditer(code):
+        kind = match.lastgroup
+        if kind == "comment":
+            continue
+        if kind == "str":
+            stream.push_token("STR")
+        elif kind == "num":
+            stream.push_token("NUM")
+        elif kind == "name":
+            word = match.group()
+            stream.push_token(word if iskeyword(word) else "ID")
+        else:
+            stream.push_token(match.group())
+    return stream
+
+
+def code_stream(code: str) -> TokenStream:
+    """Flux structurel d'un extrait de code (AST, ou lexical en repli)"""
+    try:
+        tree = ast.parse(textwrap.dedent(code))
+    except (SyntaxError, ValueError):
+        return _lexical_stream(code)
+
+    stream = TokenStream()
+    for statement in tree.body:
+        _walk(stream, statement)
+    if not stream.hashes:
+        return _lexical_stream(code)
+    return stream
+
+
+def code_fingerprint(code: str) -> str:
+    """Empreinte structurelle 128 bits d'un extrait de code"""
+    return code_stream(code).fingerprint()
+
+
+def code_shingles(code: str) -> frozenset[int]:
+    """Échantillon de shingles structurels d'un extrait de code"""
+    return frozenset(code_stream(code).shingles())
+
+
+def jaccard(
+    first: frozenset[int], second: frozenset[int], sketch_size: int = None
+) -> float:
+    """Similarité de Jaccard, estimée sur des échantillons bottom-k
+
+    Avec ``sketch_size``, la similarité est estimée sur les ``sketch_size``
+    plus petits hashes de l'union ; elle est exacte tant que l'union est
+    plus petite que l'échantillon.
+    """
+    if not first and not second:
+        return 1.0
+    union = first | second
+    if sketch_size is None or len(union) <= sketch_size:
+        return len(first & second) / len(union)
+
+    # Les plus petits hashes de l'union présents dans les deux échantillons
+    cutoff = sorted(union)[sketch_size - 1]
+    shared = sum(1 for value in first & second if value <= cutoff)
+    return shared / sketch_size
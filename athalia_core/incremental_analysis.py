@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+🔁 ANALYSE INCRÉMENTALE
+=======================
+Détermine le périmètre à ré-analyser après un changement :
+- fichiers modifiés depuis une révision de base (git diff) ou liste fournie
+- dépendants inverses de ces fichiers dans le graphe d'imports
+Les autres fichiers sont servis par le cache des analyses AST.
+"""
+
+import logging
+from collections import defaultdict, deque
+from collections.abc import Iterable
+from pathlib import Path
+
+from .ast_analyzer import FileAnalysis
+from .security_validator import SecurityError, validate_and_run
+
+logger = logging.getLogger(__name__)
+
+
+def _git_lines(project_path: Path, *args: str) -> list[str]:
+    result = validate_and_run(["git", *args], cwd=str(project_path))
+    if result.returncode != 0:
+        raise SecurityError(result.stderr.strip() or f"git {args[0]} a échoué")
+    return [line for line in result.stdout.splitlines() if line.strip()]
+
+
+def changed_files_since(project_path: Path, base_revision: str) -> list[Path] | None:
+    """Fichiers modifiés depuis base_revision (commits, index, copie de travail)
+
+    Les fichiers non suivis sont inclus. Renvoie None si git n'est pas
+    utilisable (pas de dépôt, révision inconnue).
+    """
+    project_path = Path(project_path)
+    try:
+        top_level = Path(_git_lines(project_path, "rev-parse", "--show-toplevel")[0])
+        names = _git_lines(project_path, "diff", "--name-only", base_revision, "--")
+        names += _git_lines(
+            project_path, "ls-files", "--others", "--exclude-standard", "--full-name"
+        )
+    except (SecurityError, OSError, IndexError) as e:
+        logger.warning(f"⚠️ Fichiers modifiés depuis {base_revision} inconnus: {e}")
+        return None
+
+    return sorted({top_level / name for name in names})
+
+
+def module_name(file_path: Path, root_path: Path) -> str | None:
+    """Nom de module pointé d'un fichier relatif à la racine du projet"""
+    try:
+        parts = list(Path(file_path).relative_to(root_path).with_suffix("").parts)
+    except ValueError:
+        return None
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts) or None
+
+
+class ImportGraph:
+    """Graphe des imports internes d'un projet
+
+    Les imports sont résolus vers les fichiers du projet par préfixe
+    (``import a.b.c`` dépend de ``a/b/c.py``, sinon ``a/b.py``...) puis,
+    pour les imports relatifs, depuis le paquet du module importateur.
+    """
+
+    def __init__(self, root_path: Path, analyses: Iterable[FileAnalysis]):
+        self.root_path = Path(root_path)
+        analyses = list(analyses)
+
+        self._modules: dict[str, Path] = {}
+        for analysis in analyses:
+            name = module_name(analysis.file_path, self.root_path)
+            if name:
+                self._modules[name] = Path(analysis.file_path)
+
+        self.dependencies: dict[Path, set[Path]] = defaultdict(set)
+        self.dependents: dict[Path, set[Path]] = defaultdict(set)
+        for analysis in analyses:
+            source = Path(analysis.file_path)
+            package = (module_name(source, self.root_path) or "").rpartition(".")[0]
+            if source.name == "__init__.py":
+                package = module_name(source, self.root_path) or ""
+            for imported in analysis.imports:
+                target = self._resolve(imported, package)
+                if target is not None and target != source:
+                    self.dependencies[source].add(target)
+                    self.dependents[target].add(source)
+
+    def _resolve(self, imported: str, package: str) -> Path | None:
+        parts = imported.strip(".").split(".")
+        for length in range(len(parts), 0, -1):
+            candidate = ".".join(parts[:length])
+            if candidate in self._modules:
+                return self._modules[candidate]
+            if package and f"{package}.{candidate}" in self._modules:
+                return self._modules[f"{package}.{candidate}"]
+        return None
+
+    def reverse_dependents(self, files: Iterable[Path]) -> set[Path]:
+        """Fichiers qui importent, directement ou non, l'un des fichiers donnés"""
+        seen: set[Path] = set()
+        queue = deque(Path(path) for path in files)
+        while queue:
+            for dependent in self.dependents.get(queue.popleft(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    queue.append(dependent)
+        return seen
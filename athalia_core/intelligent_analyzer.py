@@ -7,6 +7,12 @@ Orchestrateur principal qui coordonne tous les modules d'analyse:
 - Pattern Detector (détection de patterns et doublons)
 - Architecture Analyzer (analyse d'architecture)
 - Performance Analyzer (analyse de performance)
+
+En mode incrémental (révision de base ou liste de fichiers modifiés), seuls
+les fichiers modifiés sont ré-analysés ; les autres sont servis par le cache
+AST et fusionnés dans la même analyse complète. Les dépendants des fichiers
+modifiés gardent leur analyse AST : seuls les résultats inter-fichiers
+(patterns, architecture, performance) sont recalculés sur l'ensemble.
 """
 
 import json
@@ -16,10 +22,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .analysis_engine import ProjectAnalysisEngine
 from .architecture_analyzer import ArchitectureAnalyzer
-from .ast_analyzer import ASTAnalyzer
+from .ast_analyzer import ASTAnalyzer, FileAnalysis
+from .ast_cache import get_ast_cache
+from .incremental_analysis import ImportGraph, changed_files_since
 from .pattern_detector import PatternDetector
-from .performance_analyzer import PerformanceAnalyzer
+from .performance_analyzer import PerformanceAnalyzer, PerformanceReport
 
 # Import de l'orchestrateur unifié (optionnel)
 try:
@@ -41,7 +50,7 @@ class ComprehensiveAnalysis:
     ast_analysis: dict[str, Any]
     pattern_analysis: dict[str, Any]
     architecture_analysis: dict[str, Any]
-    performance_analysis: dict[str, Any]
+    performance_analysis: PerformanceReport
     overall_score: float
     recommendations: list[str]
     optimization_plan: dict[str, Any]
@@ -50,21 +59,44 @@ class ComprehensiveAnalysis:
 class IntelligentAnalyzer:
     """Orchestrateur principal de l'analyse intelligente"""
 
-    def __init__(self, root_path: str = None):
+    def __init__(self, root_path: str = None, use_ast_cache: bool = True):
         self.root_path = Path(root_path or Path.cwd())
 
+        # Un seul analyseur AST, adossé au cache persistant, partagé par tous
+        # les analyseurs spécialisés : chaque fichier n'est parsé qu'une fois.
+        # Les empreintes structurelles suffisent, le code source n'est pas gardé.
+        ast_cache = get_ast_cache(self.root_path) if use_ast_cache else None
+        self.ast_analyzer = ASTAnalyzer(capture_content=False, cache=ast_cache)
+        self.analysis_engine = ProjectAnalysisEngine(self.ast_analyzer)
+
         # Initialiser tous les analyseurs spécialisés
-        self.ast_analyzer = ASTAnalyzer()
-        self.pattern_detector = PatternDetector(self.root_path)
-        self.architecture_analyzer = ArchitectureAnalyzer(self.root_path)
-        self.performance_analyzer = PerformanceAnalyzer(self.root_path)
+        self.pattern_detector = PatternDetector(
+            self.root_path, self.ast_analyzer, self.analysis_engine
+        )
+        self.architecture_analyzer = ArchitectureAnalyzer(
+            self.root_path, self.ast_analyzer
+        )
+        self.performance_analyzer = PerformanceAnalyzer(
+            self.root_path, self.ast_analyzer, self.analysis_engine
+        )
 
         logger.info(f"🧠 Intelligent Analyzer initialisé dans {self.root_path}")
 
     def analyze_project_comprehensive(
-        self, project_path: str = None
+        self,
+        project_path: str = None,
+        base_revision: str = None,
+        changed_files: list[str | Path] = None,
     ) -> ComprehensiveAnalysis:
-        """Analyser un projet de manière complète avec tous les modules"""
+        """Analyser un projet de manière complète avec tous les modules
+
+        Args:
+            project_path: projet à analyser
+            base_revision: révision git de référence (mode incrémental)
+            changed_files: fichiers modifiés, par exemple la sortie de
+                ``git diff --name-only`` (mode incrémental, prioritaire sur
+                ``base_revision``)
+        """
         project_path = Path(project_path or self.root_path)
         project_name = project_path.name
 
@@ -72,11 +104,23 @@ class IntelligentAnalyzer:
 
         # 1. Analyse AST de base
         logger.info("📊 Étape 1/4: Analyse AST de base...")
-        ast_analysis = self._perform_ast_analysis(project_path)
+        python_files = [
+            f for f in project_path.rglob("*.py") if not f.name.startswith("._")
+        ]
+        file_analyses, scope = self._collect_file_analyses(
+            project_path, python_files, base_revision, changed_files
+        )
+        ast_analysis = self._perform_ast_analysis(
+            project_path, file_analyses, len(python_files)
+        )
+        if scope is not None:
+            ast_analysis["incremental"] = scope
 
         # 2. Analyse des patterns et doublons
         logger.info("🔍 Étape 2/4: Analyse des patterns et doublons...")
-        pattern_analysis = self.pattern_detector.analyze_project_patterns(project_path)
+        pattern_analysis = self.pattern_detector.analyze_project_patterns(
+            project_path, file_analyses
+        )
 
         # 3. Analyse d'architecture
         logger.info("🏗️ Étape 3/4: Analyse d'architecture...")
@@ -85,7 +129,7 @@ class IntelligentAnalyzer:
         # 4. Analyse de performance
         logger.info("⚡ Étape 4/4: Analyse de performance...")
         performance_analysis = self.performance_analyzer.analyze_project_performance(
-            project_path
+            project_path, file_analyses
         )
 
         # Calculer le score global
@@ -128,38 +172,103 @@ class IntelligentAnalyzer:
 
         return comprehensive_analysis
 
-    def _perform_ast_analysis(self, project_path: Path) -> dict[str, Any]:
+    def _collect_file_analyses(
+        self,
+        project_path: Path,
+        python_files: list[Path],
+        base_revision: str = None,
+        changed_files: list[str | Path] = None,
+    ) -> tuple[list[FileAnalysis], dict[str, Any] | None]:
+        """Analyses AST de tous les fichiers, complètes ou incrémentales
+
+        Renvoie les analyses et, en mode incrémental, le périmètre recalculé.
+        """
+        if changed_files is None and base_revision is not None:
+            changed_files = changed_files_since(project_path, base_revision)
+            if changed_files is None:
+                logger.warning("⚠️ Mode incrémental indisponible, analyse complète")
+        if changed_files is None:
+            return self.analysis_engine.analyze_files(python_files), None
+
+        changed = {
+            Path(path).resolve()
+            if Path(path).is_absolute()
+            else (project_path / path).resolve()
+            for path in changed_files
+        }
+        modified = {f for f in python_files if f.resolve() in changed}
+        deleted = [p for p in changed if p.suffix == ".py" and not p.exists()]
+
+        # Fichiers inchangés : résultats enregistrés (cache AST), en une lecture
+        analyses = self.analysis_engine.cached_analyses(
+            f for f in python_files if f not in modified
+        )
+        stale = {f for f in python_files if f not in modified and f not in analyses}
+        for analysis in self.analysis_engine.iter_analyses(
+            [f for f in python_files if f in modified or f in stale]
+        ):
+            analyses[analysis.file_path] = analysis
+
+        # Dépendants inverses (directs et indirects) des fichiers modifiés ou
+        # supprimés : contenu inchangé, leur analyse AST est conservée ; les
+        # résultats qui dépendent d'autres fichiers sont recalculés ensuite
+        graph = ImportGraph(project_path, analyses.values())
+        dependents = graph.reverse_dependents([*modified, *deleted])
+        dependents -= modified | stale
+
+        scope = {
+            "base_revision": base_revision,
+            "changed_files": sorted(str(f) for f in modified),
+            "deleted_files": sorted(str(f) for f in deleted),
+            "dependent_files": sorted(str(f) for f in dependents),
+            "stale_files": sorted(str(f) for f in stale),
+            "reused_files": len(python_files) - len(modified) - len(stale),
+        }
+        logger.info(
+            f"🔁 Analyse incrémentale: {len(modified)} modifiés, "
+            f"{len(dependents)} dépendants, {scope['reused_files']} réutilisés"
+        )
+        return [analyses[f] for f in python_files if f in analyses], scope
+
+    def _perform_ast_analysis(
+        self,
+        project_path: Path,
+        file_analyses: list[FileAnalysis] = None,
+        total_files: int = None,
+    ) -> dict[str, Any]:
         """Effectuer l'analyse AST de base"""
-        python_files = list(project_path.rglob("*.py"))
-        file_analyses = []
+        if file_analyses is None:
+            python_files = list(project_path.rglob("*.py"))
+            file_analyses = self.analysis_engine.iter_analyses(python_files)
+            total_files = len(python_files)
+        file_details = []
 
-        for py_file in python_files:
+        for file_analysis in file_analyses:
             try:
-                file_analysis = self.ast_analyzer.analyze_file(py_file)
-                if file_analysis:
-                    file_analyses.append(
-                        {
-                            "file_path": str(file_analysis.file_path),
-                            "functions_count": len(file_analysis.functions),
-                            "classes_count": len(file_analysis.classes),
-                            "complexity_score": file_analysis.complexity_score,
-                            "total_lines": file_analysis.total_lines,
-                        }
-                    )
+                file_details.append(
+                    {
+                        "file_path": str(file_analysis.file_path),
+                        "functions_count": len(file_analysis.functions),
+                        "classes_count": len(file_analysis.classes),
+                        "complexity_score": file_analysis.complexity_score,
+                        "total_lines": file_analysis.total_lines,
+                    }
+                )
             except Exception as e:
-                logger.warning(f"Erreur lors de l'analyse AST de {py_file}: {e}")
+                file_path = getattr(file_analysis, "file_path", file_analysis)
+                logger.warning(f"Erreur lors de l'analyse AST de {file_path}: {e}")
 
         return {
-            "files_analyzed": len(file_analyses),
-            "total_files": len(python_files),
-            "file_details": file_analyses,
+            "files_analyzed": len(file_details),
+            "total_files": total_files,
+            "file_details": file_details,
             "summary": {
-                "total_functions": sum(f["functions_count"] for f in file_analyses),
-                "total_classes": sum(f["classes_count"] for f in file_analyses),
+                "total_functions": sum(f["functions_count"] for f in file_details),
+                "total_classes": sum(f["classes_count"] for f in file_details),
                 "average_complexity": (
-                    sum(f["complexity_score"] for f in file_analyses)
-                    / len(file_analyses)
-                    if file_analyses
+                    sum(f["complexity_score"] for f in file_details)
+                    / len(file_details)
+                    if file_details
                     else 0
                 ),
             },
@@ -498,6 +607,16 @@ def main():
     parser = argparse.ArgumentParser(description="Analyseur intelligent Athalia")
     parser.add_argument("--project-path", type=str, help="Chemin du projet à analyser")
     parser.add_argument("--output", type=str, help="Fichier de sortie pour le rapport")
+    parser.add_argument(
+        "--base-revision",
+        type=str,
+        help="Analyse incrémentale depuis cette révision git (ex: HEAD, origin/main)",
+    )
+    parser.add_argument(
+        "--changed-files",
+        nargs="*",
+        help="Analyse incrémentale de ces fichiers modifiés (git diff --name-only)",
+    )
 
     args = parser.parse_args()
 
@@ -505,7 +624,11 @@ def main():
     analyzer = IntelligentAnalyzer()
 
     # Effectuer l'analyse
-    analysis = analyzer.analyze_project_comprehensive(args.project_path)
+    analysis = analyzer.analyze_project_comprehensive(
+        args.project_path,
+        base_revision=args.base_revision,
+        changed_files=args.changed_files,
+    )
 
     # Afficher les résultats
     print(f"\n🧠 ANALYSE COMPLÈTE - {analysis.project_name}")
@@ -515,6 +638,13 @@ def main():
 
     print("\n📊 RÉSUMÉ:")
     print(f"- Fichiers analysés: {analysis.ast_analysis['files_analyzed']}")
+    scope = analysis.ast_analysis.get("incremental")
+    if scope:
+        print(
+            f"- Incrémental: {len(scope['changed_files'])} modifiés, "
+            f"{len(scope['dependent_files'])} dépendants, "
+            f"{scope['reused_files']} réutilisés"
+        )
     print(
         "- Doublons détectés:"
         f" {analysis.pattern_analysis['summary']['total_duplicates']}"
@@ -522,7 +652,7 @@ def main():
     print(
         f"- Anti-patterns: {analysis.pattern_analysis['summary']['total_antipatterns']}"
     )
-    print(f"- Problèmes de performance: {len(analysis.performance_analysis['issues'])}")
+    print(f"- Problèmes de performance: {len(analysis.performance_analysis.issues)}")
 
     print("\n💡 RECOMMANDATIONS:")
     for i, rec in enumerate(analysis.recommendations, 1):
@@ -9,6 +9,16 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .code_metrics import analyze_files
+from .project_snapshot import ProjectSnapshot, snapshot_for
+from .rule_engine import (
+    DANGEROUS_CALLS,
+    HARDCODED_SECRETS,
+    RULES,
+    SECRET_TOKENS,
+    scan_files,
+)
+
 logger = logging.getLogger(__name__)
 
 """
@@ -20,11 +30,21 @@ Analyse automatique complète des projets avec recommandations
 class IntelligentAuditor:
     """Auditeur intelligent pour analyse automatique des projets"""
 
-    def __init__(self, project_path: str = None):
+    def __init__(self, project_path: str = None, snapshot: ProjectSnapshot = None):
         self.project_path = Path(project_path) if project_path else None
+        # Instantané partagé (orchestrateur) ou construit à chaque audit
+        self._shared_snapshot = snapshot
+        self._snapshot: ProjectSnapshot | None = None
         self.audit_results = {}
         self.recommendations = []
 
+    @property
+    def snapshot(self) -> ProjectSnapshot:
+        """Fichiers du projet audité, parcourus une seule fois par audit"""
+        if self._snapshot is None or self._snapshot.root_path != self.project_path:
+            self._snapshot = snapshot_for(self.project_path, self._shared_snapshot)
+        return self._snapshot
+
     def run(self) -> dict[str, Any]:
         """Méthode run() pour lorchestrateur - exécute laudit"""
         if not self.project_path:
@@ -34,6 +54,7 @@ class IntelligentAuditor:
     def audit_project(self, project_path: str) -> dict[str, Any]:
         """Audit complet dun projet"""
         self.project_path = Path(project_path)
+        self._snapshot = None
         self.audit_results = {
             "info": {},
             "code_quality": {},
@@ -79,18 +100,18 @@ class IntelligentAuditor:
 
     def _detect_project_type(self) -> str:
         """Détection automatique du type de projet"""
-        files = list(self.project_path.rglob("*"))
-        if any(file_handle.name == "package.json" for file_handle in files):
+        names = {entry.name for entry in self.snapshot}
+        if "package.json" in names:
             return "Node.js / JS"
-        elif any(file_handle.name == "requirements.txt" for file_handle in files):
+        elif "requirements.txt" in names:
             return "Python"
-        elif any(file_handle.name == "pom.xml" for file_handle in files):
+        elif "pom.xml" in names:
             return "Java / Maven"
-        elif any(file_handle.name == "Cargo.toml" for file_handle in files):
+        elif "Cargo.toml" in names:
             return "Rust"
-        elif any(file_handle.name == "go.mod" for file_handle in files):
+        elif "go.mod" in names:
             return "Go"
-        elif any(file_handle.name == "Dockerfile" for file_handle in files):
+        elif "Dockerfile" in names:
             return "Docker"
         else:
             return "Multi-langage/Autre"
@@ -100,17 +121,13 @@ class IntelligentAuditor:
         total_files = 0
         total_lines = 0
         code_files = 0
-        for file_path in self.project_path.rglob("*"):
-            if file_path.is_file():
-                total_files += 1
-                try:
-                    with open(file_path, encoding="utf-8") as file_handle:
-                        lines = len(file_handle.readlines())
-                        total_lines += lines
-                        if self._is_code_file(file_path):
-                            code_files += 1
-                except Exception:
-                    pass
+        for entry in self.snapshot:
+            total_files += 1
+            content = entry.read_text()
+            if content is not None:
+                total_lines += len(content.splitlines())
+                if self._is_code_file(entry.path):
+                    code_files += 1
         return {
             "total_files": total_files,
             "total_lines": total_lines,
@@ -143,25 +160,23 @@ class IntelligentAuditor:
     def _detect_languages(self) -> list[str]:
         """Détection des langages du projet"""
         languages = set()
-        for file_path in self.project_path.rglob("*"):
-            if file_path.is_file():
-                ext = file_path.suffix.lower()
-                if ext == ".py":
-                    languages.add("Python")
-                elif ext in [".js", ".jsx"]:
-                    languages.add("JavaScript")
-                elif ext in [".ts", ".tsx"]:
-                    languages.add("TypeScript")
-                elif ext == ".java":
-                    languages.add("Java")
-                elif ext == ".go":
-                    languages.add("Go")
-                elif ext == ".rs":
-                    languages.add("Rust")
-                elif ext == ".php":
-                    languages.add("PHP")
-                elif ext == ".rb":
-                    languages.add("Ruby")
+        for ext in {entry.suffix for entry in self.snapshot}:
+            if ext == ".py":
+                languages.add("Python")
+            elif ext in [".js", ".jsx"]:
+                languages.add("JavaScript")
+            elif ext in [".ts", ".tsx"]:
+                languages.add("TypeScript")
+            elif ext == ".java":
+                languages.add("Java")
+            elif ext == ".go":
+                languages.add("Go")
+            elif ext == ".rs":
+                languages.add("Rust")
+            elif ext == ".php":
+                languages.add("PHP")
+            elif ext == ".rb":
+                languages.add("Ruby")
         return list(languages)
 
     def _detect_dependencies(self) -> dict[str, list[str]]:
@@ -195,12 +210,7 @@ class IntelligentAuditor:
 
     def _get_last_modified(self) -> str:
         """Date de dernière modification"""
-        latest = 0
-        for file_path in self.project_path.rglob("*"):
-            if file_path.is_file():
-                mtime = file_path.stat().st_mtime
-                if mtime > latest:
-                    latest = mtime
+        latest = max((entry.mtime for entry in self.snapshot), default=0)
         return datetime.fromtimestamp(latest).strftime("%Y-%m-%d %H:%M:%S")
 
     def _analyze_code_quality(self):
@@ -215,16 +225,10 @@ class IntelligentAuditor:
 
     def _analyze_complexity(self) -> dict[str, Any]:
         """Analyse de la complexité du code"""
-        complexity_scores = []
-
-        for file_path in self.project_path.rglob("*.py"):
-            try:
-                with open(file_path, encoding="utf-8") as file_handle:
-                    tree = ast.parse(file_handle.read())
-                    complexity = self._calculate_cyclomatic_complexity(tree)
-                    complexity_scores.append(complexity)
-            except Exception:
-                pass
+        complexity_scores = [
+            metrics.complexity
+            for _, metrics in analyze_files(self.snapshot.python_files())
+        ]
 
         if complexity_scores:
             avg_complexity = sum(complexity_scores) / len(complexity_scores)
@@ -238,49 +242,24 @@ class IntelligentAuditor:
             "status": "✅" if avg_complexity < 10 else "⚠️",
         }
 
-    def _calculate_cyclomatic_complexity(self, tree: ast.AST) -> int:
-        """Calcul de la complexité cyclomatique dun fichier"""
-        complexity = 1  # Base complexity
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.If | ast.While | ast.For | ast.AsyncFor):
-                complexity += 1
-            elif isinstance(node, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(node, ast.BoolOp):
-                complexity += len(node.values) - 1
-
-        return complexity
-
     def _analyze_style(self) -> dict[str, Any]:
         """Analyse du style du code"""
         style_issues = []
 
-        for file_path in self.project_path.rglob("*.py"):
-            try:
-                with open(file_path, encoding="utf-8") as file_handle:
-                    lines = file_handle.readlines()
-                    for index, line in enumerate(lines, 1):
-                        if len(line.rstrip()) > 120:
-                            style_issues.append(
-                                f"Ligne trop longue: {file_path.name}:{index}"
-                            )
-                        if line.strip() and not line.startswith("#"):
-                            if not line.startswith((" ", "\t")) and line.strip():
-                                if not any(
-                                    keyword in line
-                                    for keyword in [
-                                        "class ",
-                                        "def ",
-                                        "import ",
-                                        "from ",
-                                    ]
-                                ):
-                                    style_issues.append(
-                                        f"Indentation: {file_path.name}:{index}"
-                                    )
-            except Exception:
-                pass
+        for entry in self.snapshot.python_files():
+            content = entry.read_text()
+            if content is None:
+                continue
+            for index, line in enumerate(content.splitlines(), 1):
+                if len(line.rstrip()) > 120:
+                    style_issues.append(f"Ligne trop longue: {entry.name}:{index}")
+                if line.strip() and not line.startswith("#"):
+                    if not line.startswith((" ", "\t")) and line.strip():
+                        if not any(
+                            keyword in line
+                            for keyword in ["class ", "def ", "import ", "from "]
+                        ):
+                            style_issues.append(f"Indentation: {entry.name}:{index}")
 
         return {
             "issues": style_issues,
@@ -292,17 +271,9 @@ class IntelligentAuditor:
         documented_functions = 0
         total_functions = 0
 
-        for file_path in self.project_path.rglob("*.py"):
-            try:
-                with open(file_path, encoding="utf-8") as file_handle:
-                    tree = ast.parse(file_handle.read())
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.FunctionDef):
-                            total_functions += 1
-                            if ast.get_docstring(node):
-                                documented_functions += 1
-            except Exception:
-                pass
+        for _, metrics in analyze_files(self.snapshot.python_files()):
+            total_functions += len(metrics.functions)
+            documented_functions += metrics.documented_functions
 
         coverage = (
             (documented_functions / total_functions * 100) if total_functions > 0 else 0
@@ -319,23 +290,17 @@ class IntelligentAuditor:
         """Analyse des conventions de nommage"""
         issues = []
 
-        for file_path in self.project_path.rglob("*.py"):
-            try:
-                with open(file_path, encoding="utf-8") as file_handle:
-                    tree = ast.parse(file_handle.read())
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.FunctionDef):
-                            if not re.match(r"^[a-z_][a-z0-9_]*$", node.name):
-                                issues.append(
-                                    f"Fonction: {node.name} dans {file_path.name}"
-                                )
-                        elif isinstance(node, ast.ClassDef):
-                            if not re.match(r"^[A-Z][a-zA-Z0-9]*$", node.name):
-                                issues.append(
-                                    f"Classe: {node.name} dans {file_path.name}"
-                                )
-            except Exception:
-                pass
+        for entry in self.snapshot.python_files():
+            tree = entry.parse()
+            if tree is None:
+                continue
+            for node in ast.walk(tree):
+                if isinstance(node, ast.FunctionDef):
+                    if not re.match(r"^[a-z_][a-z0-9_]*$", node.name):
+                        issues.append(f"Fonction: {node.name} dans {entry.name}")
+                elif isinstance(node, ast.ClassDef):
+                    if not re.match(r"^[A-Z][a-zA-Z0-9]*$", node.name):
+                        issues.append(f"Classe: {node.name} dans {entry.name}")
 
         return {"issues": issues, "status": "✅" if len(issues) < 5 else "⚠️"}
 
@@ -352,25 +317,14 @@ class IntelligentAuditor:
         """Détection des vulnérabilités de sécurité"""
         vulnerabilities = []
 
-        # Recherche de patterns dangereux
-        dangerous_patterns = [
-            (r"eval\(", "Utilisation de 'eval()'"),
-            (r"exec\(", "Utilisation de 'exec()'"),
-            (r"os\.system\(", "Utilisation de 'os.system()'"),
-            (r"subprocess\.call\(", "Utilisation de 'subprocess.call()'"),
-            (r'password\s*=\s*["\"][^"\']+["\"]', "Mot de passe en clair"),
-            (r'api_key\s*=\s*["\"][^"\']+["\"]', "Clé API en clair"),
-        ]
-
-        for file_path in self.project_path.rglob("*.py"):
-            try:
-                with open(file_path, encoding="utf-8") as file_handle:
-                    content = file_handle.read()
-                    for pattern, description in dangerous_patterns:
-                        if re.search(pattern, content):
-                            vulnerabilities.append(f"{description}: {file_path.name}")
-            except Exception:
-                pass
+        # Règles partagées avec l'auditeur de sécurité, un parcours par fichier
+        ruleset = RULES.ruleset(DANGEROUS_CALLS, HARDCODED_SECRETS)
+        for entry, findings in scan_files(self.snapshot.python_files(), ruleset):
+            reported = set()
+            for finding in findings:
+                if finding.rule.rule_id not in reported:
+                    reported.add(finding.rule.rule_id)
+                    vulnerabilities.append(f"{finding.rule.description}: {entry.name}")
 
         return vulnerabilities
 
@@ -378,23 +332,13 @@ class IntelligentAuditor:
         """Détection de secrets"""
         secrets = []
 
-        secret_patterns = [
-            r"[A-Za-z0-9+/]{40,}={0,2}",  # Base64 long
-            r"sk_[A-Za-z0-9]{24}",  # Stripe secret key
-            r"AKIA[0-9A-Z]{16},  # AWS access key",
-        ]
-
-        for file_path in self.project_path.rglob("*"):
-            if file_path.is_file():
-                try:
-                    with open(file_path, encoding="utf-8") as file_handle:
-                        content = file_handle.read()
-                        for pattern in secret_patterns:
-                            if re.search(pattern, content):
-                                secrets.append(f"Secret détecté: {file_path.name}")
-                                break
-                except Exception:
-                    pass
+        ruleset = RULES.ruleset(SECRET_TOKENS)
+        for entry in self.snapshot:
+            content = entry.read_text()
+            if content is None:
+                continue
+            if ruleset.search(content):
+                secrets.append(f"Secret détecté: {entry.name}")
 
         return secrets
 
@@ -402,14 +346,13 @@ class IntelligentAuditor:
         """Analyse des permissions des fichiers"""
         sensitive_files = []
 
-        for file_path in self.project_path.rglob("*f"):
-            if file_path.is_file():
-                try:
-                    stat = file_path.stat()
-                    if stat.st_mode & 0o777 == 0o777:  # Permissions trop ouvertes
-                        sensitive_files.append(str(file_path))
-                except Exception:
-                    pass
+        for entry in self.snapshot.glob("*f"):
+            try:
+                stat = entry.path.stat()
+                if stat.st_mode & 0o777 == 0o777:  # Permissions trop ouvertes
+                    sensitive_files.append(str(entry.path))
+            except Exception:
+                pass
 
         return {
             "files": sensitive_files,
@@ -430,12 +373,10 @@ class IntelligentAuditor:
         large_files = []
         total_size = 0
 
-        for file_path in self.project_path.rglob("*"):
-            if file_path.is_file():
-                size = file_path.stat().st_size
-                total_size += size
-                if size > 1024 * 1024:  # > 1MB
-                    large_files.append(f"{file_path.name}: {size / 1024 / 1024:.1f}MB")
+        for entry in self.snapshot:
+            total_size += entry.size
+            if entry.size > 1024 * 1024:  # > 1MB
+                large_files.append(f"{entry.name}: {entry.size / 1024 / 1024:.1f}MB")
 
         return {
             "total_size_mb": total_size / 1024 / 1024,
@@ -447,19 +388,17 @@ class IntelligentAuditor:
         """Analyse des imports"""
         imports = []
 
-        for file_path in self.project_path.rglob("*.py"):
-            try:
-                with open(file_path, encoding="utf-8") as file_handle:
-                    tree = ast.parse(file_handle.read())
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.Import):
-                            for alias in node.names:
-                                imports.append(alias.name)
-                        elif isinstance(node, ast.ImportFrom):
-                            if node.module:
-                                imports.append(node.module)
-            except Exception:
-                pass
+        for entry in self.snapshot.python_files():
+            tree = entry.parse()
+            if tree is None:
+                continue
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    for alias in node.names:
+                        imports.append(alias.name)
+                elif isinstance(node, ast.ImportFrom):
+                    if node.module:
+                        imports.append(node.module)
 
         return {
             "total_imports": len(imports),
@@ -470,10 +409,7 @@ class IntelligentAuditor:
     def _estimate_memory_usage(self) -> dict[str, Any]:
         """Estimation de la list_datausage"""
         # Estimation basique basée sur la taille du code
-        code_size = 0
-        for file_path in self.project_path.rglob("*.py"):
-            if file_path.is_file():
-                code_size += file_path.stat().st_size
+        code_size = sum(entry.size for entry in self.snapshot.python_files())
 
         estimated_memory = code_size * 0.1  # Estimation approximative
 
@@ -559,14 +495,13 @@ class IntelligentAuditor:
 
     def _analyze_test_coverage(self) -> dict[str, Any]:
         """Analyse de la couverture de tests"""
-        test_files = list(self.project_path.rglob("*test*.py"))
-        source_files = list(self.project_path.rglob("*.py"))
+        test_files = self.snapshot.glob("*test*.py")
 
         # Exclure les fichiers de test des fichiers source
         source_files = [
-            file_handle
-            for file_handle in source_files
-            if "test" not in file_handle.name.lower()
+            entry
+            for entry in self.snapshot.python_files()
+            if "test" not in entry.name.lower()
         ]
 
         coverage_ratio = len(test_files) / len(source_files) if source_files else 0
@@ -593,18 +528,14 @@ class IntelligentAuditor:
         """Analyse de la qualité des tests"""
         quality_issues = []
 
-        for file_path in self.project_path.rglob("*test*.py"):
-            try:
-                with open(file_path, encoding="utf-8") as file_handle:
-                    content = file_handle.read()
-                    if "assert" not in content and "self." not in content:
-                        quality_issues.append(f"Pas dassertions: {file_path.name}")
-                    if "def test_" not in content:
-                        quality_issues.append(
-                            f"Pas de fonctions de test: {file_path.name}"
-                        )
-            except Exception:
-                pass
+        for entry in self.snapshot.glob("*test*.py"):
+            content = entry.read_text()
+            if content is None:
+                continue
+            if "assert" not in content and "self." not in content:
+                quality_issues.append(f"Pas dassertions: {entry.name}")
+            if "def test_" not in content:
+                quality_issues.append(f"Pas de fonctions de test: {entry.name}")
 
         return {
             "issues": quality_issues,
@@ -643,13 +574,13 @@ class IntelligentAuditor:
         """Analyse du nommage des fichiers et dossiers"""
         issues = []
 
-        for item in self.project_path.rglob("*"):
-            if item.is_file() or item.is_dir():
-                name = item.name
-                if " " in name:
-                    issues.append(f"Espaces dans le nom: {name}")
-                if name.startswith(".") and name not in [".py", ".py"]:
-                    issues.append(f"Fichier caché: {name}")
+        names = [entry.name for entry in self.snapshot]
+        names.extend(path.name for path in self.snapshot.directories)
+        for name in names:
+            if " " in name:
+                issues.append(f"Espaces dans le nom: {name}")
+            if name.startswith(".") and name not in [".py", ".py"]:
+                issues.append(f"Fichier caché: {name}")
 
         return {"issues": issues, "status": "✅" if len(issues) < 5 else "⚠️"}
 
@@ -657,9 +588,8 @@ class IntelligentAuditor:
         """Analyse de la modularité"""
         modules = []
 
-        for file_path in self.project_path.rglob("*.py"):
-            if file_path.name == "__init__.py":
-                modules.append(str(file_path.parent))
+        for entry in self.snapshot.glob("__init__.py"):
+            modules.append(str(entry.path.parent))
 
         return {
             "modules": modules,
@@ -10,8 +10,6 @@ Système de mémoire qui:
 - Améliore la qualité du code continuellement
 """
 
-import difflib
-import hashlib
 import json
 import logging
 import re
@@ -21,8 +19,15 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .fingerprints import SKETCH_SIZE, code_fingerprint, code_shingles, jaccard
+from .rule_engine import COMPLEXITY, DANGEROUS_CALLS, HARDCODED_SECRETS, RULES
+from .sqlite_store import get_sqlite_store
+
 logger = logging.getLogger(__name__)
 
+# Version du schéma : 1 = pattern_hash issus des empreintes structurelles
+SCHEMA_VERSION = 1
+
 
 @dataclass
 class LearningEvent:
@@ -73,7 +78,8 @@ class IntelligentMemory:
         # Créer les dossiers nécessaires
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialiser la base de données
+        # Initialiser la base de données (connexions partagées, écritures groupées)
+        self.store = get_sqlite_store(self.db_path)
         self._init_database()
 
         # Cache pour les performances
@@ -85,7 +91,7 @@ class IntelligentMemory:
 
     def _init_database(self):
         """Initialiser la base de données de mémoire"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.transaction() as conn:
             cursor = conn.cursor()
 
             # Table des événements d'apprentissage
@@ -172,7 +178,87 @@ class IntelligentMemory:
             """
             )
 
-            conn.commit()
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                self._migrate_pattern_hashes(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _migrate_pattern_hashes(self, conn: sqlite3.Connection):
+        """Recalculer les pattern_hash (anciens MD5 textuels) en empreintes
+
+        Les événements conservent leur code : ils donnent la correspondance
+        ancien hash -> empreinte, appliquée ensuite aux patterns appris (en
+        fusionnant ceux qui deviennent identiques) et aux prédictions.
+        """
+        mapping: dict[str, str] = {}
+        rows = conn.execute(
+            "SELECT id, code_snippet, pattern_hash FROM learning_events"
+        ).fetchall()
+        for event_id, snippet, old_hash in rows:
+            new_hash = self._analyze_code_pattern(snippet)
+            if old_hash:
+                mapping[old_hash] = new_hash
+            conn.execute(
+                "UPDATE learning_events SET pattern_hash = ? WHERE id = ?",
+                (new_hash, event_id),
+            )
+
+        for old_hash, new_hash in mapping.items():
+            if old_hash == new_hash:
+                continue
+            old = conn.execute(
+                """
+                SELECT occurrences, first_seen, last_seen, success_rate
+                FROM learned_patterns WHERE pattern_hash = ?
+            """,
+                (old_hash,),
+            ).fetchone()
+            if old is not None:
+                current = conn.execute(
+                    """
+                    SELECT occurrences, first_seen, last_seen, success_rate
+                    FROM learned_patterns WHERE pattern_hash = ?
+                """,
+                    (new_hash,),
+                ).fetchone()
+                if current is None:
+                    conn.execute(
+                        "UPDATE learned_patterns SET pattern_hash = ? "
+                        "WHERE pattern_hash = ?",
+                        (new_hash, old_hash),
+                    )
+                else:
+                    occurrences = old[0] + current[0]
+                    success_rate = (
+                        old[0] * old[3] + current[0] * current[3]
+                    ) / max(occurrences, 1)
+                    conn.execute(
+                        """
+                        UPDATE learned_patterns
+                        SET occurrences = ?, first_seen = ?, last_seen = ?,
+                            success_rate = ?
+                        WHERE pattern_hash = ?
+                    """,
+                        (
+                            occurrences,
+                            min(old[1], current[1]),
+                            max(old[2], current[2]),
+                            success_rate,
+                            new_hash,
+                        ),
+                    )
+                    conn.execute(
+                        "DELETE FROM learned_patterns WHERE pattern_hash = ?",
+                        (old_hash,),
+                    )
+
+            conn.execute(
+                "UPDATE predictions SET code_pattern = ? WHERE code_pattern = ?",
+                (new_hash, old_hash),
+            )
+
+        if mapping:
+            logger.info(f"🧠 {len(mapping)} patterns migrés vers les empreintes")
 
     def learn_from_error(
         self,
@@ -312,7 +398,7 @@ class IntelligentMemory:
         suggestions = []
 
         # Chercher des corrections similaires dans l'historique
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.reading() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -349,7 +435,7 @@ class IntelligentMemory:
 
     def get_learning_insights(self) -> dict[str, Any]:
         """Obtenir des insights d'apprentissage"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.reading() as conn:
             cursor = conn.cursor()
 
             # Statistiques générales
@@ -402,41 +488,36 @@ class IntelligentMemory:
         """Enregistrer un événement d'apprentissage"""
         pattern_hash = self._analyze_code_pattern(code_snippet)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO learning_events
-                (event_type, description, code_snippet, location, timestamp,
-                 severity, resolution, success, context, pattern_hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    event_type,
-                    description,
-                    code_snippet,
-                    location,
-                    datetime.now().isoformat(),
-                    severity,
-                    resolution,
-                    success,
-                    json.dumps(context) if context else None,
-                    pattern_hash,
-                ),
-            )
-
-            event_id = cursor.lastrowid
-            conn.commit()
-
-            return str(event_id)
+        # Écriture immédiate : l'identifiant de l'événement est retourné
+        cursor = self.store.execute(
+            """
+            INSERT INTO learning_events
+            (event_type, description, code_snippet, location, timestamp,
+             severity, resolution, success, context, pattern_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                event_type,
+                description,
+                code_snippet,
+                location,
+                datetime.now().isoformat(),
+                severity,
+                resolution,
+                success,
+                json.dumps(context) if context else None,
+                pattern_hash,
+            ),
+        )
+        return str(cursor.lastrowid)
 
     def _analyze_code_pattern(self, code: str) -> str:
-        """Analyser et créer un hash du pattern de code"""
-        # Normaliser le code
-        normalized = self._normalize_code(code)
+        """Empreinte structurelle stable (128 bits) du pattern de code
 
-        # Créer un hash
-        return hashlib.md5(normalized.encode(), usedforsecurity=False).hexdigest()
+        Identifiants, littéraux, commentaires et docstrings sont ignorés : le
+        même pattern retrouve son historique d'une exécution à l'autre.
+        """
+        return code_fingerprint(code)
 
     def _normalize_code(self, code: str) -> str:
         """Normaliser le code pour la comparaison"""
@@ -459,7 +540,7 @@ class IntelligentMemory:
         self, pattern_hash: str, pattern_type: str, success: bool
     ):
         """Mettre à jour l'apprentissage d'un pattern"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.transaction() as conn:
             cursor = conn.cursor()
 
             # Vérifier si le pattern existe déjà
@@ -509,8 +590,6 @@ class IntelligentMemory:
                     ),
                 )
 
-            conn.commit()
-
     def _generate_predictions_from_error(
         self, error_description: str, code_snippet: str, pattern_hash: str
     ):
@@ -549,30 +628,27 @@ class IntelligentMemory:
             }
 
         # Sauvegarder la prédiction
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO predictions
-                (prediction_type, confidence, description, suggested_action,
-                 estimated_impact, code_pattern, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    prediction["prediction_type"],
-                    prediction["confidence"],
-                    prediction["description"],
-                    prediction["suggested_action"],
-                    prediction["estimated_impact"],
-                    prediction["code_pattern"],
-                    datetime.now().isoformat(),
-                ),
-            )
-            conn.commit()
+        self.store.insert(
+            """
+            INSERT INTO predictions
+            (prediction_type, confidence, description, suggested_action,
+             estimated_impact, code_pattern, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                prediction["prediction_type"],
+                prediction["confidence"],
+                prediction["description"],
+                prediction["suggested_action"],
+                prediction["estimated_impact"],
+                prediction["code_pattern"],
+                datetime.now().isoformat(),
+            ),
+        )
 
     def _find_similar_patterns(self, pattern_hash: str) -> list[dict[str, Any]]:
         """Trouver des patterns similaires"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.reading() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -598,49 +674,20 @@ class IntelligentMemory:
             ]
 
     def _check_antipatterns(self, code_snippet: str) -> list[Prediction]:
-        """Vérifier les anti-patterns connus"""
+        """Vérifier les anti-patterns connus (règles partagées des audits)"""
         predictions = []
 
-        # Anti-patterns à vérifier
-        antipatterns = [
-            (
-                r"eval\s*\(",
-                "Utilisation de eval() - Risque de sécurité",
-                "Remplacer par une alternative sécurisée",
-            ),
-            (
-                r"exec\s*\(",
-                "Utilisation de exec() - Risque de sécurité",
-                "Remplacer par une alternative sécurisée",
-            ),
-            (
-                r"for\s+\w+\s+in\s+\w+:\s*\n\s*for\s+\w+\s+in\s+\w+:",
-                "Boucles imbriquées - Complexité élevée",
-                "Considérer l'utilisation de list comprehensions ou itertools",
-            ),
-            (
-                r"if\s+\w+:\s*\n\s*if\s+\w+:\s*\n\s*if\s+\w+:",
-                "Conditions imbriquées - Complexité élevée",
-                "Refactoriser en utilisant des early returns ou des guard clauses",
-            ),
-            (
-                r'password\s*=\s*["\'][^"\']+["\']',
-                "Mot de passe en dur",
-                "Utiliser des variables d'environnement ou un gestionnaire de secrets",
-            ),
-        ]
-
-        for pattern, description, suggestion in antipatterns:
-            if re.search(pattern, code_snippet):
-                prediction = Prediction(
-                    prediction_type="antipattern",
-                    confidence=0.9,
-                    description=description,
-                    suggested_action=suggestion,
-                    estimated_impact="Élevé",
-                    code_pattern=self._analyze_code_pattern(code_snippet),
-                )
-                predictions.append(prediction)
+        ruleset = RULES.ruleset(DANGEROUS_CALLS, HARDCODED_SECRETS, COMPLEXITY)
+        for rule in ruleset.matched_rules(code_snippet):
+            prediction = Prediction(
+                prediction_type="antipattern",
+                confidence=0.9,
+                description=rule.description,
+                suggested_action=rule.suggestion,
+                estimated_impact="Élevé",
+                code_pattern=self._analyze_code_pattern(code_snippet),
+            )
+            predictions.append(prediction)
 
         return predictions
 
@@ -671,14 +718,8 @@ class IntelligentMemory:
         return predictions
 
     def _calculate_code_similarity(self, code1: str, code2: str) -> float:
-        """Calculer la similarité entre deux codes"""
-        # Normaliser les codes
-        norm1 = self._normalize_code(code1)
-        norm2 = self._normalize_code(code2)
-
-        # Utiliser difflib pour calculer la similarité
-        similarity = difflib.SequenceMatcher(None, norm1, norm2).ratio()
-        return similarity
+        """Calculer la similarité (Jaccard sur shingles structurels)"""
+        return jaccard(code_shingles(code1), code_shingles(code2), SKETCH_SIZE)
 
     def _save_correction_suggestion(
         self,
@@ -688,28 +729,25 @@ class IntelligentMemory:
         success: bool,
     ):
         """Sauvegarder une suggestion de correction"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO correction_suggestions
-                (original_code, suggested_code, reason, confidence,
-                 based_on_corrections, created_at, applied, success)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    original_code,
-                    corrected_code,
-                    reason,
-                    0.8 if success else 0.3,
-                    json.dumps([]),
-                    # Pour l'instant, pas de corrections basées
-                    datetime.now().isoformat(),
-                    True,
-                    success,
-                ),
-            )
-            conn.commit()
+        self.store.insert(
+            """
+            INSERT INTO correction_suggestions
+            (original_code, suggested_code, reason, confidence,
+             based_on_corrections, created_at, applied, success)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                original_code,
+                corrected_code,
+                reason,
+                0.8 if success else 0.3,
+                json.dumps([]),
+                # Pour l'instant, pas de corrections basées
+                datetime.now().isoformat(),
+                True,
+                success,
+            ),
+        )
 
 
 def main():
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+💤 IMPORTS ET INSTANCES DIFFÉRÉS
+================================
+Outils pour ne payer l'import d'un module, ou la construction d'un objet
+coûteux, qu'au premier usage. Les commandes courtes (hooks, CLI) démarrent
+ainsi sans charger l'IA, la robotique ou les auditeurs dont elles n'ont pas
+besoin.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class LazyAttribute:
+    """Attribut (classe, fonction) d'un module importé au premier usage
+
+    Le proxy s'appelle et se parcourt comme l'objet réel ; ``resolve()``
+    renvoie l'objet lui-même (pour ``isinstance`` par exemple). L'attribut
+    est relu à chaque usage (une simple recherche une fois le module chargé),
+    ce qui suit les remplacements faits dans le module source.
+    """
+
+    def __init__(self, module: str, name: str):
+        self._module = module
+        self._name = name
+
+    def resolve(self) -> Any:
+        module = sys.modules.get(self._module)
+        if module is None:
+            module = importlib.import_module(self._module)
+        return getattr(module, self._name)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        state = "chargé" if self._module in sys.modules else "différé"
+        return f"<LazyAttribute {self._module}.{self._name} ({state})>"
+
+
+def lazy_attribute(module: str, name: str) -> LazyAttribute:
+    """Attribut ``name`` du module ``module``, importé au premier usage"""
+    return LazyAttribute(module, name)
+
+
+class LazyAvailability:
+    """Disponibilité d'un groupe d'attributs différés
+
+    Vaut True si tous les attributs s'importent ; la vérification (donc les
+    imports) n'a lieu qu'au premier test de vérité.
+    """
+
+    def __init__(self, *attributes: LazyAttribute, warning: str = ""):
+        self._attributes = attributes
+        self._warning = warning
+        self._available: bool | None = None
+
+    def __bool__(self) -> bool:
+        if self._available is None:
+            try:
+                for attribute in self._attributes:
+                    attribute.resolve()
+                self._available = True
+            except (ImportError, AttributeError):
+                self._available = False
+                if self._warning:
+                    logger.warning(self._warning)
+        return self._available
+
+    def __repr__(self) -> str:
+        state = "non vérifiée" if self._available is None else self._available
+        return f"<LazyAvailability {state}>"
+
+
+class LazyInstance:
+    """Objet construit au premier accès à l'un de ses attributs
+
+    Args:
+        factory: fonction sans argument construisant l'objet
+        name: nom affiché dans les messages
+        on_error: appelé avec l'exception si la construction échoue
+            (l'exception est ensuite relancée)
+
+    Le proxy est vrai si l'objet peut être construit : un module optionnel
+    en échec est ignoré par ``if module:``. Une construction échouée n'est
+    pas retentée, l'exception initiale est relancée à chaque accès.
+
+    La construction est protégée par un verrou : plusieurs étapes parallèles
+    peuvent utiliser le même proxy sans construire l'objet deux fois.
+    """
+
+    __slots__ = ("_factory", "_name", "_on_error", "_instance", "_error", "_lock")
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        name: str = "",
+        on_error: Callable[[str, Exception], None] | None = None,
+    ):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_on_error", on_error)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_error", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def resolve(self) -> Any:
+        """Objet réel (construit à la demande)"""
+        if self._instance is None:
+            with self._lock:
+                if self._error is not None:
+                    raise self._error
+                if self._instance is None:
+                    try:
+                        instance = self._factory()
+                    except Exception as e:
+                        object.__setattr__(self, "_error", e)
+                        if self._on_error is not None:
+                            self._on_error(self._name, e)
+                        raise
+                    object.__setattr__(self, "_instance", instance)
+        return self._instance
+
+    def __getattr__(self, attr: str):
+        return getattr(self.resolve(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self.resolve(), attr, value)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __bool__(self) -> bool:
+        try:
+            self.resolve()
+        except Exception:
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        state = "construit" if self.initialized else "différé"
+        return f"<LazyInstance {self._name} ({state})>"
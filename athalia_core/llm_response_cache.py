@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+🧠 CACHE PERSISTANT DES RÉPONSES IA
+===================================
+Cache SQLite des réponses des modèles IA, partagé entre processus. Une
+entrée est indexée par le modèle, le template de prompt normalisé (espaces
+réduits) et les paramètres du prompt : un même blueprint, une même revue ou
+une même documentation ne rappellent pas le modèle.
+
+Les entrées ont une durée de vie et sont évincées par ordre d'accès (LRU)
+au-delà des bornes. ``ATHALIA_LLM_CACHE=0`` désactive le cache. Les accès
+passent par le store SQLite partagé (connexions longues, mises à jour de
+la date d'accès groupées).
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .cache_manager import canonical_json
+from .sqlite_store import get_sqlite_store
+
+logger = logging.getLogger(__name__)
+
+# Version des clés : à incrémenter si la normalisation des prompts change
+KEY_VERSION = 1
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 20_000
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def llm_cache_enabled() -> bool:
+    """Cache actif sauf si ATHALIA_LLM_CACHE vaut 0/false/off"""
+    return os.environ.get("ATHALIA_LLM_CACHE", "1").lower() not in {
+        "0",
+        "false",
+        "off",
+        "no",
+    }
+
+
+def normalize_prompt(template: str) -> str:
+    """Template débarrassé des différences d'espacement"""
+    return _WHITESPACE.sub(" ", template).strip()
+
+
+class LLMResponseCache:
+    """Cache SQLite des réponses IA avec TTL et éviction LRU
+
+    Args:
+        db_path: chemin de la base SQLite
+        ttl: durée de vie par défaut des réponses en secondes
+        max_entries: nombre maximal de réponses conservées
+        max_bytes: taille cumulée maximale des réponses
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "saves": 0,
+            "evictions": 0,
+            "expired": 0,
+            "saved_seconds": 0.0,
+        }
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.store = get_sqlite_store(self.db_path)
+        self._init_database()
+
+    def _init_database(self):
+        with self.store.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    context TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    response_size INTEGER NOT NULL,
+                    latency REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_responses_access "
+                "ON llm_responses(last_access)"
+            )
+
+    def _count(self, name: str, value: float = 1):
+        with self._lock:
+            self.stats[name] += value
+
+    @staticmethod
+    def make_key(
+        model: str, context: str, template: str, params: dict[str, Any]
+    ) -> str:
+        """Clé d'une réponse : modèle, contexte, template normalisé, paramètres"""
+        payload = canonical_json(
+            {
+                "version": KEY_VERSION,
+                "model": model,
+                "context": context,
+                "template": normalize_prompt(template),
+                "params": params,
+            }
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Réponse en cache (None si absente ou expirée)"""
+        now = time.time()
+        try:
+            rows = self.store.query(
+                "SELECT response, latency, expires_at FROM llm_responses "
+                "WHERE key = ?",
+                (key,),
+            )
+            row = rows[0] if rows else None
+            if row is not None and row[2] <= now:
+                self.store.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._count("expired")
+                row = None
+            elif row is not None:
+                # Date d'accès écrite par lot (avant toute éviction)
+                self.store.insert(
+                    "UPDATE llm_responses SET last_access = ? WHERE key = ?",
+                    (now, key),
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Lecture du cache IA impossible: {e}")
+            row = None
+
+        if row is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        self._count("saved_seconds", row[1])
+        return row[0]
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        model: str = "",
+        context: str = "",
+        latency: float = 0.0,
+        ttl: float | None = None,
+    ) -> bool:
+        """Enregistrer une réponse (latency : durée de l'appel évité ensuite)"""
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        try:
+            with self.store.transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses "
+                    "(key, model, context, response, response_size, latency, "
+                    "created_at, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        model,
+                        context,
+                        response,
+                        len(response.encode("utf-8")),
+                        latency,
+                        now,
+                        expires_at,
+                        now,
+                    ),
+                )
+                self._evict(conn, now)
+        except Exception as e:
+            logger.warning(f"⚠️ Écriture du cache IA impossible: {e}")
+            return False
+        self._count("saves")
+        return True
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Purger les réponses expirées puis les moins récemment utilisées"""
+        expired = conn.execute(
+            "DELETE FROM llm_responses WHERE expires_at <= ?", (now,)
+        ).rowcount
+        if expired:
+            self._count("expired", expired)
+
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(response_size), 0) FROM llm_responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        removed = 0
+        rows = conn.execute(
+            "SELECT key, response_size FROM llm_responses ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            removed += 1
+        self._count("evictions", removed)
+        logger.debug(f"🧹 Cache IA: {removed} réponses évincées")
+
+    def clear(self):
+        """Vider le cache"""
+        self.store.execute("DELETE FROM llm_responses")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Statistiques du cache"""
+        count, total = self.store.query(
+            "SELECT COUNT(*), COALESCE(SUM(response_size), 0) FROM llm_responses"
+        )[0]
+        requests = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "saved_seconds": round(self.stats["saved_seconds"], 3),
+            "entries": count,
+            "size_bytes": total,
+            "hit_rate": round(self.stats["hits"] / max(requests, 1) * 100, 2),
+        }
+
+
+# Caches partagés, un par base
+_shared_caches: dict[Path, LLMResponseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_llm_response_cache(cache_dir: str | Path | None = None) -> LLMResponseCache:
+    """Retourne le cache partagé des réponses IA (.athalia_cache/llm_responses.db)"""
+    cache_dir = Path(cache_dir) if cache_dir else Path.cwd() / ".athalia_cache"
+    db_path = (cache_dir / "llm_responses.db").resolve()
+    with _shared_lock:
+        cache = _shared_caches.get(db_path)
+        if cache is None:
+            cache = LLMResponseCache(db_path)
+            _shared_caches[db_path] = cache
+        return cache
@@ -2,27 +2,313 @@
 """
 Système de logging avancé pour Athalia/Arkalia
 Logging intelligent avec rotation, compression et analyse automatique
+
+Par défaut l'écriture est asynchrone : l'appelant ne fait que déposer
+l'enregistrement dans une file, un thread d'écriture le met en forme et
+l'écrit par lots (une écriture et un flush par lot et par fichier). Les
+champs structurés peuvent aussi être écrits en JSON lines (``*.jsonl``) et
+les contenus volumineux tronqués ou remplacés par leur empreinte.
 """
 
+import atexit
 import gzip
+import hashlib
 import json
 import logging
 import logging.handlers
+import queue
 import shutil
 import threading
 import time
+import weakref
 from collections import defaultdict, deque
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from .rolling_metrics import RollingAggregator
+
+# Représentation des contenus (ancien/nouveau code) dans les logs structurés
+CONTENT_MODES = ("none", "hash", "truncate", "full")
+
+
+class _Deferred:
+    """Valeur calculée seulement à l'écriture (dans le thread d'écriture)"""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func: Callable[..., Any], *args):
+        self.func = func
+        self.args = args
+
+    def resolve(self) -> Any:
+        return self.func(*self.args)
+
+    def __str__(self) -> str:
+        return str(self.resolve())
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, _Deferred):
+        return value.resolve()
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+def summarize_content(content: str, mode: str = "hash", limit: int = 2048) -> Any:
+    """Représentation d'un contenu volumineux selon ``mode``
+
+    ``hash`` : taille et empreinte ; ``truncate`` : ``limit`` premiers
+    caractères (contenu plus long marqué) ; ``full`` : contenu entier.
+    """
+    if mode == "full":
+        return content
+    if mode == "truncate":
+        if len(content) <= limit:
+            return content
+        return f"{content[:limit]}…[+{len(content) - limit} caractères]"
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+    return {"size": len(content), "blake2b": digest}
+
+
+class TextFormatter(logging.Formatter):
+    """Format texte ; les champs marqués ``inline_fields`` sont ajoutés en JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        if getattr(record, "inline_fields", False) and record.fields:
+            text = f"{text} | {_dumps(record.fields)}"
+        return text
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Un objet JSON par enregistrement, champs structurés compris"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return _dumps(payload)
+
+
+class BatchedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Fichier avec rotation écrit par lots (un seul flush par lot)"""
+
+    def emit_batch(self, records: list[logging.LogRecord]):
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            for record in records:
+                try:
+                    text = self.format(record) + self.terminator
+                    if self.maxBytes > 0:
+                        size = self.stream.tell() + len(text.encode("utf-8"))
+                        if size >= self.maxBytes and self.stream.tell() > 0:
+                            self.doRollover()
+                    self.stream.write(text)
+                except Exception:
+                    self.handleError(record)
+            self.stream.flush()
+        finally:
+            self.release()
+
+
+class _RoutedQueueHandler(logging.handlers.QueueHandler):
+    """Dépose l'enregistrement dans la file du thread d'écriture
+
+    Aucune mise en forme côté appelant (même processus, pas de pickling) ;
+    si la file est pleine l'enregistrement est compté comme perdu, sauf les
+    erreurs qui attendent une place.
+    """
+
+    def __init__(self, writer: "AsyncLogWriter", handlers: list[logging.Handler]):
+        super().__init__(writer.queue)
+        self.writer = writer
+        self.targets = tuple(handlers)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        self.writer.submit(self.targets, record)
+
+
+class _FlushRequest:
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+# Écrivains vivants, vidés à la sortie du processus
+_live_writers: "weakref.WeakSet[AsyncLogWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_all_writers():
+    for writer in list(_live_writers):
+        writer.stop()
+
+
+class AsyncLogWriter:
+    """Thread d'écriture des logs par lots
+
+    Args:
+        batch_size: enregistrements écrits au plus par lot
+        flush_interval: attente maximale d'un enregistrement (secondes)
+        queue_size: taille de la file (au-delà, les logs non-erreurs sont perdus)
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        queue_size: int = 10_000,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.stats = {"written": 0, "batches": 0, "dropped": 0}
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        _live_writers.add(self)
+
+    def handler(self, handlers: list[logging.Handler]) -> logging.Handler:
+        """Handler de file routant vers ``handlers`` (écrits dans le thread)"""
+        return _RoutedQueueHandler(self, handlers)
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="athalia-log-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def submit(self, targets: tuple[logging.Handler, ...], record: logging.LogRecord):
+        self._ensure_started()
+        try:
+            if record.levelno >= logging.ERROR:
+                self.queue.put((targets, record), timeout=1.0)
+            else:
+                self.queue.put_nowait((targets, record))
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def _run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            flushes = []
+            stop = False
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _FlushRequest):
+                    flushes.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for request in flushes:
+                request.done.set()
+            if stop:
+                return
+
+    def _write(self, batch: list[tuple[tuple, logging.LogRecord]]):
+        if not batch:
+            return
+        routes: dict[tuple, list[logging.LogRecord]] = {}
+        for targets, record in batch:
+            routes.setdefault(targets, []).append(record)
+        for targets, records in routes.items():
+            for handler in targets:
+                selected = [r for r in records if r.levelno >= handler.level]
+                if not selected:
+                    continue
+                if isinstance(handler, BatchedRotatingFileHandler):
+                    handler.emit_batch(selected)
+                else:
+                    for record in selected:
+                        handler.handle(record)
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Attend l'écriture de tout ce qui a été déposé avant l'appel"""
+        if self._thread is None:
+            return True
+        request = _FlushRequest()
+        self.queue.put(request)
+        return request.done.wait(timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """Écrit les enregistrements en attente puis arrête le thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self.queue.put(_STOP)
+            thread.join(timeout)
 
-class AthaliaLogger:
-    """Système de logging avancé pour Athalia/Arkalia"""
 
-    def __init__(self, log_dir: str = "logs"):
+class AthaliaLogger:
+    """Système de logging avancé pour Athalia/Arkalia
+
+    Args:
+        log_dir: dossier des fichiers de log
+        async_mode: écriture différée dans un thread, par lots
+        json_lines: écrire aussi chaque canal en JSON lines (``<canal>.jsonl``)
+        content_mode: contenus de ``log_correction`` dans les champs
+            structurés (``none``, ``hash``, ``truncate``, ``full``)
+        max_content_chars: longueur conservée en mode ``truncate``
+        batch_size, flush_interval, queue_size: réglages du thread d'écriture
+    """
+
+    def __init__(
+        self,
+        log_dir: str = "logs",
+        async_mode: bool = True,
+        json_lines: bool = False,
+        content_mode: str = "none",
+        max_content_chars: int = 2048,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        queue_size: int = 10_000,
+    ):
+        if content_mode not in CONTENT_MODES:
+            raise ValueError(f"Mode de contenu inconnu: {content_mode}")
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
+        self.json_lines = json_lines
+        self.content_mode = content_mode
+        self.max_content_chars = max_content_chars
+        self.writer = (
+            AsyncLogWriter(batch_size, flush_interval, queue_size)
+            if async_mode
+            else None
+        )
 
         # Créer le dossier archive
         self.archive_dir = self.log_dir / "archive"
@@ -30,7 +316,13 @@ class AthaliaLogger:
 
         # Configuration des loggers
         self.loggers = {}
-        self.metrics = defaultdict(deque)
+        self.metrics = defaultdict(lambda: deque(maxlen=1000))
+        self.metrics["errors"] = deque(maxlen=100)
+        # Agrégats par minute pour les statistiques (requêtes en O(seaux))
+        self.aggregates = {
+            channel: RollingAggregator()
+            for channel in ("validation", "correction", "performance", "errors")
+        }
         self.performance_data = {}
 
         # Initialiser les loggers
@@ -78,36 +370,68 @@ class AthaliaLogger:
         if logger.handlers:
             return logger
 
-        # Handler pour fichier avec rotation
-        file_handler = logging.handlers.RotatingFileHandler(
-            log_file,
-            maxBytes=10 * 1024 * 1024,
-            backupCount=5,
-            encoding="utf-8",  # 10MB
-        )
+        # Handlers pour fichier avec rotation (10MB)
+        file_handlers = [
+            BatchedRotatingFileHandler(
+                log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
+            )
+        ]
 
         # Format personnalisé
-        formatter = logging.Formatter(
+        formatter = TextFormatter(
             "%(asctime)s | %(name)s | %(levelname)s | %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
         )
-        file_handler.setFormatter(formatter)
+        file_handlers[0].setFormatter(formatter)
+
+        if self.json_lines:
+            json_handler = BatchedRotatingFileHandler(
+                log_file.with_suffix(".jsonl"),
+                maxBytes=10 * 1024 * 1024,
+                backupCount=5,
+                encoding="utf-8",
+            )
+            json_handler.setFormatter(JsonLinesFormatter())
+            file_handlers.append(json_handler)
 
-        # Handler pour console (seulement pour les erreurs)
+        # Handler pour console (seulement pour les erreurs, immédiat)
         if name == "errors":
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.ERROR)
             console_handler.setFormatter(formatter)
             logger.addHandler(console_handler)
 
-        logger.addHandler(file_handler)
+        if self.writer is not None:
+            logger.addHandler(self.writer.handler(file_handlers))
+        else:
+            for handler in file_handlers:
+                logger.addHandler(handler)
         return logger
 
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Attend l'écriture des logs en attente (mode asynchrone)"""
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+
+    def close(self):
+        """Écrit les logs en attente et arrête le thread d'écriture"""
+        if self.writer is not None:
+            self.writer.stop()
+
+    def _content(self, content: str) -> Any:
+        """Contenu pour les champs structurés (calculé à l'écriture)"""
+        return _Deferred(
+            summarize_content, content, self.content_mode, self.max_content_chars
+        )
+
     def log_main(self, message: str, level: str = "INFO", **kwargs):
         """Log dans le logger principal"""
         logger = self.loggers["main"]
-        extra_data = f" | {json.dumps(kwargs)}" if kwargs else ""
-        getattr(logger, level.lower())(f"{message}{extra_data}")
+        # Sérialisation des champs faite par le thread d'écriture
+        getattr(logger, level.lower())(
+            "%s", message, extra={"fields": kwargs, "inline_fields": True}
+        )
 
     def log_validation(self, test_name: str, result: dict[str, Any], duration: float):
         """Log des résultats de validation"""
@@ -123,14 +447,22 @@ class AthaliaLogger:
                 "details": result,
             }
         )
-
-        # Garder seulement les 1000 dernières métriques
-        if len(self.metrics["validation"]) > 1000:
-            self.metrics["validation"].popleft()
+        self.aggregates["validation"].record(duration, result.get("success", False))
 
         logger.info(
-            f"VALIDATION | {test_name} | {result.get('succes', False)} |"
-            f" {duration:.2f}s | {result}"
+            "VALIDATION | %s | %s | %.2fs | %s",
+            test_name,
+            result.get("succes", False),
+            duration,
+            result,
+            extra={
+                "fields": {
+                    "test_name": test_name,
+                    "success": result.get("success", False),
+                    "duration": duration,
+                    "result": result,
+                }
+            },
         )
 
     def log_correction(
@@ -142,8 +474,14 @@ class AthaliaLogger:
         new_content: str,
         duration: float,
     ):
-        """Log des corrections automatiques"""
+        """Log des corrections automatiques
+
+        Les contenus ne sont jamais copiés ni analysés côté appelant : seuls
+        les champs structurés en JSON lines les reprennent, selon
+        ``content_mode``, au moment de l'écriture.
+        """
         logger = self.loggers["correction"]
+        changes = len(new_content) - len(old_content)
 
         # Métriques de correction
         self.metrics["correction"].append(
@@ -153,21 +491,38 @@ class AthaliaLogger:
                 "type": correction_type,
                 "success": success,
                 "duration": duration,
-                "changes": len(new_content) - len(old_content),
+                "changes": changes,
             }
         )
+        self.aggregates["correction"].record(duration, success, correction_type)
 
-        # Garder seulement les 1000 dernières métriques
-        if len(self.metrics["correction"]) > 1000:
-            self.metrics["correction"].popleft()
+        fields = {
+            "file_path": file_path,
+            "type": correction_type,
+            "success": success,
+            "duration": duration,
+            "changes": changes,
+        }
+        if self.json_lines and self.content_mode != "none":
+            fields["old_content"] = self._content(old_content)
+            fields["new_content"] = self._content(new_content)
 
         logger.info(
-            f"CORRECTION | {file_path} | {correction_type} | {success} |"
-            f" {duration:.2f}s"
+            "CORRECTION | %s | %s | %s | %.2fs",
+            file_path,
+            correction_type,
+            success,
+            duration,
+            extra={"fields": fields},
         )
 
         if not success:
-            logger.warning(f"CORRECTION_FAILED | {file_path} | {correction_type}")
+            logger.warning(
+                "CORRECTION_FAILED | %s | %s",
+                file_path,
+                correction_type,
+                extra={"fields": fields},
+            )
 
     def log_performance(
         self,
@@ -191,14 +546,15 @@ class AthaliaLogger:
         }
 
         self.metrics["performance"].append(perf_data)
-
-        # Garder seulement les 1000 dernières métriques
-        if len(self.metrics["performance"]) > 1000:
-            self.metrics["performance"].popleft()
+        self.aggregates["performance"].record(duration, key=operation)
 
         logger.info(
-            f"PERFORMANCE | {operation} | {duration:.2f}s | {memory_mb}MB |"
-            f" {cpu_percent}%"
+            "PERFORMANCE | %s | %.2fs | %sMB | %s%%",
+            operation,
+            duration,
+            memory_mb,
+            cpu_percent,
+            extra={"fields": perf_data},
         )
 
     def log_error(self, error: Exception, context: str = "", **kwargs):
@@ -214,140 +570,111 @@ class AthaliaLogger:
         }
 
         self.metrics["errors"].append(error_data)
-
-        # Garder seulement les 100 dernières erreurs
-        if len(self.metrics["errors"]) > 100:
-            self.metrics["errors"].popleft()
+        self.aggregates["errors"].record(key=error_data["error_type"])
 
         logger.error(
-            f"ERROR | {context} | {type(error).__name__} | {str(error)} | {kwargs}"
+            "ERROR | %s | %s | %s | %s",
+            context,
+            error_data["error_type"],
+            error_data["error_message"],
+            kwargs,
+            extra={"fields": error_data},
         )
 
-    def get_validation_stats(self, hours: int = 24) -> dict[str, Any]:
-        """Récupère les statistiques de validation"""
+    def _recent(self, channel: str, hours: float, limit: int = 10) -> list[dict]:
+        """Derniers événements de la fenêtre (lecture depuis la fin)"""
         cutoff = datetime.now() - timedelta(hours=hours)
+        recent = []
+        for entry in reversed(self.metrics[channel]):
+            if len(recent) >= limit:
+                break
+            if datetime.fromisoformat(entry["timestamp"]) <= cutoff:
+                break
+            recent.append(entry)
+        recent.reverse()
+        return recent
+
+    @staticmethod
+    def _duration_stats(summary: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "avg_duration": summary["avg"],
+            "min_duration": summary["min"],
+            "max_duration": summary["max"],
+            "p50_duration": summary["p50"],
+            "p95_duration": summary["p95"],
+            "p99_duration": summary["p99"],
+        }
 
-        recent_metrics = [
-            m
-            for m in self.metrics["validation"]
-            if datetime.fromisoformat(m["timestamp"]) > cutoff
-        ]
-
-        if not recent_metrics:
+    def get_validation_stats(self, hours: int = 24) -> dict[str, Any]:
+        """Récupère les statistiques de validation"""
+        summary = self.aggregates["validation"].summary(hours * 3600)
+        if not summary["count"]:
             return {"total": 0, "success_rate": 0, "avg_duration": 0}
 
-        total = len(recent_metrics)
-        success_count = sum(1 for m in recent_metrics if m["success"])
-        success_rate = (success_count / total) * 100
-        avg_duration = sum(m["duration"] for m in recent_metrics) / total
-
         return {
-            "total": total,
-            "success_rate": success_rate,
-            "avg_duration": avg_duration,
-            "recent_tests": recent_metrics[-10:],  # 10 derniers tests
+            "total": summary["count"],
+            "success_rate": summary["success_rate"],
+            **self._duration_stats(summary),
+            "recent_tests": self._recent("validation", hours),  # 10 derniers
         }
 
     def get_correction_stats(self, hours: int = 24) -> dict[str, Any]:
         """Récupère les statistiques de correction"""
-        cutoff = datetime.now() - timedelta(hours=hours)
-
-        recent_metrics = [
-            m
-            for m in self.metrics["correction"]
-            if datetime.fromisoformat(m["timestamp"]) > cutoff
-        ]
-
-        if not recent_metrics:
+        summary = self.aggregates["correction"].summary(hours * 3600)
+        if not summary["count"]:
             return {"total": 0, "success_rate": 0, "avg_duration": 0}
 
-        total = len(recent_metrics)
-        success_count = sum(1 for m in recent_metrics if m["success"])
-        success_rate = (success_count / total) * 100
-        avg_duration = sum(m["duration"] for m in recent_metrics) / total
-
         # Statistiques par type de correction
-        correction_types = defaultdict(list)
-        for m in recent_metrics:
-            correction_types[m["type"]].append(m)
-
-        type_stats = {}
-        for corr_type, metrics in correction_types.items():
-            type_success = sum(1 for m in metrics if m["success"])
-            type_stats[corr_type] = {
-                "count": len(metrics),
-                "success_rate": (type_success / len(metrics)) * 100,
-            }
+        type_stats = {
+            corr_type: {"count": stats["count"], "success_rate": stats["success_rate"]}
+            for corr_type, stats in summary["by_key"].items()
+        }
 
         return {
-            "total": total,
-            "success_rate": success_rate,
-            "avg_duration": avg_duration,
+            "total": summary["count"],
+            "success_rate": summary["success_rate"],
+            **self._duration_stats(summary),
             "type_stats": type_stats,
             # 10 dernières corrections
-            "recent_corrections": recent_metrics[-10:],
+            "recent_corrections": self._recent("correction", hours),
         }
 
     def get_performance_stats(self, hours: int = 24) -> dict[str, Any]:
         """Récupère les statistiques de performance"""
-        cutoff = datetime.now() - timedelta(hours=hours)
-
-        recent_metrics = [
-            m
-            for m in self.metrics["performance"]
-            if datetime.fromisoformat(m["timestamp"]) > cutoff
-        ]
-
-        if not recent_metrics:
+        summary = self.aggregates["performance"].summary(hours * 3600)
+        if not summary["count"]:
             return {"total": 0, "avg_duration": 0}
 
         # Statistiques par opération
-        operations = defaultdict(list)
-        for m in recent_metrics:
-            operations[m["operation"]].append(m)
-
-        op_stats = {}
-        for op, metrics in operations.items():
-            durations = [m["duration"] for m in metrics]
-            op_stats[op] = {
-                "count": len(metrics),
-                "avg_duration": sum(durations) / len(durations),
-                "min_duration": min(durations),
-                "max_duration": max(durations),
+        op_stats = {
+            op: {
+                "count": stats["count"],
+                "avg_duration": stats["avg"],
+                "min_duration": stats["min"],
+                "max_duration": stats["max"],
             }
-
-        all_durations = [m["duration"] for m in recent_metrics]
+            for op, stats in summary["by_key"].items()
+        }
 
         return {
-            "total": len(recent_metrics),
-            "avg_duration": sum(all_durations) / len(all_durations),
-            "min_duration": min(all_durations),
-            "max_duration": max(all_durations),
+            "total": summary["count"],
+            **self._duration_stats(summary),
             "operation_stats": op_stats,
         }
 
     def get_error_stats(self, hours: int = 24) -> dict[str, Any]:
         """Récupère les statistiques d'erreurs"""
-        cutoff = datetime.now() - timedelta(hours=hours)
-
-        recent_errors = [
-            m
-            for m in self.metrics["errors"]
-            if datetime.fromisoformat(m["timestamp"]) > cutoff
-        ]
-
-        if not recent_errors:
+        summary = self.aggregates["errors"].summary(hours * 3600)
+        if not summary["count"]:
             return {"total": 0, "error_types": {}}
 
-        # Statistiques par type d'erreur
-        error_types = defaultdict(int)
-        for error in recent_errors:
-            error_types[error["error_type"]] += 1
-
         return {
-            "total": len(recent_errors),
-            "error_types": dict(error_types),
-            "recent_errors": recent_errors[-10:],  # 10 dernières erreurs
+            "total": summary["count"],
+            "error_types": {
+                error_type: stats["count"]
+                for error_type, stats in summary["by_key"].items()
+            },
+            "recent_errors": self._recent("errors", hours),  # 10 dernières
         }
 
     def _cleanup_worker(self):
@@ -479,3 +806,8 @@ def log_performance(
 def log_error(error: Exception, context: str = "", **kwargs):
     """Log des erreurs"""
     athalia_logger.log_error(error, context, **kwargs)
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """Attend l'écriture des logs en attente"""
+    return athalia_logger.flush(timeout)
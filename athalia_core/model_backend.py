@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+🔌 BACKENDS DES MODÈLES IA
+==========================
+Accès aux modèles locaux par l'API HTTP d'Ollama plutôt que par un processus
+``ollama run`` par requête : connexions persistantes et mutualisées, modèle
+gardé en mémoire côté serveur (``keep_alive``), prompt envoyé dans le corps
+de la requête (et non en argument de ligne de commande).
+
+Les réponses peuvent être lues au fil des tokens (``stream``), avec un délai
+maximal par requête et une annulation par ``threading.Event``.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+
+
+class ModelBackendError(Exception):
+    """Erreur d'appel d'un modèle (serveur absent, réponse invalide...)"""
+
+
+class ModelTimeoutError(ModelBackendError):
+    """Délai de la requête dépassé"""
+
+
+class GenerationCancelled(ModelBackendError):
+    """Génération interrompue à la demande de l'appelant"""
+
+
+class ModelBackend(ABC):
+    """Interface commune des backends de modèles"""
+
+    @abstractmethod
+    def stream(
+        self,
+        model: str,
+        prompt: str,
+        timeout: float | None = None,
+        cancel: threading.Event | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> Iterator[str]:
+        """Tokens de la réponse, au fur et à mesure de leur génération"""
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        timeout: float | None = None,
+        cancel: threading.Event | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> str:
+        """Réponse complète"""
+        return "".join(self.stream(model, prompt, timeout, cancel, options))
+
+    def list_models(self) -> list[str]:
+        """Noms des modèles disponibles"""
+        return []
+
+    def close(self) -> None:
+        """Libère les ressources (connexions) ; rien à libérer par défaut"""
+        return None
+
+
+class OllamaHTTPBackend(ModelBackend):
+    """Client HTTP de l'API Ollama avec pool de connexions keep-alive
+
+    Args:
+        base_url: adresse du serveur (par défaut ``OLLAMA_HOST`` ou localhost)
+        pool_size: connexions gardées ouvertes vers le serveur
+        timeout: délai maximal par défaut d'une requête (secondes)
+        connect_timeout: délai d'établissement de la connexion
+        keep_alive: durée de maintien du modèle en mémoire côté serveur
+        models_ttl: durée de mémorisation de la liste des modèles (y compris
+            d'un serveur absent)
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        pool_size: int = 8,
+        timeout: float = 30.0,
+        connect_timeout: float = 2.0,
+        keep_alive: str = "5m",
+        models_ttl: float = 30.0,
+    ):
+        base_url = base_url or os.environ.get("OLLAMA_HOST") or DEFAULT_OLLAMA_URL
+        if "://" not in base_url:
+            base_url = f"http://{base_url}"
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.keep_alive = keep_alive
+        self.models_ttl = models_ttl
+        self._models: tuple[float, list[str] | ModelBackendError] | None = None
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Session HTTP partagée (créée au premier appel)"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=self.pool_size, max_retries=0
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def _timeouts(self, deadline: float) -> tuple[float, float]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ModelTimeoutError("Délai de génération dépassé")
+        return min(self.connect_timeout, remaining), remaining
+
+    def stream(
+        self,
+        model: str,
+        prompt: str,
+        timeout: float | None = None,
+        cancel: threading.Event | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> Iterator[str]:
+        """Tokens de la réponse d'Ollama (``/api/generate`` en streaming)
+
+        Le délai porte sur la requête entière ; l'annulation est vérifiée à
+        chaque token reçu.
+        """
+        import requests
+
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        payload: dict[str, Any] = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+        }
+        if options:
+            payload["options"] = options
+
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                stream=True,
+                timeout=self._timeouts(deadline),
+            )
+        except requests.Timeout as e:
+            raise ModelTimeoutError(f"Ollama {model}: {e}") from e
+        except requests.RequestException as e:
+            raise ModelBackendError(f"Ollama {model} injoignable: {e}") from e
+
+        with response:
+            if response.status_code != 200:
+                raise ModelBackendError(
+                    f"Ollama {model}: HTTP {response.status_code} "
+                    f"{response.text[:200]}"
+                )
+            try:
+                for line in response.iter_lines():
+                    if cancel is not None and cancel.is_set():
+                        raise GenerationCancelled(f"Génération {model} annulée")
+                    if time.monotonic() > deadline:
+                        raise ModelTimeoutError(f"Ollama {model}: délai dépassé")
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise ModelBackendError(f"Ollama {model}: {chunk['error']}")
+                    token = chunk.get("response", "")
+                    if token:
+                        yield token
+                # Réponse lue jusqu'au bout : la connexion retourne au pool
+            except requests.Timeout as e:
+                raise ModelTimeoutError(f"Ollama {model}: {e}") from e
+            except (requests.RequestException, ValueError) as e:
+                raise ModelBackendError(f"Ollama {model}: {e}") from e
+
+    def list_models(self) -> list[str]:
+        """Modèles installés (``/api/tags``), mémorisés ``models_ttl`` secondes"""
+        import requests
+
+        cached = self._models
+        if cached is not None and time.monotonic() - cached[0] < self.models_ttl:
+            if isinstance(cached[1], ModelBackendError):
+                raise cached[1]
+            return list(cached[1])
+
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/tags",
+                timeout=(self.connect_timeout, self.timeout),
+            )
+            response.raise_for_status()
+            models = [model["name"] for model in response.json().get("models", [])]
+        except (requests.RequestException, ValueError, KeyError) as e:
+            error = ModelBackendError(f"Liste des modèles Ollama indisponible: {e}")
+            self._models = (time.monotonic(), error)
+            raise error from e
+        self._models = (time.monotonic(), models)
+        return list(models)
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+# Backends partagés, un par serveur
+_shared_backends: dict[str, OllamaHTTPBackend] = {}
+_shared_lock = threading.Lock()
+
+
+def get_ollama_backend(base_url: str | None = None) -> OllamaHTTPBackend:
+    """Retourne le backend Ollama partagé (une session par serveur)"""
+    key = base_url or os.environ.get("OLLAMA_HOST") or DEFAULT_OLLAMA_URL
+    with _shared_lock:
+        backend = _shared_backends.get(key)
+        if backend is None:
+            backend = OllamaHTTPBackend(base_url)
+            _shared_backends[key] = backend
+        return backend
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+🏁 RÉPARTITION DES REQUÊTES ENTRE MODÈLES IA
+===========================================
+Au lieu d'essayer les modèles l'un après l'autre (chacun pouvant attendre
+jusqu'à son délai maximal), le répartiteur lance les appels en concurrence :
+
+- ``sequential`` : un modèle à la fois, le suivant seulement après un échec
+- ``hedged`` : le modèle suivant démarre si le précédent n'a pas répondu
+  dans un délai dérivé de son p95 de latence observé
+- ``first_success`` : tous les modèles en parallèle, la première réponse gagne
+- ``gather`` : toutes les réponses (pour la distillation)
+
+Chaque modèle a un disjoncteur alimenté par les latences et les erreurs
+observées : un modèle en panne ou trop lent est écarté pendant un délai de
+refroidissement, puis réessayé par une requête sonde.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("sequential", "hedged", "first_success", "gather")
+
+
+def _model_name(model: Any) -> str:
+    return str(getattr(model, "value", model))
+
+
+class CircuitBreaker:
+    """Disjoncteur d'un modèle (fermé, ouvert, semi-ouvert)
+
+    Args:
+        name: nom du modèle
+        window: nombre d'appels récents pris en compte
+        failure_rate: taux d'échec (appels lents compris) ouvrant le circuit
+        min_calls: appels minimum avant de pouvoir ouvrir le circuit
+        cooldown: durée d'ouverture avant une requête sonde (secondes)
+        slow_call: latence au-delà de laquelle un appel compte comme un échec
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        failure_rate: float = 0.5,
+        min_calls: int = 4,
+        cooldown: float = 30.0,
+        slow_call: float | None = None,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.slow_call = slow_call
+        self.state = self.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Le modèle peut-il être appelé maintenant ?"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record(self, success: bool, latency: float | None = None):
+        """Enregistrer le résultat d'un appel"""
+        with self._lock:
+            if latency is not None:
+                self._latencies.append(latency)
+                if self.slow_call is not None and latency > self.slow_call:
+                    success = False
+
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                if success:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        logger.warning(f"⚡ Circuit ouvert pour le modèle {self.name}")
+
+    @property
+    def samples(self) -> int:
+        """Nombre de latences mesurées"""
+        return len(self._latencies)
+
+    def latency_percentile(self, percentile: float = 95) -> float | None:
+        """Percentile des latences récentes (None sans mesure)"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        rank = max(math.ceil(percentile / 100 * len(latencies)) - 1, 0)
+        return latencies[rank]
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            outcomes = list(self._outcomes)
+            state = self.state
+        return {
+            "state": state,
+            "calls": len(outcomes),
+            "error_rate": round(outcomes.count(False) / max(len(outcomes), 1), 3),
+            "p95": self.latency_percentile(95),
+        }
+
+
+class CircuitBreakerRegistry:
+    """Disjoncteurs par modèle, créés à la demande"""
+
+    def __init__(self, **breaker_options):
+        self._options = breaker_options
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: Any) -> CircuitBreaker:
+        name = _model_name(model)
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **self._options)
+                self._breakers[name] = breaker
+            return breaker
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.snapshot() for name, breaker in breakers.items()}
+
+
+@dataclass
+class DispatchResult:
+    """Résultat d'une répartition
+
+    ``model``/``result`` : réponse retenue (None si aucun modèle n'a répondu) ;
+    ``results`` : toutes les réponses obtenues, par ordre d'arrivée ;
+    ``started`` : modèles effectivement appelés ; ``skipped`` : modèles écartés
+    par leur disjoncteur.
+    """
+
+    model: Any = None
+    result: Any = None
+    results: list[tuple[Any, Any]] = field(default_factory=list)
+    started: list[Any] = field(default_factory=list)
+    skipped: list[Any] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.model is not None
+
+
+class ModelDispatcher:
+    """Répartiteur asynchrone des appels de modèles
+
+    Args:
+        strategy: stratégie par défaut (voir ``STRATEGIES``)
+        hedge_delay: délai avant relance tant qu'un modèle n'a pas de mesures
+        hedge_percentile: percentile de latence servant de délai de relance
+        min_hedge_delay: délai de relance minimal
+        min_samples: mesures nécessaires avant d'utiliser le percentile
+        breakers: disjoncteurs (par défaut ceux partagés par le processus)
+        max_workers: appels simultanés (les appels de modèles sont bloquants)
+    """
+
+    def __init__(
+        self,
+        strategy: str = "hedged",
+        hedge_delay: float = 8.0,
+        hedge_percentile: float = 95,
+        min_hedge_delay: float = 0.05,
+        min_samples: int = 5,
+        breakers: CircuitBreakerRegistry | None = None,
+        max_workers: int = 8,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Stratégie inconnue: {strategy}")
+        self.strategy = strategy
+        self.hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.breakers = breakers if breakers is not None else _shared_breakers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="athalia-model"
+        )
+
+    def hedge_delay_for(self, model: Any) -> float:
+        """Délai avant de relancer sur le modèle suivant"""
+        breaker = self.breakers.get(model)
+        if breaker.samples < self.min_samples:
+            return self.hedge_delay
+        delay = breaker.latency_percentile(self.hedge_percentile)
+        return max(delay, self.min_hedge_delay)
+
+    def _call(
+        self,
+        model: Any,
+        call: Callable[[Any], Any],
+        accept: Callable[[Any], bool],
+    ) -> tuple[bool, Any]:
+        """Appel bloquant instrumenté (exécuté dans le pool de threads)
+
+        Le disjoncteur est alimenté même si plus personne n'attend l'appel
+        (perdant d'une course) : sa latence reste une mesure utile.
+        """
+        breaker = self.breakers.get(model)
+        started = time.perf_counter()
+        try:
+            result = call(model)
+        except Exception as e:
+            logger.warning(f"Modèle {_model_name(model)} échoué: {e}")
+            breaker.record(False, time.perf_counter() - started)
+            return False, None
+        ok = accept(result)
+        breaker.record(ok, time.perf_counter() - started)
+        return ok, result
+
+    async def dispatch_async(
+        self,
+        models: Sequence[Any],
+        call: Callable[[Any], Any],
+        strategy: str | None = None,
+        accept: Callable[[Any], bool] = bool,
+        timeout: float | None = None,
+    ) -> DispatchResult:
+        """Répartir un appel entre ``models`` (par ordre de préférence)
+
+        Args:
+            call: fonction bloquante ``call(model) -> résultat``
+            accept: le résultat est-il une réponse valable ?
+            timeout: délai maximal de la répartition entière
+        """
+        strategy = strategy or self.strategy
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Stratégie inconnue: {strategy}")
+
+        loop = asyncio.get_running_loop()
+        outcome = DispatchResult()
+        started_at = time.perf_counter()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        queue = list(models)
+        running: dict[asyncio.Future, Any] = {}
+
+        def launch_next() -> bool:
+            while queue:
+                model = queue.pop(0)
+                if not self.breakers.get(model).allow():
+                    outcome.skipped.append(model)
+                    continue
+                future = loop.run_in_executor(
+                    self._executor, self._call, model, call, accept
+                )
+                running[future] = model
+                outcome.started.append(model)
+                return True
+            return False
+
+        def remaining() -> float | None:
+            return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        parallel = strategy in ("first_success", "gather")
+        launch_next()
+        while parallel and launch_next():
+            pass
+
+        while running:
+            wait_for = remaining()
+            if strategy == "hedged" and queue:
+                hedge = self.hedge_delay_for(outcome.started[-1])
+                wait_for = hedge if wait_for is None else min(wait_for, hedge)
+            done, _ = await asyncio.wait(
+                running, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            failures = 0
+            for future in done:
+                model = running.pop(future)
+                ok, result = future.result()
+                if not ok:
+                    failures += 1
+                    continue
+                outcome.results.append((model, result))
+                if outcome.model is None:
+                    outcome.model, outcome.result = model, result
+                if strategy != "gather":
+                    running.clear()
+                    break
+
+            if outcome.model is not None and strategy != "gather":
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            # Relance : un modèle par échec, ou délai de couverture écoulé
+            if not parallel:
+                for _ in range(failures if done else 1):
+                    launch_next()
+
+        # Les appels abandonnés se terminent en arrière-plan (délai du backend)
+        outcome.duration = time.perf_counter() - started_at
+        return outcome
+
+    def dispatch(
+        self,
+        models: Sequence[Any],
+        call: Callable[[Any], Any],
+        strategy: str | None = None,
+        accept: Callable[[Any], bool] = bool,
+        timeout: float | None = None,
+    ) -> DispatchResult:
+        """Version synchrone de ``dispatch_async``"""
+        coroutine = self.dispatch_async(models, call, strategy, accept, timeout)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # Appel depuis une boucle en cours : exécuter dans un thread dédié
+        with ThreadPoolExecutor(max_workers=1) as runner:
+            return runner.submit(asyncio.run, coroutine).result()
+
+
+# Disjoncteurs partagés par tous les répartiteurs du processus
+_shared_breakers = CircuitBreakerRegistry()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Retourne les disjoncteurs partagés du processus"""
+    return _shared_breakers
+
+
+_shared_dispatcher: ModelDispatcher | None = None
+_shared_dispatcher_lock = threading.Lock()
+
+
+def get_model_dispatcher() -> ModelDispatcher:
+    """Retourne le répartiteur partagé du processus (pool de threads commun)"""
+    global _shared_dispatcher
+    with _shared_dispatcher_lock:
+        if _shared_dispatcher is None:
+            _shared_dispatcher = ModelDispatcher()
+        return _shared_dispatcher
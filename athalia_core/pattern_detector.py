@@ -6,16 +6,19 @@ Module spécialisé dans la détection de patterns de code,
 doublons et anti-patterns. Utilise l'analyseur AST de base.
 """
 
-import difflib
 import json
 import logging
-import sqlite3
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from .ast_analyzer import ASTAnalyzer, FileAnalysis
+from .analysis_engine import ProjectAnalysisEngine
+from .ast_analyzer import ASTAnalyzer, ASTNodeInfo, FileAnalysis
+from .duplicate_index import DuplicateIndex
+from .fingerprints import SKETCH_SIZE, code_shingles, jaccard
+from .sqlite_store import get_sqlite_store
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,8 @@ class CodePattern:
     complexity: int  # Complexité du pattern
     last_seen: datetime
     correction_history: list[str] = None
+    fingerprint: str = None  # Empreinte structurelle (doublons exacts)
+    shingles: frozenset[int] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -61,18 +66,31 @@ class AntiPattern:
 class PatternDetector:
     """Détecteur de patterns et doublons"""
 
-    def __init__(self, root_path: str = None):
+    def __init__(
+        self,
+        root_path: str = None,
+        ast_analyzer: ASTAnalyzer = None,
+        analysis_engine: ProjectAnalysisEngine = None,
+        similarity_threshold: float = 0.7,
+    ):
         self.root_path = Path(root_path or Path.cwd())
         self.db_path = self.root_path / "data" / "pattern_analysis.db"
 
+        # Similarité minimale (Jaccard sur shingles) entre quasi-doublons
+        self.similarity_threshold = similarity_threshold
+
         # Créer les dossiers nécessaires
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialiser la base de données
+        # Initialiser la base de données (connexions partagées, écritures groupées)
+        self.store = get_sqlite_store(self.db_path)
         self._init_database()
 
-        # Analyseur AST
-        self.ast_analyzer = ASTAnalyzer()
+        # Analyseur AST (partagé avec les autres analyseurs si fourni)
+        self.ast_analyzer = ast_analyzer or ASTAnalyzer()
+        self.analysis_engine = analysis_engine or ProjectAnalysisEngine(
+            self.ast_analyzer
+        )
 
         # Cache pour les analyses
         self._pattern_cache = {}
@@ -86,7 +104,7 @@ class PatternDetector:
 
     def _init_database(self):
         """Initialiser la base de données"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.transaction() as conn:
             cursor = conn.cursor()
 
             # Table des patterns de code
@@ -142,11 +160,9 @@ class PatternDetector:
             """
             )
 
-            conn.commit()
-
     def _load_patterns(self):
         """Charger les patterns depuis la base de données"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.reading() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM code_patterns")
             rows = cursor.fetchall()
@@ -163,8 +179,18 @@ class PatternDetector:
                 )
                 self._pattern_cache[pattern.signature] = pattern
 
-    def analyze_project_patterns(self, project_path: str = None) -> dict[str, Any]:
-        """Analyser les patterns d'un projet complet"""
+    def analyze_project_patterns(
+        self,
+        project_path: str = None,
+        file_analyses: Iterable[FileAnalysis] = None,
+    ) -> dict[str, Any]:
+        """Analyser les patterns d'un projet complet
+
+        Args:
+            project_path: projet à analyser
+            file_analyses: analyses AST déjà disponibles pour le projet, à
+                utiliser au lieu de (ré)analyser ses fichiers
+        """
         project_path = Path(project_path or self.root_path)
         logger.info(f"🔍 Analyse des patterns du projet: {project_path.name}")
 
@@ -174,24 +200,22 @@ class PatternDetector:
         ]
         logger.info(f"📁 {len(python_files)} fichiers Python trouvés")
 
-        # Limiter le nombre de fichiers pour les tests
-        if len(python_files) > 50:
-            python_files = python_files[:50]
-            logger.info("📁 Limitation à 50 fichiers pour les performances")
-
-        # Analyser chaque fichier
+        # Analyser chaque fichier (en parallèle, résultats au fil de l'eau)
         all_patterns = []
         all_duplicates = []
         all_antipatterns = []
 
-        for py_file in python_files:
+        if file_analyses is None:
+            file_analyses = self.analysis_engine.iter_analyses(python_files)
+
+        for file_analysis in file_analyses:
             try:
-                file_analysis = self.ast_analyzer.analyze_file(py_file)
-                if file_analysis:
-                    file_patterns = self._extract_patterns_from_file(file_analysis)
-                    all_patterns.extend(file_patterns)
+                file_patterns = self._extract_patterns_from_file(file_analysis)
+                all_patterns.extend(file_patterns)
             except Exception as e:
-                logger.warning(f"Erreur lors de l'analyse de {py_file}: {e}")
+                logger.warning(
+                    f"Erreur lors de l'analyse de {file_analysis.file_path}: {e}"
+                )
 
         # Détecter les doublons
         duplicates = self._detect_duplicates(all_patterns)
@@ -228,66 +252,64 @@ class PatternDetector:
         """Extraire les patterns d'un fichier analysé"""
         patterns = []
 
-        # Patterns de fonctions
-        for func in file_analysis.functions:
-            pattern = CodePattern(
-                pattern_type="function",
-                signature=func.signature,
-                locations=[str(file_analysis.file_path)],
-                similarity_score=1.0,
-                complexity=func.complexity,
-                last_seen=file_analysis.last_modified,
-                correction_history=[],
-            )
-            patterns.append(pattern)
-
-        # Patterns de classes
-        for cls in file_analysis.classes:
-            pattern = CodePattern(
-                pattern_type="class",
-                signature=cls.signature,
-                locations=[str(file_analysis.file_path)],
-                similarity_score=1.0,
-                complexity=cls.complexity,
-                last_seen=file_analysis.last_modified,
-                correction_history=[],
-            )
-            patterns.append(pattern)
-
-        # Patterns de conditions
-        for cond in file_analysis.conditionals:
-            pattern = CodePattern(
-                pattern_type="conditional",
-                signature=cond.signature,
-                locations=[str(file_analysis.file_path)],
-                similarity_score=1.0,
-                complexity=cond.complexity,
-                last_seen=file_analysis.last_modified,
-                correction_history=[],
-            )
-            patterns.append(pattern)
-
-        # Patterns de boucles
-        for loop in file_analysis.loops:
-            pattern = CodePattern(
-                pattern_type="loop",
-                signature=loop.signature,
-                locations=[str(file_analysis.file_path)],
-                similarity_score=1.0,
-                complexity=loop.complexity,
-                last_seen=file_analysis.last_modified,
-                correction_history=[],
-            )
-            patterns.append(pattern)
+        for pattern_type, nodes in (
+            ("function", file_analysis.functions),
+            ("class", file_analysis.classes),
+            ("conditional", file_analysis.conditionals),
+            ("loop", file_analysis.loops),
+        ):
+            for node in nodes:
+                patterns.append(
+                    self._create_pattern(pattern_type, node, file_analysis)
+                )
 
         return patterns
 
+    def _create_pattern(
+        self, pattern_type: str, node: ASTNodeInfo, file_analysis: FileAnalysis
+    ) -> CodePattern:
+        """Créer un pattern et son empreinte à partir d'un nœud AST"""
+        return CodePattern(
+            pattern_type=pattern_type,
+            signature=node.signature,
+            locations=[str(file_analysis.file_path)],
+            similarity_score=1.0,
+            complexity=node.complexity,
+            last_seen=file_analysis.last_modified,
+            correction_history=[],
+            fingerprint=node.fingerprint or None,
+            shingles=frozenset(node.shingles) if node.shingles else None,
+        )
+
+    def _pattern_shingles(self, pattern: CodePattern) -> frozenset[int]:
+        """Shingles d'un pattern (de sa signature à défaut de son code)"""
+        if pattern.shingles is None:
+            pattern.shingles = code_shingles(pattern.signature)
+        return pattern.shingles
+
+    def _build_duplicate_index(
+        self, patterns: list[CodePattern], threshold: float
+    ) -> DuplicateIndex:
+        """Indexer des patterns pour la recherche de doublons"""
+        index = DuplicateIndex(threshold)
+        for position, pattern in enumerate(patterns):
+            index.add(
+                position,
+                pattern.fingerprint or pattern.signature,
+                self._pattern_shingles(pattern),
+            )
+        return index
+
     def _detect_duplicates(
-        self, patterns: list[CodePattern]
+        self, patterns: list[CodePattern], threshold: float = None
     ) -> list[DuplicateAnalysis]:
-        """Détecter les doublons parmi les patterns"""
+        """Détecter les doublons parmi les patterns
+
+        Regroupement exact par empreinte structurelle, puis MinHash/LSH pour
+        les quasi-doublons : le coût est quasi linéaire en nombre de patterns.
+        """
+        threshold = self.similarity_threshold if threshold is None else threshold
         duplicates = []
-        processed = set()
 
         # Grouper les patterns par type pour une comparaison plus efficace
         patterns_by_type = {}
@@ -298,63 +320,52 @@ class PatternDetector:
 
         # Détecter les doublons par type
         for _pattern_type, type_patterns in patterns_by_type.items():
-            for i, pattern1 in enumerate(type_patterns):
-                if pattern1.signature in processed:
-                    continue
-
-                similar_patterns = [pattern1]
-
-                for _j, pattern2 in enumerate(type_patterns[i + 1 :], i + 1):
-                    if pattern2.signature in processed:
-                        continue
-
-                    similarity = self._calculate_similarity(pattern1, pattern2)
-                    if similarity > 0.7:  # Seuil de similarité plus bas
-                        similar_patterns.append(pattern2)
-                        processed.add(pattern2.signature)
-
-                if len(similar_patterns) > 1:
-                    processed.add(pattern1.signature)
-
-                    # Calculer la sévérité
-                    severity = "low"
-                    if len(similar_patterns) > 3:
-                        severity = "high"
-                    elif len(similar_patterns) > 2:
-                        severity = "medium"
-
-                    # Calculer l'effort estimé
-                    effort = "low"
-                    if pattern1.complexity > 10:
-                        effort = "high"
-                    elif pattern1.complexity > 5:
-                        effort = "medium"
-
-                    duplicate = DuplicateAnalysis(
-                        duplicate_type=pattern1.pattern_type,
-                        items=[p.signature for p in similar_patterns],
-                        locations=list(
-                            {loc for p in similar_patterns for loc in p.locations}
-                        ),
-                        severity=severity,
-                        similarity_score=similarity,
-                        suggested_action=(
-                            "merge" if severity in ["medium", "high"] else "review"
-                        ),
-                        estimated_effort=effort,
-                    )
-                    duplicates.append(duplicate)
+            index = self._build_duplicate_index(type_patterns, threshold)
+
+            for positions, similarity in index.clusters():
+                similar_patterns = [type_patterns[p] for p in positions]
+                pattern1 = similar_patterns[0]
+
+                # Calculer la sévérité
+                severity = "low"
+                if len(similar_patterns) > 3:
+                    severity = "high"
+                elif len(similar_patterns) > 2:
+                    severity = "medium"
+
+                # Calculer l'effort estimé
+                effort = "low"
+                if pattern1.complexity > 10:
+                    effort = "high"
+                elif pattern1.complexity > 5:
+                    effort = "medium"
+
+                duplicate = DuplicateAnalysis(
+                    duplicate_type=pattern1.pattern_type,
+                    items=[p.signature for p in similar_patterns],
+                    locations=list(
+                        {loc for p in similar_patterns for loc in p.locations}
+                    ),
+                    severity=severity,
+                    similarity_score=similarity,
+                    suggested_action=(
+                        "merge" if severity in ["medium", "high"] else "review"
+                    ),
+                    estimated_effort=effort,
+                )
+                duplicates.append(duplicate)
 
         return duplicates
 
     def _calculate_similarity(
         self, pattern1: CodePattern, pattern2: CodePattern
     ) -> float:
-        """Calculer la similarité entre deux patterns"""
-        # Comparer les signatures
-        return difflib.SequenceMatcher(
-            None, pattern1.signature, pattern2.signature
-        ).ratio()
+        """Calculer la similarité (Jaccard sur shingles) entre deux patterns"""
+        return jaccard(
+            self._pattern_shingles(pattern1),
+            self._pattern_shingles(pattern2),
+            SKETCH_SIZE,
+        )
 
     def _detect_antipatterns(self, patterns: list[CodePattern]) -> list[AntiPattern]:
         """Détecter les anti-patterns"""
@@ -395,19 +406,19 @@ class PatternDetector:
                 antipatterns.append(antipattern)
 
         # Anti-pattern: patterns trop similaires (doublons potentiels)
-        for pattern in patterns:
-            if pattern.pattern_type in ["function", "class"] and pattern.complexity > 5:
-                # Chercher des patterns similaires
-                similar_count = 0
-                for other_pattern in patterns:
-                    if (
-                        other_pattern != pattern
-                        and other_pattern.pattern_type == pattern.pattern_type
-                        and self._calculate_similarity(pattern, other_pattern) > 0.6
-                    ):
-                        similar_count += 1
-
-                if similar_count >= 2:
+        for pattern_type in ("function", "class"):
+            type_patterns = [p for p in patterns if p.pattern_type == pattern_type]
+            index = self._build_duplicate_index(type_patterns, 0.6)
+
+            for positions, _similarity in index.clusters():
+                similar_count = len(positions) - 1
+                if similar_count < 2:
+                    continue
+
+                for position in positions:
+                    pattern = type_patterns[position]
+                    if pattern.complexity <= 5:
+                        continue
                     antipattern = AntiPattern(
                         pattern_name="potential_duplicate",
                         description=(
@@ -429,72 +440,71 @@ class PatternDetector:
         duplicates: list[DuplicateAnalysis],
         antipatterns: list[AntiPattern],
     ):
-        """Sauvegarder les résultats d'analyse"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Sauvegarder les patterns
-            for pattern in patterns:
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO code_patterns
-                    (pattern_type, signature, locations, similarity_score,
-                     complexity, last_seen, correction_history)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        pattern.pattern_type,
-                        pattern.signature,
-                        json.dumps(pattern.locations),
-                        pattern.similarity_score,
-                        pattern.complexity,
-                        pattern.last_seen.isoformat(),
-                        json.dumps(pattern.correction_history or []),
-                    ),
+        """Sauvegarder les résultats d'analyse (insertions groupées)"""
+        self.store.insert_many(
+            """
+            INSERT OR REPLACE INTO code_patterns
+            (pattern_type, signature, locations, similarity_score,
+             complexity, last_seen, correction_history)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    pattern.pattern_type,
+                    pattern.signature,
+                    json.dumps(pattern.locations),
+                    pattern.similarity_score,
+                    pattern.complexity,
+                    pattern.last_seen.isoformat(),
+                    json.dumps(pattern.correction_history or []),
                 )
+                for pattern in patterns
+            ),
+        )
 
-            # Sauvegarder les doublons
-            for duplicate in duplicates:
-                cursor.execute(
-                    """
-                    INSERT INTO duplicates
-                    (duplicate_type, items, locations, severity,
-                     similarity_score, suggested_action, estimated_effort, detected_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        duplicate.duplicate_type,
-                        json.dumps(duplicate.items),
-                        json.dumps(duplicate.locations),
-                        duplicate.severity,
-                        duplicate.similarity_score,
-                        duplicate.suggested_action,
-                        duplicate.estimated_effort,
-                        datetime.now().isoformat(),
-                    ),
+        detected_at = datetime.now().isoformat()
+        self.store.insert_many(
+            """
+            INSERT INTO duplicates
+            (duplicate_type, items, locations, severity,
+             similarity_score, suggested_action, estimated_effort, detected_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    duplicate.duplicate_type,
+                    json.dumps(duplicate.items),
+                    json.dumps(duplicate.locations),
+                    duplicate.severity,
+                    duplicate.similarity_score,
+                    duplicate.suggested_action,
+                    duplicate.estimated_effort,
+                    detected_at,
                 )
+                for duplicate in duplicates
+            ),
+        )
 
-            # Sauvegarder les anti-patterns
-            for antipattern in antipatterns:
-                cursor.execute(
-                    """
-                    INSERT INTO antipatterns
-                    (pattern_name, description, locations, impact,
-                     suggestion, previous_corrections, detected_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        antipattern.pattern_name,
-                        antipattern.description,
-                        json.dumps(antipattern.locations),
-                        antipattern.impact,
-                        antipattern.suggestion,
-                        json.dumps(antipattern.previous_corrections or []),
-                        datetime.now().isoformat(),
-                    ),
+        self.store.insert_many(
+            """
+            INSERT INTO antipatterns
+            (pattern_name, description, locations, impact,
+             suggestion, previous_corrections, detected_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    antipattern.pattern_name,
+                    antipattern.description,
+                    json.dumps(antipattern.locations),
+                    antipattern.impact,
+                    antipattern.suggestion,
+                    json.dumps(antipattern.previous_corrections or []),
+                    detected_at,
                 )
-
-            conn.commit()
+                for antipattern in antipatterns
+            ),
+        )
 
     def _generate_recommendations(
         self,
@@ -537,7 +547,7 @@ class PatternDetector:
 
     def get_learning_insights(self) -> dict[str, Any]:
         """Obtenir des insights d'apprentissage"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.reading() as conn:
             cursor = conn.cursor()
 
             # Statistiques des patterns
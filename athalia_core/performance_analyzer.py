@@ -10,14 +10,16 @@ import cProfile
 import io
 import logging
 import pstats
-import sqlite3
 import time
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .analysis_engine import ProjectAnalysisEngine
 from .ast_analyzer import ASTAnalyzer, FileAnalysis
+from .sqlite_store import get_sqlite_store
 
 logger = logging.getLogger(__name__)
 
@@ -60,18 +62,27 @@ class PerformanceReport:
 class PerformanceAnalyzer:
     """Analyseur de performance pour détecter les goulots d'étranglement"""
 
-    def __init__(self, root_path: str = None):
+    def __init__(
+        self,
+        root_path: str = None,
+        ast_analyzer: ASTAnalyzer = None,
+        analysis_engine: ProjectAnalysisEngine = None,
+    ):
         self.root_path = Path(root_path or Path.cwd())
         self.db_path = self.root_path / "data" / "performance_analysis.db"
 
         # Créer les dossiers nécessaires
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialiser la base de données
+        # Initialiser la base de données (connexions partagées, écritures groupées)
+        self.store = get_sqlite_store(self.db_path)
         self._init_database()
 
-        # Analyseur AST
-        self.ast_analyzer = ASTAnalyzer()
+        # Analyseur AST (partagé avec les autres analyseurs si fourni)
+        self.ast_analyzer = ast_analyzer or ASTAnalyzer()
+        self.analysis_engine = analysis_engine or ProjectAnalysisEngine(
+            self.ast_analyzer
+        )
 
         # Seuils de performance
         self.thresholds = {
@@ -87,7 +98,7 @@ class PerformanceAnalyzer:
 
     def _init_database(self):
         """Initialiser la base de données de performance"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.transaction() as conn:
             cursor = conn.cursor()
 
             # Table des métriques de performance
@@ -138,12 +149,18 @@ class PerformanceAnalyzer:
             """
             )
 
-            conn.commit()
-
     def analyze_project_performance(
-        self, project_path: str = None
+        self,
+        project_path: str = None,
+        file_analyses: Iterable[FileAnalysis] = None,
     ) -> PerformanceReport:
-        """Analyser les performances d'un projet complet"""
+        """Analyser les performances d'un projet complet
+
+        Args:
+            project_path: projet à analyser
+            file_analyses: analyses AST déjà disponibles pour le projet, à
+                utiliser au lieu de (ré)analyser ses fichiers
+        """
         project_path = Path(project_path or self.root_path)
         logger.info(f"⚡ Analyse des performances du projet: {project_path.name}")
 
@@ -153,26 +170,23 @@ class PerformanceAnalyzer:
         ]
         logger.info(f"📁 {len(python_files)} fichiers Python analysés")
 
-        # Limiter le nombre de fichiers pour les performances
-        if len(python_files) > 50:
-            python_files = python_files[:50]
-            logger.info("📁 Limitation à 50 fichiers pour les performances")
-
         all_metrics = []
         all_issues = []
 
-        for py_file in python_files:
+        if file_analyses is None:
+            file_analyses = self.analysis_engine.iter_analyses(python_files)
+
+        for file_analysis in file_analyses:
             try:
-                file_analysis = self.ast_analyzer.analyze_file(py_file)
-                if file_analysis:
-                    file_metrics = self._analyze_file_performance(file_analysis)
-                    file_issues = self._detect_performance_issues(file_analysis)
+                file_metrics = self._analyze_file_performance(file_analysis)
+                file_issues = self._detect_performance_issues(file_analysis)
 
-                    all_metrics.extend(file_metrics)
-                    all_issues.extend(file_issues)
+                all_metrics.extend(file_metrics)
+                all_issues.extend(file_issues)
             except Exception as e:
                 logger.warning(
-                    f"Erreur lors de l'analyse de performance de {py_file}: {e}"
+                    "Erreur lors de l'analyse de performance de "
+                    f"{file_analysis.file_path}: {e}"
                 )
 
         # Calculer le score global
@@ -464,51 +478,49 @@ class PerformanceAnalyzer:
         return opportunities
 
     def _save_performance_report(self, report: PerformanceReport):
-        """Sauvegarder le rapport de performance"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Sauvegarder les métriques
-            for metric in report.metrics:
-                cursor.execute(
-                    """
-                    INSERT INTO performance_metrics
-                    (metric_type, value, unit, location, threshold, status,
-                     measured_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        metric.metric_type,
-                        metric.value,
-                        metric.unit,
-                        metric.location,
-                        metric.threshold,
-                        metric.status,
-                        datetime.now().isoformat(),
-                    ),
+        """Sauvegarder le rapport de performance (insertions groupées)"""
+        measured_at = datetime.now().isoformat()
+        self.store.insert_many(
+            """
+            INSERT INTO performance_metrics
+            (metric_type, value, unit, location, threshold, status,
+             measured_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    metric.metric_type,
+                    metric.value,
+                    metric.unit,
+                    metric.location,
+                    metric.threshold,
+                    metric.status,
+                    measured_at,
                 )
+                for metric in report.metrics
+            ),
+        )
 
-            # Sauvegarder les problèmes
-            for issue in report.issues:
-                cursor.execute(
-                    """
-                    INSERT INTO performance_issues
-                    (issue_type, location, description, impact, suggestion,
-                     estimated_improvement, detected_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        issue.issue_type,
-                        issue.location,
-                        issue.description,
-                        issue.impact,
-                        issue.suggestion,
-                        issue.estimated_improvement,
-                        datetime.now().isoformat(),
-                    ),
+        self.store.insert_many(
+            """
+            INSERT INTO performance_issues
+            (issue_type, location, description, impact, suggestion,
+             estimated_improvement, detected_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                (
+                    issue.issue_type,
+                    issue.location,
+                    issue.description,
+                    issue.impact,
+                    issue.suggestion,
+                    issue.estimated_improvement,
+                    measured_at,
                 )
-
-            conn.commit()
+                for issue in report.issues
+            ),
+        )
 
     def profile_function(
         self, function_path: str, function_name: str, *args, **kwargs
@@ -552,7 +564,7 @@ class PerformanceAnalyzer:
 
     def get_performance_insights(self) -> dict[str, Any]:
         """Obtenir des insights de performance"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.store.reading() as conn:
             cursor = conn.cursor()
 
             # Statistiques globales
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+🗂️ INSTANTANÉ DES FICHIERS D'UN PROJET
+======================================
+Un seul parcours ``os.scandir`` du projet, partagé par tous les scanners
+(audit, sécurité, linting, tests, documentation, nettoyage) au lieu d'un
+``rglob`` par analyse :
+
+- les répertoires exclus sont écartés une fois, pendant le parcours
+- chaque fichier garde chemin, suffixe, taille, mtime et mode (du scandir)
+- contenu texte et AST sont chargés à la demande puis mémorisés
+
+``invalidate()`` marque l'instantané comme périmé (après une étape qui
+écrit dans le projet) : le parcours suivant réutilise contenus et AST des
+fichiers dont mtime et taille n'ont pas changé.
+"""
+
+import ast
+import fnmatch
+import logging
+import os
+import threading
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Répertoires jamais parcourus (gestion de versions, caches d'outils,
+# dépendances installées)
+EXCLUDED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".athalia_cache",
+        "node_modules",
+        ".venv",
+        "venv",
+    }
+)
+
+# Taille au-delà de laquelle le contenu est relu à chaque accès
+MAX_CACHED_SIZE = 1024 * 1024
+
+_UNSET = object()
+
+
+class FileEntry:
+    """Fichier de l'instantané, contenu et AST mémorisés à la demande"""
+
+    __slots__ = (
+        "path",
+        "relative",
+        "suffix",
+        "size",
+        "mtime_ns",
+        "mode",
+        "_text",
+        "_tree",
+    )
+
+    def __init__(self, path: Path, relative: str, stat: os.stat_result):
+        self.path = path
+        self.relative = relative
+        self.suffix = path.suffix.lower()
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.mode = stat.st_mode
+        self._text = _UNSET
+        self._tree = _UNSET
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1e9
+
+    def read_text(self) -> str | None:
+        """Contenu UTF-8 (None si illisible ou binaire)"""
+        if self._text is not _UNSET:
+            return self._text
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            text = None
+        if self.size <= MAX_CACHED_SIZE:
+            self._text = text
+        return text
+
+    def parse(self) -> ast.Module | None:
+        """AST du fichier (None si illisible ou syntaxe invalide)"""
+        if self._tree is not _UNSET:
+            return self._tree
+        text = self.read_text()
+        tree = None
+        if text is not None:
+            try:
+                tree = ast.parse(text, filename=str(self.path))
+            except (SyntaxError, ValueError):
+                tree = None
+        if self.size <= MAX_CACHED_SIZE:
+            self._tree = tree
+        return tree
+
+    def __repr__(self) -> str:
+        return f"FileEntry({self.relative!r}, size={self.size})"
+
+
+class ProjectSnapshot:
+    """Index des fichiers d'un projet, construit en un seul parcours
+
+    Args:
+        root_path: racine du projet
+        excluded_dirs: noms de répertoires ignorés (à tout niveau)
+    """
+
+    def __init__(
+        self, root_path: str | Path, excluded_dirs: Iterable[str] = EXCLUDED_DIRS
+    ):
+        self.root_path = Path(root_path)
+        self.excluded_dirs = frozenset(excluded_dirs)
+        self._files: list[FileEntry] | None = None
+        self._dirs: list[Path] = []
+        self._by_path: dict[Path, FileEntry] = {}
+        self._lock = threading.Lock()
+        self.walks = 0
+
+    def _ensure(self) -> list[FileEntry]:
+        files = self._files
+        if files is None:
+            with self._lock:
+                if self._files is None:
+                    self._walk()
+                files = self._files
+        return files
+
+    def _walk(self):
+        """Parcours ``os.scandir`` itératif (liens de répertoires non suivis)"""
+        previous = self._by_path
+        files: list[FileEntry] = []
+        dirs: list[Path] = []
+        root = str(self.root_path)
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self.excluded_dirs:
+                            subdirs.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                path = Path(entry.path)
+                old = previous.get(path)
+                if old and (old.mtime_ns, old.size, old.mode) == (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    stat.st_mode,
+                ):
+                    files.append(old)
+                    continue
+                relative = os.path.relpath(entry.path, root)
+                files.append(FileEntry(path, relative, stat))
+            dirs.extend(Path(subdir) for subdir in subdirs)
+            stack.extend(reversed(subdirs))
+
+        self._dirs = dirs
+        self._by_path = {entry.path: entry for entry in files}
+        self._files = files
+        self.walks += 1
+        logger.debug(f"🗂️ {len(files)} fichiers indexés dans {self.root_path}")
+
+    def invalidate(self):
+        """Marquer l'instantané périmé (reparcouru au prochain accès)"""
+        with self._lock:
+            self._files = None
+
+    @property
+    def files(self) -> list[FileEntry]:
+        """Fichiers du projet, dans l'ordre du parcours"""
+        return self._ensure()
+
+    @property
+    def directories(self) -> list[Path]:
+        """Répertoires du projet (hors racine et répertoires exclus)"""
+        self._ensure()
+        return self._dirs
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        return iter(self._ensure())
+
+    def __len__(self) -> int:
+        return len(self._ensure())
+
+    def get(self, path: str | Path) -> FileEntry | None:
+        """Entrée d'un fichier (chemin absolu ou relatif à la racine)"""
+        self._ensure()
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.root_path / path
+        return self._by_path.get(path)
+
+    def by_suffix(self, *suffixes: str) -> list[FileEntry]:
+        """Fichiers ayant l'un des suffixes (insensible à la casse)"""
+        wanted = {suffix.lower() for suffix in suffixes}
+        return [entry for entry in self._ensure() if entry.suffix in wanted]
+
+    def python_files(self) -> list[FileEntry]:
+        return self.by_suffix(".py")
+
+    def glob(self, pattern: str) -> list[FileEntry]:
+        """Fichiers dont le nom correspond au motif (comme ``rglob``)
+
+        Un motif contenant ``/`` s'applique au chemin relatif.
+        """
+        if "/" in pattern:
+            return [
+                entry
+                for entry in self._ensure()
+                if fnmatch.fnmatchcase(Path(entry.relative).as_posix(), pattern)
+            ]
+        return [
+            entry
+            for entry in self._ensure()
+            if fnmatch.fnmatchcase(entry.name, pattern)
+        ]
+
+    def glob_dirs(self, pattern: str) -> list[Path]:
+        """Répertoires dont le nom correspond au motif"""
+        self._ensure()
+        return [path for path in self._dirs if fnmatch.fnmatchcase(path.name, pattern)]
+
+    @property
+    def total_size(self) -> int:
+        return sum(entry.size for entry in self._ensure())
+
+
+def snapshot_for(
+    project_path: str | Path, snapshot: ProjectSnapshot | None = None
+) -> ProjectSnapshot:
+    """Instantané fourni s'il couvre ``project_path``, sinon un nouveau"""
+    if snapshot is not None and Path(snapshot.root_path) == Path(project_path):
+        return snapshot
+    return ProjectSnapshot(project_path)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+📈 AGRÉGATION GLISSANTE DES MÉTRIQUES
+=====================================
+Les événements (durées, succès/échecs) sont agrégés dans des seaux de temps
+(par minute par défaut) : nombre, succès, somme, min, max et un résumé de
+quantiles. Une requête sur une fenêtre quelconque fusionne les seaux
+concernés, sans relire les événements : son coût dépend du nombre de seaux,
+pas du volume, et la mémoire reste bornée par la rétention.
+
+Les quantiles (p50/p95/p99) viennent d'un histogramme à échelle
+logarithmique (à la DDSketch) : erreur relative bornée, fusion exacte entre
+seaux.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# Regroupement des clés au-delà de ``max_keys``
+OVERFLOW_BUCKET = "other"
+
+
+class QuantileSketch:
+    """Histogramme logarithmique pour quantiles à erreur relative bornée
+
+    Args:
+        relative_accuracy: erreur relative maximale d'un quantile
+        max_bins: nombre maximal de classes (les plus basses sont fusionnées)
+    """
+
+    __slots__ = ("gamma", "_log_gamma", "max_bins", "bins", "zeros", "count")
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 1024):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.bins: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float, weight: int = 1):
+        self.count += weight
+        if value <= 0:
+            self.zeros += weight
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + weight
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self):
+        """Fusionne les classes les plus basses dans la suivante"""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.bins[target] += self.bins.pop(key)
+
+    def merge(self, other: "QuantileSketch"):
+        self.count += other.count
+        self.zeros += other.zeros
+        for index, weight in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + weight
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q: float) -> float | None:
+        """Valeur du quantile ``q`` (0..1), None sans données"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+
+class _Stats:
+    """Nombre, succès, somme, min et max d'une série"""
+
+    __slots__ = ("count", "successes", "total", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.successes = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float | None, success: bool | None):
+        self.count += 1
+        if success:
+            self.successes += 1
+        if value is not None:
+            self.total += value
+            self.minimum = min(self.minimum, value)
+            self.maximum = max(self.maximum, value)
+
+    def merge(self, other: "_Stats"):
+        self.count += other.count
+        self.successes += other.successes
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def to_dict(self) -> dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "successes": self.successes,
+            "success_rate": self.successes / self.count * 100,
+            "sum": self.total,
+            "avg": self.total / self.count,
+            "min": self.minimum if self.minimum != math.inf else None,
+            "max": self.maximum if self.maximum != -math.inf else None,
+        }
+
+
+class _Bucket:
+    __slots__ = ("start", "stats", "sketch", "by_key")
+
+    def __init__(self, start: float, relative_accuracy: float):
+        self.start = start
+        self.stats = _Stats()
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.by_key: dict[str, _Stats] = {}
+
+
+class RollingAggregator:
+    """Agrégats par seaux de temps sur une durée de rétention bornée
+
+    Args:
+        bucket_seconds: largeur d'un seau
+        retention_seconds: âge maximal des seaux conservés
+        relative_accuracy: précision des quantiles
+        max_keys: clés distinctes suivies par seau (au-delà : ``OVERFLOW_BUCKET``)
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: float = 60.0,
+        retention_seconds: float = 24 * 3600,
+        relative_accuracy: float = 0.01,
+        max_keys: int = 256,
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.retention_seconds = retention_seconds
+        self.relative_accuracy = relative_accuracy
+        self.max_keys = max_keys
+        self._buckets: deque[_Bucket] = deque()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        value: float | None = None,
+        success: bool | None = None,
+        key: str | None = None,
+        timestamp: float | None = None,
+    ):
+        """Ajouter un événement (durée, succès, clé de regroupement)"""
+        now = time.time() if timestamp is None else timestamp
+        start = now - now % self.bucket_seconds
+        with self._lock:
+            bucket = self._buckets[-1] if self._buckets else None
+            if bucket is None or bucket.start < start:
+                bucket = _Bucket(start, self.relative_accuracy)
+                self._buckets.append(bucket)
+                self._expire(now)
+            elif bucket.start > start:
+                # Événement en retard : seau existant le plus proche
+                bucket = self._find_bucket(start) or bucket
+            bucket.stats.add(value, success)
+            if value is not None:
+                bucket.sketch.add(value)
+            if key is not None:
+                if key not in bucket.by_key and len(bucket.by_key) >= self.max_keys:
+                    key = OVERFLOW_BUCKET
+                bucket.by_key.setdefault(key, _Stats()).add(value, success)
+
+    def _find_bucket(self, start: float) -> _Bucket | None:
+        for bucket in reversed(self._buckets):
+            if bucket.start <= start:
+                return bucket
+        return None
+
+    def _expire(self, now: float):
+        cutoff = now - self.retention_seconds - self.bucket_seconds
+        while self._buckets and self._buckets[0].start < cutoff:
+            self._buckets.popleft()
+
+    def summary(
+        self,
+        window_seconds: float | None = None,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+        now: float | None = None,
+    ) -> dict[str, Any]:
+        """Agrégats des seaux de la fenêtre (toute la rétention par défaut)
+
+        Retourne ``count``, ``successes``, ``success_rate``, ``sum``, ``avg``,
+        ``min``, ``max``, les quantiles (``p50``...) et ``by_key``.
+        """
+        now = time.time() if now is None else now
+        cutoff = -math.inf
+        if window_seconds is not None:
+            # Seau contenant le début de la fenêtre inclus
+            cutoff = now - window_seconds
+            cutoff -= cutoff % self.bucket_seconds
+        stats = _Stats()
+        sketch = QuantileSketch(self.relative_accuracy)
+        by_key: dict[str, _Stats] = {}
+        with self._lock:
+            for bucket in reversed(self._buckets):
+                if bucket.start < cutoff:
+                    break
+                stats.merge(bucket.stats)
+                sketch.merge(bucket.sketch)
+                for key, key_stats in bucket.by_key.items():
+                    by_key.setdefault(key, _Stats()).merge(key_stats)
+
+        result = stats.to_dict()
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = sketch.quantile(q)
+        result["by_key"] = {key: s.to_dict() for key, s in by_key.items()}
+        return result
+
+    @property
+    def bucket_count(self) -> int:
+        return len(self._buckets)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
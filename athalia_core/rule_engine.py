@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+🔎 MOTEUR DE RÈGLES SUR LE CODE SOURCE
+======================================
+Registre commun des règles (appels dangereux, secrets en dur, jetons,
+complexité) utilisé par l'auditeur de sécurité, l'auditeur intelligent et
+la mémoire intelligente.
+
+Chaque fichier est lu une fois ; chaque règle compilée y est appliquée par
+son propre ``re.finditer`` : correspondances sans chevauchement pour une
+même règle, chevauchements permis entre règles. Une expression unique en
+assertion avant réessaierait toutes les règles à chaque position et
+deviendrait quadratique sur les longues correspondances (blobs base64).
+Les numéros de ligne viennent d'une bissection dans l'index des sauts de
+ligne, construit seulement si le fichier contient une correspondance.
+"""
+
+import bisect
+import logging
+import os
+import re
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .project_snapshot import FileEntry
+
+logger = logging.getLogger(__name__)
+
+_NEWLINE = re.compile("\n")
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Règle de détection (expression sans groupe nommé)"""
+
+    rule_id: str
+    category: str
+    pattern: str
+    description: str
+    suggestion: str = ""
+
+
+@dataclass(frozen=True)
+class Finding:
+    """Correspondance d'une règle dans un texte"""
+
+    rule: Rule
+    line: int
+    start: int
+    end: int
+    text: str
+
+
+class LineIndex:
+    """Numéro de ligne d'une position, par bissection des sauts de ligne"""
+
+    def __init__(self, text: str):
+        self._newlines = [match.start() for match in _NEWLINE.finditer(text)]
+
+    def line_of(self, offset: int) -> int:
+        return bisect.bisect_left(self._newlines, offset) + 1
+
+
+class RuleSet:
+    """Règles compilées, appliquées ensemble à un texte"""
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = tuple(rules)
+        self._patterns = []
+        for rule in self.rules:
+            compiled = re.compile(rule.pattern)
+            if compiled.groupindex:
+                raise ValueError(f"Règle {rule.rule_id}: groupe nommé interdit")
+            self._patterns.append(compiled)
+        self._groups = {f"r{i}": i for i in range(len(self.rules))}
+        # Alternative unique pour ``search`` : première position, puis
+        # première règle dans l'ordre du registre
+        alternatives = "|".join(
+            f"(?P<r{i}>{rule.pattern})" for i, rule in enumerate(self.rules)
+        )
+        self._combined = re.compile(alternatives) if self.rules else None
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def scan(self, text: str) -> list[Finding]:
+        """Toutes les correspondances, par position puis ordre des règles"""
+        matches = sorted(
+            (match.start(), i, match.end())
+            for i, pattern in enumerate(self._patterns)
+            for match in pattern.finditer(text)
+        )
+        if not matches:
+            return []
+        lines = LineIndex(text)
+        return [
+            Finding(self.rules[i], lines.line_of(start), start, end, text[start:end])
+            for start, i, end in matches
+        ]
+
+    def search(self, text: str) -> Finding | None:
+        """Première correspondance (toutes règles confondues)"""
+        if self._combined is None:
+            return None
+        match = self._combined.search(text)
+        if match is None:
+            return None
+        pos = match.start()
+        end = match.end(match.lastgroup)
+        rule = self.rules[self._groups[match.lastgroup]]
+        line = text.count("\n", 0, pos) + 1
+        return Finding(rule, line, pos, end, text[pos:end])
+
+    def matched_rules(self, text: str) -> list[Rule]:
+        """Règles ayant au moins une correspondance, dans l'ordre du registre"""
+        matched = {finding.rule.rule_id for finding in self.scan(text)}
+        return [rule for rule in self.rules if rule.rule_id in matched]
+
+
+class RuleRegistry:
+    """Règles partagées, regroupées par catégorie"""
+
+    def __init__(self, rules: Iterable[Rule] = ()):
+        self._rules: dict[str, Rule] = {}
+        self._rulesets: dict[tuple[str, ...], RuleSet] = {}
+        self._lock = threading.Lock()
+        for rule in rules:
+            self.register(rule)
+
+    def register(self, rule: Rule):
+        """Ajouter ou remplacer une règle"""
+        re.compile(rule.pattern)
+        with self._lock:
+            self._rules[rule.rule_id] = rule
+            self._rulesets.clear()
+
+    def rules(self, *categories: str) -> list[Rule]:
+        """Règles des catégories indiquées (toutes par défaut)"""
+        return [
+            rule
+            for rule in self._rules.values()
+            if not categories or rule.category in categories
+        ]
+
+    def ruleset(self, *categories: str) -> RuleSet:
+        """Ensemble compilé des catégories (mémorisé)"""
+        with self._lock:
+            ruleset = self._rulesets.get(categories)
+        if ruleset is None:
+            ruleset = RuleSet(self.rules(*categories))
+            with self._lock:
+                self._rulesets[categories] = ruleset
+        return ruleset
+
+
+DANGEROUS_CALLS = "dangerous_calls"
+HARDCODED_SECRETS = "hardcoded_secrets"
+SECRET_TOKENS = "secret_tokens"
+COMPLEXITY = "complexity"
+
+_SAFE_ALTERNATIVE = "Remplacer par une alternative sécurisée"
+_USE_ENVIRONMENT = (
+    "Utiliser des variables d'environnement ou un gestionnaire de secrets"
+)
+
+RULES = RuleRegistry(
+    [
+        Rule(
+            "eval",
+            DANGEROUS_CALLS,
+            r"\beval\s*\(",
+            "Utilisation de 'eval()'",
+            _SAFE_ALTERNATIVE,
+        ),
+        Rule(
+            "exec",
+            DANGEROUS_CALLS,
+            r"\bexec\s*\(",
+            "Utilisation de 'exec()'",
+            _SAFE_ALTERNATIVE,
+        ),
+        Rule(
+            "os_system",
+            DANGEROUS_CALLS,
+            r"\bos\.system\s*\(",
+            "Utilisation de 'os.system()'",
+            "Utiliser subprocess.run avec une liste d'arguments",
+        ),
+        Rule(
+            "subprocess_call",
+            DANGEROUS_CALLS,
+            r"\bsubprocess\.call\s*\(",
+            "Utilisation de 'subprocess.call()'",
+            "Utiliser subprocess.run avec check=True",
+        ),
+        Rule(
+            "pickle_loads",
+            DANGEROUS_CALLS,
+            r"\bpickle\.loads\s*\(",
+            "Utilisation de 'pickle.loads()'",
+            "Ne désérialiser que des données de confiance (ou JSON)",
+        ),
+        Rule(
+            "yaml_load",
+            DANGEROUS_CALLS,
+            r"\byaml\.load\s*\(",
+            "Utilisation de 'yaml.load()'",
+            "Utiliser yaml.safe_load",
+        ),
+        Rule(
+            "input",
+            DANGEROUS_CALLS,
+            r"(?<![\w.])input\s*\(",
+            "Utilisation de 'input()'",
+            "Valider les entrées utilisateur",
+        ),
+        Rule(
+            "password_literal",
+            HARDCODED_SECRETS,
+            r"""\bpassword\s*=\s*["'][^"'\n]+["']""",
+            "Mot de passe en clair",
+            _USE_ENVIRONMENT,
+        ),
+        Rule(
+            "api_key_literal",
+            HARDCODED_SECRETS,
+            r"""\bapi_key\s*=\s*["'][^"'\n]+["']""",
+            "Clé API en clair",
+            _USE_ENVIRONMENT,
+        ),
+        Rule(
+            "secret_literal",
+            HARDCODED_SECRETS,
+            r"""\bsecret\s*=\s*["'][^"'\n]+["']""",
+            "Secret en clair",
+            _USE_ENVIRONMENT,
+        ),
+        Rule(
+            "token_literal",
+            HARDCODED_SECRETS,
+            r"""\btoken\s*=\s*["'][^"'\n]+["']""",
+            "Jeton en clair",
+            _USE_ENVIRONMENT,
+        ),
+        Rule(
+            "base64_blob",
+            SECRET_TOKENS,
+            r"[A-Za-z0-9+/]{40,}={0,2}",
+            "Chaîne base64 longue",
+            _USE_ENVIRONMENT,
+        ),
+        Rule(
+            "stripe_secret",
+            SECRET_TOKENS,
+            r"sk_[A-Za-z0-9]{24}",
+            "Clé secrète Stripe",
+            _USE_ENVIRONMENT,
+        ),
+        Rule(
+            "aws_access_key",
+            SECRET_TOKENS,
+            r"AKIA[0-9A-Z]{16}",
+            "Clé d'accès AWS",
+            _USE_ENVIRONMENT,
+        ),
+        Rule(
+            "nested_loops",
+            COMPLEXITY,
+            r"for\s+\w+\s+in\s+\w+:\s*\n\s*for\s+\w+\s+in\s+\w+:",
+            "Boucles imbriquées - Complexité élevée",
+            "Considérer l'utilisation de list comprehensions ou itertools",
+        ),
+        Rule(
+            "nested_conditions",
+            COMPLEXITY,
+            r"if\s+\w+:\s*\n\s*if\s+\w+:\s*\n\s*if\s+\w+:",
+            "Conditions imbriquées - Complexité élevée",
+            "Refactoriser en utilisant des early returns ou des guard clauses",
+        ),
+    ]
+)
+
+
+def scan_files(
+    entries: Iterable[FileEntry],
+    ruleset: RuleSet,
+    max_workers: int = None,
+    min_parallel_files: int = 32,
+) -> list[tuple[FileEntry, list[Finding]]]:
+    """Appliquer un ensemble de règles à des fichiers de l'instantané
+
+    Les lectures se recouvrent dans un pool de threads ; les fichiers
+    illisibles sont ignorés. Retourne ``(fichier, correspondances)`` dans
+    l'ordre des fichiers.
+    """
+    entries = list(entries)
+
+    def scan_entry(entry: FileEntry) -> list[Finding] | None:
+        text = entry.read_text()
+        if text is None:
+            logger.debug(f"Fichier illisible ignoré: {entry.path}")
+            return None
+        return ruleset.scan(text)
+
+    if len(entries) < min_parallel_files:
+        results = map(scan_entry, entries)
+    else:
+        workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="rules"
+        ) as executor:
+            results = list(executor.map(scan_entry, entries))
+    return [
+        (entry, findings)
+        for entry, findings in zip(entries, results, strict=True)
+        if findings is not None
+    ]
@@ -6,6 +6,14 @@ import subprocess
 from pathlib import Path
 from typing import Any
 
+from .project_snapshot import ProjectSnapshot
+from .security_scanner import (
+    CALL_FINDING,
+    SECRET_FINDING,
+    SecurityScanner,
+    SecurityScanReport,
+)
+
 # Import du validateur de sécurité
 try:
     from athalia_core.security_validator import SecurityError, validate_and_run
@@ -30,8 +38,12 @@ Détection automatique de vulnérabilités et bonnes pratiques
 class SecurityAuditor:
     """Auditeur de sécurité pour Athalia"""
 
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, snapshot: ProjectSnapshot = None):
         self.project_path = Path(project_path)
+        # Instantané partagé (orchestrateur) ou propre, reparcouru à chaque run
+        self._owns_snapshot = snapshot is None
+        self.snapshot = snapshot or ProjectSnapshot(self.project_path)
+        self._scan_report: SecurityScanReport | None = None
         self.report = {
             "score": 0,
             "vulnerabilities": [],
@@ -42,6 +54,9 @@ class SecurityAuditor:
     def run(self) -> dict[str, Any]:
         """Lance l'audit de sécurité renforcé"""
         logger.info(f"🔒 Audit de sécurité renforcé pour: {self.project_path.name}")
+        if self._owns_snapshot:
+            self.snapshot.invalidate()
+        self._scan_report = None
 
         # Vérifications en séquence
         self._check_dependencies()
@@ -111,90 +126,40 @@ class SecurityAuditor:
         except (Exception, SecurityError) as e:
             self.report["warnings"].append(f"Safety non exécuté: {e}")
 
+    def _security_scan(self) -> SecurityScanReport:
+        """Appels dangereux et secrets : un parcours AST par fichier modifié"""
+        if self._scan_report is None:
+            scanner = SecurityScanner(self.project_path, snapshot=self.snapshot)
+            self._scan_report = scanner.scan()
+            if self._scan_report.baselined:
+                self.report["recommendations"].append(
+                    f"{self._scan_report.baselined} constats acceptés par la "
+                    "baseline de sécurité."
+                )
+        return self._scan_report
+
     def _check_code_vulnerabilities(self):
         """Vérification des vulnérabilités dans le code"""
-        dangerous_patterns = [
-            r"eval\(",
-            r"exec\(",
-            r"subprocess\.call\(",
-            r"os\.system\(",
-            r"pickle\.loads\(",
-            r"yaml\.load\(",
-            r"input\(",
-        ]
-
-        for py_file in self.project_path.rglob("*.py"):
-            try:
-                with open(py_file, encoding="utf-8") as f:
-                    content = f.read()
-
-                for pattern in dangerous_patterns:
-                    matches = re.finditer(pattern, content)
-                    for match in matches:
-                        line_num = content[: match.start()].count("\n") + 1
-                        self.report["vulnerabilities"].append(
-                            f"Pattern dangereux {pattern} dans"
-                            f" {py_file.name}:{line_num}"
-                        )
-
-            except (
-                OSError,
-                UnicodeDecodeError,
-                PermissionError,
-            ) as file_error:
-                logger.debug(
-                    f"Erreur lors de l'analyse du fichier {py_file}: {file_error}"
-                )
-                continue
+        for finding in self._security_scan().by_category(CALL_FINDING):
+            self.report["vulnerabilities"].append(
+                f"Pattern dangereux {finding.symbol} dans "
+                f"{Path(finding.path).name}:{finding.line}"
+            )
 
     def _check_secrets(self):
         """Vérification des secrets"""
-        secret_patterns = [
-            r"password\s*=\s*\"[^\"]+\"",
-            r"api_key\s*=\s*\"[^\"]+\"",
-            r"secret\s*=\s*\"[^\"]+\"",
-            r"token\s*=\s*\"[^\"]+\"",
-        ]
-
-        for py_file in self.project_path.rglob("*.py"):
-            try:
-                with open(py_file, encoding="utf-8") as f:
-                    content = f.read()
-
-                for pattern in secret_patterns:
-                    matches = re.finditer(pattern, content)
-                    for match in matches:
-                        line_num = content[: match.start()].count("\n") + 1
-                        self.report["vulnerabilities"].append(
-                            f"Secret potentiel dans {py_file.name}:{line_num}"
-                        )
-
-            except (
-                OSError,
-                UnicodeDecodeError,
-                PermissionError,
-            ) as file_error:
-                logger.debug(
-                    f"Erreur lors de l'analyse du fichier {py_file}: {file_error}"
-                )
-                continue
+        for finding in self._security_scan().by_category(SECRET_FINDING):
+            self.report["vulnerabilities"].append(
+                f"Secret potentiel dans {Path(finding.path).name}:{finding.line}"
+            )
 
     def _check_permissions(self):
         """Vérification des permissions des fichiers"""
-        for file_path in self.project_path.rglob("*"):
-            if file_path.is_file():
-                try:
-                    stat = file_path.stat()
-                    if stat.st_mode & 0o777 == 0o777:
-                        self.report["warnings"].append(
-                            f"Permissions trop ouvertes: {file_path}"
-                        )
-                except (OSError, PermissionError) as perm_error:
-                    logger.debug(
-                        f"Erreur lors de la vérification des permissions {file_path}:"
-                        f" {perm_error}"
-                    )
-                    continue
+        for entry in self.snapshot:
+            if entry.mode & 0o777 == 0o777:
+                self.report["warnings"].append(
+                    f"Permissions trop ouvertes: {entry.path}"
+                )
 
     def _check_encryption(self):
         """Vérification de lutilisation du chiffrement"""
@@ -205,26 +170,17 @@ class SecurityAuditor:
         ]
 
         has_encryption = False
-        for py_file in self.project_path.rglob("*.py"):
-            try:
-                with open(py_file, encoding="utf-8") as f:
-                    content = f.read()
-
-                for pattern in encryption_patterns:
-                    if re.search(pattern, content):
-                        has_encryption = True
-                        break
-
-            except (
-                OSError,
-                UnicodeDecodeError,
-                PermissionError,
-            ) as file_error:
-                logger.debug(
-                    f"Erreur lors de l'analyse du fichier {py_file}: {file_error}"
-                )
+        for entry in self.snapshot.python_files():
+            content = entry.read_text()
+            if content is None:
+                logger.debug(f"Fichier illisible ignoré: {entry.path}")
                 continue
 
+            for pattern in encryption_patterns:
+                if re.search(pattern, content):
+                    has_encryption = True
+                    break
+
         if not has_encryption:
             self.report["recommendations"].append(
                 "Considérer lutilisation de modules de chiffrement pour les données"
@@ -249,19 +205,16 @@ class SecurityAuditor:
         ]
 
         has_validation = False
-        for py_file in self.project_path.rglob("*.py"):
-            try:
-                with open(py_file, encoding="utf-8") as f:
-                    content = f.read()
-
-                for pattern in validation_patterns:
-                    if re.search(pattern, content):
-                        has_validation = True
-                        break
-
-            except (OSError, UnicodeDecodeError, PermissionError):
+        for entry in self.snapshot.python_files():
+            content = entry.read_text()
+            if content is None:
                 continue
 
+            for pattern in validation_patterns:
+                if re.search(pattern, content):
+                    has_validation = True
+                    break
+
         if not has_validation:
             self.report["warnings"].append(
                 "Validation des entrées utilisateur recommandée"
@@ -278,19 +231,16 @@ class SecurityAuditor:
         ]
 
         has_auth = False
-        for py_file in self.project_path.rglob("*.py"):
-            try:
-                with open(py_file, encoding="utf-8") as f:
-                    content = f.read()
-
-                for pattern in auth_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        has_auth = True
-                        break
-
-            except (OSError, UnicodeDecodeError, PermissionError):
+        for entry in self.snapshot.python_files():
+            content = entry.read_text()
+            if content is None:
                 continue
 
+            for pattern in auth_patterns:
+                if re.search(pattern, content, re.IGNORECASE):
+                    has_auth = True
+                    break
+
         if not has_auth:
             self.report["recommendations"].append(
                 "Considérer l'ajout d'un système d'authentification"
@@ -306,19 +256,16 @@ class SecurityAuditor:
         ]
 
         has_protection = False
-        for py_file in self.project_path.rglob("*.py"):
-            try:
-                with open(py_file, encoding="utf-8") as f:
-                    content = f.read()
-
-                for pattern in protection_patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        has_protection = True
-                        break
-
-            except (OSError, UnicodeDecodeError, PermissionError):
+        for entry in self.snapshot.python_files():
+            content = entry.read_text()
+            if content is None:
                 continue
 
+            for pattern in protection_patterns:
+                if re.search(pattern, content, re.IGNORECASE):
+                    has_protection = True
+                    break
+
         if not has_protection:
             self.report["recommendations"].append(
                 "Considérer l'ajout de mesures de protection des données (GDPR)"
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+🛡️ DÉTECTION DE SÉCURITÉ PAR AST, INCRÉMENTALE
+==============================================
+Un parcours de l'AST par fichier relève :
+
+- les appels dangereux (``eval``, ``exec``, ``os.system``, ``pickle.loads``,
+  ``yaml.load`` sans chargeur sûr, ``subprocess`` avec ``shell=True``),
+  alias d'import résolus
+- les secrets en dur : chaîne littérale affectée à un nom sensible
+  (variable, attribut, clé de dictionnaire, argument nommé) et chaînes à
+  forte entropie, y compris dans les parties fixes des f-strings
+
+Les constats de chaque fichier sont mémorisés dans un index persistant
+(``.athalia_cache/security_index.db``) indexé par hash du contenu : un
+fichier inchangé n'est ni reparsé ni réanalysé. Un fichier à la syntaxe
+invalide est analysé par les règles regex de ``rule_engine``.
+
+Suppressions :
+
+- en ligne : ``# athalia: ignore`` ou ``# nosec`` (éventuellement
+  ``[eval, secret]``) sur une ligne de l'instruction
+- baseline : ``.athalia-security-baseline.json`` à la racine du projet,
+  constats acceptés identifiés par une empreinte stable (chemin, règle,
+  symbole, texte de la ligne) qui survit aux décalages de lignes
+"""
+
+import ast
+import hashlib
+import io
+import json
+import logging
+import math
+import re
+import sqlite3
+import time
+import tokenize
+from collections import Counter
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+from .project_snapshot import FileEntry, ProjectSnapshot, snapshot_for
+from .rule_engine import DANGEROUS_CALLS, HARDCODED_SECRETS, RULES
+from .sqlite_store import get_sqlite_store
+
+logger = logging.getLogger(__name__)
+
+# Version des règles : à incrémenter dès que la détection change, les
+# constats indexés par une autre version sont alors purgés.
+INDEX_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 50_000
+BASELINE_FILE = ".athalia-security-baseline.json"
+
+CALL_FINDING = "dangerous_call"
+SECRET_FINDING = "secret"
+
+# Appels dangereux : nom qualifié -> (règle, description)
+_CALLS = {
+    "eval": ("eval", "Utilisation de 'eval()'"),
+    "exec": ("exec", "Utilisation de 'exec()'"),
+    "os.system": ("os_system", "Utilisation de 'os.system()'"),
+    "os.popen": ("os_system", "Utilisation de 'os.popen()'"),
+    "pickle.load": ("pickle_loads", "Utilisation de 'pickle.load()'"),
+    "pickle.loads": ("pickle_loads", "Utilisation de 'pickle.loads()'"),
+    "yaml.load": ("yaml_load", "Utilisation de 'yaml.load()' sans chargeur sûr"),
+}
+_SUBPROCESS = {
+    "subprocess.call",
+    "subprocess.run",
+    "subprocess.Popen",
+    "subprocess.check_call",
+    "subprocess.check_output",
+}
+_SAFE_YAML_LOADERS = ("SafeLoader", "CSafeLoader", "BaseLoader")
+
+# Noms dont la valeur littérale est un secret
+_SENSITIVE_NAME = re.compile(
+    r"(?:^|_)(?:pass(?:word|wd)?|pwd|secret|token|"
+    r"(?:secret|api|access|private)_?key|credentials?)$",
+    re.IGNORECASE,
+)
+_TOKEN = re.compile(r"[A-Za-z0-9+/=_-]{20,}")
+_HEX = re.compile(r"[0-9a-fA-F]+")
+_SUPPRESSION = re.compile(
+    r"#\s*(?:athalia:\s*ignore|nosec)\b(?:\[([\w\s,-]*)\])?", re.IGNORECASE
+)
+
+# Répertoires de tests : secrets de fixtures ignorés
+_TEST_DIRS = frozenset({"test", "tests", "fixtures"})
+
+
+@dataclass(frozen=True)
+class SecurityFinding:
+    """Constat de sécurité (chemin et empreinte ajoutés au rapport)"""
+
+    rule_id: str
+    category: str
+    line: int
+    message: str
+    symbol: str
+    source: str = ""
+    path: str = ""
+    fingerprint: str = ""
+
+
+# Constats d'un fichier et nombre de constats supprimés en ligne
+FileFindings = tuple[list[SecurityFinding], int]
+
+
+@dataclass
+class SecurityScanReport:
+    """Résultat d'un passage du détecteur"""
+
+    findings: list[SecurityFinding] = field(default_factory=list)
+    suppressed: int = 0
+    baselined: int = 0
+    analyzed: int = 0
+    reused: int = 0
+
+    def by_category(self, category: str) -> list[SecurityFinding]:
+        return [f for f in self.findings if f.category == category]
+
+
+def shannon_entropy(value: str) -> float:
+    """Entropie de Shannon (bits par caractère)"""
+    if not value:
+        return 0.0
+    total = len(value)
+    return -sum(
+        count / total * math.log2(count / total) for count in Counter(value).values()
+    )
+
+
+def _high_entropy_token(text: str) -> str | None:
+    """Jeton ressemblant à une clé (base64 ou hexadécimal aléatoire)"""
+    for token in _TOKEN.findall(text):
+        if _HEX.fullmatch(token):
+            if len(token) >= 32 and shannon_entropy(token) >= 3.0:
+                return token
+            continue
+        classes = sum(
+            (
+                any(c.islower() for c in token),
+                any(c.isupper() for c in token),
+                any(c.isdigit() for c in token),
+            )
+        )
+        if classes >= 2 and shannon_entropy(token) >= 4.0:
+            return token
+    return None
+
+
+def _is_placeholder(name: str, value: str) -> bool:
+    value = value.strip()
+    return (
+        len(value) < 4
+        or len(set(value)) == 1
+        or value.startswith(("<", "${", "{{", "%("))
+        or value.lower().replace("-", "_") == name.lower()
+        or shannon_entropy(value) < 2.0
+    )
+
+
+def _source_line(lines: list[str], line: int) -> str:
+    return lines[line - 1].strip()[:200] if 0 < line <= len(lines) else ""
+
+
+def _qualified_name(node: ast.AST, aliases: dict[str, str]) -> str | None:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(aliases.get(node.id, node.id))
+    return ".".join(reversed(parts))
+
+
+class _SecurityVisitor(ast.NodeVisitor):
+    """Appels dangereux et secrets d'un module"""
+
+    def __init__(self, lines: list[str], check_secrets: bool = True):
+        self.lines = lines
+        self.check_secrets = check_secrets
+        self.aliases: dict[str, str] = {}
+        # (constat, première ligne, dernière ligne)
+        self.found: list[tuple[SecurityFinding, int, int]] = []
+
+    def _add(self, node: ast.AST, rule_id: str, category: str, message, symbol):
+        line = node.lineno
+        finding = SecurityFinding(
+            rule_id, category, line, message, symbol, _source_line(self.lines, line)
+        )
+        self.found.append((finding, line, node.end_lineno or line))
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                self.aliases[alias.asname] = alias.name
+            else:
+                root = alias.name.split(".")[0]
+                self.aliases[root] = root
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module:
+            for alias in node.names:
+                self.aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+
+    def visit_Call(self, node: ast.Call):
+        name = _qualified_name(node.func, self.aliases)
+        if name in _CALLS and not self._safe_yaml(name, node):
+            rule_id, message = _CALLS[name]
+            self._add(node, rule_id, CALL_FINDING, message, name)
+        elif name in _SUBPROCESS and any(
+            kw.arg == "shell"
+            and isinstance(kw.value, ast.Constant)
+            and kw.value.value is True
+            for kw in node.keywords
+        ):
+            message = f"Utilisation de '{name}()' avec shell=True"
+            self._add(node, "subprocess_shell", CALL_FINDING, message, name)
+        for keyword in node.keywords:
+            if keyword.arg:
+                self._check_value(keyword.value, keyword.arg)
+        self.generic_visit(node)
+
+    def _safe_yaml(self, name: str, node: ast.Call) -> bool:
+        if name != "yaml.load":
+            return False
+        loaders = [kw.value for kw in node.keywords if kw.arg == "Loader"]
+        loaders += node.args[1:2]
+        return any(
+            (_qualified_name(loader, self.aliases) or "").endswith(_SAFE_YAML_LOADERS)
+            for loader in loaders
+        )
+
+    def visit_Assign(self, node: ast.Assign):
+        for target in node.targets:
+            self._check_target(target, node.value)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        if node.value is not None:
+            self._check_target(node.target, node.value)
+        self.generic_visit(node)
+
+    def visit_Dict(self, node: ast.Dict):
+        for key, value in zip(node.keys, node.values, strict=True):
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                self._check_value(value, key.value)
+        self.generic_visit(node)
+
+    def _check_target(self, target: ast.AST, value: ast.AST):
+        if isinstance(target, ast.Name):
+            self._check_value(value, target.id)
+        elif isinstance(target, ast.Attribute):
+            self._check_value(value, target.attr)
+        elif isinstance(target, ast.Subscript):
+            key = target.slice
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                self._check_value(value, key.value)
+
+    def _check_value(self, value: ast.AST, name: str):
+        """Secret affecté à ``name`` (littéral, f-string ou jeton aléatoire)"""
+        if not self.check_secrets:
+            return
+        if isinstance(value, ast.Constant) and isinstance(value.value, str):
+            texts = [value.value]
+            if _SENSITIVE_NAME.search(name) and not _is_placeholder(name, value.value):
+                message = f"Secret en dur dans '{name}'"
+                self._add(value, "hardcoded_secret", SECRET_FINDING, message, name)
+                return
+        elif isinstance(value, ast.JoinedStr):
+            # Parties fixes d'une f-string
+            texts = [
+                part.value
+                for part in value.values
+                if isinstance(part, ast.Constant) and isinstance(part.value, str)
+            ]
+        else:
+            return
+        if any(_high_entropy_token(text) for text in texts):
+            message = f"Chaîne à forte entropie dans '{name}'"
+            self._add(value, "high_entropy_string", SECRET_FINDING, message, name)
+
+
+def _inline_suppressions(text: str) -> dict[int, set[str] | None]:
+    """Lignes portant un commentaire de suppression (None : toutes règles)"""
+    lowered = text.lower()
+    if "nosec" not in lowered and "athalia" not in lowered:
+        return {}
+    suppressions: dict[int, set[str] | None] = {}
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(text).readline))
+    except (tokenize.TokenError, SyntaxError):
+        return {}
+    for token in tokens:
+        if token.type != tokenize.COMMENT:
+            continue
+        match = _SUPPRESSION.search(token.string)
+        if match:
+            rules = match.group(1)
+            suppressions[token.start[0]] = (
+                {rule.strip() for rule in rules.split(",") if rule.strip()}
+                if rules
+                else None
+            )
+    return suppressions
+
+
+def _is_suppressed(
+    finding: SecurityFinding,
+    first: int,
+    last: int,
+    suppressions: dict[int, set[str] | None],
+) -> bool:
+    for line in range(first, last + 1):
+        if line in suppressions:
+            rules = suppressions[line]
+            if rules is None or {finding.rule_id, finding.category} & rules:
+                return True
+    return False
+
+
+def analyze_source(text: str, check_secrets: bool = True) -> FileFindings:
+    """Constats d'un fichier source et nombre de constats supprimés en ligne"""
+    lines = text.splitlines()
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        found = _regex_findings(text, lines, check_secrets)
+    else:
+        visitor = _SecurityVisitor(lines, check_secrets)
+        visitor.visit(tree)
+        found = visitor.found
+
+    suppressions = _inline_suppressions(text)
+    findings = []
+    suppressed = 0
+    for finding, first, last in found:
+        if suppressions and _is_suppressed(finding, first, last, suppressions):
+            suppressed += 1
+        else:
+            findings.append(finding)
+    findings.sort(key=lambda f: (f.line, f.rule_id))
+    return findings, suppressed
+
+
+def _regex_findings(text: str, lines: list[str], check_secrets: bool):
+    """Repli par règles regex pour un fichier que l'AST ne lit pas"""
+    categories = [DANGEROUS_CALLS]
+    if check_secrets:
+        categories.append(HARDCODED_SECRETS)
+    found = []
+    for match in RULES.ruleset(*categories).scan(text):
+        rule = match.rule
+        finding = SecurityFinding(
+            rule.rule_id,
+            CALL_FINDING if rule.category == DANGEROUS_CALLS else SECRET_FINDING,
+            match.line,
+            rule.description,
+            match.text,
+            _source_line(lines, match.line),
+        )
+        found.append((finding, match.line, match.line))
+    return found
+
+
+def fingerprint(path: str, finding: SecurityFinding) -> str:
+    """Empreinte stable d'un constat (indépendante du numéro de ligne)"""
+    key = f"{path}:{finding.rule_id}:{finding.symbol}:{finding.source}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _is_test_path(relative: str) -> bool:
+    path = Path(relative)
+    return path.name == "conftest.py" or bool(_TEST_DIRS & set(path.parts[:-1]))
+
+
+class SecurityFindingIndex:
+    """Constats par hash de contenu, persistés en SQLite
+
+    Args:
+        db_path: base de l'index
+        max_entries: contenus conservés (les moins récemment vus sont purgés)
+    """
+
+    def __init__(self, db_path: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.store = get_sqlite_store(self.db_path)
+        self._init_database()
+
+    def _init_database(self):
+        with self.store.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != INDEX_VERSION:
+                conn.execute("DROP TABLE IF EXISTS file_findings")
+                conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS file_findings (
+                    content_hash TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    last_seen REAL NOT NULL
+                )
+            """
+            )
+
+    def get_many(self, hashes: list[str]) -> dict[str, FileFindings]:
+        """Constats indexés (et supprimés en ligne) des contenus connus"""
+        known = {}
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.store.query(
+                "SELECT content_hash, payload FROM file_findings "
+                f"WHERE content_hash IN ({placeholders})",
+                chunk,
+            )
+            for content_hash, payload in rows:
+                data = json.loads(payload)
+                findings = [SecurityFinding(**item) for item in data["findings"]]
+                known[content_hash] = (findings, data["suppressed"])
+        if known:
+            now = time.time()
+            self.store.insert_many(
+                "UPDATE file_findings SET last_seen = ? WHERE content_hash = ?",
+                [(now, content_hash) for content_hash in known],
+            )
+        return known
+
+    def set_many(self, entries: dict[str, FileFindings]):
+        now = time.time()
+        rows = [
+            (
+                content_hash,
+                json.dumps(
+                    {
+                        "findings": [asdict(finding) for finding in findings],
+                        "suppressed": suppressed,
+                    }
+                ),
+                now,
+            )
+            for content_hash, (findings, suppressed) in entries.items()
+        ]
+        self.store.insert_many(
+            "INSERT OR REPLACE INTO file_findings (content_hash, payload, last_seen) "
+            "VALUES (?, ?, ?)",
+            rows,
+        )
+
+    def prune(self):
+        """Purger les contenus les moins récemment vus au-delà de la limite"""
+        count = self.store.query("SELECT COUNT(*) FROM file_findings")[0][0]
+        if count > self.max_entries:
+            self.store.execute(
+                "DELETE FROM file_findings WHERE content_hash NOT IN ("
+                "SELECT content_hash FROM file_findings "
+                "ORDER BY last_seen DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+
+class SecurityScanner:
+    """Détecteur de sécurité incrémental d'un projet
+
+    Args:
+        project_path: racine du projet
+        snapshot: instantané partagé des fichiers (construit sinon)
+        index_path: base de l'index (``None`` : dans ``.athalia_cache``)
+        baseline_path: baseline des constats acceptés
+        use_index: mémoriser les constats par hash de contenu
+    """
+
+    def __init__(
+        self,
+        project_path: str | Path = ".",
+        snapshot: ProjectSnapshot = None,
+        index_path: str | Path | None = None,
+        baseline_path: str | Path | None = None,
+        use_index: bool = True,
+    ):
+        self.project_path = Path(project_path)
+        self.snapshot = snapshot_for(self.project_path, snapshot)
+        self.baseline_path = Path(baseline_path or self.project_path / BASELINE_FILE)
+        self.index = None
+        if use_index:
+            index_path = index_path or (
+                self.project_path / ".athalia_cache" / "security_index.db"
+            )
+            try:
+                self.index = SecurityFindingIndex(index_path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"⚠️ Index de sécurité indisponible: {e}")
+
+    def scan(self) -> SecurityScanReport:
+        """Analyser les fichiers Python (constats supprimés exclus)"""
+        report = SecurityScanReport()
+        files: list[tuple[FileEntry, str]] = []
+        for entry in self.snapshot.python_files():
+            text = entry.read_text()
+            if text is None:
+                logger.debug(f"Fichier illisible ignoré: {entry.path}")
+                continue
+            files.append((entry, text))
+
+        hashes = [self._content_hash(entry, text) for entry, text in files]
+        known = self._lookup(hashes)
+        fresh = {}
+        baseline = self.load_baseline()
+        for (entry, text), content_hash in zip(files, hashes, strict=True):
+            cached = known.get(content_hash) or fresh.get(content_hash)
+            if cached is None:
+                cached = analyze_source(text, not _is_test_path(entry.relative))
+                fresh[content_hash] = cached
+                report.analyzed += 1
+            else:
+                report.reused += 1
+            findings, suppressed = cached
+            report.suppressed += suppressed
+            relative = Path(entry.relative).as_posix()
+            for finding in findings:
+                located = replace(
+                    finding, path=relative, fingerprint=fingerprint(relative, finding)
+                )
+                if located.fingerprint in baseline:
+                    report.baselined += 1
+                else:
+                    report.findings.append(located)
+
+        self._store(fresh)
+        logger.info(
+            f"🛡️ {len(report.findings)} constats de sécurité "
+            f"({report.analyzed} fichiers analysés, {report.reused} repris de l'index)"
+        )
+        return report
+
+    @staticmethod
+    def _content_hash(entry: FileEntry, text: str) -> str:
+        # Les secrets des tests sont ignorés : le chemin compte aussi
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16)
+        if _is_test_path(entry.relative):
+            digest.update(b"\0test")
+        return digest.hexdigest()
+
+    def _lookup(self, hashes: list[str]) -> dict[str, FileFindings]:
+        if self.index is None or not hashes:
+            return {}
+        try:
+            return self.index.get_many(sorted(set(hashes)))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Lecture de l'index de sécurité impossible: {e}")
+            return {}
+
+    def _store(self, fresh: dict[str, FileFindings]):
+        if self.index is None or not fresh:
+            return
+        try:
+            self.index.set_many(fresh)
+            self.index.prune()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Écriture de l'index de sécurité impossible: {e}")
+
+    def load_baseline(self) -> set[str]:
+        """Empreintes des constats acceptés"""
+        try:
+            data = json.loads(self.baseline_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return set()
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Baseline de sécurité illisible: {e}")
+            return set()
+        return {item["fingerprint"] for item in data.get("findings", [])}
+
+    def write_baseline(self, report: SecurityScanReport) -> Path:
+        """Accepter les constats du rapport (ajoutés à la baseline existante)"""
+        try:
+            data = json.loads(self.baseline_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        entries: dict[str, dict[str, Any]] = {
+            item["fingerprint"]: item for item in data.get("findings", [])
+        }
+        for finding in report.findings:
+            entries[finding.fingerprint] = {
+                "fingerprint": finding.fingerprint,
+                "path": finding.path,
+                "rule_id": finding.rule_id,
+                "line": finding.line,
+                "message": finding.message,
+            }
+        baseline = {
+            "version": 1,
+            "findings": sorted(
+                entries.values(), key=lambda item: (item["path"], item["line"])
+            ),
+        }
+        self.baseline_path.write_text(
+            json.dumps(baseline, indent=2, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+        return self.baseline_path
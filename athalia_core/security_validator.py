@@ -72,6 +72,9 @@ class SecurityValidator:
             "flake8",
             "black",
             "mypy",
+            "ruff",
+            "isort",
+            "coverage",
             # Commandes de développement
             "git",
             "git status",
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+🗄️ COUCHE D'ÉCRITURE SQLITE PARTAGÉE
+====================================
+Accès commun aux bases d'analyse et d'apprentissage (mémoire intelligente,
+patterns, performance, architecture, dashboard) :
+
+- connexions longues (une de lecture par thread, une d'écriture partagée)
+  au lieu d'un ``sqlite3.connect`` par opération ; les requêtes préparées
+  restent ainsi dans le cache de chaque connexion
+- journal WAL et ``synchronous=NORMAL`` : lectures concurrentes des
+  écritures, pas de fsync à chaque transaction
+- insertions mises en tampon et écrites par ``executemany`` dans une seule
+  transaction, au-delà d'un nombre de lignes ou d'un délai
+
+Les lectures passant par le store vident d'abord le tampon : le processus
+relit toujours ses propres écritures. Les autres processus les voient au
+plus tard après ``flush_interval``.
+"""
+
+import atexit
+import logging
+import sqlite3
+import threading
+import weakref
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Stores vivants, vidés à la sortie du processus
+_live_stores: "weakref.WeakSet[SQLiteStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_stores():
+    for store in list(_live_stores):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.warning(f"⚠️ Écritures SQLite en attente perdues: {e}")
+
+
+class SQLiteStore:
+    """Base SQLite à connexions longues et insertions groupées
+
+    Args:
+        db_path: chemin de la base
+        batch_size: lignes en attente déclenchant l'écriture
+        flush_interval: délai maximal avant écriture des lignes en attente
+        timeout: attente maximale d'un verrou tenu par un autre processus
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        timeout: float = 30.0,
+    ):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.stats = {"buffered": 0, "flushed": 0, "flushes": 0}
+        self._pending: dict[str, list[Sequence[Any]]] = {}
+        self._pending_rows = 0
+        self._timer: threading.Timer | None = None
+        self._write_lock = threading.RLock()
+        self._pending_lock = threading.Lock()
+        self._local = threading.local()
+        self._writer: sqlite3.Connection | None = None
+        self._readers: list[sqlite3.Connection] = []
+        _live_stores.add(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        """Connexion d'écriture (à utiliser sous ``_write_lock``)"""
+        if self._writer is None:
+            self._writer = self._connect()
+        return self._writer
+
+    def connection(self) -> sqlite3.Connection:
+        """Connexion de lecture du thread courant"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._pending_lock:
+                self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transaction d'écriture (validée en sortie, annulée sur exception)
+
+        Les insertions en attente sont écrites avant.
+        """
+        with self._write_lock:
+            self.flush()
+            conn = self.writer
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        """Écriture immédiate (``lastrowid``, ``rowcount`` disponibles)"""
+        with self.transaction() as conn:
+            return conn.execute(sql, params)
+
+    @contextmanager
+    def reading(self) -> Iterator[sqlite3.Connection]:
+        """Connexion de lecture (insertions en attente écrites avant)"""
+        if self._pending_rows:
+            self.flush()
+        yield self.connection()
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> list[tuple]:
+        """Lecture (après écriture des insertions en attente)"""
+        with self.reading() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def insert(self, sql: str, params: Sequence[Any]):
+        """Insertion différée (écrite par lot)"""
+        self.insert_many(sql, (params,))
+
+    def insert_many(self, sql: str, rows: Iterable[Sequence[Any]]):
+        """Insertions différées d'une même requête"""
+        rows = list(rows)
+        if not rows:
+            return
+        with self._pending_lock:
+            self._pending.setdefault(sql, []).extend(rows)
+            self._pending_rows += len(rows)
+            self.stats["buffered"] += len(rows)
+            full = self._pending_rows >= self.batch_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Écrit les insertions en attente en une transaction"""
+        with self._write_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                rows, self._pending_rows = self._pending_rows, 0
+                timer, self._timer = self._timer, None
+            if timer is not None and timer is not threading.current_thread():
+                timer.cancel()
+            if not pending:
+                return 0
+
+            conn = self.writer
+            try:
+                for sql, batch in pending.items():
+                    conn.executemany(sql, batch)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.error(f"❌ Écriture groupée échouée ({rows} lignes)")
+                raise
+            self.stats["flushed"] += rows
+            self.stats["flushes"] += 1
+            return rows
+
+    def close(self):
+        """Écrit les insertions en attente et ferme les connexions"""
+        self.flush()
+        with self._write_lock, self._pending_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._local = threading.local()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+# Stores partagés, un par base (libérés quand plus personne ne les utilise)
+_shared_stores: "weakref.WeakValueDictionary[Path, SQLiteStore]" = (
+    weakref.WeakValueDictionary()
+)
+_shared_lock = threading.Lock()
+
+
+def get_sqlite_store(db_path: str | Path) -> SQLiteStore:
+    """Retourne le store partagé d'une base
+
+    Un store dont le fichier a disparu (base supprimée ou recréée) est
+    remplacé : ses connexions pointeraient sur l'ancien fichier.
+    """
+    key = Path(db_path).resolve()
+    with _shared_lock:
+        store = _shared_stores.get(key)
+        if store is not None and not key.exists():
+            store.close()
+            store = None
+        if store is None:
+            store = SQLiteStore(key)
+            _shared_stores[key] = store
+        return store
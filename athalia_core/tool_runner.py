@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""
+🧰 EXÉCUTION PARALLÈLE ET INCRÉMENTALE DES OUTILS EXTERNES
+==========================================================
+Lance les outils de qualité (ruff, black, isort, mypy, bandit, coverage)
+pour le linter :
+
+- les outils sont indépendants : chacun tourne dans son propre thread,
+  la durée totale est celle du plus lent au lieu de la somme
+- sorties JSON quand l'outil en propose (``ruff --output-format=json``,
+  ``bandit -f json``), texte brut sinon ; une sortie illisible est
+  remontée ligne par ligne
+- mode incrémental pour les outils qui analysent chaque fichier
+  isolément : les constats sont mémorisés par fichier dans
+  ``.athalia_cache/tool_results.db``, indexés par hash du contenu, version
+  de l'outil et configuration du projet. Seuls les fichiers modifiés (ou
+  la liste demandée) sont passés à l'outil, qui applique quand même les
+  exclusions du projet (``ruff --force-exclude``, ``isort --filter-files``).
+  black ignore ses exclusions pour un fichier cité : sans liste demandée,
+  il porte sur le projet entier.
+
+mypy et coverage portent sur le projet entier (analyse inter-modules,
+exécution des tests) et ne sont jamais mis en cache. Complexité et
+documentation sont calculées en processus (``code_metrics``).
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .project_snapshot import FileEntry, ProjectSnapshot, snapshot_for
+from .security_validator import validate_and_run
+from .sqlite_store import get_sqlite_store
+
+logger = logging.getLogger(__name__)
+
+# Format des constats mémorisés : à incrémenter s'il change
+CACHE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 50_000
+# Fichiers passés par invocation (limite de longueur de ligne de commande)
+BATCH_SIZE = 200
+COVERAGE_THRESHOLD = 80
+
+# Configuration du projet prise en compte dans les clés du cache
+CONFIG_FILES = (
+    "pyproject.toml",
+    "setup.cfg",
+    "tox.ini",
+    "ruff.toml",
+    ".ruff.toml",
+    ".isort.cfg",
+    "mypy.ini",
+    ".bandit",
+)
+
+
+class ToolExecutionError(RuntimeError):
+    """Code de sortie anormal d'un outil"""
+
+
+@dataclass(frozen=True)
+class ToolIssue:
+    """Constat d'un outil (``path`` à ``None`` si non attribuable)"""
+
+    path: str | None
+    line: int
+    code: str
+    message: str
+
+    def __str__(self) -> str:
+        if self.path is None:
+            return self.message
+        location = f"{self.path}:{self.line}" if self.line else self.path
+        parts = (f"{location}:", self.code, self.message)
+        return " ".join(part for part in parts if part)
+
+
+@dataclass
+class ToolResult:
+    """Résultat d'un outil
+
+    ``checked`` : fichiers passés à l'outil, ``cached`` : fichiers repris du
+    cache (tous deux nuls pour une exécution sur le projet entier).
+    """
+
+    name: str
+    issues: list[ToolIssue] = field(default_factory=list)
+    error: str | None = None
+    checked: int = 0
+    cached: int = 0
+    duration: float = 0.0
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Description d'un outil
+
+    Args:
+        name: nom de l'outil
+        command: ligne de commande pour des cibles (fichiers ou projet)
+        parse: constats depuis ``(stdout, stderr, code de sortie)``
+        per_file: constats d'un fichier indépendants des autres fichiers
+            (condition du mode incrémental)
+        ok_codes: codes de sortie normaux (au-delà : échec de l'outil)
+        timeout: délai maximal d'une invocation
+        followup: commande lancée après une première commande réussie,
+            dont la sortie est analysée à la place
+        honors_excludes: l'outil applique les exclusions du projet aux
+            fichiers cités ; sinon, sans liste demandée, il porte sur le
+            projet entier
+    """
+
+    name: str
+    command: Callable[[list[str]], list[str]]
+    parse: Callable[[str, str, int], list[ToolIssue]]
+    per_file: bool = True
+    ok_codes: tuple[int, ...] = (0, 1)
+    timeout: int = 30
+    followup: tuple[str, ...] = ()
+    honors_excludes: bool = True
+
+    @property
+    def executable(self) -> str:
+        return self.command([])[0]
+
+
+def _load_json(text: str):
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _text_issues(text: str) -> list[ToolIssue]:
+    """Sortie non structurée : un constat non attribué par ligne"""
+    return [ToolIssue(None, 0, "", line) for line in text.splitlines() if line.strip()]
+
+
+def parse_ruff(stdout: str, stderr: str, returncode: int) -> list[ToolIssue]:
+    data = _load_json(stdout)
+    if not isinstance(data, list):
+        return _text_issues(stdout)
+    return [
+        ToolIssue(
+            item.get("filename"),
+            (item.get("location") or {}).get("row", 0),
+            item.get("code") or "",
+            item.get("message", ""),
+        )
+        for item in data
+    ]
+
+
+def parse_bandit(stdout: str, stderr: str, returncode: int) -> list[ToolIssue]:
+    data = _load_json(stdout)
+    if not isinstance(data, dict):
+        return _text_issues(stdout)
+    return [
+        ToolIssue(
+            item.get("filename"),
+            item.get("line_number", 0),
+            item.get("test_id", ""),
+            f"[{item.get('issue_severity', '?')}] {item.get('issue_text', '')}",
+        )
+        for item in data.get("results", [])
+    ]
+
+
+def _reformat_parser(pattern: str, code: str, message: str):
+    """Outils de vérification (black, isort) : un constat par fichier cité"""
+    compiled = re.compile(pattern, re.MULTILINE)
+
+    def parse(stdout: str, stderr: str, returncode: int) -> list[ToolIssue]:
+        output = f"{stdout}\n{stderr}"
+        issues = [
+            ToolIssue(match.group(1).strip(), 0, code, message)
+            for match in compiled.finditer(output)
+        ]
+        if not issues and returncode != 0:
+            issues = [ToolIssue(None, 0, code, output.strip() or message)]
+        return issues
+
+    return parse
+
+
+parse_black = _reformat_parser(
+    r"^would reformat (.+)$", "black", "formatage à corriger"
+)
+parse_isort = _reformat_parser(
+    r"^ERROR: (.+?) Imports are incorrectly sorted", "isort", "imports à trier"
+)
+
+
+def parse_mypy(stdout: str, stderr: str, returncode: int) -> list[ToolIssue]:
+    # Lignes brutes ; le résumé final (« Success: », « Found N errors »)
+    # n'est pas un constat
+    return [
+        issue
+        for issue in _text_issues(stdout)
+        if not issue.message.startswith(("Success:", "Found "))
+    ]
+
+
+def parse_coverage(stdout: str, stderr: str, returncode: int) -> list[ToolIssue]:
+    # Ligne « TOTAL » de ``coverage report`` ; constat sous le seuil seulement
+    for line in stdout.splitlines():
+        parts = line.split()
+        if parts[:1] != ["TOTAL"] or len(parts) < 4:
+            continue
+        try:
+            coverage = int(float(parts[-1].rstrip("%")))
+        except ValueError:
+            return []
+        if coverage >= COVERAGE_THRESHOLD:
+            return []
+        return [
+            ToolIssue(None, 0, "coverage", f"Couverture de tests faible: {coverage}%")
+        ]
+    return []
+
+
+TOOLS = {
+    spec.name: spec
+    for spec in (
+        ToolSpec(
+            "ruff",
+            lambda targets: [
+                "ruff",
+                "check",
+                "--force-exclude",
+                "--output-format=json",
+                *targets,
+            ],
+            parse_ruff,
+        ),
+        # ``black --force-exclude`` attend une expression régulière : les
+        # ``exclude`` de la configuration ne s'appliquent qu'au parcours
+        ToolSpec(
+            "black",
+            lambda targets: ["black", "--check", *targets],
+            parse_black,
+            honors_excludes=False,
+        ),
+        ToolSpec(
+            "isort",
+            lambda targets: ["isort", "--check-only", "--filter-files", *targets],
+            parse_isort,
+        ),
+        ToolSpec(
+            "mypy",
+            lambda targets: ["mypy", *targets],
+            parse_mypy,
+            per_file=False,
+        ),
+        ToolSpec(
+            "bandit",
+            lambda targets: ["bandit", "-f", "json", "-q", "-r", *targets],
+            parse_bandit,
+        ),
+        ToolSpec(
+            "coverage",
+            lambda targets: ["coverage", "run", "-m", "pytest", *targets],
+            parse_coverage,
+            per_file=False,
+            # 1 : tests en échec, 5 : aucun test collecté
+            ok_codes=(0, 1, 5),
+            timeout=60,
+            followup=("coverage", "report"),
+        ),
+    )
+}
+
+
+class ToolResultCache:
+    """Constats par fichier, persistés en SQLite
+
+    Args:
+        db_path: base du cache
+        max_entries: entrées conservées (les moins récemment vues sont purgées)
+    """
+
+    def __init__(self, db_path: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.store = get_sqlite_store(self.db_path)
+        self._init_database()
+
+    def _init_database(self):
+        with self.store.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != CACHE_VERSION:
+                conn.execute("DROP TABLE IF EXISTS tool_results")
+                conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tool_results (
+                    cache_key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    last_seen REAL NOT NULL
+                )
+            """
+            )
+
+    def get_many(self, keys: list[str]) -> dict[str, list[list]]:
+        """Constats mémorisés ``[ligne, code, message]`` des clés connues"""
+        known = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.store.query(
+                "SELECT cache_key, payload FROM tool_results "
+                f"WHERE cache_key IN ({placeholders})",
+                chunk,
+            )
+            known.update((key, json.loads(payload)) for key, payload in rows)
+        if known:
+            now = time.time()
+            self.store.insert_many(
+                "UPDATE tool_results SET last_seen = ? WHERE cache_key = ?",
+                [(now, key) for key in known],
+            )
+        return known
+
+    def set_many(self, entries: dict[str, list[ToolIssue]]):
+        now = time.time()
+        rows = [
+            (
+                key,
+                json.dumps(
+                    [[issue.line, issue.code, issue.message] for issue in issues]
+                ),
+                now,
+            )
+            for key, issues in entries.items()
+        ]
+        self.store.insert_many(
+            "INSERT OR REPLACE INTO tool_results (cache_key, payload, last_seen) "
+            "VALUES (?, ?, ?)",
+            rows,
+        )
+
+    def prune(self):
+        """Purger les entrées les moins récemment vues au-delà de la limite"""
+        count = self.store.query("SELECT COUNT(*) FROM tool_results")[0][0]
+        if count > self.max_entries:
+            self.store.execute(
+                "DELETE FROM tool_results WHERE cache_key NOT IN ("
+                "SELECT cache_key FROM tool_results "
+                "ORDER BY last_seen DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+
+def _output(value) -> str:
+    return value if isinstance(value, str) else ""
+
+
+class ToolRunner:
+    """Exécution des outils externes d'un projet
+
+    Args:
+        project_path: racine du projet
+        snapshot: instantané partagé des fichiers (construit sinon)
+        run_command: exécution d'une commande (``validate_and_run`` par défaut)
+        cache_path: base du cache (``None`` : dans ``.athalia_cache``)
+        use_cache: mémoriser les constats par fichier
+        max_workers: outils exécutés simultanément (tous par défaut)
+    """
+
+    def __init__(
+        self,
+        project_path: str | Path = ".",
+        snapshot: ProjectSnapshot = None,
+        run_command: Callable = None,
+        cache_path: str | Path | None = None,
+        use_cache: bool = True,
+        max_workers: int = None,
+    ):
+        self.project_path = Path(project_path)
+        self.snapshot = snapshot_for(self.project_path, snapshot)
+        self.run_command = run_command or validate_and_run
+        self.max_workers = max_workers
+        self.cache = None
+        if use_cache:
+            cache_path = cache_path or (
+                self.project_path / ".athalia_cache" / "tool_results.db"
+            )
+            try:
+                self.cache = ToolResultCache(cache_path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"⚠️ Cache des outils indisponible: {e}")
+        self._fingerprints: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        tools: Iterable[str | ToolSpec],
+        files: Iterable[str | Path] | None = None,
+        incremental: bool = True,
+    ) -> dict[str, ToolResult]:
+        """Exécuter des outils en parallèle
+
+        Args:
+            tools: noms (voir ``TOOLS``) ou descriptions d'outils
+            files: fichiers à analyser (tous les fichiers Python sinon, ou le
+                projet entier pour un outil qui ignore alors les exclusions)
+            incremental: fichier par fichier avec cache ; sinon une
+                invocation par outil sur le projet entier
+
+        Returns:
+            Résultats par nom d'outil, dans l'ordre demandé
+        """
+        specs = [TOOLS[tool] if isinstance(tool, str) else tool for tool in tools]
+        entries = self._select(files) if incremental else None
+        if not specs:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers or len(specs), thread_name_prefix="tools"
+        ) as executor:
+            futures = {
+                spec.name: executor.submit(
+                    self.run_tool,
+                    spec,
+                    entries if files is not None or spec.honors_excludes else None,
+                )
+                for spec in specs
+            }
+        results = {name: future.result() for name, future in futures.items()}
+        logger.info(
+            "🧰 Outils: "
+            + ", ".join(
+                f"{result.name} {result.duration:.1f}s"
+                + (f" ({result.cached} en cache)" if result.cached else "")
+                for result in results.values()
+            )
+        )
+        return results
+
+    def run_tool(
+        self, spec: ToolSpec, entries: list[FileEntry] | None = None
+    ) -> ToolResult:
+        """Exécuter un outil (projet entier si ``entries`` vaut ``None``)"""
+        started = time.perf_counter()
+        result = ToolResult(spec.name)
+        try:
+            if entries is None or not spec.per_file:
+                result.issues = self._execute(spec, [str(self.project_path)])
+            else:
+                self._run_incremental(spec, entries, result)
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        result.duration = time.perf_counter() - started
+        return result
+
+    def _select(self, files: Iterable[str | Path] | None) -> list[FileEntry]:
+        if files is None:
+            return self.snapshot.python_files()
+        entries = {}
+        for path in files:
+            entry = self.snapshot.get(path)
+            if entry is None:
+                logger.debug(f"Fichier hors du projet ignoré: {path}")
+            else:
+                entries.setdefault(entry.relative, entry)
+        return list(entries.values())
+
+    def _execute(self, spec: ToolSpec, targets: list[str]) -> list[ToolIssue]:
+        completed = self.run_command(
+            spec.command(targets),
+            capture_output=True,
+            text=True,
+            timeout=spec.timeout,
+        )
+        returncode = completed.returncode
+        if returncode not in spec.ok_codes:
+            details = _output(completed.stderr).strip() or _output(completed.stdout)
+            raise ToolExecutionError(f"code de sortie {returncode}: {details[:200]}")
+        if spec.followup:
+            if returncode != 0:
+                return []
+            completed = self.run_command(
+                list(spec.followup),
+                capture_output=True,
+                text=True,
+                timeout=spec.timeout,
+            )
+        issues = spec.parse(
+            _output(completed.stdout), _output(completed.stderr), returncode
+        )
+        return [self._localize(issue) for issue in issues]
+
+    def _localize(self, issue: ToolIssue) -> ToolIssue:
+        """Chemins des constats relatifs à la racine du projet"""
+        if issue.path is None:
+            return issue
+        try:
+            relative = Path(issue.path).resolve().relative_to(
+                self.project_path.resolve()
+            )
+        except (OSError, ValueError):
+            return issue
+        return ToolIssue(relative.as_posix(), issue.line, issue.code, issue.message)
+
+    def _run_incremental(
+        self, spec: ToolSpec, entries: list[FileEntry], result: ToolResult
+    ):
+        keys = self._cache_keys(spec, entries) if self.cache else {}
+        known = self._lookup(sorted(set(keys.values())))
+        by_path: dict[str | None, list[ToolIssue]] = {}
+        pending = []
+        for entry in entries:
+            relative = Path(entry.relative).as_posix()
+            cached = known.get(keys.get(entry.relative))
+            if cached is None:
+                pending.append(entry)
+                continue
+            result.cached += 1
+            by_path[relative] = [
+                ToolIssue(relative, line, code, message)
+                for line, code, message in cached
+            ]
+
+        fresh = {}
+        for start in range(0, len(pending), BATCH_SIZE):
+            batch = pending[start : start + BATCH_SIZE]
+            issues = self._execute(spec, [str(entry.path) for entry in batch])
+            result.checked += len(batch)
+            reported: dict[str | None, list[ToolIssue]] = {}
+            for issue in issues:
+                reported.setdefault(issue.path, []).append(issue)
+            for path, path_issues in reported.items():
+                by_path.setdefault(path, []).extend(path_issues)
+            # Une sortie non attribuable ne permet pas de mémoriser le lot
+            if None in reported:
+                continue
+            for entry in batch:
+                key = keys.get(entry.relative)
+                if key is not None:
+                    relative = Path(entry.relative).as_posix()
+                    fresh[key] = reported.get(relative, [])
+
+        self._store(fresh)
+        # Constats dans l'ordre des fichiers, puis ceux hors liste
+        order = [Path(entry.relative).as_posix() for entry in entries]
+        for path in order + [path for path in by_path if path not in order]:
+            result.issues.extend(sorted(by_path.get(path, []), key=_issue_line))
+
+    def _cache_keys(self, spec: ToolSpec, entries: list[FileEntry]) -> dict[str, str]:
+        """Clé de cache par fichier lisible (chemin relatif -> clé)"""
+        fingerprint = self._fingerprint(spec)
+        keys = {}
+        for entry in entries:
+            text = entry.read_text()
+            if text is None:
+                continue
+            digest = hashlib.blake2b(digest_size=16)
+            for part in (fingerprint, Path(entry.relative).as_posix(), text):
+                digest.update(part.encode("utf-8", "surrogatepass") + b"\0")
+            keys[entry.relative] = digest.hexdigest()
+        return keys
+
+    def _fingerprint(self, spec: ToolSpec) -> str:
+        """Version de l'outil et configuration du projet (mémorisées)"""
+        with self._lock:
+            fingerprint = self._fingerprints.get(spec.name)
+        if fingerprint is not None:
+            return fingerprint
+        completed = self.run_command(
+            [spec.executable, "--version"], capture_output=True, text=True, timeout=10
+        )
+        version = _output(completed.stdout).strip() or _output(completed.stderr)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{spec.name}\0{version.strip()}\0".encode())
+        for name in CONFIG_FILES:
+            entry = self.snapshot.get(name)
+            if entry is not None:
+                digest.update(f"{name}\0{entry.read_text() or ''}\0".encode())
+        fingerprint = digest.hexdigest()
+        with self._lock:
+            self._fingerprints[spec.name] = fingerprint
+        return fingerprint
+
+    def _lookup(self, keys: list[str]) -> dict[str, list[list]]:
+        if self.cache is None or not keys:
+            return {}
+        try:
+            return self.cache.get_many(keys)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Lecture du cache des outils impossible: {e}")
+            return {}
+
+    def _store(self, fresh: dict[str, list[ToolIssue]]):
+        if self.cache is None or not fresh:
+            return
+        try:
+            self.cache.set_many(fresh)
+            self.cache.prune()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Écriture du cache des outils impossible: {e}")
+
+
+def _issue_line(issue: ToolIssue) -> int:
+    return issue.line
@@ -6,90 +6,136 @@ Coordination centralisée de tous les modules
 
 import json
 import logging
+import threading
+import time
+from collections import ChainMap
+from collections.abc import Callable
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Any
 
-# Imports des modules Athalia
-from .ai_robust import RobustAI
-from .auto_cicd import AutoCICD
-from .auto_cleaner import AutoCleaner
-from .auto_documenter import AutoDocumenter
-from .auto_tester import AutoTester
 from .cache_manager import cache_result, get_cache_stats, get_cached_result
-from .code_linter import CodeLinter
-from .correction_optimizer import CorrectionOptimizer
-from .generation import generate_project
-from .security_auditor import SecurityAuditor
+from .lazy_imports import LazyAvailability, LazyInstance, lazy_attribute
+from .project_snapshot import ProjectSnapshot
+from .workflow_checkpoint import WorkflowCheckpoint
+from .workflow_scheduler import StepResult, WorkflowScheduler, WorkflowStep
 
 logger = logging.getLogger(__name__)
 
-# Imports des modules avancés
-try:
-    from .advanced_modules.auto_correction_advanced import AutoCorrectionAvancee
-
-    ADVANCED_MODULES_AVAILABLE = True
-except ImportError:
-    ADVANCED_MODULES_AVAILABLE = False
-    logger.warning("⚠️ Modules avancés non disponibles - mode fallback activé")
-
-# Imports des nouveaux modules IA et distillation
-try:
-    from .agents.audit_agent import AuditAgent
-    from .agents.context_prompt import ContextPromptAgent
-    from .agents.unified_agent import UnifiedAgent
-    from .distillation.code_genetics import CodeGenetics
-    from .distillation.quality_scorer import QualityScorer
-    from .distillation.response_distiller import ResponseDistiller
-
-    AI_MODULES_AVAILABLE = True
-except ImportError:
-    AI_MODULES_AVAILABLE = False
-    logger.warning("⚠️ Modules IA non disponibles - mode fallback activé")
-
-# Import des modules robotiques
-try:
-    from athalia_core.robotics import (
-        DockerRoboticsManager,
-        ReachyAuditor,
-        RoboticsCI,
-        ROS2Validator,
-        RustAnalyzer,
-    )
-
-    ROBOTICS_MODULES_AVAILABLE = True
-except ImportError:
-    ROBOTICS_MODULES_AVAILABLE = False
-    logger.warning("⚠️ Modules robotiques non disponibles - mode fallback activé")
-
-# Import des templates artistiques
-try:
-    from athalia_core.templates.artistic_templates import get_artistic_templates
-    from athalia_core.templates.base_templates import get_base_templates
-
-    ARTISTIC_MODULES_AVAILABLE = True
-except ImportError:
-    ARTISTIC_MODULES_AVAILABLE = False
-    logger.warning("⚠️ Modules artistiques non disponibles - mode fallback activé")
-
-# Import des modules de classification avancée
-try:
-    from athalia_core.classification.project_classifier import classify_project_type
-    from athalia_core.classification.project_types import (
-        get_project_config,
-    )
-
-    CLASSIFICATION_MODULES_AVAILABLE = True
-except ImportError:
-    CLASSIFICATION_MODULES_AVAILABLE = False
-    logger.warning("⚠️ Modules de classification non disponibles - mode fallback activé")
+# Modules Athalia : importés au premier usage, chaque module n'étant construit
+# qu'au moment où une étape du workflow en a besoin
+RobustAI = lazy_attribute("athalia_core.ai_robust", "RobustAI")
+AutoCICD = lazy_attribute("athalia_core.auto_cicd", "AutoCICD")
+AutoCleaner = lazy_attribute("athalia_core.auto_cleaner", "AutoCleaner")
+AutoDocumenter = lazy_attribute("athalia_core.auto_documenter", "AutoDocumenter")
+AutoTester = lazy_attribute("athalia_core.auto_tester", "AutoTester")
+CodeLinter = lazy_attribute("athalia_core.code_linter", "CodeLinter")
+CorrectionOptimizer = lazy_attribute(
+    "athalia_core.correction_optimizer", "CorrectionOptimizer"
+)
+generate_project = lazy_attribute("athalia_core.generation", "generate_project")
+SecurityAuditor = lazy_attribute("athalia_core.security_auditor", "SecurityAuditor")
+
+# Modules optionnels : leur disponibilité n'est vérifiée (par import) qu'au
+# premier test, lors de l'initialisation des modules
+AutoCorrectionAvancee = lazy_attribute(
+    "athalia_core.advanced_modules.auto_correction_advanced", "AutoCorrectionAvancee"
+)
+ADVANCED_MODULES_AVAILABLE = LazyAvailability(
+    AutoCorrectionAvancee,
+    warning="⚠️ Modules avancés non disponibles - mode fallback activé",
+)
+
+AuditAgent = lazy_attribute("athalia_core.agents.audit_agent", "AuditAgent")
+ContextPromptAgent = lazy_attribute(
+    "athalia_core.agents.context_prompt", "ContextPromptAgent"
+)
+UnifiedAgent = lazy_attribute("athalia_core.agents.unified_agent", "UnifiedAgent")
+CodeGenetics = lazy_attribute("athalia_core.distillation.code_genetics", "CodeGenetics")
+QualityScorer = lazy_attribute(
+    "athalia_core.distillation.quality_scorer", "QualityScorer"
+)
+ResponseDistiller = lazy_attribute(
+    "athalia_core.distillation.response_distiller", "ResponseDistiller"
+)
+AI_MODULES_AVAILABLE = LazyAvailability(
+    AuditAgent,
+    ContextPromptAgent,
+    UnifiedAgent,
+    CodeGenetics,
+    QualityScorer,
+    ResponseDistiller,
+    warning="⚠️ Modules IA non disponibles - mode fallback activé",
+)
+
+DockerRoboticsManager = lazy_attribute("athalia_core.robotics", "DockerRoboticsManager")
+ReachyAuditor = lazy_attribute("athalia_core.robotics", "ReachyAuditor")
+RoboticsCI = lazy_attribute("athalia_core.robotics", "RoboticsCI")
+ROS2Validator = lazy_attribute("athalia_core.robotics", "ROS2Validator")
+RustAnalyzer = lazy_attribute("athalia_core.robotics", "RustAnalyzer")
+ROBOTICS_MODULES_AVAILABLE = LazyAvailability(
+    DockerRoboticsManager,
+    ReachyAuditor,
+    RoboticsCI,
+    ROS2Validator,
+    RustAnalyzer,
+    warning="⚠️ Modules robotiques non disponibles - mode fallback activé",
+)
+
+get_artistic_templates = lazy_attribute(
+    "athalia_core.templates.artistic_templates", "get_artistic_templates"
+)
+get_base_templates = lazy_attribute(
+    "athalia_core.templates.base_templates", "get_base_templates"
+)
+ARTISTIC_MODULES_AVAILABLE = LazyAvailability(
+    get_artistic_templates,
+    get_base_templates,
+    warning="⚠️ Modules artistiques non disponibles - mode fallback activé",
+)
+
+classify_project_type = lazy_attribute(
+    "athalia_core.classification.project_classifier", "classify_project_type"
+)
+get_project_config = lazy_attribute(
+    "athalia_core.classification.project_types", "get_project_config"
+)
+CLASSIFICATION_MODULES_AVAILABLE = LazyAvailability(
+    classify_project_type,
+    get_project_config,
+    warning="⚠️ Modules de classification non disponibles - mode fallback activé",
+)
+
+# Ressources du workflow stockées sur disque, dans le projet
+DISK_RESOURCES = frozenset({"project", "tests", "docs", "ci"})
 
 
 class UnifiedOrchestrator:
     """Orchestrateur unifié pour Athalia"""
 
-    def __init__(self, project_path: str = "."):
+    def __init__(
+        self,
+        project_path: str = ".",
+        max_workers: int = 4,
+        step_timeout: float | None = None,
+        memoize_steps: bool = True,
+        checkpoint_dir: str | None = None,
+    ):
         self.project_path = Path(project_path)
+        self.max_workers = max_workers
+        self.step_timeout = step_timeout
+        self.memoize_steps = memoize_steps
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+
+        # Vue des résultats propre à l'étape exécutée par chaque thread
+        self._step_local = threading.local()
+        self._results_lock = threading.Lock()
+        self._checkpoint: WorkflowCheckpoint | None = None
+        self._reused_steps: list[str] = []
+        # Fichiers du projet parcourus une fois par workflow, partagés par
+        # les scanners (audit, linting, tests, documentation, nettoyage)
+        self.snapshot = ProjectSnapshot(self.project_path)
         self.workflow_results = {
             "status": "idle",
             "steps_completed": [],
@@ -137,72 +183,89 @@ class UnifiedOrchestrator:
         # Initialiser les modules avancés
         self.auto_correction_advanced = None
 
+        # Ordonnanceur du workflow en cours (pour l'annulation)
+        self._scheduler: WorkflowScheduler | None = None
+
+    @property
+    def workflow_results(self) -> dict[str, Any]:
+        """Résultats du workflow (vue de l'étape en cours dans ce thread)"""
+        view = getattr(self._step_local, "results", None)
+        return self._results if view is None else view
+
+    @workflow_results.setter
+    def workflow_results(self, results: dict[str, Any]):
+        self._results = results
+
     def initialize_modules(self):
-        """Initialise tous les modules"""
+        """Initialise tous les modules
+
+        Le module IA central est construit immédiatement ; les autres sont
+        des proxys construits au premier usage : une commande qui n'exécute
+        qu'une étape ne paie que les modules de cette étape. Une erreur de
+        construction est ajoutée aux erreurs du workflow et l'étape du module
+        est ignorée.
+        """
         try:
+            path = str(self.project_path)
+            lazy = self._lazy_module
+            shared = {"snapshot": self.snapshot}
+
             # Modules de base
             self.robust_ai = RobustAI()
-            self.security_auditor = SecurityAuditor(str(self.project_path))
-            self.code_linter = CodeLinter(str(self.project_path))
-            self.correction_optimizer = CorrectionOptimizer()
-            self.auto_tester = AutoTester(str(self.project_path))
-            self.auto_documenter = AutoDocumenter(str(self.project_path))
-            self.auto_cleaner = AutoCleaner(str(self.project_path))
-            self.auto_cicd = AutoCICD()
+            self.security_auditor = lazy(
+                "security_auditor", SecurityAuditor, path, **shared
+            )
+            self.code_linter = lazy("code_linter", CodeLinter, path, **shared)
+            self.correction_optimizer = lazy(
+                "correction_optimizer", CorrectionOptimizer
+            )
+            self.auto_tester = lazy("auto_tester", AutoTester, path, **shared)
+            self.auto_documenter = lazy(
+                "auto_documenter", AutoDocumenter, path, **shared
+            )
+            self.auto_cleaner = lazy("auto_cleaner", AutoCleaner, path, **shared)
+            self.auto_cicd = lazy("auto_cicd", AutoCICD)
 
             # Modules IA et distillation (si disponibles)
             if AI_MODULES_AVAILABLE:
-                try:
-                    self.unified_agent = UnifiedAgent()
-                    self.context_agent = ContextPromptAgent()
-                    self.audit_agent = AuditAgent()
-                    self.quality_scorer = QualityScorer()
-                    self.response_distiller = ResponseDistiller()
-                    self.code_genetics = CodeGenetics()
-                    logger.info("✅ Modules IA et distillation initialisés")
-                except Exception as e:
-                    logger.warning(f"⚠️ Erreur initialisation modules IA: {e}")
+                self.unified_agent = lazy("unified_agent", UnifiedAgent)
+                self.context_agent = lazy("context_agent", ContextPromptAgent)
+                self.audit_agent = lazy("audit_agent", AuditAgent)
+                self.quality_scorer = lazy("quality_scorer", QualityScorer)
+                self.response_distiller = lazy("response_distiller", ResponseDistiller)
+                self.code_genetics = lazy("code_genetics", CodeGenetics)
+                logger.info("✅ Modules IA et distillation déclarés")
 
             # Modules robotiques (si disponibles)
             if ROBOTICS_MODULES_AVAILABLE:
-                try:
-                    self.reachy_auditor = ReachyAuditor(str(self.project_path))
-                    self.ros2_validator = ROS2Validator(str(self.project_path))
-                    self.docker_robotics = DockerRoboticsManager(str(self.project_path))
-                    self.rust_analyzer = RustAnalyzer(str(self.project_path))
-                    self.robotics_ci = RoboticsCI(str(self.project_path))
-                    logger.info("✅ Modules robotiques initialisés")
-                except Exception as e:
-                    logger.warning(f"⚠️ Erreur initialisation modules robotiques: {e}")
+                self.reachy_auditor = lazy("reachy_auditor", ReachyAuditor, path)
+                self.ros2_validator = lazy("ros2_validator", ROS2Validator, path)
+                self.docker_robotics = lazy(
+                    "docker_robotics", DockerRoboticsManager, path
+                )
+                self.rust_analyzer = lazy("rust_analyzer", RustAnalyzer, path)
+                self.robotics_ci = lazy("robotics_ci", RoboticsCI, path)
+                logger.info("✅ Modules robotiques déclarés")
 
             # Modules artistiques (si disponibles)
             if ARTISTIC_MODULES_AVAILABLE:
-                try:
-                    self.artistic_templates = get_artistic_templates()
-                    self.base_templates = get_base_templates()
-                    logger.info("✅ Modules artistiques initialisés")
-                except Exception as e:
-                    logger.warning(f"⚠️ Erreur initialisation modules artistiques: {e}")
+                self.artistic_templates = lazy(
+                    "artistic_templates", get_artistic_templates
+                )
+                self.base_templates = lazy("base_templates", get_base_templates)
+                logger.info("✅ Modules artistiques déclarés")
 
             # Modules de classification (si disponibles)
             if CLASSIFICATION_MODULES_AVAILABLE:
-                try:
-                    self.project_classifier = classify_project_type
-                    logger.info("✅ Modules de classification initialisés")
-                except Exception as e:
-                    logger.warning(
-                        f"⚠️ Erreur initialisation modules de classification: {e}"
-                    )
+                self.project_classifier = classify_project_type
+                logger.info("✅ Modules de classification initialisés")
 
             # Modules avancés (si disponibles)
             if ADVANCED_MODULES_AVAILABLE:
-                try:
-                    self.auto_correction_advanced = AutoCorrectionAvancee(
-                        str(self.project_path)
-                    )
-                    logger.info("✅ Modules avancés initialisés")
-                except Exception as e:
-                    logger.warning(f"⚠️ Erreur initialisation modules avancés: {e}")
+                self.auto_correction_advanced = lazy(
+                    "auto_correction_advanced", AutoCorrectionAvancee, path
+                )
+                logger.info("✅ Modules avancés déclarés")
 
             self.workflow_results["status"] = "initialized"
             logger.info("✅ Tous les modules initialisés")
@@ -213,12 +276,25 @@ class UnifiedOrchestrator:
             )
             logger.error(f"❌ Erreur initialisation: {e}")
 
+    def _lazy_module(
+        self, name: str, factory: Callable, *args, **kwargs
+    ) -> LazyInstance:
+        """Module construit au premier usage par ``factory(*args, **kwargs)``"""
+        return LazyInstance(partial(factory, *args, **kwargs), name, self._module_error)
+
+    def _module_error(self, name: str, error: Exception):
+        self.workflow_results["errors"].append(
+            f"Erreur initialisation modules: {name}: {error}"
+        )
+        logger.error(f"❌ Erreur initialisation {name}: {error}")
+
     def run_full_workflow(self, blueprint: dict[str, Any]) -> dict[str, Any]:
         """Exécute le workflow complet"""
         logger.info("🚀 Démarrage du workflow unifié")
 
-        # Vérifier le cache en premier
-        cached_result = get_cached_result(blueprint)
+        # Vérifier le cache en premier (la clé inclut le dossier de sortie)
+        cache_context = {"project_path": str(self.project_path.resolve())}
+        cached_result = get_cached_result(blueprint, cache_context)
         if cached_result:
             logger.info("✅ Résultat trouvé dans le cache")
             cached_result["cached"] = True
@@ -228,53 +304,13 @@ class UnifiedOrchestrator:
         self.workflow_results["status"] = "running"
 
         try:
-            # Étape 1: Classification intelligente du projet
-            self._step_intelligent_classification(blueprint)
-
-            # Étape 2: Génération du projet
-            self._step_generate_project(blueprint)
-
-            # Étape 4: Amélioration IA intelligente
-            self._step_ai_enhancement(blueprint)
-
-            # Étape 5: Audit de sécurité
-            self._step_security_audit()
-
-            # Étape 6: Linting du code
-            self._step_code_linting()
-
-            # Étape 7: Auto-correction avancée
-            self._step_advanced_auto_correction()
-
-            # Étape 8: Optimisation des corrections
-            self._step_correction_optimization()
-
-            # Étape 9: Tests automatiques
-            self._step_auto_testing()
-
-            # Étape 10: Documentation automatique
-            self._step_auto_documentation()
-
-            # Étape 11: Templates artistiques (si applicable) - AVANT le nettoyage
-            self._step_artistic_templates(blueprint)
-
-            # Étape 12: Validation robotique (si applicable)
-            self._step_robotics_validation(blueprint)
-
-            # Étape 13: Classification avancée
-            self._step_advanced_classification(blueprint)
-
-            # Étape 14: CI/CD automatique
-            self._step_auto_cicd()
-
-            # Étape 15: Nettoyage automatique - APRÈS les templates
-            self._step_auto_cleaning()
+            self._run_steps(self._workflow_steps(blueprint))
 
             self.workflow_results["status"] = "completed"
             logger.info("✅ Workflow terminé avec succès")
 
             # Sauvegarder dans le cache
-            cache_result(blueprint, self.workflow_results)
+            cache_result(blueprint, self.workflow_results, context=cache_context)
             logger.info("💾 Résultat sauvegardé dans le cache")
 
         except Exception as e:
@@ -284,6 +320,294 @@ class UnifiedOrchestrator:
 
         return self.workflow_results
 
+    def _workflow_steps(self, blueprint: dict[str, Any]) -> list[WorkflowStep]:
+        """Étapes du workflow, dans l'ordre séquentiel de référence
+
+        Chaque étape déclare les ressources qu'elle lit et écrit ; les étapes
+        qui ne se gênent pas (audit, linting, classification...) s'exécutent
+        en parallèle. Le nettoyage touche tout le projet et passe en dernier.
+        Les champs du blueprint indiqués (None : tous) entrent dans la clé de
+        mémoïsation de l'étape.
+        """
+        step = self._workflow_step
+        return [
+            step(
+                "intelligent_classification",
+                self._step_intelligent_classification,
+                blueprint,
+                fields=("project_name", "description", "project_type"),
+                reads=("blueprint",),
+                writes=("blueprint",),
+            ),
+            step(
+                "project_generation",
+                self._step_generate_project,
+                blueprint,
+                fields=None,
+                reads=("blueprint",),
+                writes=("project",),
+                critical=True,
+            ),
+            step(
+                "ai_enhancement",
+                self._step_ai_enhancement,
+                blueprint,
+                fields=None,
+                reads=("blueprint", "project"),
+                writes=("project",),
+            ),
+            step("security_audit", self._step_security_audit, reads=("project",)),
+            step("code_linting", self._step_code_linting, reads=("project",)),
+            step(
+                "advanced_auto_correction",
+                self._step_advanced_auto_correction,
+                reads=("project",),
+                writes=("project", "corrections"),
+            ),
+            step(
+                "correction_optimization",
+                self._step_correction_optimization,
+                reads=("corrections",),
+            ),
+            # Tests, docs et CI sont écrits dans l'arborescence du projet :
+            # ces générateurs s'exécutent l'un après l'autre
+            step(
+                "auto_testing",
+                self._step_auto_testing,
+                reads=("project",),
+                writes=("project", "tests"),
+            ),
+            step(
+                "auto_documentation",
+                self._step_auto_documentation,
+                reads=("project",),
+                writes=("project", "docs"),
+            ),
+            step(
+                "artistic_templates",
+                self._step_artistic_templates,
+                blueprint,
+                fields=("project_type",),
+                reads=("blueprint",),
+                writes=("project",),
+            ),
+            step(
+                "robotics_validation",
+                self._step_robotics_validation,
+                blueprint,
+                fields=("project_type",),
+                reads=("blueprint", "project"),
+            ),
+            step(
+                "advanced_classification",
+                self._step_advanced_classification,
+                blueprint,
+                fields=("description",),
+                reads=("blueprint",),
+            ),
+            step(
+                "auto_cicd",
+                self._step_auto_cicd,
+                reads=("project",),
+                writes=("project", "ci"),
+            ),
+            step(
+                "auto_cleaning",
+                self._step_auto_cleaning,
+                reads=("project",),
+                writes=("project", "tests", "docs", "ci"),
+            ),
+        ]
+
+    def _workflow_step(
+        self,
+        name: str,
+        method: Callable,
+        blueprint: dict[str, Any] | None = None,
+        fields: tuple[str, ...] | None = (),
+        reads: tuple[str, ...] = (),
+        writes: tuple[str, ...] = (),
+        critical: bool = False,
+    ) -> WorkflowStep:
+        run = partial(self._run_step, name, method, blueprint, fields, reads, writes)
+        return WorkflowStep(name, run, reads=reads, writes=writes, critical=critical)
+
+    def _run_step(
+        self,
+        name: str,
+        method: Callable,
+        blueprint: dict[str, Any] | None,
+        fields: tuple[str, ...] | None,
+        reads: tuple[str, ...],
+        writes: tuple[str, ...],
+    ):
+        """Exécuter une étape, ou rejouer son résultat mémorisé
+
+        L'étape travaille sur une vue des résultats et une copie du blueprint :
+        ce qu'elle y ajoute forme son delta, fusionné dans le workflow puis
+        mémorisé si elle n'a produit ni erreur ni avertissement. Après une
+        étape qui écrit sur disque, l'instantané du projet est périmé.
+        """
+        try:
+            self._execute_step(name, method, blueprint, fields, reads, writes)
+        finally:
+            if DISK_RESOURCES.intersection(writes):
+                self.snapshot.invalidate()
+
+    def _execute_step(
+        self,
+        name: str,
+        method: Callable,
+        blueprint: dict[str, Any] | None,
+        fields: tuple[str, ...] | None,
+        reads: tuple[str, ...],
+        writes: tuple[str, ...],
+    ):
+        checkpoint = self._checkpoint
+        if checkpoint is None:
+            return method() if blueprint is None else method(blueprint)
+
+        if blueprint is None:
+            values = {}
+        elif fields is None:
+            values = dict(blueprint)
+        else:
+            values = {field: blueprint.get(field) for field in fields}
+        # Le blueprint entre dans la clé par ses champs, pas par sa version
+        inputs = tuple(resource for resource in reads if resource != "blueprint")
+        key = checkpoint.step_key(name, values, inputs)
+
+        delta = checkpoint.lookup(key, writes)
+        if delta is not None:
+            logger.info(f"♻️ Étape {name} reprise du cache")
+            self._apply_step_delta(blueprint, delta)
+            self._reused_steps.append(name)
+            checkpoint.complete(key, writes, reused=True, succeeded=True)
+            return
+
+        view = self._results_view()
+        blueprint_copy = None if blueprint is None else dict(blueprint)
+        self._step_local.results = dict(view)
+        failed = True
+        try:
+            method() if blueprint is None else method(blueprint_copy)
+            failed = False
+        finally:
+            results = self._step_local.results
+            self._step_local.results = None
+            delta = self._step_delta(view, results, blueprint, blueprint_copy)
+            self._apply_step_delta(blueprint, delta)
+            succeeded = not failed and not any(
+                key in ("errors", "warnings") for key, _, _ in delta["results"]
+            )
+            checkpoint.complete(key, writes, reused=False, succeeded=succeeded)
+        if succeeded:
+            checkpoint.store(key, delta)
+
+    def _results_view(self) -> dict[str, Any]:
+        """Vue vide des résultats : listes neuves, dictionnaires en surcouche"""
+        return {
+            key: []
+            if isinstance(value, list)
+            else ChainMap({}, value)
+            if isinstance(value, dict)
+            else value
+            for key, value in self._results.items()
+        }
+
+    @staticmethod
+    def _step_delta(
+        view: dict[str, Any],
+        results: dict[str, Any],
+        blueprint: dict[str, Any] | None,
+        blueprint_copy: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        changes = []
+        for key, value in results.items():
+            if value is not view.get(key):
+                changes.append((key, "set", value))
+            elif isinstance(value, list) and value:
+                changes.append((key, "extend", value))
+            elif isinstance(value, ChainMap) and value.maps[0]:
+                changes.append((key, "update", dict(value.maps[0])))
+
+        blueprint_changes = {}
+        if blueprint is not None:
+            blueprint_changes = {
+                field: value
+                for field, value in blueprint_copy.items()
+                if field not in blueprint or blueprint[field] != value
+            }
+        return {"blueprint": blueprint_changes, "results": changes}
+
+    def _apply_step_delta(self, blueprint: dict[str, Any] | None, delta: dict):
+        with self._results_lock:
+            if blueprint is not None:
+                blueprint.update(delta["blueprint"])
+            for key, operation, value in delta["results"]:
+                if operation == "extend":
+                    self._results.setdefault(key, []).extend(value)
+                elif operation == "update":
+                    self._results.setdefault(key, {}).update(value)
+                else:
+                    self._results[key] = value
+
+    def _run_steps(self, steps: list[WorkflowStep]):
+        """Exécuter les étapes et enregistrer leurs durées dans les métriques"""
+        scheduler = WorkflowScheduler(
+            steps, max_workers=self.max_workers, default_timeout=self.step_timeout
+        )
+        self._scheduler = scheduler
+        self.snapshot.invalidate()
+        self._checkpoint = self._open_checkpoint()
+        self._reused_steps = []
+        resumed = self._checkpoint.begin() if self._checkpoint else False
+        start = time.perf_counter()
+        results: dict[str, StepResult] = {}
+        try:
+            results = scheduler.run()
+        finally:
+            duration = time.perf_counter() - start
+            self._record_step_metrics(results, duration)
+            self.workflow_results["metrics"]["resumed"] = resumed
+            self.workflow_results["metrics"]["reused_steps"] = sorted(
+                self._reused_steps
+            )
+            self._scheduler = None
+            self._checkpoint = None
+
+        for result in results.values():
+            if result.status in ("timeout", "cancelled"):
+                self.workflow_results["warnings"].append(
+                    f"Étape {result.name} {result.error or result.status}"
+                )
+
+    def _open_checkpoint(self) -> WorkflowCheckpoint | None:
+        """Point de reprise, rangé avec le projet (None si désactivé)"""
+        if not self.memoize_steps:
+            return None
+        cache_dir = self.checkpoint_dir or (
+            self.project_path / ".athalia_cache" / "workflow"
+        )
+        return WorkflowCheckpoint(self.project_path, cache_dir)
+
+    def _record_step_metrics(self, results: dict[str, StepResult], duration: float):
+        metrics = self.workflow_results["metrics"]
+        busy = sum(result.duration for result in results.values())
+        metrics["workflow_duration"] = round(duration, 3)
+        metrics["step_timings"] = {
+            name: round(result.duration, 3) for name, result in results.items()
+        }
+        metrics["step_status"] = {
+            name: result.status for name, result in results.items()
+        }
+        metrics["parallelism"] = round(busy / duration, 2) if duration else 1.0
+
+    def cancel_workflow(self):
+        """Annuler le workflow en cours : aucune nouvelle étape ne démarre"""
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+
     def _step_intelligent_classification(self, blueprint: dict[str, Any]):
         """Étape 1: Classification intelligente du projet"""
         logger.info("🧠 Classification intelligente du projet...")
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+💾 MÉMOÏSATION ET POINTS DE REPRISE DU WORKFLOW
+===============================================
+Clé de chaque étape = champs du blueprint lus + version des ressources lues.
+La version d'une ressource disque est l'empreinte du contenu de l'arborescence
+du projet après son dernier écrivain ; celle d'une ressource logique est la clé
+de son dernier écrivain. Une étape sans effet disque est rejouée depuis le
+cache dès que sa clé est connue ; une étape qui écrit sur le disque ne l'est
+que si le point de reprise atteste que son effet est déjà présent.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+# Répertoires ignorés dans l'empreinte de l'arborescence
+EXCLUDED_DIRS = frozenset(
+    {
+        ".git",
+        ".athalia_cache",
+        "__pycache__",
+        ".pytest_cache",
+        ".mypy_cache",
+        "node_modules",
+        ".venv",
+        "venv",
+    }
+)
+
+
+class TreeHasher:
+    """Empreinte du contenu d'une arborescence
+
+    Le condensat de chaque fichier est mémorisé selon (mtime, taille) : seuls
+    les fichiers modifiés sont relus d'un appel à l'autre.
+    """
+
+    def __init__(self, root_path: Path, excluded: frozenset[str] = EXCLUDED_DIRS):
+        self.root_path = Path(root_path)
+        self.excluded = excluded
+        self._files: dict[str, tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def _file_digest(self, path: str, stat: os.stat_result) -> str:
+        cached = self._files.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self._files[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+        return self._files[path][2]
+
+    def digest(self) -> str:
+        """Empreinte (chemins relatifs et contenus) de l'arborescence"""
+        tree = hashlib.blake2b(digest_size=16)
+        with self._lock:
+            for dirpath, dirnames, filenames in os.walk(self.root_path):
+                dirnames[:] = sorted(d for d in dirnames if d not in self.excluded)
+                for filename in sorted(filenames):
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        file_digest = self._file_digest(path, os.stat(path))
+                    except OSError:
+                        continue
+                    relative = os.path.relpath(path, self.root_path)
+                    tree.update(f"{relative}\0{file_digest}\n".encode())
+        return tree.hexdigest()
+
+
+class WorkflowCheckpoint:
+    """Mémoïsation par étape et point de reprise d'un workflow
+
+    Args:
+        project_path: répertoire sur lequel travaillent les étapes
+        cache_dir: répertoire du cache (points de reprise et résultats)
+        disk_resources: ressources matérialisées dans ``project_path``
+        max_age: âge maximal (secondes) d'un résultat d'étape en cache
+    """
+
+    def __init__(
+        self,
+        project_path: Path,
+        cache_dir: Path,
+        disk_resources: frozenset[str] = frozenset({"project", "tests", "docs", "ci"}),
+        max_age: float = 86400,
+    ):
+        self.project_path = Path(project_path).resolve()
+        self.cache_dir = Path(cache_dir)
+        self.steps_dir = self.cache_dir / "steps"
+        self.disk_resources = disk_resources
+        self.max_age = max_age
+        self.hasher = TreeHasher(self.project_path)
+
+        project_id = hashlib.sha256(str(self.project_path).encode()).hexdigest()[:16]
+        self.checkpoint_file = self.cache_dir / f"checkpoint_{project_id}.json"
+
+        self.initial: dict[str, str] = {}
+        # Empreinte courante de l'arborescence, recalculée seulement après
+        # une étape qui écrit sur le disque
+        self.digest = ""
+        self.versions: dict[str, str] = {}
+        # Clés des étapes dont l'effet disque est présent -> versions produites
+        self.applied: dict[str, dict[str, str]] = {}
+        self._inherited: set[str] = set()
+        self._lock = threading.Lock()
+
+    def begin(self) -> bool:
+        """Démarrer un workflow ; renvoie True s'il reprend le précédent
+
+        La reprise n'a lieu que si l'arborescence n'a pas changé depuis le
+        dernier point de reprise.
+        """
+        digest = self.digest = self.hasher.digest()
+        checkpoint = self._load_checkpoint()
+        if checkpoint and checkpoint.get("digest") == digest:
+            self.initial = dict(checkpoint["initial"])
+            self.applied = dict(checkpoint["applied"])
+            self._inherited = set(self.applied)
+            logger.info(f"♻️ Reprise du workflow ({len(self.applied)} étapes)")
+        else:
+            self.initial = dict.fromkeys(self.disk_resources, digest)
+            self.applied = {}
+            self._inherited = set()
+        self.versions = dict(self.initial)
+        return bool(self._inherited)
+
+    def step_key(
+        self, name: str, fields: dict[str, Any], reads: tuple[str, ...]
+    ) -> str:
+        """Clé d'une étape selon ses entrées effectives"""
+        key_data = {
+            "step": name,
+            "project": str(self.project_path),
+            "fields": fields,
+            "inputs": {resource: self.versions.get(resource, "") for resource in reads},
+        }
+        key_string = json.dumps(key_data, sort_keys=True, default=str)
+        return hashlib.sha256(key_string.encode()).hexdigest()[:32]
+
+    def writes_disk(self, writes: tuple[str, ...]) -> bool:
+        return any(resource in self.disk_resources for resource in writes)
+
+    def lookup(self, key: str, writes: tuple[str, ...]) -> dict[str, Any] | None:
+        """Résultat réutilisable d'une étape, ou None s'il faut l'exécuter"""
+        if self.writes_disk(writes) and key not in self.applied:
+            return None
+        step_file = self.steps_dir / f"{key}.pkl"
+        try:
+            if time.time() - step_file.stat().st_mtime > self.max_age:
+                return None
+            with open(step_file, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"⚠️ Résultat d'étape illisible {key}: {e}")
+            return None
+
+    def store(self, key: str, delta: dict[str, Any]):
+        """Mémoriser le résultat d'une étape réussie"""
+        try:
+            self.steps_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = self.steps_dir / f"{key}.pkl.tmp"
+            with open(temp_file, "wb") as f:
+                pickle.dump(delta, f)
+            temp_file.replace(self.steps_dir / f"{key}.pkl")
+        except (OSError, pickle.PickleError, TypeError, AttributeError) as e:
+            logger.warning(f"⚠️ Résultat d'étape non mémorisé {key}: {e}")
+
+    def complete(
+        self,
+        key: str,
+        writes: tuple[str, ...],
+        reused: bool,
+        succeeded: bool,
+    ):
+        """Enregistrer la fin d'une étape et mettre à jour le point de reprise"""
+        with self._lock:
+            if reused:
+                produced = self.applied.get(key) or dict.fromkeys(writes, key)
+            else:
+                digest = ""
+                if self.writes_disk(writes):
+                    # L'arborescence a changé : les effets hérités du workflow
+                    # précédent ne sont plus garantis
+                    for inherited in self._inherited:
+                        self.applied.pop(inherited, None)
+                    self._inherited = set()
+                    digest = self.digest = self.hasher.digest()
+                produced = {
+                    resource: digest if resource in self.disk_resources else key
+                    for resource in writes
+                }
+                self.applied.pop(key, None)
+                if succeeded:
+                    self.applied[key] = produced
+            self.versions.update(produced)
+            self._save_checkpoint()
+
+    def _load_checkpoint(self) -> dict[str, Any] | None:
+        try:
+            with open(self.checkpoint_file, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Point de reprise illisible: {e}")
+            return None
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            return None
+        return checkpoint
+
+    def _save_checkpoint(self):
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "project_path": str(self.project_path),
+            "digest": self.digest,
+            "initial": self.initial,
+            "applied": self.applied,
+            "saved_at": time.time(),
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_file = self.checkpoint_file.with_suffix(".tmp")
+            temp_file.write_text(json.dumps(checkpoint, indent=2), encoding="utf-8")
+            temp_file.replace(self.checkpoint_file)
+        except OSError as e:
+            logger.warning(f"⚠️ Point de reprise non sauvegardé: {e}")
+
+    def clear(self):
+        """Supprimer le point de reprise (le prochain workflow repart de zéro)"""
+        self.checkpoint_file.unlink(missing_ok=True)
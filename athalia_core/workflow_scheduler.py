@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+🗓️ ORDONNANCEUR DE WORKFLOW (DAG)
+=================================
+Exécute des étapes déclarant les ressources qu'elles lisent et écrivent.
+Les dépendances sont déduites de l'ordre de déclaration (une lecture attend
+le dernier écrivain, une écriture attend les lectures et écritures
+précédentes) : le résultat est celui d'une exécution séquentielle, mais les
+étapes indépendantes tournent en parallèle sur un pool de threads.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkflowStep:
+    """Étape de workflow
+
+    Args:
+        name: identifiant unique de l'étape
+        func: fonction sans argument exécutant l'étape
+        reads: ressources lues (ex: "blueprint", "project")
+        writes: ressources modifiées
+        after: étapes à attendre en plus de celles déduites des ressources
+        timeout: durée maximale en secondes (None : celle de l'ordonnanceur)
+        critical: un échec annule le reste du workflow et est propagé
+    """
+
+    name: str
+    func: Callable[[], Any]
+    reads: tuple[str, ...] = ()
+    writes: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    timeout: float | None = None
+    critical: bool = False
+
+
+@dataclass
+class StepResult:
+    """Résultat d'exécution d'une étape"""
+
+    name: str
+    status: str  # 'completed', 'failed', 'timeout', 'cancelled'
+    started_at: float = 0.0  # secondes depuis le début du workflow
+    duration: float = 0.0
+    error: str | None = None
+
+
+class WorkflowScheduler:
+    """Ordonnanceur d'étapes selon leurs dépendances
+
+    Args:
+        steps: étapes, dans l'ordre séquentiel de référence
+        max_workers: étapes exécutées simultanément
+        default_timeout: durée maximale par défaut d'une étape (None : aucune)
+    """
+
+    def __init__(
+        self,
+        steps: Iterable[WorkflowStep],
+        max_workers: int = 4,
+        default_timeout: float | None = None,
+    ):
+        self.steps = list(steps)
+        self.max_workers = max(1, max_workers)
+        self.default_timeout = default_timeout
+
+        names = [step.name for step in self.steps]
+        if len(set(names)) != len(names):
+            raise ValueError("Noms d'étapes dupliqués")
+        self.dependencies = self._build_dependencies()
+        self._cancelled = threading.Event()
+
+    def _build_dependencies(self) -> dict[str, set[str]]:
+        """Déduire le graphe de dépendances des ressources lues et écrites"""
+        known = {step.name for step in self.steps}
+        dependencies: dict[str, set[str]] = {}
+        last_writer: dict[str, str] = {}
+        readers: dict[str, list[str]] = defaultdict(list)
+
+        for step in self.steps:
+            unknown = set(step.after) - known
+            if unknown:
+                raise ValueError(f"Étapes inconnues pour {step.name}: {unknown}")
+            required = set(step.after)
+            for resource in step.reads:
+                if resource in last_writer:
+                    required.add(last_writer[resource])
+            for resource in step.writes:
+                if resource in last_writer:
+                    required.add(last_writer[resource])
+                required.update(readers[resource])
+            required.discard(step.name)
+            dependencies[step.name] = required
+
+            for resource in step.reads:
+                readers[resource].append(step.name)
+            for resource in step.writes:
+                last_writer[resource] = step.name
+                readers[resource] = []
+
+        return dependencies
+
+    def cancel(self):
+        """Ne plus démarrer de nouvelle étape (les étapes en cours finissent)"""
+        self._cancelled.set()
+
+    def _dependents(self, name: str) -> set[str]:
+        """Étapes dépendant, directement ou non, d'une étape"""
+        found: set[str] = set()
+        stack = [name]
+        while stack:
+            current = stack.pop()
+            for step, required in self.dependencies.items():
+                if current in required and step not in found:
+                    found.add(step)
+                    stack.append(step)
+        return found
+
+    def run(self) -> dict[str, StepResult]:
+        """Exécuter le workflow et renvoyer le résultat de chaque étape
+
+        Une étape en échec libère ses dépendants (comme en séquentiel), sauf
+        si elle est critique : le workflow est alors annulé et l'exception
+        relancée. Une étape hors délai est abandonnée et ses dépendants
+        annulés, car elle peut encore modifier ses ressources.
+        """
+        start = time.monotonic()
+        steps = {step.name: step for step in self.steps}
+        waiting = {name: set(required) for name, required in self.dependencies.items()}
+        results: dict[str, StepResult] = {}
+        running: dict[Future, tuple[WorkflowStep, float]] = {}
+        abandoned = False
+        failure: BaseException | None = None
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="athalia-step"
+        )
+        try:
+            while True:
+                # Démarrer les étapes prêtes, dans l'ordre de déclaration
+                for step in self.steps:
+                    if self._cancelled.is_set() or len(running) >= self.max_workers:
+                        break
+                    if step.name in results or waiting[step.name] is None:
+                        continue
+                    if not waiting[step.name]:
+                        waiting[step.name] = None
+                        running[executor.submit(step.func)] = (step, time.monotonic())
+
+                if not running:
+                    break
+
+                done, _ = wait(
+                    running,
+                    timeout=self._next_deadline(running),
+                    return_when=FIRST_COMPLETED,
+                )
+                now = time.monotonic()
+                finished = []
+
+                for future in done:
+                    step, started = running.pop(future)
+                    result = StepResult(
+                        step.name, "completed", started - start, now - started
+                    )
+                    error = future.exception()
+                    if error is not None:
+                        result.status, result.error = "failed", str(error)
+                        logger.warning(f"⚠️ Étape {step.name} en échec: {error}")
+                        if step.critical and failure is None:
+                            failure = error
+                            self.cancel()
+                    results[step.name] = result
+                    finished.append(step.name)
+
+                for future, (step, started) in list(running.items()):
+                    timeout = self._timeout(step)
+                    if timeout is None or now - started < timeout:
+                        continue
+                    running.pop(future)
+                    future.cancel()
+                    abandoned = True
+                    results[step.name] = StepResult(
+                        step.name,
+                        "timeout",
+                        started - start,
+                        now - started,
+                        f"Délai de {timeout}s dépassé",
+                    )
+                    logger.warning(f"⏱️ Étape {step.name} abandonnée après {timeout}s")
+                    for dependent in self._dependents(step.name):
+                        results.setdefault(
+                            dependent,
+                            StepResult(
+                                dependent, "cancelled", error=f"{step.name} hors délai"
+                            ),
+                        )
+                    if step.critical and failure is None:
+                        failure = TimeoutError(f"Étape {step.name} hors délai")
+                        self.cancel()
+
+                for name in finished:
+                    for required in waiting.values():
+                        if required:
+                            required.discard(name)
+        finally:
+            executor.shutdown(wait=not abandoned, cancel_futures=True)
+
+        for name in steps:
+            results.setdefault(name, StepResult(name, "cancelled"))
+        if failure is not None:
+            raise failure
+        return {name: results[name] for name in steps}
+
+    def _timeout(self, step: WorkflowStep) -> float | None:
+        return step.timeout if step.timeout is not None else self.default_timeout
+
+    def _next_deadline(
+        self, running: dict[Future, tuple[WorkflowStep, float]]
+    ) -> float | None:
+        """Délai avant la prochaine échéance d'une étape en cours"""
+        now = time.monotonic()
+        deadlines = [
+            started + timeout - now
+            for step, started in running.values()
+            if (timeout := self._timeout(step)) is not None
+        ]
+        return max(0.0, min(deadlines)) if deadlines else None
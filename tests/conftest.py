@@ -15,6 +15,7 @@ import pytest
 # Optimisation: Réduire la consommation mémoire globale
 os.environ["PYTHONHASHSEED"] = "0"  # Hash déterministe pour réduire la mémoire
 os.environ["PYTHONDONTWRITEBYTECODE"] = "1"  # Éviter les fichiers .pyc
+os.environ["ATHALIA_LLM_CACHE"] = "0"  # Pas de réponses IA partagées entre tests
 
 # Optimisation: Configuration du garbage collector
 gc.set_threshold(700, 10, 10)  # Plus agressif
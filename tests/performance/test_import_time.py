@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark du temps de démarrage (python -X importtime)
+Les commandes courtes (hooks, CLI) ne doivent charger ni l'IA, ni les
+auditeurs, ni l'orchestrateur avant d'en avoir besoin.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Budget d'import (ms, cumul -X importtime) ; mesuré autour de 50-70 ms
+STARTUP_BUDGET_MS = {
+    "athalia_core": 200,
+    "athalia_core.cli": 200,
+    "athalia_core.main": 200,
+    "athalia_core.security_validator": 200,
+}
+
+# Modules coûteux qu'un simple import du CLI ne doit pas charger
+HEAVY_MODULES = [
+    "requests",
+    "yaml",
+    "psutil",
+    "athalia_core.ai_robust",
+    "athalia_core.audit",
+    "athalia_core.robotics",
+    "athalia_core.unified_orchestrator",
+]
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def _import_time_ms(module: str) -> float:
+    """Cumul -X importtime (ms) du module, meilleur de trois mesures"""
+    timings = []
+    for _ in range(3):
+        result = _run_python("-X", "importtime", "-c", f"import {module}")
+        assert result.returncode == 0, result.stderr[-2000:]
+        for line in result.stderr.splitlines():
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) == 3 and parts[2] == module:
+                timings.append(int(parts[1]) / 1000)
+    return min(timings)
+
+
+@pytest.mark.parametrize("module", sorted(STARTUP_BUDGET_MS))
+def test_import_time_budget(module):
+    elapsed = _import_time_ms(module)
+    assert elapsed < STARTUP_BUDGET_MS[module], (
+        f"import {module}: {elapsed:.0f} ms > {STARTUP_BUDGET_MS[module]} ms"
+    )
+
+
+def test_cli_import_is_lazy():
+    code = (
+        "import sys, athalia_core.cli; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = _run_python("-c", code)
+
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_exports_still_resolve():
+    code = (
+        "import athalia_core; "
+        "print(athalia_core.UnifiedOrchestrator.__name__, "
+        "athalia_core.cli.name, athalia_core.main.__module__)"
+    )
+    result = _run_python("-c", code)
+
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.split() == ["UnifiedOrchestrator", "cli", "athalia_core.main"]
@@ -4,7 +4,7 @@ Tests pour le module context_prompt.py
 Amélioration de la couverture de code de 16.55% à 80%+
 """
 
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import mock_open, patch
 
 from athalia_core.agents.context_prompt import (
     PROMPTS,
@@ -139,12 +139,10 @@ class TestPromptDetection:
 class TestSemanticPromptDetection:
     """Tests pour la détection sémantique de prompts"""
 
-    @patch("athalia_core.agents.context_prompt.validate_and_run")
-    def test_detect_prompt_semantic(self, mock_validate):
+    @patch("athalia_core.agents.context_prompt.get_ollama_backend")
+    def test_detect_prompt_semantic(self, mock_backend):
         """Test de détection sémantique de prompt"""
-        mock_result = MagicMock()
-        mock_result.stdout = "Stratégie de tests"
-        mock_validate.return_value = mock_result
+        mock_backend.return_value.generate.return_value = "Stratégie de tests"
 
         filepath = "test_file.py"
 
@@ -159,10 +157,10 @@ class TestSemanticPromptDetection:
             "prompts/dev_debug.yaml",
         ]
 
-    @patch("athalia_core.agents.context_prompt.validate_and_run")
-    def test_detect_prompt_semantic_error(self, mock_validate):
+    @patch("athalia_core.agents.context_prompt.get_ollama_backend")
+    def test_detect_prompt_semantic_error(self, mock_backend):
         """Test de détection sémantique avec erreur"""
-        mock_validate.side_effect = Exception("Error")
+        mock_backend.return_value.generate.side_effect = Exception("Error")
 
         filepath = "test_file.py"
 
@@ -170,10 +168,10 @@ class TestSemanticPromptDetection:
 
         assert semantic_prompt is None
 
-    @patch("athalia_core.agents.context_prompt.validate_and_run")
-    def test_detect_prompt_semantic_timeout(self, mock_validate):
+    @patch("athalia_core.agents.context_prompt.get_ollama_backend")
+    def test_detect_prompt_semantic_timeout(self, mock_backend):
         """Test de détection sémantique avec timeout"""
-        mock_validate.side_effect = TimeoutError("Timeout")
+        mock_backend.return_value.generate.side_effect = TimeoutError("Timeout")
 
         filepath = "test_file.py"
 
@@ -278,12 +276,10 @@ class TestIntegration:
         new_callable=mock_open,
         read_data="import pytest\ndef test_function(): assert True",
     )
-    @patch("athalia_core.agents.context_prompt.validate_and_run")
-    def test_full_prompt_detection_workflow(self, mock_validate, mock_file):
+    @patch("athalia_core.agents.context_prompt.get_ollama_backend")
+    def test_full_prompt_detection_workflow(self, mock_backend, mock_file):
         """Test du workflow complet de détection de prompts"""
-        mock_result = MagicMock()
-        mock_result.stdout = "Stratégie de tests"
-        mock_validate.return_value = mock_result
+        mock_backend.return_value.generate.return_value = "Stratégie de tests"
 
         filepath = "test_file.py"
 
@@ -17,6 +17,7 @@ from athalia_core.ai_robust import (
     query_qwen,
     robust_ai,
 )
+from athalia_core.model_backend import ModelBackendError
 
 
 class TestRobustAI:
@@ -221,57 +222,53 @@ def test_function():
 
     def test_detect_available_models_with_ollama_error(self):
         """Test la détection avec erreur Ollama."""
-        with patch("athalia_core.ai_robust.validate_and_run") as mock_validate:
-            mock_validate.side_effect = Exception("Ollama error")
-            ai = RobustAI()
-            assert AIModel.MOCK in ai.available_models
+        backend = Mock()
+        backend.list_models.side_effect = ModelBackendError("Ollama error")
+        ai = RobustAI(backend=backend)
+        assert ai.available_models == [AIModel.MOCK]
 
     def test_detect_available_models_with_ollama_failure(self):
         """Test la détection avec échec Ollama."""
-        with patch("athalia_core.ai_robust.validate_and_run") as mock_validate:
-            mock_result = Mock()
-            mock_result.returncode = 1
-            mock_validate.return_value = mock_result
-            ai = RobustAI()
-            assert AIModel.MOCK in ai.available_models
+        backend = Mock()
+        backend.list_models.return_value = []
+        ai = RobustAI(backend=backend)
+        assert ai.available_models == [AIModel.MOCK]
 
     def test_detect_available_models_with_ollama_success(self):
         """Test la détection avec succès Ollama."""
-        with patch("athalia_core.ai_robust.validate_and_run") as mock_validate:
-            mock_result = Mock()
-            mock_result.returncode = 0
-            mock_result.stdout = "qwen mistral llava llama codegen"
-            mock_validate.return_value = mock_result
-            ai = RobustAI()
-            assert AIModel.OLLAMA_QWEN in ai.available_models
-            assert AIModel.OLLAMA_MISTRAL in ai.available_models
+        backend = Mock()
+        backend.list_models.return_value = [
+            "qwen:7b",
+            "mistral:latest",
+            "llava:latest",
+            "llama3:8b",
+            "codegen:2b",
+        ]
+        ai = RobustAI(backend=backend)
+        assert AIModel.OLLAMA_QWEN in ai.available_models
+        assert AIModel.OLLAMA_MISTRAL in ai.available_models
 
     def test_call_ollama_success(self):
         """Test l'appel Ollama réussi."""
-        with patch("athalia_core.ai_robust.validate_and_run") as mock_validate:
-            mock_result = Mock()
-            mock_result.returncode = 0
-            mock_result.stdout = "Réponse Ollama"
-            mock_validate.return_value = mock_result
+        with patch.object(self.ai.backend, "generate") as mock_generate:
+            mock_generate.return_value = "Réponse Ollama\n"
 
             result = self.ai._call_ollama("mistral", "test prompt")
             assert result == "Réponse Ollama"
+            mock_generate.assert_called_once_with("mistral", "test prompt", timeout=30)
 
     def test_call_ollama_failure(self):
         """Test l'appel Ollama échoué."""
-        with patch("athalia_core.ai_robust.validate_and_run") as mock_validate:
-            mock_result = Mock()
-            mock_result.returncode = 1
-            mock_result.stderr = "Erreur Ollama"
-            mock_validate.return_value = mock_result
+        with patch.object(self.ai.backend, "generate") as mock_generate:
+            mock_generate.side_effect = ModelBackendError("HTTP 500 Erreur Ollama")
 
             result = self.ai._call_ollama("mistral", "test prompt")
             assert result is None
 
     def test_call_ollama_exception(self):
         """Test l'appel Ollama avec exception."""
-        with patch("athalia_core.ai_robust.validate_and_run") as mock_validate:
-            mock_validate.side_effect = Exception("Erreur système")
+        with patch.object(self.ai.backend, "generate") as mock_generate:
+            mock_generate.side_effect = Exception("Erreur système")
 
             result = self.ai._call_ollama("mistral", "test prompt")
             assert result is None
@@ -476,65 +473,55 @@ def test_fallback_ia_all_fail():
         assert result == "[Aucune réponse IA]"
 
 
-@patch("requests.post")
-def test_query_qwen_success(mock_post):
+@patch("athalia_core.ai_robust.get_ollama_backend")
+def test_query_qwen_success(mock_backend):
     """Test de query_qwen avec succès."""
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"response": "Réponse Qwen"}
-    mock_post.return_value = mock_response
+    mock_backend.return_value.generate.return_value = "Réponse Qwen"
 
     result = query_qwen("Test prompt")
     assert result == "Réponse Qwen"
 
 
-@patch("requests.post")
-def test_query_qwen_failure(mock_post):
+@patch("athalia_core.ai_robust.get_ollama_backend")
+def test_query_qwen_failure(mock_backend):
     """Test de query_qwen avec échec."""
-    mock_response = Mock()
-    mock_response.status_code = 500
-    mock_post.return_value = mock_response
+    mock_backend.return_value.generate.side_effect = ModelBackendError("HTTP 500")
 
     result = query_qwen("Test prompt")
     assert result == ""
 
 
-@patch("requests.post")
-def test_query_qwen_exception(mock_post):
+@patch("athalia_core.ai_robust.get_ollama_backend")
+def test_query_qwen_exception(mock_backend):
     """Test de query_qwen avec exception."""
-    mock_post.side_effect = Exception("Erreur réseau")
+    mock_backend.return_value.generate.side_effect = Exception("Erreur réseau")
 
     result = query_qwen("Test prompt")
     assert result == ""
 
 
-@patch("requests.post")
-def test_query_mistral_success(mock_post):
+@patch("athalia_core.ai_robust.get_ollama_backend")
+def test_query_mistral_success(mock_backend):
     """Test de query_mistral avec succès."""
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"response": "Réponse Mistral"}
-    mock_post.return_value = mock_response
+    mock_backend.return_value.generate.return_value = "Réponse Mistral"
 
     result = query_mistral("Test prompt")
     assert result == "Réponse Mistral"
 
 
-@patch("requests.post")
-def test_query_mistral_failure(mock_post):
+@patch("athalia_core.ai_robust.get_ollama_backend")
+def test_query_mistral_failure(mock_backend):
     """Test de query_mistral avec échec."""
-    mock_response = Mock()
-    mock_response.status_code = 500
-    mock_post.return_value = mock_response
+    mock_backend.return_value.generate.side_effect = ModelBackendError("HTTP 500")
 
     result = query_mistral("Test prompt")
     assert result == ""
 
 
-@patch("requests.post")
-def test_query_mistral_exception(mock_post):
+@patch("athalia_core.ai_robust.get_ollama_backend")
+def test_query_mistral_exception(mock_backend):
     """Test de query_mistral avec exception."""
-    mock_post.side_effect = Exception("Erreur réseau")
+    mock_backend.return_value.generate.side_effect = Exception("Erreur réseau")
 
     result = query_mistral("Test prompt")
     assert result == ""
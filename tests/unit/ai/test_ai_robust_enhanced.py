@@ -110,16 +110,17 @@ class TestRobustAI:
         assert prompt is not None
         assert isinstance(prompt, str)
 
-    @patch("athalia_core.ai_robust_enhanced.subprocess.run")
-    def test_call_ollama(self, mock_run):
+    def test_call_ollama(self):
         """Test d'appel Ollama"""
-        ai = RobustAI()
-        mock_run.return_value = MagicMock(stdout=b"test response", returncode=0)
+        backend = MagicMock()
+        backend.list_models.return_value = []
+        backend.generate.return_value = "test response\n"
+        ai = RobustAI(backend=backend)
 
         response = ai._call_ollama("mistral", "test prompt")
 
-        assert response is not None
-        assert "test response" in response.decode()  # Ajout de .decode()
+        assert response == "test response"
+        backend.generate.assert_called_once_with("mistral", "test prompt", timeout=30)
 
     def test_mock_response(self):
         """Test de réponse mock"""
@@ -166,33 +167,31 @@ class TestFunctions:
 
     def test_fallback_ia(self):
         """Test de la fonction fallback_ia"""
-        with patch("athalia_core.ai_robust_enhanced.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(stdout=b"fallback response", returncode=0)
+        with patch("athalia_core.ai_robust_enhanced.get_ollama_backend") as backend:
+            backend.return_value.list_models.return_value = []
 
             response = fallback_ia("test prompt")
             assert response is not None
             # Test plus flexible pour la réponse
             assert isinstance(response, str)
 
-    @patch("athalia_core.ai_robust_enhanced.subprocess.run")
-    def test_query_qwen(self, mock_run):
+    @patch("athalia_core.ai_robust_enhanced.get_ollama_backend")
+    def test_query_qwen(self, mock_backend):
         """Test de la fonction query_qwen"""
-        mock_run.return_value = MagicMock(stdout=b"qwen response", returncode=0)
+        mock_backend.return_value.list_models.return_value = ["qwen:7b"]
+        mock_backend.return_value.generate.return_value = "qwen response"
 
         response = query_qwen("test prompt")
-        assert response is not None
-        # Test plus flexible pour la réponse
-        assert isinstance(response, str)
+        assert response == "qwen response"
 
-    @patch("athalia_core.ai_robust_enhanced.subprocess.run")
-    def test_query_mistral(self, mock_run):
+    @patch("athalia_core.ai_robust_enhanced.get_ollama_backend")
+    def test_query_mistral(self, mock_backend):
         """Test de la fonction query_mistral"""
-        mock_run.return_value = MagicMock(stdout=b"mistral response", returncode=0)
+        mock_backend.return_value.list_models.return_value = ["mistral:7b"]
+        mock_backend.return_value.generate.return_value = "mistral response"
 
         response = query_mistral("test prompt")
-        assert response is not None
-        # Test plus flexible pour la réponse
-        assert isinstance(response, str)
+        assert response == "mistral response"
 
 
 class TestErrorHandling:
@@ -208,11 +207,11 @@ class TestErrorHandling:
         assert blueprint is not None
         assert "project_name" in blueprint
 
-    @patch("athalia_core.ai_robust_enhanced.subprocess.run")
-    def test_call_ollama_error_handling(self, mock_run):
+    def test_call_ollama_error_handling(self):
         """Test de gestion d'erreur dans _call_ollama"""
         ai = RobustAI()
-        mock_run.side_effect = Exception("Ollama not available")
+        ai.backend = MagicMock()
+        ai.backend.generate.side_effect = Exception("Ollama not available")
 
         response = ai._call_ollama("mistral", "test prompt")
 
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 
 from athalia_core import ai_robust
 
@@ -25,6 +26,14 @@ class TestAiRobust(unittest.TestCase):
         result = instance.generate_blueprint("Créer un assistant")
         self.assertIsInstance(result, dict)
 
+    def test_robustai_generate_blueprint_with_known_type(self):
+        instance = ai_robust.robust_ai()
+        with patch.object(ai_robust, "detect_blueprint_type") as detect:
+            result = instance.generate_blueprint("Créer une API", project_type="web")
+        detect.assert_not_called()
+        self.assertEqual(result["project_type"], "web")
+        self.assertIn("flask", result["dependencies"])
+
     def test_robustai_review_code(self):
         instance = ai_robust.robust_ai()
         result = instance.review_code('print("ok")', "main.py", "python", 80)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module analysis_engine.py
+"""
+
+from unittest.mock import patch
+
+from athalia_core.analysis_engine import ProjectAnalysisEngine
+from athalia_core.ast_analyzer import ASTAnalyzer
+from athalia_core.ast_cache import ASTAnalysisCache
+
+
+def _make_project(tmp_path, count=12):
+    files = []
+    for index in range(count):
+        file_path = tmp_path / f"module_{index}.py"
+        file_path.write_text(
+            f"def func_{index}(x):\n    if x:\n        return {index}\n    return 0\n",
+            encoding="utf-8",
+        )
+        files.append(file_path)
+    (tmp_path / "broken.py").write_text("def broken(:\n", encoding="utf-8")
+    files.append(tmp_path / "broken.py")
+    return files
+
+
+def _by_path(analyses):
+    return sorted(analyses, key=lambda analysis: str(analysis.file_path))
+
+
+class TestProjectAnalysisEngine:
+    """Tests du moteur d'analyse parallèle"""
+
+    def test_sequential_below_threshold(self, tmp_path):
+        """Test que les petits projets restent dans le processus courant"""
+        files = _make_project(tmp_path, count=3)
+        engine = ProjectAnalysisEngine(max_workers=4, min_parallel_files=10)
+
+        with patch.object(engine, "_iter_parallel") as mock_parallel:
+            analyses = engine.analyze_files(files)
+
+        mock_parallel.assert_not_called()
+        assert len(analyses) == 3
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        """Test que l'analyse parallèle donne les mêmes résultats"""
+        files = _make_project(tmp_path)
+
+        sequential = ProjectAnalysisEngine(max_workers=1).analyze_files(files)
+        parallel = ProjectAnalysisEngine(
+            max_workers=2, chunk_size=3, min_parallel_files=1
+        ).analyze_files(files)
+
+        assert len(parallel) == 12
+        assert _by_path(parallel) == _by_path(sequential)
+
+    def test_parallel_results_fill_cache(self, tmp_path):
+        """Test que les résultats des workers sont enregistrés dans le cache"""
+        files = _make_project(tmp_path)
+        cache = ASTAnalysisCache(tmp_path / "cache.db")
+        engine = ProjectAnalysisEngine(
+            ASTAnalyzer(cache=cache), max_workers=2, min_parallel_files=1
+        )
+
+        first = engine.analyze_files(files)
+        assert cache.get_stats()["entries"] == 12
+
+        with patch.object(engine, "_iter_parallel") as mock_parallel:
+            second = engine.analyze_files(files[:-1])
+
+        mock_parallel.assert_not_called()
+        assert _by_path(second) == _by_path(first)
+
+    def test_streams_results(self, tmp_path):
+        """Test que les résultats sont renvoyés au fil de l'eau"""
+        files = _make_project(tmp_path, count=4)
+        engine = ProjectAnalysisEngine(max_workers=1)
+
+        iterator = engine.iter_analyses(files)
+        first = next(iterator)
+
+        assert first.file_path == files[0]
+        assert len(list(iterator)) == 3
+
+    def test_no_file_cap_in_pattern_detector(self, tmp_path):
+        """Test que tous les fichiers d'un projet sont analysés"""
+        from athalia_core.pattern_detector import PatternDetector
+
+        project = tmp_path / "project"
+        project.mkdir()
+        _make_project(project, count=60)
+        detector = PatternDetector(
+            str(tmp_path),
+            analysis_engine=ProjectAnalysisEngine(max_workers=1),
+        )
+
+        result = detector.analyze_project_patterns(str(project))
+
+        assert result["summary"]["files_analyzed"] == 61
+        assert result["summary"]["total_patterns"] >= 60
@@ -98,7 +98,7 @@ class TestArchitectureAnalyzer:
         """Test d'initialisation de l'analyseur d'architecture"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -114,7 +114,7 @@ class TestArchitectureAnalyzer:
         """Test d'initialisation avec chemin par défaut"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -129,7 +129,7 @@ class TestArchitectureAnalyzer:
         """Test de chargement de configuration"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         config_data = """
@@ -150,7 +150,7 @@ class TestArchitectureAnalyzer:
         """Test de chargement de configuration avec fichier inexistant"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", side_effect=FileNotFoundError):
@@ -165,7 +165,7 @@ class TestArchitectureAnalyzer:
         """Test d'analyse complète de l'architecture"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -209,7 +209,7 @@ class TestArchitectureAnalyzer:
         """Test d'analyse d'un module unique"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -241,7 +241,7 @@ class TestArchitectureAnalyzer:
         """Test d'extraction des dépendances"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -259,7 +259,7 @@ class TestArchitectureAnalyzer:
         """Test de détection des problèmes de module"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -282,7 +282,7 @@ class TestArchitectureAnalyzer:
         """Test de calcul du score de performance"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -307,7 +307,7 @@ class TestArchitectureAnalyzer:
         """Test de détection des duplications"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -354,7 +354,7 @@ class TestArchitectureAnalyzer:
         """Test d'analyse des performances"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -390,7 +390,7 @@ class TestArchitectureAnalyzer:
         """Test de construction du graphe de dépendances"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -439,7 +439,7 @@ class TestArchitectureAnalyzer:
         """Test de génération de recommandations"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -486,7 +486,7 @@ class TestArchitectureAnalyzer:
         """Test de génération du plan d'optimisation"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -525,7 +525,7 @@ class TestArchitectureAnalyzer:
         """Test de génération de coordination intelligente"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("builtins.open", mock_open(read_data="config: test")):
@@ -567,7 +567,7 @@ class TestIntegration:
         """Test du workflow complet d'analyse d'architecture"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         config_data = """
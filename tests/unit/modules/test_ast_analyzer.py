@@ -1,7 +1,38 @@
-# Template de test pour athalia_core/ast_analyzer.py
-# Fichier: tests/test_ast_analyzer.py
+#!/usr/bin/env python3
+"""
+Tests pour le module ast_analyzer.py
+"""
+
+from pathlib import Path
 
 import athalia_core.ast_analyzer as module
+from athalia_core.ast_analyzer import ASTAnalyzer, FileAnalysis, SourceIndex
+
+SAMPLE_CODE = '''import os
+from pathlib import Path
+
+
+class Greeter:
+    def greet(self, name):
+        if name and len(name) > 2:
+            return "Bonjour " + name
+        return "Bonjour"
+
+
+def process(items):
+    total = 0
+    for item in items:
+        if item > 0:
+            total += item
+        else:
+            while total > 10:
+                total -= 1
+    try:
+        os.remove("x")
+    except OSError:
+        pass
+    return total
+'''
 
 
 class TestAst_Analyzer:
@@ -13,16 +44,114 @@ class TestAst_Analyzer:
 
     def test_module_has_expected_attributes(self):
         """Test que le module a les attributs attendus"""
-        # TODO: Ajouter les tests spécifiques au module
-        pass
+        assert hasattr(module, "ASTAnalyzer")
+        assert hasattr(module, "ASTNodeInfo")
+        assert hasattr(module, "FileAnalysis")
 
-    def test_module_functions(self):
-        """Test des fonctions principales du module"""
-        # TODO: Ajouter les tests des fonctions
-        pass
 
+class TestASTAnalyzerExtraction:
+    """Tests de l'extraction en un seul parcours"""
+
+    def _analyze(self, tmp_path: Path, code: str = SAMPLE_CODE) -> FileAnalysis:
+        file_path = tmp_path / "sample.py"
+        file_path.write_text(code, encoding="utf-8")
+        analysis = ASTAnalyzer().analyze_file(file_path)
+        assert analysis is not None
+        return analysis
+
+    def test_extracts_all_node_kinds(self, tmp_path):
+        """Test de l'extraction des fonctions, classes, conditions et boucles"""
+        analysis = self._analyze(tmp_path)
+
+        assert [f.name for f in analysis.functions] == ["greet", "process"]
+        assert [c.name for c in analysis.classes] == ["Greeter"]
+        assert [c.line_number for c in analysis.conditionals] == [7, 15]
+        assert [loop.name for loop in analysis.loops] == ["for_14", "while_18"]
+        assert analysis.imports == ["os", "pathlib.Path"]
+        assert analysis.total_lines == len(SAMPLE_CODE.splitlines())
+
+    def test_complexity_is_accumulated_bottom_up(self, tmp_path):
+        """Test de la complexité cyclomatique cumulée par sous-arbre"""
+        analysis = self._analyze(tmp_path)
+        by_name = {f.name: f.complexity for f in analysis.functions}
+
+        # if + and
+        assert by_name["greet"] == 3
+        # for + if + while + except
+        assert by_name["process"] == 5
+        assert analysis.classes[0].complexity == 3
+
+        loops = {loop.name: loop.complexity for loop in analysis.loops}
+        assert loops["for_14"] == 4
+        assert loops["while_18"] == 2
+
+        scored = (
+            analysis.functions
+            + analysis.classes
+            + analysis.conditionals
+            + analysis.loops
+        )
+        expected = sum(n.complexity for n in scored) / len(scored)
+        assert analysis.complexity_score == expected
+
+    def test_deeply_nested_code(self, tmp_path):
+        """Test d'un code profondément imbriqué"""
+        depth = 60
+        lines = ["def nested(x):"]
+        for level in range(depth):
+            lines.append("    " * (level + 1) + f"if x > {level}:")
+        lines.append("    " * (depth + 1) + "return x")
+        analysis = self._analyze(tmp_path, "\n".join(lines) + "\n")
+
+        assert analysis.functions[0].complexity == depth + 1
+        assert analysis.conditionals[0].complexity == depth + 1
+        assert analysis.conditionals[-1].complexity == 2
+
+    def test_node_content_matches_source_lines(self, tmp_path):
+        """Test que le contenu d'un nœud correspond à ses lignes source"""
+        analysis = self._analyze(tmp_path)
+        lines = SAMPLE_CODE.splitlines()
+
+        greet = analysis.functions[0]
+        assert greet.content == "\n".join(lines[5:9])
+        assert analysis.loops[1].content == "\n".join(lines[17:19])
+
+    def test_capture_content_disabled(self, tmp_path):
+        """Test que les signatures restent identiques sans capture du contenu"""
+        file_path = tmp_path / "sample.py"
+        file_path.write_text(SAMPLE_CODE, encoding="utf-8")
+
+        full = ASTAnalyzer().analyze_file(file_path)
+        light = ASTAnalyzer(capture_content=False).analyze_file(file_path)
+
+        assert all(f.content == "" for f in light.functions + light.loops)
+        assert [f.signature for f in light.functions] == [
+            f.signature for f in full.functions
+        ]
+
+    def test_invalid_file_returns_none(self, tmp_path):
+        """Test qu'un fichier invalide renvoie None"""
+        file_path = tmp_path / "broken.py"
+        file_path.write_text("def broken(:\n", encoding="utf-8")
+        assert ASTAnalyzer().analyze_file(file_path) is None
+
+
+class TestSourceIndex:
+    """Tests pour l'index des lignes source"""
+
+    def test_segment(self):
+        """Test du découpage par lignes"""
+        index = SourceIndex("a\nbb\nccc")
+        assert index.line_count == 3
+        assert index.segment(1, 1) == "a"
+        assert index.segment(2, 3) == "bb\nccc"
+        assert index.segment(3, 10) == "ccc"
+        assert index.segment(4, 5) == ""
 
-def test_module_integration():
-    """Test d'intégration du module"""
-    # TODO: Ajouter les tests d'intégration
-    pass
+    def test_segment_with_other_separators(self):
+        """Test que les séparateurs non standard sont normalisés"""
+        content = "a\r\nb\x0cc\n"
+        index = SourceIndex(content)
+        lines = content.splitlines()
+        assert index.line_count == len(lines)
+        assert index.segment(1, 3) == "\n".join(lines)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module ast_cache.py
+"""
+
+import ast
+import os
+import sqlite3
+
+import pytest
+
+from athalia_core.ast_analyzer import ASTAnalyzer
+from athalia_core.ast_cache import SCHEMA_VERSION, ASTAnalysisCache, get_ast_cache
+
+SAMPLE_CODE = """def add(a, b):
+    if a and b:
+        return a + b
+    return 0
+
+
+class Box:
+    def size(self):
+        for i in range(3):
+            pass
+"""
+
+
+class TestASTAnalysisCache:
+    """Tests du cache persistant des analyses AST"""
+
+    def _write(self, tmp_path, name="sample.py", code=SAMPLE_CODE):
+        file_path = tmp_path / name
+        file_path.write_text(code, encoding="utf-8")
+        return file_path
+
+    def test_roundtrip_preserves_analysis(self, tmp_path):
+        """Test qu'une analyse relue depuis la base est identique"""
+        file_path = self._write(tmp_path)
+        db_path = tmp_path / "cache.db"
+
+        fresh = ASTAnalyzer(cache=ASTAnalysisCache(db_path)).analyze_file(file_path)
+
+        # Nouvelle instance : pas de cache mémoire, lecture depuis SQLite
+        cache = ASTAnalysisCache(db_path)
+        cached = ASTAnalyzer(cache=cache).analyze_file(file_path)
+
+        assert cache.stats["hits"] == 1
+        assert cached == fresh
+
+    def test_file_parsed_once_per_change(self, tmp_path, monkeypatch):
+        """Test qu'un fichier inchangé n'est pas re-parsé"""
+        file_path = self._write(tmp_path)
+        analyzer = ASTAnalyzer(cache=ASTAnalysisCache(tmp_path / "cache.db"))
+
+        parses = []
+        original_parse = ast.parse
+        monkeypatch.setattr(
+            ast, "parse", lambda source: parses.append(1) or original_parse(source)
+        )
+
+        analyzer.analyze_file(file_path)
+        analyzer.analyze_file(file_path)
+        assert len(parses) == 1
+
+        file_path.write_text(SAMPLE_CODE + "\nx = 1\n", encoding="utf-8")
+        analysis = analyzer.analyze_file(file_path)
+        assert len(parses) == 2
+        assert analysis.total_lines == len(SAMPLE_CODE.splitlines()) + 2
+
+    def test_touched_file_hits_by_content_hash(self, tmp_path):
+        """Test qu'un fichier touché mais inchangé est retrouvé par son hash"""
+        file_path = self._write(tmp_path)
+        db_path = tmp_path / "cache.db"
+        ASTAnalyzer(cache=ASTAnalysisCache(db_path)).analyze_file(file_path)
+
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        cache = ASTAnalysisCache(db_path)
+        assert cache.get_fresh(file_path, file_path.stat()) is None
+        assert ASTAnalyzer(cache=cache).analyze_file(file_path) is not None
+        assert cache.stats == {
+            "hits": 0,
+            "misses": 2,
+            "revalidated": 1,
+            "saves": 0,
+            "evictions": 0,
+        }
+        assert cache.get_stats()["hit_rate"] == 50.0
+
+    def test_batch_misses_are_counted_once(self, tmp_path):
+        """Test qu'un fichier absent d'une lecture groupée n'est compté qu'une fois"""
+        known = self._write(tmp_path, "a.py")
+        new = self._write(tmp_path, "b.py")
+        db_path = tmp_path / "cache.db"
+        ASTAnalyzer(cache=ASTAnalysisCache(db_path)).analyze_file(known)
+
+        cache = ASTAnalysisCache(db_path)
+        found = cache.get_fresh_many([(known, known.stat()), (new, new.stat())])
+        ASTAnalyzer(cache=cache).analyze_file(new)
+
+        assert list(found) == [known]
+        assert (cache.stats["hits"], cache.stats["misses"]) == (1, 1)
+        assert cache.get_fresh(new, new.stat()) is not None
+
+    def test_connections_are_closed(self, tmp_path, monkeypatch):
+        """Test que chaque opération ferme sa connexion"""
+        opened = []
+        real_connect = sqlite3.connect
+
+        def connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            opened.append(conn)
+            return conn
+
+        monkeypatch.setattr(sqlite3, "connect", connect)
+        file_path = self._write(tmp_path)
+        cache = ASTAnalysisCache(tmp_path / "cache.db")
+        ASTAnalyzer(cache=cache).analyze_file(file_path)
+        cache.get_stats()
+
+        assert len(opened) >= 3
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+    def test_signature_only_entries_do_not_serve_content(self, tmp_path):
+        """Test qu'une entrée sans contenu ne sert pas un appelant qui le veut"""
+        file_path = self._write(tmp_path)
+        cache = ASTAnalysisCache(tmp_path / "cache.db")
+
+        light = ASTAnalyzer(capture_content=False, cache=cache).analyze_file(file_path)
+        full = ASTAnalyzer(cache=cache).analyze_file(file_path)
+
+        assert light.functions[0].content == ""
+        assert full.functions[0].content.startswith("def add")
+
+    def test_lru_eviction(self, tmp_path):
+        """Test de l'éviction des entrées les moins récemment utilisées"""
+        cache = ASTAnalysisCache(tmp_path / "cache.db", max_entries=2)
+        analyzer = ASTAnalyzer(cache=cache)
+
+        first = self._write(tmp_path, "a.py")
+        second = self._write(tmp_path, "b.py")
+        third = self._write(tmp_path, "c.py")
+        analyzer.analyze_file(first)
+        analyzer.analyze_file(second)
+        analyzer.analyze_file(first)
+        analyzer.analyze_file(third)
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        with sqlite3.connect(cache.db_path) as conn:
+            paths = {row[0] for row in conn.execute("SELECT path FROM ast_cache")}
+        assert paths == {str(first), str(third)}
+
+    def test_schema_version_mismatch_purges(self, tmp_path):
+        """Test qu'un schéma obsolète est purgé"""
+        db_path = tmp_path / "cache.db"
+        file_path = self._write(tmp_path)
+        ASTAnalyzer(cache=ASTAnalysisCache(db_path)).analyze_file(file_path)
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+
+        assert ASTAnalysisCache(db_path).get_stats()["entries"] == 0
+
+    def test_shared_cache_per_project(self, tmp_path):
+        """Test que le cache partagé est unique par projet"""
+        assert get_ast_cache(tmp_path) is get_ast_cache(tmp_path)
+        assert (
+            get_ast_cache(tmp_path).db_path
+            == (tmp_path / ".athalia_cache" / "ast_cache.db").resolve()
+        )
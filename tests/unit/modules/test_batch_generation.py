@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module batch_generation.py
+"""
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from athalia_core.batch_generation import (
+    BatchGenerator,
+    generate_batch,
+    load_ideas,
+    plan_batch,
+)
+from athalia_core.cli import cli
+
+
+class FakeAI:
+    """IA de test : compte les blueprints, échoue sur les idées « boom »"""
+
+    def __init__(self):
+        self.ideas = []
+        self.types = {}
+        self._lock = threading.Lock()
+
+    def generate_blueprint(self, idea, **kwargs):
+        with self._lock:
+            self.ideas.append(idea)
+            self.types[idea] = kwargs.get("project_type")
+        if "boom" in idea:
+            raise RuntimeError("modèle indisponible")
+        return {"project_name": idea.split()[0], "description": idea, **kwargs}
+
+
+@pytest.fixture
+def fake_ai():
+    ai = FakeAI()
+    with patch("athalia_core.batch_generation._robust_ai", return_value=ai):
+        yield ai
+
+
+def test_load_ideas_formats(tmp_path):
+    jsonl = tmp_path / "ideas.jsonl"
+    jsonl.write_text('"api météo"\n\n{"id": "b", "idea": "robot reachy"}\n')
+    yaml_file = tmp_path / "ideas.yaml"
+    yaml_file.write_text("ideas:\n  - api météo\n  - idea: robot reachy\n")
+    text = tmp_path / "ideas.txt"
+    text.write_text("# commentaire\napi météo\nrobot reachy\n")
+
+    for path in (jsonl, yaml_file, text):
+        ideas = [entry["idea"] for entry in load_ideas(path)]
+        assert ideas == ["api météo", "robot reachy"]
+    assert load_ideas(jsonl)[1]["id"] == "b"
+
+
+def test_plan_batch_deduplicates_and_classifies():
+    entries = [
+        {"idea": "API REST de météo"},
+        {"idea": "  api   rest de MÉTÉO "},
+        {"idea": "robot reachy"},
+    ]
+    items, duplicates = plan_batch(entries)
+
+    assert duplicates == 1
+    assert [item.index for item in items] == [0, 2]
+    assert items[0].duplicates == [1]
+    assert [item.project_type for item in items] == ["api", "robotics"]
+    (item,), _ = plan_batch([{"idea": "robot", "project_type": "web"}])
+    assert (item.project_type, item.options) == ("web", {})
+
+
+def test_batch_streams_results_and_failures(tmp_path, fake_ai):
+    entries = [
+        {"idea": "alpha api"},
+        {"idea": "boom api"},
+        {"idea": "ALPHA  api"},
+        {"idea": "gamma robot", "id": "g"},
+    ]
+    results = tmp_path / "results.jsonl"
+    generator = BatchGenerator(tmp_path / "out", workers=3, use_processes=False)
+    with open(results, "w", encoding="utf-8") as f:
+        summary = generator.run(entries, f)
+
+    records = {
+        record["index"]: record
+        for record in map(json.loads, results.read_text().splitlines())
+    }
+    assert sorted(fake_ai.ideas) == ["alpha api", "boom api", "gamma robot"]
+    assert fake_ai.types["gamma robot"] == "robotics"
+    assert (summary.total, summary.unique, summary.duplicates) == (4, 3, 1)
+    assert (summary.succeeded, summary.failed) == (2, 1)
+    assert records[1]["status"] == "failed"
+    assert "modèle indisponible" in records[1]["error"]
+    assert records[2] == {
+        "index": 2,
+        "idea": "alpha api",
+        "status": "duplicate",
+        "duplicate_of": 0,
+    }
+    assert records[3]["id"] == "g"
+    assert (tmp_path / "out" / "00003_gamma" / "main.py").exists()
+
+
+def test_batch_concurrency_is_bounded(tmp_path):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    release = threading.Event()
+
+    class SlowAI(FakeAI):
+        def generate_blueprint(self, idea, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            release.wait(0.05)
+            with lock:
+                active -= 1
+            return super().generate_blueprint(idea, **kwargs)
+
+    with patch("athalia_core.batch_generation._robust_ai", return_value=SlowAI()):
+        generator = BatchGenerator(
+            tmp_path, workers=2, use_processes=False, dry_run=True
+        )
+        summary = generator.run([{"idea": f"projet {i}"} for i in range(8)])
+
+    assert summary.succeeded == 8
+    assert peak <= 2
+
+
+def test_unknown_post_step_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        BatchGenerator(tmp_path, post_steps=["deploy"])
+
+
+def test_batch_cli(tmp_path, fake_ai):
+    ideas = tmp_path / "ideas.txt"
+    ideas.write_text("alpha api\nbeta web\nalpha api\n")
+    output = tmp_path / "projects"
+
+    result = CliRunner().invoke(
+        cli, ["batch", str(ideas), "-o", str(output), "--threads", "--dry-run"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "2/2 projets générés" in result.output
+    lines = (output / "batch_results.jsonl").read_text().splitlines()
+    assert len(lines) == 3
+
+
+def test_generate_batch_writes_results_file(tmp_path, fake_ai):
+    ideas = tmp_path / "ideas.jsonl"
+    ideas.write_text('"alpha api"\n"boom"\n')
+    results = tmp_path / "results.jsonl"
+
+    summary = generate_batch(
+        ideas, tmp_path / "out", results, workers=1, use_processes=False
+    )
+
+    assert summary.failed == 1
+    lines = results.read_text().splitlines()
+    statuses = [json.loads(line)["status"] for line in lines]
+    assert sorted(statuses) == ["failed", "ok"]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests pour le cache à deux niveaux de cache_manager.py
+"""
+
+import json
+import math
+import threading
+import time
+
+from athalia_core.cache_manager import NEVER_EXPIRES, CacheManager
+
+BLUEPRINT = {"name": "demo", "description": "Projet", "project_type": "api"}
+
+
+def test_entries_are_sharded_and_shared(tmp_path):
+    cache = CacheManager(str(tmp_path))
+    assert cache.set(BLUEPRINT, {"value": 1})
+
+    key = cache._generate_cache_key(BLUEPRINT)
+    assert (tmp_path / key[:2] / f"{key}.pkl").exists()
+    assert not list(tmp_path.glob("*.pkl"))
+    assert CacheManager(str(tmp_path)).get(BLUEPRINT) == {"value": 1}
+
+
+def test_memory_tier_returns_copies(tmp_path):
+    cache = CacheManager(str(tmp_path))
+    cache.set(BLUEPRINT, {"items": []})
+
+    cache.get(BLUEPRINT)["items"].append("modifié")
+    assert cache.get(BLUEPRINT) == {"items": []}
+    assert cache.get_stats()["memory_entries"] == 1
+
+
+def test_per_entry_ttl(tmp_path):
+    cache = CacheManager(str(tmp_path), ttl=3600)
+    cache.set_entry("aa01", "court", ttl=-1)
+    cache.set_entry("aa02", "illimité", ttl=math.inf)
+    cache.set_entry("aa03", "défaut")
+
+    assert cache.get_entry("aa01") is None
+    assert not (tmp_path / "aa" / "aa01.pkl").exists()
+    assert (tmp_path / "aa" / "aa02.pkl").stat().st_mtime == NEVER_EXPIRES
+    assert cache.get_entry("aa02") == "illimité"
+    expires = (tmp_path / "aa" / "aa03.pkl").stat().st_mtime
+    assert 3500 < expires - time.time() <= 3600
+
+
+def test_eviction_by_count_and_size(tmp_path):
+    cache = CacheManager(str(tmp_path), max_entries=10, evict_every=5)
+    for i in range(30):
+        cache.set_entry(f"{i:02x}{i:04d}", i, ttl=100 + i)
+
+    assert cache.get_stats()["cache_size"] <= 10
+    # Les entrées expirant le plus tard sont conservées
+    assert cache.get_entry(f"{29:02x}0029") == 29
+
+    small = CacheManager(str(tmp_path / "small"), max_size_mb=0.01)
+    for i in range(10):
+        small.set_entry(f"ab{i:04d}", b"x" * 4096)
+    assert small.optimize_cache()
+    assert small.get_stats()["cache_bytes"] <= 0.01 * 1024 * 1024
+    assert small.get_stats()["evictions"] > 0
+
+
+def test_stats_are_flushed_in_batches(tmp_path):
+    cache = CacheManager(
+        str(tmp_path), stats_flush_every=10, stats_flush_interval=3600
+    )
+    for _ in range(5):
+        cache.get(BLUEPRINT)
+    assert not (tmp_path / "cache_stats.json").exists()
+    assert cache.get_stats()["misses"] == 5
+
+    other = CacheManager(str(tmp_path))
+    other.get(BLUEPRINT)
+    other.flush_stats()
+    cache.flush_stats()
+
+    saved = json.loads((tmp_path / "cache_stats.json").read_text())
+    assert saved["misses"] == 6 and saved["total_requests"] == 6
+
+
+def test_concurrent_writers(tmp_path):
+    caches = [CacheManager(str(tmp_path)) for _ in range(4)]
+    errors = []
+
+    def worker(cache, n):
+        try:
+            for i in range(50):
+                cache.set_entry(f"ff{i:04d}", {"writer": n, "i": i})
+                assert cache.get_entry(f"ff{i:04d}")["i"] == i
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=worker, args=(cache, n))
+        for n, cache in enumerate(caches)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert not list(tmp_path.rglob(".tmp-*"))
+    assert caches[0].clear()
+    assert caches[0].get_stats()["cache_size"] == 0
+
+
+def test_keys_cover_the_full_blueprint(tmp_path):
+    cache = CacheManager(str(tmp_path))
+    key = cache._generate_cache_key(BLUEPRINT)
+
+    assert len(key) == 64
+    with_modules = {**BLUEPRINT, "modules": ["auth"]}
+    assert cache._generate_cache_key(with_modules) != key
+    assert cache._generate_cache_key(dict(reversed(BLUEPRINT.items()))) == key
+    assert cache._generate_cache_key({**BLUEPRINT, "timestamp": "now"}) == key
+    assert cache._generate_cache_key(BLUEPRINT, {"project_path": "/a"}) != key
+    assert CacheManager(str(tmp_path), namespace="ia")._generate_cache_key(
+        BLUEPRINT
+    ) != key
+
+    cache.set(BLUEPRINT, {"value": 1})
+    assert cache.get(with_modules) is None
+
+
+def test_explain_key(tmp_path):
+    cache = CacheManager(str(tmp_path))
+    explanation = cache.explain_key(
+        {**BLUEPRINT, "created_at": "hier", "tags": {"b", "a"}}, {"project_path": "."}
+    )
+
+    assert explanation["key"] == cache._generate_cache_key(
+        {**BLUEPRINT, "tags": {"a", "b"}}, {"project_path": "."}
+    )
+    assert explanation["fields"] == ["description", "name", "project_type", "tags"]
+    assert explanation["ignored_fields"] == ["created_at"]
+    assert explanation["context"] == ["project_path"]
+    assert explanation["namespace"].startswith("athalia-")
+    assert '"tags":["a","b"]' in explanation["canonical"]
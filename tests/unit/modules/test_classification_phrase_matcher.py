@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module classification/phrase_matcher.py
+"""
+
+from athalia_core.classification import (
+    KeywordMatcher,
+    ProjectType,
+    classify_project,
+    detect_blueprint_type,
+    rank_project_types,
+)
+
+
+def test_matcher_respects_word_boundaries():
+    matcher = KeywordMatcher({"api": ["api"], "art": ["art"]})
+
+    assert matcher.find("une api rapide") == {"api"}
+    assert matcher.find("smart rapid apartment") == set()
+    assert matcher.best("smart rapid apartment", default="generic") == "generic"
+
+
+def test_matcher_credits_contained_keywords_and_plurals():
+    matcher = KeywordMatcher(
+        {"web": ["web", "application web"], "game": ["jeu", "plateforme"]}
+    )
+
+    assert matcher.find("Une APPLICATION WEB") == {"application web", "web"}
+    assert matcher.find("jeux de plateformes") == {"jeu", "plateforme"}
+
+
+def test_matcher_ranks_all_labels_with_confidence():
+    matcher = KeywordMatcher(
+        {"api": {"api": 1.0, "rest": 1.0}, "web": ["web"], "data": ["pandas"]}
+    )
+
+    ranked = matcher.rank("api rest pour le web")
+
+    assert [entry.label for entry in ranked] == ["api", "web"]
+    assert ranked[0].score == 2.0
+    assert ranked[0].confidence == round(2 / 3, 3)
+    # Égalité : l'ordre de la table départage
+    assert matcher.rank("web pandas")[0].label == "web"
+
+
+def test_classify_project_scores_instead_of_first_match():
+    assert classify_project("une todo list partagée") == ProjectType.API
+    assert classify_project("fleur qui danse en musique") == ProjectType.ARTISTIC
+    assert classify_project("robot avec capteur de distance") == ProjectType.ROBOTICS
+    assert classify_project("jeu de plateforme avec score") == ProjectType.GAME
+    assert classify_project("projet sans indice") == ProjectType.GENERIC
+
+    ranked = rank_project_types("dashboard web avec pandas et numpy")
+    assert ranked[0].label == ProjectType.DATA
+    assert ProjectType.WEB in [entry.label for entry in ranked]
+    assert abs(sum(entry.confidence for entry in ranked) - 1) < 0.01
+
+
+def test_detect_blueprint_type():
+    assert detect_blueprint_type("Créer une API REST avec FastAPI") == "api"
+    assert detect_blueprint_type("Robot Reachy avec ROS2") == "robotics"
+    assert detect_blueprint_type("calculatrice desktop") == "desktop"
+    assert detect_blueprint_type("maison intelligente") == "generic"
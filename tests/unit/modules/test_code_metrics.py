@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module code_metrics.py
+"""
+
+import pytest
+
+from athalia_core import code_metrics
+from athalia_core.advanced_analytics import AdvancedAnalytics
+from athalia_core.ast_analyzer import ASTAnalyzer
+from athalia_core.code_linter import CodeLinter
+from athalia_core.code_metrics import (
+    METRICS_CACHE,
+    MetricsCache,
+    analyze_files,
+    analyze_source,
+)
+from athalia_core.intelligent_auditor import IntelligentAuditor
+from athalia_core.project_snapshot import ProjectSnapshot
+
+SOURCE = '''"""Module documenté"""
+
+
+class Parser:
+    """Analyseur"""
+
+    def parse(self, items):
+        """Parcourt les éléments"""
+        if items and self.ready:
+            for item in items:
+                if item:
+                    yield item
+        elif self.strict:
+            raise ValueError
+        return [i for i in items if i]
+
+
+async def fetch(url):
+    def retry():
+        return 1 if url else 2
+
+    try:
+        pass
+    except OSError:
+        pass
+    else:
+        pass
+'''
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    METRICS_CACHE.clear()
+    yield
+    METRICS_CACHE.clear()
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "parser.py").write_text(SOURCE)
+    (tmp_path / "simple.py").write_text("def f(x):\n    return x\n")
+    (tmp_path / "broken.py").write_text("def broken(:\n")
+    return tmp_path
+
+
+def test_function_metrics_in_one_pass():
+    metrics = analyze_source(SOURCE)
+
+    assert [
+        (f.name, f.line, f.complexity, f.nesting, f.loc, f.has_docstring)
+        for f in metrics.functions
+    ] == [
+        # if + and + for + if + elif + compréhension (for, if)
+        ("Parser.parse", 7, 8, 3, 9, True),
+        # except + else du try + expression conditionnelle de retry
+        ("fetch", 18, 4, 1, 10, False),
+        ("fetch.retry", 19, 2, 0, 2, False),
+    ]
+    assert metrics.complexity == 11
+    assert metrics.loc == len(SOURCE.splitlines())
+    assert (metrics.has_docstring, metrics.classes, metrics.documented_classes) == (
+        True,
+        1,
+        1,
+    )
+    assert [f.name for f in metrics.complex_functions(threshold=5)] == [
+        "Parser.parse"
+    ]
+    assert analyze_source("def broken(:\n") is None
+
+
+def test_radon_rules_for_assert_and_match():
+    source = """def route(command, strict):
+    assert command
+    match command:
+        case "start":
+            return 1
+        case "stop" if strict:
+            return 2
+        case _:
+            return 0
+
+
+def only_default(value):
+    match value:
+        case _:
+            return value
+"""
+    metrics = analyze_source(source)
+
+    # assert + deux ``case`` ; ni le ``case _`` ni la garde ne comptent
+    assert [(f.name, f.complexity) for f in metrics.functions] == [
+        ("route", 4),
+        ("only_default", 1),
+    ]
+
+
+def test_modules_report_the_same_complexity(project):
+    snapshot = ProjectSnapshot(project)
+    expected = analyze_source(SOURCE)
+
+    analysis = ASTAnalyzer().analyze_file(project / "parser.py")
+    analytics = AdvancedAnalytics(str(project), snapshot=snapshot)
+    analytics._analyze_complexity()
+    auditor = IntelligentAuditor(str(project), snapshot=snapshot)
+    complexity = auditor._analyze_complexity()
+
+    assert {f.name: f.complexity for f in analysis.functions} == {
+        "parse": 8,
+        "retry": 2,
+    }
+    assert analytics.metrics["complexity"]["complexity"] == {
+        "parser.py": expected.complexity,
+        "simple.py": 1,
+    }
+    assert complexity["max_complexity"] == expected.complexity
+
+
+def test_unchanged_files_are_not_reanalyzed(project, monkeypatch):
+    analyzed = []
+    original = code_metrics.analyze_tree
+    monkeypatch.setattr(
+        code_metrics,
+        "analyze_tree",
+        lambda tree, loc=0: analyzed.append(loc) or original(tree, loc),
+    )
+    snapshot = ProjectSnapshot(project)
+
+    first = analyze_files(snapshot.python_files())
+    (project / "simple.py").write_text("def f(x):\n    return x or 0\n")
+    snapshot.invalidate()
+    second = analyze_files(snapshot.python_files())
+
+    assert [entry.name for entry, _ in first] == ["parser.py", "simple.py"]
+    assert len(analyzed) == 3
+    assert second[1][1].functions[0].complexity == 2
+
+
+def test_parallel_analysis_matches_sequential(project):
+    for i in range(4):
+        (project / f"copy{i}.py").write_text(SOURCE + f"\nx = {i}\n")
+    entries = ProjectSnapshot(project).python_files()
+
+    parallel = analyze_files(entries, max_workers=2, min_parallel_files=1)
+    METRICS_CACHE.clear()
+    sequential = analyze_files(entries, min_parallel_files=100)
+
+    assert parallel == sequential
+    assert len(parallel) == 6
+
+
+def test_cache_evicts_least_recently_used():
+    cache = MetricsCache(max_entries=2)
+    cache.store("a", None)
+    cache.store("b", None)
+    cache.lookup("a")
+    cache.store("c", None)
+
+    assert (cache.lookup("a")[0], cache.lookup("b")[0], len(cache)) == (
+        True,
+        False,
+        2,
+    )
+
+
+def test_linter_uses_in_process_metrics(project):
+    nested = "def tangled(x):\n" + "".join(
+        "    " * (level + 1) + f"if x > {level}:\n" for level in range(12)
+    )
+    (project / "tangled.py").write_text(nested + "    " * 13 + "return x\n")
+    linter = CodeLinter(str(project))
+
+    linter._run_complexity_analysis()
+    linter._run_documentation_check()
+
+    assert linter.report["warnings"] == [
+        "Fonctions complexes détectées: tangled (complexité: 13)",
+        "Couverture documentation faible: 20.0%",
+    ]
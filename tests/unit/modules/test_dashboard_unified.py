@@ -17,7 +17,7 @@ class TestDashboardUnifieSimple:
         """Test de création du dashboard unifié"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         dashboard = DashboardUnifieSimple("test_db.sqlite")
@@ -30,7 +30,7 @@ class TestDashboardUnifieSimple:
         """Test d'enregistrement d'une métrique"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         dashboard = DashboardUnifieSimple("test_db.sqlite")
@@ -43,14 +43,16 @@ class TestDashboardUnifieSimple:
             details={"tests_passes": 100, "tests_total": 120},
         )
 
-        mock_cursor.execute.assert_called()
+        # Insertion groupée : écrite au vidage du tampon
+        dashboard.store.flush()
+        mock_conn.executemany.assert_called()
 
     @patch("sqlite3.connect")
     def test_enregistrer_evenement(self, mock_connect):
         """Test d'enregistrement d'un événement"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         dashboard = DashboardUnifieSimple("test_db.sqlite")
@@ -65,14 +67,16 @@ class TestDashboardUnifieSimple:
             details={"tests_passes": 95, "tests_echoues": 5},
         )
 
-        mock_cursor.execute.assert_called()
+        # Insertion groupée : écrite au vidage du tampon
+        dashboard.store.flush()
+        mock_conn.executemany.assert_called()
 
     @patch("sqlite3.connect")
     def test_enregistrer_rapport(self, mock_connect):
         """Test d'enregistrement d'un rapport"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         dashboard = DashboardUnifieSimple("test_db.sqlite")
@@ -86,14 +90,16 @@ class TestDashboardUnifieSimple:
             score_securite=90,
         )
 
-        mock_cursor.execute.assert_called()
+        # Insertion groupée : écrite au vidage du tampon
+        dashboard.store.flush()
+        mock_conn.executemany.assert_called()
 
     @patch("sqlite3.connect")
     def test_obtenir_metriques_temps_reel(self, mock_connect):
         """Test de récupération des métriques en temps réel"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         # Mock des données de métriques avec la vraie structure
@@ -119,7 +125,7 @@ class TestDashboardUnifieSimple:
         """Test de génération du rapport consolidé"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         # Mock des données pour le rapport avec la vraie structure
@@ -159,7 +165,7 @@ class TestDashboardUnifieSimple:
         """Test de génération du dashboard HTML"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         # Mock des données pour le dashboard avec la vraie structure
@@ -198,7 +204,7 @@ class TestDashboardUnifieSimple:
         """Test d'ouverture du dashboard"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         dashboard = DashboardUnifieSimple("test_db.sqlite")
@@ -221,7 +227,7 @@ class TestIntegration:
         """Test du workflow complet du dashboard"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         # Mock des données variées
@@ -270,7 +276,7 @@ class TestIntegration:
         """Test de cohérence des données du dashboard"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         # Mock des données de métriques
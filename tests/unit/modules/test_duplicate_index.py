@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module duplicate_index.py
+"""
+
+import random
+from datetime import datetime
+
+from athalia_core.duplicate_index import DuplicateIndex, lsh_parameters
+from athalia_core.fingerprints import code_fingerprint, code_shingles, jaccard
+from athalia_core.pattern_detector import CodePattern, PatternDetector
+
+BODY = """
+def compute_total(items):
+    total = 0
+    for item in items:
+        if item.price > 0:
+            total += item.price * item.quantity
+    return round(total, 2)
+"""
+
+
+class TestShingles:
+    """Tests des empreintes de code"""
+
+    def test_fingerprint_ignores_comments_and_spacing(self):
+        """Test que commentaires et espaces n'affectent pas l'empreinte"""
+        variant = BODY.replace("    total = 0", "    total   =   0  # init")
+        assert code_fingerprint(variant) == code_fingerprint(BODY)
+        assert code_shingles(variant) == code_shingles(BODY)
+
+    def test_jaccard(self):
+        """Test de la similarité de Jaccard"""
+        assert jaccard(frozenset({1, 2}), frozenset({1, 2})) == 1.0
+        assert jaccard(frozenset({1, 2}), frozenset({2, 3})) == 1 / 3
+        assert jaccard(frozenset(), frozenset()) == 1.0
+        # Bottom-k : 4 plus petits hashes de l'union {1..6}, dont 2 communs
+        first, second = frozenset({1, 3, 4, 6}), frozenset({2, 3, 5, 6})
+        assert jaccard(first, second, sketch_size=4) == 1 / 4
+        assert jaccard(first, second, sketch_size=6) == 2 / 6
+
+    def test_lsh_parameters_favor_recall(self):
+        """Test que le seuil LSH effectif reste sous le seuil demandé"""
+        bands, rows = lsh_parameters(0.7, 64)
+        assert bands * rows == 64
+        assert (1 / bands) ** (1 / rows) < 0.7
+
+
+class TestDuplicateIndex:
+    """Tests de l'index de doublons"""
+
+    def _index(self, bodies, threshold=0.7):
+        index = DuplicateIndex(threshold)
+        for key, body in bodies.items():
+            index.add(key, code_fingerprint(body), code_shingles(body))
+        return index
+
+    def test_exact_duplicates(self):
+        """Test du regroupement des doublons exacts"""
+        clusters = self._index({"a": BODY, "b": BODY, "c": "x = 1"}).clusters()
+        assert clusters == [(["a", "b"], 1.0)]
+
+    def test_near_duplicates_with_real_similarity(self):
+        """Test des quasi-doublons et de leur similarité réelle"""
+        near = BODY.replace("round(total, 2)", "round(total)")
+        other = "def unrelated(a, b):\n    return [x ** 2 for x in range(a, b)]\n"
+        index = self._index({"a": BODY, "b": near, "c": other})
+
+        clusters = index.clusters()
+
+        assert len(clusters) == 1
+        keys, similarity = clusters[0]
+        assert sorted(keys) == ["a", "b"]
+        expected = jaccard(code_shingles(BODY), code_shingles(near))
+        assert similarity == round(expected, 4)
+        assert 0.7 <= similarity < 1.0
+
+    def test_threshold_is_tunable(self):
+        """Test que le seuil de similarité est respecté"""
+        near = BODY.replace("item.price * item.quantity", "item.cost")
+        similarity = jaccard(code_shingles(BODY), code_shingles(near))
+
+        assert self._index({"a": BODY, "b": near}, similarity - 0.05).clusters()
+        assert not self._index({"a": BODY, "b": near}, similarity + 0.05).clusters()
+
+    def test_scales_to_many_items(self):
+        """Test qu'un grand nombre d'éléments distincts reste rapide"""
+        index = DuplicateIndex(0.7)
+        for number in range(5000):
+            generator = random.Random(number)
+            shingles = [generator.getrandbits(64) for _ in range(40)]
+            index.add(number, f"body_{number}", shingles)
+        index.add("copy", "body_1", [])
+
+        clusters = index.clusters()
+        assert [sorted(map(str, keys)) for keys, _ in clusters] == [["1", "copy"]]
+
+
+class TestPatternDetectorDuplicates:
+    """Tests de la détection de doublons du PatternDetector"""
+
+    def _pattern(self, body, location):
+        return CodePattern(
+            pattern_type="function",
+            signature=f"function:{location}",
+            locations=[location],
+            similarity_score=1.0,
+            complexity=2,
+            last_seen=datetime.now(),
+            fingerprint=code_fingerprint(body),
+            shingles=code_shingles(body),
+        )
+
+    def test_detect_duplicates_reports_cluster_similarity(self, tmp_path):
+        """Test que les doublons approchés sont regroupés avec leur score"""
+        detector = PatternDetector(str(tmp_path), similarity_threshold=0.6)
+        near = BODY.replace("round(total, 2)", "round(total)")
+        patterns = [
+            self._pattern(BODY, "a.py"),
+            self._pattern(BODY, "b.py"),
+            self._pattern(near, "c.py"),
+            self._pattern("def other():\n    return None\n", "d.py"),
+        ]
+
+        duplicates = detector._detect_duplicates(patterns)
+
+        assert len(duplicates) == 1
+        assert sorted(duplicates[0].locations) == ["a.py", "b.py", "c.py"]
+        assert duplicates[0].severity == "medium"
+        assert 0.6 <= duplicates[0].similarity_score < 1.0
+
+        exact_only = detector._detect_duplicates(patterns, threshold=1.0)
+        assert [sorted(d.locations) for d in exact_only] == [["a.py", "b.py"]]
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module fingerprints.py
+"""
+
+import subprocess
+import sys
+
+from athalia_core.ast_analyzer import ASTAnalyzer
+from athalia_core.fingerprints import (
+    SKETCH_SIZE,
+    code_fingerprint,
+    code_shingles,
+    jaccard,
+)
+from athalia_core.intelligent_memory import IntelligentMemory
+
+BODY = '''
+def compute_total(items):
+    """Somme des prix"""
+    total = 0
+    for item in items:
+        if item.price > 0:
+            total += item.price * item.quantity
+    return round(total, 2)
+'''
+
+RENAMED = '''
+def sum_cart(rows):
+    acc = 0  # accumulateur
+    for row in rows:
+        if row.cost > 10:
+            acc += row.cost * row.count
+    return round(acc, 4)
+'''
+
+
+class TestStructuralFingerprints:
+    """Tests des empreintes structurelles"""
+
+    def test_identifiers_literals_and_docstrings_are_abstracted(self):
+        """Test qu'un renommage ne change pas l'empreinte"""
+        assert code_fingerprint(RENAMED) == code_fingerprint(BODY)
+        assert code_shingles(RENAMED) == code_shingles(BODY)
+        assert len(code_fingerprint(BODY)) == 32
+
+    def test_structure_changes_fingerprint(self):
+        """Test qu'un changement de structure change l'empreinte"""
+        changed = BODY.replace("total += item.price", "total -= item.price")
+        assert code_fingerprint(changed) != code_fingerprint(BODY)
+        assert 0.5 < jaccard(code_shingles(changed), code_shingles(BODY)) < 1.0
+
+    def test_stable_across_processes(self):
+        """Test que l'empreinte ne dépend pas du sel de hash() du processus"""
+        script = (
+            "from athalia_core.fingerprints import code_fingerprint;"
+            f"print(code_fingerprint({BODY!r}))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={"PYTHONHASHSEED": "123"},
+        ).stdout.strip()
+        assert output == code_fingerprint(BODY)
+
+    def test_indented_and_invalid_code(self):
+        """Test des extraits indentés et du repli lexical"""
+        indented = "\n".join("        " + line for line in BODY.splitlines())
+        assert code_fingerprint(indented) == code_fingerprint(BODY)
+        assert len(code_fingerprint("def broken(:")) == 32
+        assert code_shingles("def broken(:")
+
+    def test_sketch_is_bounded(self):
+        """Test que l'échantillon de shingles reste borné"""
+        big = "\n".join(f"value_{i} = compute({i}, 'x') + {i}" for i in range(500))
+        shingles = code_shingles(big)
+        assert 0 < len(shingles) <= SKETCH_SIZE
+        assert jaccard(shingles, shingles, SKETCH_SIZE) == 1.0
+
+
+class TestFingerprintConsumers:
+    """Tests de l'utilisation des empreintes par les analyseurs"""
+
+    def test_ast_nodes_carry_fingerprints_without_content(self, tmp_path):
+        """Test que les nœuds AST portent l'empreinte de leur sous-arbre"""
+        file_path = tmp_path / "module.py"
+        file_path.write_text(BODY + "\n" + RENAMED, encoding="utf-8")
+
+        analysis = ASTAnalyzer(capture_content=False).analyze_file(file_path)
+
+        first, second = analysis.functions
+        assert first.content == ""
+        assert first.fingerprint == second.fingerprint == code_fingerprint(BODY)
+        assert first.shingles == tuple(sorted(code_shingles(BODY)))
+        assert first.signature.endswith(first.fingerprint[:16])
+        assert analysis.loops[0].fingerprint != first.fingerprint
+
+    def test_memory_migrates_legacy_hashes(self, tmp_path):
+        """Test que les anciens hash MD5 sont remplacés par les empreintes"""
+        import sqlite3
+
+        memory = IntelligentMemory(str(tmp_path))
+        with sqlite3.connect(memory.db_path) as conn:
+            for legacy in ("a" * 32, "b" * 32):
+                conn.execute(
+                    """
+                    INSERT INTO learning_events (event_type, description,
+                        code_snippet, location, timestamp, severity, pattern_hash)
+                    VALUES ('error', 'd', ?, 'x.py', 't', 'low', ?)
+                """,
+                    (BODY if legacy[0] == "a" else RENAMED, legacy),
+                )
+                conn.execute(
+                    """
+                    INSERT INTO learned_patterns (pattern_hash, pattern_type,
+                        occurrences, first_seen, last_seen, success_rate)
+                    VALUES (?, 'error', 2, '2024', '2025', 0.5)
+                """,
+                    (legacy,),
+                )
+            conn.execute("PRAGMA user_version = 0")
+
+        IntelligentMemory(str(tmp_path))
+
+        with sqlite3.connect(memory.db_path) as conn:
+            rows = conn.execute(
+                "SELECT pattern_hash, occurrences FROM learned_patterns"
+            ).fetchall()
+        assert rows == [(code_fingerprint(BODY), 4)]
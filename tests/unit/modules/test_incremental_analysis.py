@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module incremental_analysis.py
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from athalia_core.ast_analyzer import ASTAnalyzer
+from athalia_core.incremental_analysis import (
+    ImportGraph,
+    changed_files_since,
+    module_name,
+)
+from athalia_core.intelligent_analyzer import IntelligentAnalyzer
+
+
+def _make_project(root):
+    package = root / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "base.py").write_text("def base():\n    return 1\n", encoding="utf-8")
+    (package / "middle.py").write_text(
+        "from .base import base\n\ndef middle():\n    return base()\n",
+        encoding="utf-8",
+    )
+    (root / "app.py").write_text(
+        "import pkg.middle\n\ndef app():\n    return pkg.middle.middle()\n",
+        encoding="utf-8",
+    )
+    (root / "other.py").write_text("def other():\n    return 2\n", encoding="utf-8")
+
+
+def _analyses(root):
+    analyzer = ASTAnalyzer()
+    return [analyzer.analyze_file(path) for path in sorted(root.rglob("*.py"))]
+
+
+class TestImportGraph:
+    """Tests du graphe d'imports"""
+
+    def test_module_name(self, tmp_path):
+        """Test des noms de modules pointés"""
+        assert module_name(tmp_path / "pkg" / "base.py", tmp_path) == "pkg.base"
+        assert module_name(tmp_path / "pkg" / "__init__.py", tmp_path) == "pkg"
+        assert module_name(tmp_path.parent / "x.py", tmp_path) is None
+
+    def test_reverse_dependents_are_transitive(self, tmp_path):
+        """Test des dépendants directs, relatifs et indirects"""
+        _make_project(tmp_path)
+        graph = ImportGraph(tmp_path, _analyses(tmp_path))
+
+        base = tmp_path / "pkg" / "base.py"
+        assert graph.dependencies[tmp_path / "pkg" / "middle.py"] == {base}
+        assert graph.reverse_dependents([base]) == {
+            tmp_path / "pkg" / "middle.py",
+            tmp_path / "app.py",
+        }
+        assert graph.reverse_dependents([tmp_path / "other.py"]) == set()
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git indisponible")
+class TestGitChanges:
+    """Tests de la détection des fichiers modifiés"""
+
+    def _git(self, root, *args):
+        subprocess.run(
+            ["git", "-c", "user.email=t@t", "-c", "user.name=t", *args],
+            cwd=root,
+            check=True,
+            capture_output=True,
+        )
+
+    def test_changed_files_since(self, tmp_path):
+        """Test des fichiers modifiés, indexés et non suivis"""
+        _make_project(tmp_path)
+        self._git(tmp_path, "init", "-q")
+        self._git(tmp_path, "add", ".")
+        self._git(tmp_path, "commit", "-qm", "init")
+
+        (tmp_path / "other.py").write_text("x = 1\n", encoding="utf-8")
+        (tmp_path / "new.py").write_text("y = 2\n", encoding="utf-8")
+
+        changed = changed_files_since(tmp_path, "HEAD")
+
+        assert [path.name for path in changed] == ["new.py", "other.py"]
+        assert changed_files_since(tmp_path, "unknown-revision") is None
+
+
+class TestIncrementalComprehensiveAnalysis:
+    """Tests du mode incrémental de l'analyse complète"""
+
+    def test_incremental_matches_full_analysis(self, tmp_path):
+        """Test que l'analyse incrémentale fusionne les résultats réutilisés"""
+        _make_project(tmp_path)
+        analyzer = IntelligentAnalyzer(str(tmp_path))
+        full = analyzer.analyze_project_comprehensive(str(tmp_path))
+
+        saves = analyzer.ast_analyzer.cache.stats["saves"]
+        base = tmp_path / "pkg" / "base.py"
+        base.write_text("def base():\n    if True:\n        return 1\n", "utf-8")
+        incremental = IntelligentAnalyzer(
+            str(tmp_path)
+        ).analyze_project_comprehensive(
+            str(tmp_path), changed_files=["pkg/base.py"]
+        )
+
+        scope = incremental.ast_analysis["incremental"]
+        assert scope["changed_files"] == [str(base)]
+        assert scope["dependent_files"] == sorted(
+            [str(tmp_path / "app.py"), str(tmp_path / "pkg" / "middle.py")]
+        )
+        # Les dépendants, inchangés, ne sont pas ré-analysés
+        assert scope["reused_files"] == 4
+        assert analyzer.ast_analyzer.cache.stats["saves"] == saves + 1
+        assert incremental.ast_analysis["files_analyzed"] == 5
+        assert (
+            incremental.ast_analysis["summary"]["total_functions"]
+            == full.ast_analysis["summary"]["total_functions"]
+        )
+        assert incremental.pattern_analysis["summary"]["total_patterns"] == (
+            full.pattern_analysis["summary"]["total_patterns"] + 1
+        )
@@ -169,7 +169,7 @@ class TestIntelligentMemory(unittest.TestCase):
         pattern_hash = self.memory._analyze_code_pattern(code)
 
         self.assertIsInstance(pattern_hash, str)
-        self.assertEqual(len(pattern_hash), 32)  # MD5 hash length
+        self.assertEqual(len(pattern_hash), 32)  # Empreinte 128 bits
 
     def test_normalize_code(self):
         """Test de normalisation de code"""
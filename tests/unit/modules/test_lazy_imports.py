@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module lazy_imports.py
+"""
+
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from athalia_core.lazy_imports import LazyAvailability, LazyInstance, lazy_attribute
+
+
+def test_lazy_attribute_imports_on_first_use():
+    sys.modules.pop("colorsys", None)
+    rgb_to_hsv = lazy_attribute("colorsys", "rgb_to_hsv")
+    assert "colorsys" not in sys.modules
+
+    assert rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+    assert rgb_to_hsv.resolve() is sys.modules["colorsys"].rgb_to_hsv
+
+
+def test_lazy_attribute_follows_patches():
+    dumps = lazy_attribute("json", "dumps")
+    with patch("json.dumps", return_value="patché"):
+        assert dumps({}) == "patché"
+    assert dumps({}) == "{}"
+
+
+def test_lazy_availability():
+    assert LazyAvailability(lazy_attribute("json", "dumps"))
+    assert not LazyAvailability(lazy_attribute("json", "absent"))
+    assert not LazyAvailability(lazy_attribute("module_inexistant_xyz", "x"))
+
+
+def test_lazy_instance_builds_once():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return {"ready": True}
+
+    instance = LazyInstance(factory, "demo")
+    assert not instance.initialized
+
+    threads = [threading.Thread(target=instance.get, args=("ready",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert instance and instance.get("ready") is True
+    assert len(calls) == 1
+
+
+def test_lazy_instance_reports_errors():
+    errors = []
+
+    def factory():
+        raise RuntimeError("indisponible")
+
+    instance = LazyInstance(factory, "demo", lambda name, e: errors.append(name))
+    assert not instance
+    with pytest.raises(RuntimeError, match="indisponible"):
+        instance.run()
+    assert errors == ["demo"]
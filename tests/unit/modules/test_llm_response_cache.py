@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module llm_response_cache.py
+"""
+
+import sqlite3
+import time
+from unittest.mock import patch
+
+from athalia_core.ai_robust import AIModel, PromptContext, RobustAI
+from athalia_core.llm_response_cache import LLMResponseCache, normalize_prompt
+
+
+def _robust_ai(cache):
+    with patch.object(RobustAI, "_detect_available_models", return_value=[]):
+        ai = RobustAI(response_cache=cache, use_cache=True)
+    ai.fallback_chain = [AIModel.OLLAMA_QWEN, AIModel.MOCK]
+    return ai
+
+
+def test_keys_normalize_templates(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.db")
+    key = cache.make_key("qwen", "blueprint", "Idée:  {idea}\n", {"idea": "x"})
+
+    assert normalize_prompt(" a \n\t b ") == "a b"
+    assert cache.make_key("qwen", "blueprint", "Idée: {idea}", {"idea": "x"}) == key
+    assert cache.make_key("mistral", "blueprint", "Idée: {idea}", {"idea": "x"}) != key
+    assert cache.make_key("qwen", "blueprint", "Idée: {idea}", {"idea": "y"}) != key
+
+
+def test_ttl_and_lru_eviction(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.db", max_entries=2)
+    cache.set("a", "réponse a", ttl=-1)
+    assert cache.get("a") is None
+
+    cache.set("b", "réponse b")
+    time.sleep(0.01)
+    cache.set("c", "réponse c")
+    time.sleep(0.01)
+    assert cache.get("b") == "réponse b"
+    cache.set("d", "réponse d")
+
+    assert cache.get("c") is None
+    assert cache.get("b") == "réponse b"
+    stats = cache.get_stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["expired"] == 1
+
+
+def test_operations_reuse_store_connections(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm.db")
+    cache.set("a", "réponse a")
+    cache.get("a")
+    opened = []
+    connect = sqlite3.connect
+    monkeypatch.setattr(
+        sqlite3,
+        "connect",
+        lambda *args, **kwargs: opened.append(args) or connect(*args, **kwargs),
+    )
+
+    for i in range(5):
+        cache.set(f"k{i}", "réponse")
+        assert cache.get(f"k{i}") == "réponse"
+    cache.clear()
+
+    assert opened == []
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_robust_ai_reuses_responses(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.db")
+    ai = _robust_ai(cache)
+    params = {"idea": "api", "project_type": "api", "complexity": "simple"}
+
+    with patch.object(ai, "_call_model", return_value="blueprint qwen") as call:
+        first = ai.generate_response(PromptContext.BLUEPRINT, **params)
+        second = ai.generate_response(PromptContext.BLUEPRINT, **params)
+        third = ai.generate_response(
+            PromptContext.BLUEPRINT, bypass_cache=True, **params
+        )
+
+    assert first["cached"] is False and second["cached"] is True
+    assert second["response"] == "blueprint qwen"
+    assert third["cached"] is False
+    assert call.call_count == 2
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_mock_responses_are_not_cached(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.db")
+    ai = _robust_ai(cache)
+    ai.fallback_chain = [AIModel.MOCK]
+
+    ai.generate_response(PromptContext.DOCUMENTATION, project_name="demo")
+    assert cache.get_stats()["entries"] == 0
+    assert RobustAI(use_cache=False).response_cache is None
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module model_backend.py (serveur Ollama simulé)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from athalia_core.model_backend import (
+    GenerationCancelled,
+    ModelBackend,
+    ModelBackendError,
+    ModelTimeoutError,
+    OllamaHTTPBackend,
+)
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen: list[dict] = []
+    connections: set[int] = set()
+    token_delay = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        type(self).connections.add(self.client_address[1])
+        models = {"models": [{"name": "qwen:7b"}, {"name": "mistral:latest"}]}
+        self._send(200, json.dumps(models).encode())
+
+    def do_POST(self):
+        type(self).connections.add(self.client_address[1])
+        length = int(self.headers["Content-Length"])
+        payload = json.loads(self.rfile.read(length))
+        type(self).requests_seen.append(payload)
+        if payload["model"] == "absent":
+            self._send(404, b'{"error": "model not found"}')
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for word in ["Bon", "jour", " !"]:
+            self._chunk({"response": word, "done": False})
+            time.sleep(type(self).token_delay)
+        self._chunk({"response": "", "done": True})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, data: dict):
+        line = json.dumps(data).encode() + b"\n"
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+
+@pytest.fixture
+def ollama_server():
+    _StubOllama.requests_seen = []
+    _StubOllama.connections = set()
+    _StubOllama.token_delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_generate_reuses_pooled_connection(ollama_server):
+    backend = OllamaHTTPBackend(ollama_server, keep_alive="10m")
+
+    assert backend.generate("qwen", "Salut") == "Bonjour !"
+    assert backend.generate("qwen", "Encore") == "Bonjour !"
+    assert backend.list_models() == ["qwen:7b", "mistral:latest"]
+
+    first = _StubOllama.requests_seen[0]
+    assert first["prompt"] == "Salut" and first["stream"] is True
+    assert first["keep_alive"] == "10m"
+    # Une seule connexion keep-alive pour les trois requêtes
+    assert len(_StubOllama.connections) == 1
+    backend.close()
+
+
+def test_stream_yields_tokens(ollama_server):
+    backend = OllamaHTTPBackend(ollama_server)
+    assert list(backend.stream("qwen", "Salut")) == ["Bon", "jour", " !"]
+
+    with pytest.raises(TypeError, match="stream"):
+        ModelBackend()
+
+
+def test_cancel_and_timeout(ollama_server):
+    _StubOllama.token_delay = 0.2
+    backend = OllamaHTTPBackend(ollama_server)
+
+    cancel = threading.Event()
+    tokens = []
+    with pytest.raises(GenerationCancelled):
+        for token in backend.stream("qwen", "Salut", cancel=cancel):
+            tokens.append(token)
+            cancel.set()
+    assert tokens == ["Bon"]
+
+    with pytest.raises(ModelTimeoutError):
+        backend.generate("qwen", "Salut", timeout=0.3)
+
+
+def test_errors(ollama_server):
+    backend = OllamaHTTPBackend(ollama_server)
+    with pytest.raises(ModelBackendError, match="404"):
+        backend.generate("absent", "Salut")
+
+    unreachable = OllamaHTTPBackend("127.0.0.1:9", connect_timeout=0.5)
+    with pytest.raises(ModelBackendError):
+        unreachable.generate("qwen", "Salut")
+    with pytest.raises(ModelBackendError):
+        unreachable.list_models()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module model_dispatcher.py
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from athalia_core.ai_robust import AIModel, PromptContext, RobustAI
+from athalia_core.llm_response_cache import LLMResponseCache
+from athalia_core.model_dispatcher import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    ModelDispatcher,
+)
+
+
+def _model(delays: dict[str, float], failures=()):
+    calls = []
+
+    def call(model):
+        calls.append(model)
+        time.sleep(delays.get(model, 0))
+        if model in failures:
+            raise RuntimeError(f"{model} indisponible")
+        return f"réponse {model}"
+
+    return call, calls
+
+
+def _dispatcher(**options):
+    return ModelDispatcher(breakers=CircuitBreakerRegistry(), **options)
+
+
+def test_hedged_request_beats_slow_model():
+    call, calls = _model({"lent": 1.0})
+    started = time.perf_counter()
+    outcome = _dispatcher(hedge_delay=0.05).dispatch(["lent", "rapide"], call)
+
+    assert outcome.model == "rapide"
+    assert outcome.result == "réponse rapide"
+    assert outcome.started == ["lent", "rapide"]
+    assert time.perf_counter() - started < 0.5
+
+
+def test_sequential_waits_and_falls_back_on_failure():
+    call, calls = _model({"premier": 0.1}, failures={"premier"})
+    dispatcher = _dispatcher(hedge_delay=0.01)
+
+    outcome = dispatcher.dispatch(["premier", "second"], call, strategy="sequential")
+    assert outcome.model == "second" and calls == ["premier", "second"]
+
+    call, calls = _model({"premier": 0.1})
+    outcome = dispatcher.dispatch(["premier", "second"], call, strategy="sequential")
+    assert outcome.model == "premier" and calls == ["premier"]
+
+
+def test_first_success_and_gather():
+    call, _ = _model({"a": 0.2, "b": 0.0, "c": 0.1}, failures={"c"})
+    dispatcher = _dispatcher()
+
+    outcome = dispatcher.dispatch(["a", "b", "c"], call, strategy="first_success")
+    assert outcome.model == "b"
+
+    outcome = dispatcher.dispatch(["a", "b", "c"], call, strategy="gather")
+    assert [model for model, _ in outcome.results] == ["b", "a"]
+    assert outcome.model == "b"
+
+    with pytest.raises(ValueError):
+        dispatcher.dispatch(["a"], call, strategy="inconnue")
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker("qwen", min_calls=2, cooldown=0.1)
+    breaker.record(False, 0.1)
+    assert breaker.allow()
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow() and not breaker.allow()  # une seule sonde
+    breaker.record(True, 0.05)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    slow = CircuitBreaker("lent", min_calls=1, slow_call=0.5)
+    slow.record(True, 2.0)
+    assert slow.state == CircuitBreaker.OPEN
+
+
+def test_breaker_skips_model_and_feeds_hedge_delay():
+    breakers = CircuitBreakerRegistry(min_calls=1, cooldown=60)
+    dispatcher = ModelDispatcher(breakers=breakers, min_samples=3)
+    call, calls = _model({}, failures={"panne"})
+
+    dispatcher.dispatch(["panne", "ok"], call, strategy="sequential")
+    outcome = dispatcher.dispatch(["panne", "ok"], call)
+    assert outcome.skipped == ["panne"] and outcome.model == "ok"
+    assert breakers.snapshot()["panne"]["state"] == "open"
+
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        breakers.get("ok").record(True, latency)
+    assert dispatcher.hedge_delay_for("ok") == pytest.approx(0.4)
+    assert dispatcher.hedge_delay_for("inconnu") == dispatcher.hedge_delay
+
+
+def test_robust_ai_distillation_gathers_models():
+    with patch.object(RobustAI, "_detect_available_models", return_value=[]):
+        ai = RobustAI(use_cache=False, dispatcher=_dispatcher())
+    ai.fallback_chain = [AIModel.OLLAMA_QWEN, AIModel.OLLAMA_MISTRAL, AIModel.MOCK]
+
+    def call_model(model, prompt):
+        return None if model == AIModel.MOCK else "même réponse"
+
+    with patch.object(ai, "_call_model", side_effect=call_model):
+        result = ai.generate_response(PromptContext.CODE_REVIEW, distillation=True)
+        single = ai.generate_response(PromptContext.CODE_REVIEW)
+
+    assert result["model"] == "distillation"
+    assert sorted(result["models"]) == ["ollama_mistral", "ollama_qwen"]
+    assert result["response"] == "même réponse"
+    assert single["model"] == "ollama_qwen"
+
+
+def test_cache_hits_do_not_feed_breakers(tmp_path):
+    dispatcher = _dispatcher()
+    with patch.object(RobustAI, "_detect_available_models", return_value=[]):
+        ai = RobustAI(
+            response_cache=LLMResponseCache(tmp_path / "llm.db"),
+            use_cache=True,
+            dispatcher=dispatcher,
+        )
+    ai.fallback_chain = [AIModel.OLLAMA_QWEN, AIModel.OLLAMA_MISTRAL]
+
+    with patch.object(ai, "_call_model", return_value="réponse") as call:
+        first = ai.generate_response(PromptContext.CODE_REVIEW)
+        hits = [ai.generate_response(PromptContext.CODE_REVIEW) for _ in range(6)]
+        distilled = ai.generate_response(PromptContext.CODE_REVIEW, distillation=True)
+
+    assert first["cached"] is False
+    assert all(hit["cached"] and hit["model"] == "ollama_qwen" for hit in hits)
+    assert sorted(distilled["models"]) == ["ollama_mistral", "ollama_qwen"]
+    assert distilled["cached"] is False
+    assert call.call_count == 2
+    assert dispatcher.breakers.get(AIModel.OLLAMA_QWEN).samples == 1
+    assert dispatcher.hedge_delay_for(AIModel.OLLAMA_QWEN) == dispatcher.hedge_delay
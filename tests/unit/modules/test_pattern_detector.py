@@ -94,7 +94,7 @@ class TestPatternDetector:
         """Test d'initialisation du détecteur de patterns"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         detector = PatternDetector("/tmp/test")
@@ -111,7 +111,7 @@ class TestPatternDetector:
         """Test d'initialisation avec chemin par défaut"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         with patch("pathlib.Path.cwd", return_value=Path("/current/dir")):
@@ -125,7 +125,7 @@ class TestPatternDetector:
         """Test de chargement des patterns"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         # Mock des données de patterns avec le bon format
@@ -151,7 +151,7 @@ class TestPatternDetector:
         """Test d'analyse des patterns du projet"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         detector = PatternDetector("/tmp/test")
@@ -189,7 +189,7 @@ class TestPatternDetector:
         """Test d'extraction de patterns depuis un fichier"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         detector = PatternDetector("/tmp/test")
@@ -213,7 +213,7 @@ class TestPatternDetector:
         """Test de détection de doublons"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         detector = PatternDetector("/tmp/test")
@@ -248,7 +248,7 @@ class TestPatternDetector:
         """Test de calcul de similarité"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         detector = PatternDetector("/tmp/test")
@@ -282,7 +282,7 @@ class TestPatternDetector:
         """Test de détection d'anti-patterns"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         detector = PatternDetector("/tmp/test")
@@ -309,7 +309,7 @@ class TestPatternDetector:
         """Test de génération de recommandations"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         detector = PatternDetector("/tmp/test")
@@ -349,7 +349,7 @@ class TestPatternDetector:
         """Test de récupération des insights d'apprentissage"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         # Mock des données d'insights avec le bon format
@@ -384,7 +384,7 @@ class TestIntegration:
         """Test du workflow complet d'analyse de patterns"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         detector = PatternDetector("/tmp/test")
@@ -425,7 +425,7 @@ class TestIntegration:
         """Test de détection de patterns avec des données réalistes"""
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
         mock_conn.cursor.return_value = mock_cursor
 
         detector = PatternDetector("/tmp/test")
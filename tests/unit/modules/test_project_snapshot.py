@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module project_snapshot.py
+"""
+
+import os
+
+import pytest
+
+from athalia_core.auto_cleaner import AutoCleaner
+from athalia_core.auto_documenter import AutoDocumenter
+from athalia_core.auto_tester import AutoTester
+from athalia_core.code_linter import CodeLinter
+from athalia_core.intelligent_auditor import IntelligentAuditor
+from athalia_core.project_snapshot import ProjectSnapshot, snapshot_for
+from athalia_core.security_auditor import SecurityAuditor
+from athalia_core.unified_orchestrator import UnifiedOrchestrator
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text(
+        '"""Module principal"""\n\n\ndef run():\n    """Lance le programme"""\n'
+    )
+    (tmp_path / "src" / "broken.py").write_text("def broken(:\n")
+    (tmp_path / "README.md").write_text("# Projet\n")
+    (tmp_path / "debug.log").write_text("trace\n")
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "main.cpython-312.pyc").write_bytes(b"\0")
+    for excluded in (".git", "node_modules"):
+        (tmp_path / excluded).mkdir()
+        (tmp_path / excluded / "ignored.py").write_text("x = 1\n")
+    return tmp_path
+
+
+def test_walk_skips_excluded_directories(project):
+    snapshot = ProjectSnapshot(project)
+
+    assert sorted(entry.relative for entry in snapshot) == [
+        "README.md",
+        os.path.join("__pycache__", "main.cpython-312.pyc"),
+        "debug.log",
+        os.path.join("src", "broken.py"),
+        os.path.join("src", "main.py"),
+    ]
+    assert sorted(path.name for path in snapshot.directories) == [
+        "__pycache__",
+        "src",
+    ]
+    assert snapshot.walks == 1
+
+
+def test_lookup_and_globs(project):
+    snapshot = ProjectSnapshot(project)
+
+    assert [entry.name for entry in snapshot.python_files()] == [
+        "broken.py",
+        "main.py",
+    ]
+    assert [entry.name for entry in snapshot.glob("*.log")] == ["debug.log"]
+    assert [entry.name for entry in snapshot.glob("src/m*.py")] == ["main.py"]
+    assert snapshot.glob_dirs("__pycache__") == [project / "__pycache__"]
+    assert snapshot.get("src/main.py") is snapshot.get(project / "src" / "main.py")
+    assert snapshot.get("absent.py") is None
+
+
+def test_content_and_ast_are_memoized(project):
+    snapshot = ProjectSnapshot(project)
+    main = snapshot.get("src/main.py")
+
+    assert main.parse() is main.parse()
+    assert main.read_text().startswith('"""Module principal"""')
+    assert snapshot.get("src/broken.py").parse() is None
+
+
+def test_invalidate_reuses_unchanged_entries(project):
+    snapshot = ProjectSnapshot(project)
+    main = snapshot.get("src/main.py")
+    tree = main.parse()
+    readme = project / "README.md"
+    readme.write_text("# Projet modifié\n")
+    os.utime(readme, ns=(0, 0))
+    (project / "src" / "extra.py").write_text("y = 2\n")
+
+    snapshot.invalidate()
+
+    assert snapshot.get("src/main.py") is main
+    assert main.parse() is tree
+    assert snapshot.get("README.md").read_text() == "# Projet modifié\n"
+    assert snapshot.get("src/extra.py") is not None
+    assert snapshot.walks == 2
+
+
+def test_snapshot_for_matches_root(project, tmp_path_factory):
+    snapshot = ProjectSnapshot(project)
+
+    assert snapshot_for(project, snapshot) is snapshot
+    other = tmp_path_factory.mktemp("autre")
+    assert snapshot_for(other, snapshot).root_path == other
+
+
+def test_scanners_share_a_single_walk(project):
+    snapshot = ProjectSnapshot(project)
+    path = str(project)
+
+    IntelligentAuditor(snapshot=snapshot).audit_project(path)
+    SecurityAuditor(path, snapshot=snapshot).run()
+    CodeLinter(path, snapshot=snapshot)._run_documentation_check()
+    AutoDocumenter(path, snapshot=snapshot).analyze_python_files()
+    candidates = AutoCleaner(path, snapshot=snapshot).scan_for_cleanup_candidates()
+    tester = AutoTester(path, snapshot=snapshot)
+    tester._analyze_modules()
+
+    assert snapshot.walks == 1
+    assert str(project / "debug.log") in candidates["files_to_remove"]
+    assert str(project / "__pycache__") in candidates["directories_to_remove"]
+
+
+def test_orchestrator_shares_snapshot(project):
+    orchestrator = UnifiedOrchestrator(str(project))
+    orchestrator.initialize_modules()
+
+    assert orchestrator.security_auditor.snapshot is orchestrator.snapshot
+    assert orchestrator.auto_cleaner.snapshot is orchestrator.snapshot
+
+    before = orchestrator.snapshot.files
+    orchestrator._run_step("docs", lambda: None, None, (), ("project",), ("docs",))
+    after = orchestrator.snapshot.files
+    assert len(before) == len(after) == 5
+    assert orchestrator.snapshot.walks == 2
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module rolling_metrics.py
+"""
+
+import random
+
+from athalia_core.rolling_metrics import QuantileSketch, RollingAggregator
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(0, 1) for _ in range(5000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(sketch.quantile(q) - exact) / exact < 0.03
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_windows_only_merge_recent_buckets():
+    aggregator = RollingAggregator(bucket_seconds=60, retention_seconds=3600)
+    now = 1_000_000.0
+    aggregator.record(5.0, False, "old", timestamp=now - 1800)
+    for index in range(100):
+        aggregator.record(float(index + 1), True, "new", timestamp=now - 30)
+
+    recent = aggregator.summary(300, now=now)
+    assert recent["count"] == 100
+    assert recent["success_rate"] == 100
+    assert (recent["min"], recent["max"]) == (1.0, 100.0)
+    assert abs(recent["p95"] - 95) < 2
+    assert set(recent["by_key"]) == {"new"}
+
+    everything = aggregator.summary(now=now)
+    assert everything["count"] == 101
+    assert everything["by_key"]["old"]["success_rate"] == 0
+
+
+def test_memory_bounded_by_retention():
+    aggregator = RollingAggregator(bucket_seconds=1, retention_seconds=10)
+    for second in range(1000):
+        for _ in range(20):
+            aggregator.record(0.5, True, timestamp=float(second))
+
+    assert aggregator.bucket_count <= 12
+    assert aggregator.summary(now=999.0)["count"] <= 12 * 20
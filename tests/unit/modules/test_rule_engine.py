@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module rule_engine.py
+"""
+
+import re
+import time
+
+import pytest
+
+from athalia_core.intelligent_memory import IntelligentMemory
+from athalia_core.project_snapshot import ProjectSnapshot
+from athalia_core.rule_engine import (
+    COMPLEXITY,
+    DANGEROUS_CALLS,
+    HARDCODED_SECRETS,
+    RULES,
+    SECRET_TOKENS,
+    LineIndex,
+    Rule,
+    RuleRegistry,
+    RuleSet,
+    scan_files,
+)
+
+SOURCE = """import os, pickle
+
+def run(data):
+    eval(data); eval (data)
+    password = "hunter2"
+    os.system("ls")
+    return pickle.loads(data), ast.literal_eval(data)
+"""
+
+
+def separate_scans(ruleset, text):
+    """Référence : un ``re.finditer`` par règle"""
+    return sorted(
+        (match.start(), rule.rule_id, match.end(), text.count("\n", 0, match.start()))
+        for rule in ruleset.rules
+        for match in re.finditer(rule.pattern, text)
+    )
+
+
+def test_single_pass_matches_separate_scans():
+    ruleset = RULES.ruleset()
+    text = SOURCE * 3 + "for a in b:\n    for c in d:\n        pass\n" + "Ab1+" * 20
+
+    findings = ruleset.scan(text)
+
+    assert sorted(
+        (f.start, f.rule.rule_id, f.end, f.line - 1) for f in findings
+    ) == separate_scans(ruleset, text)
+
+
+def test_overlapping_rules_are_all_reported():
+    ruleset = RuleSet(
+        [
+            Rule("word", "test", r"abc\w*", "mot"),
+            Rule("prefix", "test", r"ab", "préfixe"),
+            Rule("inner", "test", r"cd", "intérieur"),
+        ]
+    )
+
+    findings = ruleset.scan("abcd abx")
+
+    assert [(f.rule.rule_id, f.start, f.text) for f in findings] == [
+        ("word", 0, "abcd"),
+        ("prefix", 0, "ab"),
+        ("inner", 2, "cd"),
+        ("prefix", 5, "ab"),
+    ]
+
+
+def test_long_blob_scans_in_linear_time():
+    ruleset = RULES.ruleset(DANGEROUS_CALLS, HARDCODED_SECRETS, SECRET_TOKENS)
+    text = 'DATA = "' + "QUJD" * 50_000 + '"\neval(x)\n'
+
+    started = time.perf_counter()
+    findings = ruleset.scan(text)
+    elapsed = time.perf_counter() - started
+
+    # Réessayer les règles à chaque position prendrait plusieurs minutes
+    assert elapsed < 1.0
+    assert [(f.rule.rule_id, f.line) for f in findings] == [
+        ("base64_blob", 1),
+        ("eval", 2),
+    ]
+
+
+def test_findings_carry_line_numbers():
+    findings = RULES.ruleset(DANGEROUS_CALLS).scan(SOURCE)
+
+    assert [(f.rule.rule_id, f.line) for f in findings] == [
+        ("eval", 4),
+        ("eval", 4),
+        ("os_system", 6),
+        ("pickle_loads", 7),
+    ]
+    assert LineIndex("a\nb\n\nc").line_of(5) == 4
+
+
+def test_search_and_matched_rules():
+    tokens = RULES.ruleset(SECRET_TOKENS)
+
+    finding = tokens.search("cle = 'AKIA" + "A" * 16 + "'")
+    assert finding.rule.rule_id == "aws_access_key"
+    assert tokens.search("rien ici") is None
+    rules = RULES.ruleset(HARDCODED_SECRETS, COMPLEXITY).matched_rules(SOURCE)
+    assert [rule.rule_id for rule in rules] == ["password_literal"]
+
+
+def test_registry_caches_and_refreshes_rulesets():
+    registry = RuleRegistry([Rule("todo", "notes", r"TODO", "À faire")])
+    ruleset = registry.ruleset("notes")
+
+    assert registry.ruleset("notes") is ruleset
+    registry.register(Rule("fixme", "notes", r"FIXME", "À corriger"))
+    assert len(registry.ruleset("notes")) == 2
+    with pytest.raises(ValueError):
+        RuleSet([Rule("named", "notes", r"(?P<x>a)", "groupe")])
+
+
+@pytest.mark.parametrize("min_parallel_files", [1, 100])
+def test_scan_files_keeps_file_order(tmp_path, min_parallel_files):
+    for i in range(6):
+        (tmp_path / f"m{i}.py").write_text("x = 1\n" * i + "eval(x)\n")
+    (tmp_path / "binaire.py").write_bytes(b"\xff\xfe\x00")
+    snapshot = ProjectSnapshot(tmp_path)
+
+    results = scan_files(
+        snapshot.python_files(),
+        RULES.ruleset(DANGEROUS_CALLS),
+        max_workers=3,
+        min_parallel_files=min_parallel_files,
+    )
+
+    assert [entry.name for entry, _ in results] == [f"m{i}.py" for i in range(6)]
+    assert [findings[0].line for _, findings in results] == list(range(1, 7))
+
+
+def test_memory_antipatterns_use_shared_rules(tmp_path):
+    memory = IntelligentMemory(root_path=str(tmp_path))
+
+    predictions = memory._check_antipatterns(SOURCE)
+
+    assert [p.description for p in predictions] == [
+        rule.description
+        for rule in RULES.rules()
+        if rule.rule_id in ("eval", "os_system", "pickle_loads", "password_literal")
+    ]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module sqlite_store.py
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from athalia_core.advanced_modules.dashboard_unified import DashboardUnifieSimple
+from athalia_core.sqlite_store import SQLiteStore, get_sqlite_store
+
+INSERT = "INSERT INTO events (name, value) VALUES (?, ?)"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStore(tmp_path / "store.db", batch_size=10, flush_interval=60)
+    with store.transaction() as conn:
+        conn.execute("CREATE TABLE events (name TEXT, value INTEGER)")
+    yield store
+    store.close()
+
+
+def count_on_disk(store):
+    with sqlite3.connect(store.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+def test_inserts_are_buffered_until_read(store):
+    store.insert(INSERT, ("a", 1))
+    store.insert_many(INSERT, [("b", 2), ("c", 3)])
+
+    assert count_on_disk(store) == 0
+    assert store.query("SELECT COUNT(*) FROM events") == [(3,)]
+    assert count_on_disk(store) == 3
+    assert store.stats == {"buffered": 3, "flushed": 3, "flushes": 1}
+
+
+def test_full_batch_is_written_immediately(store):
+    store.insert_many(INSERT, [(str(i), i) for i in range(10)])
+
+    assert count_on_disk(store) == 10
+    assert store.stats["flushes"] == 1
+
+
+def test_pending_rows_written_after_interval(tmp_path):
+    store = SQLiteStore(tmp_path / "timer.db", flush_interval=0.05)
+    with store.transaction() as conn:
+        conn.execute("CREATE TABLE events (name TEXT, value INTEGER)")
+    store.insert(INSERT, ("a", 1))
+
+    deadline = time.monotonic() + 5
+    while count_on_disk(store) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert count_on_disk(store) == 1
+    store.close()
+
+
+def test_transaction_rolls_back_on_error(store):
+    with pytest.raises(RuntimeError):
+        with store.transaction() as conn:
+            conn.execute(INSERT, ("a", 1))
+            raise RuntimeError("échec")
+
+    assert store.query("SELECT COUNT(*) FROM events") == [(0,)]
+
+
+def test_execute_returns_lastrowid_and_uses_wal(store):
+    cursor = store.execute(INSERT, ("a", 1))
+
+    assert cursor.lastrowid == 1
+    assert store.query("PRAGMA journal_mode") == [("wal",)]
+
+
+def test_concurrent_writers(store):
+    def worker(n):
+        for i in range(25):
+            store.insert(INSERT, (f"t{n}", i))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.query("SELECT COUNT(*) FROM events") == [(100,)]
+
+
+def test_shared_store_per_database(tmp_path):
+    db_path = tmp_path / "shared.db"
+    first = get_sqlite_store(db_path)
+    first.execute("CREATE TABLE t (x INTEGER)")
+
+    assert get_sqlite_store(str(db_path)) is first
+
+    first.close()
+    db_path.unlink()
+    assert get_sqlite_store(db_path) is not first
+
+
+def test_dashboard_writes_through_store(tmp_path):
+    db_path = str(tmp_path / "analytics.db")
+    dashboard = DashboardUnifieSimple(db_path)
+    for i in range(3):
+        dashboard.enregistrer_evenement("audit_projet", projet=f"p{i}")
+    dashboard.enregistrer_rapport("audit", "p0", "ok", score_qualite=80)
+
+    metriques = dashboard.obtenir_metriques_temps_reel()
+
+    assert metriques["projets_analyses"] == 3
+    assert metriques["actions_effectuees"] == 3
+    assert metriques["score_qualite_moyen"] == 80
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module workflow_checkpoint.py
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from athalia_core.unified_orchestrator import UnifiedOrchestrator
+from athalia_core.workflow_checkpoint import TreeHasher, WorkflowCheckpoint
+
+BLUEPRINT = {
+    "project_name": "checkpoint_demo",
+    "description": "Projet de démonstration",
+    "project_type": "api",
+}
+
+
+@pytest.fixture(autouse=True)
+def no_workflow_cache():
+    with patch(
+        "athalia_core.unified_orchestrator.get_cached_result", return_value=None
+    ), patch("athalia_core.unified_orchestrator.cache_result"):
+        yield
+
+
+def _run(tmp_path, blueprint=BLUEPRINT):
+    orchestrator = UnifiedOrchestrator(
+        str(tmp_path / "out"), checkpoint_dir=str(tmp_path / "cache")
+    )
+    results = orchestrator.run_full_workflow(dict(blueprint))
+    return orchestrator, results
+
+
+def test_tree_hasher_tracks_content(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "__pycache__").mkdir()
+    hasher = TreeHasher(tmp_path)
+    first = hasher.digest()
+
+    (tmp_path / "__pycache__" / "a.pyc").write_bytes(b"ignored")
+    assert hasher.digest() == first
+
+    (tmp_path / "a.py").write_text("x = 2\n", encoding="utf-8")
+    assert hasher.digest() != first
+
+
+def test_step_key_depends_on_inputs(tmp_path):
+    checkpoint = WorkflowCheckpoint(tmp_path, tmp_path / "cache")
+    checkpoint.begin()
+    key = checkpoint.step_key("lint", {}, ("project",))
+
+    assert checkpoint.step_key("lint", {}, ("project",)) == key
+    assert checkpoint.step_key("lint", {"name": "x"}, ("project",)) != key
+    (tmp_path / "new.py").write_text("", encoding="utf-8")
+    checkpoint.begin()
+    assert checkpoint.step_key("lint", {}, ("project",)) != key
+
+
+def test_tree_is_hashed_only_after_disk_writes(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    checkpoint = WorkflowCheckpoint(project, tmp_path / "cache")
+    hasher = checkpoint.hasher
+    with patch.object(hasher, "digest", wraps=hasher.digest) as digest:
+        checkpoint.begin()
+        checkpoint.complete("analyse", ("report",), reused=False, succeeded=True)
+        checkpoint.complete("analyse", ("report",), reused=True, succeeded=True)
+        (project / "gen.py").write_text("", encoding="utf-8")
+        checkpoint.complete("generation", ("project",), reused=False, succeeded=True)
+
+    assert digest.call_count == 2
+    assert checkpoint.versions["project"] == checkpoint.hasher.digest()
+    assert checkpoint._load_checkpoint()["digest"] == checkpoint.digest
+
+
+def test_rerun_replays_every_step(tmp_path):
+    _, first = _run(tmp_path)
+    assert first["status"] == "completed"
+    assert first["metrics"]["reused_steps"] == []
+
+    _, second = _run(tmp_path)
+    assert second["status"] == "completed"
+    assert second["metrics"]["resumed"] is True
+    assert "project_generation" in second["metrics"]["reused_steps"]
+    assert sorted(second["steps_completed"]) == sorted(first["steps_completed"])
+    assert second["artifacts"]["project_path"] == first["artifacts"]["project_path"]
+
+
+def test_resume_reruns_only_failed_step(tmp_path):
+    calls = []
+
+    def flaky_cicd(orchestrator):
+        calls.append(1)
+        if len(calls) == 1:
+            orchestrator.workflow_results["warnings"].append("CI/CD indisponible")
+
+    orchestrator = UnifiedOrchestrator(
+        str(tmp_path / "out"), checkpoint_dir=str(tmp_path / "cache")
+    )
+    orchestrator._step_auto_cicd = lambda: flaky_cicd(orchestrator)
+    first = orchestrator.run_full_workflow(dict(BLUEPRINT))
+    assert first["warnings"] == ["CI/CD indisponible"]
+
+    orchestrator = UnifiedOrchestrator(
+        str(tmp_path / "out"), checkpoint_dir=str(tmp_path / "cache")
+    )
+    orchestrator._step_auto_cicd = lambda: flaky_cicd(orchestrator)
+    second = orchestrator.run_full_workflow(dict(BLUEPRINT))
+    reused = second["metrics"]["reused_steps"]
+
+    assert second["warnings"] == []
+    # Le nettoyage suit l'étape rejouée, qui a pu modifier l'arborescence
+    assert "auto_cicd" not in reused and "auto_cleaning" not in reused
+    assert {"project_generation", "ai_enhancement", "security_audit"} <= set(reused)
+    assert len(calls) == 2
+
+
+def test_changed_blueprint_reuses_unaffected_steps(tmp_path):
+    _run(tmp_path)
+    # Le champ ajouté ne change pas les fichiers générés
+    _, results = _run(tmp_path, blueprint={**BLUEPRINT, "notes": "revue"})
+    reused = set(results["metrics"]["reused_steps"])
+
+    assert "project_generation" not in reused
+    assert {"security_audit", "code_linting", "advanced_classification"} <= reused
+
+
+def test_memoization_can_be_disabled(tmp_path):
+    orchestrator = UnifiedOrchestrator(
+        str(tmp_path / "out"),
+        memoize_steps=False,
+        checkpoint_dir=str(tmp_path / "cache"),
+    )
+    orchestrator.run_full_workflow(dict(BLUEPRINT))
+
+    assert not (tmp_path / "cache").exists()
+    assert orchestrator.workflow_results["metrics"]["reused_steps"] == []
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module workflow_scheduler.py
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from athalia_core.unified_orchestrator import UnifiedOrchestrator
+from athalia_core.workflow_scheduler import WorkflowScheduler, WorkflowStep
+
+
+def _step(name, log, reads=(), writes=(), delay=0.0, **kwargs):
+    def run():
+        time.sleep(delay)
+        log.append(name)
+
+    return WorkflowStep(name, run, reads=reads, writes=writes, **kwargs)
+
+
+def test_dependencies_follow_read_write_hazards():
+    log = []
+    scheduler = WorkflowScheduler(
+        [
+            _step("generate", log, reads=("bp",), writes=("project",)),
+            _step("audit", log, reads=("project",)),
+            _step("lint", log, reads=("project",)),
+            _step("fix", log, reads=("project",), writes=("project",)),
+            _step("classify", log, reads=("bp",)),
+        ]
+    )
+
+    assert scheduler.dependencies == {
+        "generate": set(),
+        "audit": {"generate"},
+        "lint": {"generate"},
+        "fix": {"generate", "audit", "lint"},
+        "classify": set(),
+    }
+
+
+def test_run_respects_dependencies():
+    log = []
+    results = WorkflowScheduler(
+        [
+            _step("generate", log, writes=("project",), delay=0.02),
+            _step("audit", log, reads=("project",)),
+            _step("clean", log, reads=("project",), writes=("project",)),
+        ]
+    ).run()
+
+    assert log == ["generate", "audit", "clean"]
+    assert all(result.status == "completed" for result in results.values())
+    assert results["generate"].duration >= 0.02
+
+
+def test_independent_steps_run_in_parallel():
+    barrier = threading.Barrier(3, timeout=2)
+    steps = [
+        WorkflowStep(name, barrier.wait, reads=("project",))
+        for name in ("audit", "lint", "docs")
+    ]
+
+    results = WorkflowScheduler(steps, max_workers=3).run()
+
+    assert {result.status for result in results.values()} == {"completed"}
+
+
+def test_failure_releases_dependents_unless_critical():
+    log = []
+
+    def broken():
+        raise ValueError("boom")
+
+    results = WorkflowScheduler(
+        [
+            WorkflowStep("lint", broken, writes=("report",)),
+            _step("summary", log, reads=("report",)),
+        ]
+    ).run()
+    assert results["lint"].status == "failed"
+    assert results["lint"].error == "boom"
+    assert log == ["summary"]
+
+    with pytest.raises(ValueError):
+        WorkflowScheduler(
+            [
+                WorkflowStep("generate", broken, writes=("project",), critical=True),
+                _step("audit", log, reads=("project",)),
+            ]
+        ).run()
+    assert log == ["summary"]
+
+
+def test_timeout_cancels_dependents():
+    log = []
+    release = threading.Event()
+    results = WorkflowScheduler(
+        [
+            WorkflowStep("slow", release.wait, writes=("project",), timeout=0.05),
+            _step("audit", log, reads=("project",)),
+            _step("classify", log, reads=("bp",)),
+        ]
+    ).run()
+    release.set()
+
+    assert results["slow"].status == "timeout"
+    assert results["audit"].status == "cancelled"
+    assert results["classify"].status == "completed"
+    assert log == ["classify"]
+
+
+def test_orchestrator_serializes_project_writers(tmp_path):
+    orchestrator = UnifiedOrchestrator(str(tmp_path))
+    steps = orchestrator._workflow_steps({"project_name": "ordre"})
+    dependencies = WorkflowScheduler(steps).dependencies
+
+    assert "auto_testing" in dependencies["auto_documentation"]
+    assert "artistic_templates" in dependencies["auto_cicd"]
+    assert {"security_audit", "code_linting"} <= dependencies[
+        "advanced_auto_correction"
+    ]
+
+
+def test_orchestrator_records_step_metrics(tmp_path):
+    orchestrator = UnifiedOrchestrator(str(tmp_path))
+    orchestrator._step_generate_project = lambda blueprint: None
+
+    with patch(
+        "athalia_core.unified_orchestrator.get_cached_result", return_value=None
+    ), patch("athalia_core.unified_orchestrator.cache_result"):
+        orchestrator.run_full_workflow({"project_name": "metrics-test"})
+    metrics = orchestrator.workflow_results["metrics"]
+
+    assert orchestrator.workflow_results["status"] == "completed"
+    assert set(metrics["step_timings"]) >= {"project_generation", "auto_cleaning"}
+    assert metrics["step_status"]["auto_cleaning"] == "completed"
+    assert metrics["workflow_duration"] >= 0
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module tool_runner.py
+"""
+
+import json
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+import pytest
+
+from athalia_core import code_linter
+from athalia_core.code_linter import CodeLinter
+from athalia_core.tool_runner import (
+    ToolIssue,
+    ToolRunner,
+    ToolSpec,
+    parse_bandit,
+    parse_ruff,
+)
+
+
+class FakeTools:
+    """Exécution simulée : constat ruff (JSON) par fichier important ``os``"""
+
+    def __init__(self, returncode=1):
+        self.calls = []
+        self.returncode = returncode
+
+    def __call__(self, command, **kwargs):
+        self.calls.append(command)
+        if command[-1] == "--version":
+            return subprocess.CompletedProcess(command, 0, "ruff 0.5.0\n", "")
+        files = [arg for arg in command if arg.endswith(".py")]
+        report = [
+            {
+                "filename": path,
+                "location": {"row": 1},
+                "code": "F401",
+                "message": "unused import",
+            }
+            for path in files
+            if "os" in Path(path).read_text()
+        ]
+        if command[0] != "ruff":
+            return subprocess.CompletedProcess(command, 0, "", "")
+        return subprocess.CompletedProcess(
+            command, self.returncode, json.dumps(report), ""
+        )
+
+    def linted(self, tool="ruff"):
+        return [
+            sorted(Path(arg).name for arg in call if arg.endswith(".py"))
+            for call in self.calls
+            if call[0] == tool and call[-1] != "--version"
+        ]
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "a.py").write_text("import os\n")
+    (tmp_path / "b.py").write_text("x = 1\n")
+    return tmp_path
+
+
+def test_json_parsers():
+    ruff = parse_ruff(
+        '[{"filename": "a.py", "location": {"row": 3}, "code": "E501",'
+        ' "message": "line too long"}]',
+        "",
+        1,
+    )
+    bandit = parse_bandit(
+        '{"results": [{"filename": "a.py", "line_number": 2, "test_id": "B307",'
+        ' "issue_severity": "MEDIUM", "issue_text": "eval"}]}',
+        "",
+        1,
+    )
+
+    assert [str(issue) for issue in ruff] == ["a.py:3: E501 line too long"]
+    assert [str(issue) for issue in bandit] == ["a.py:2: B307 [MEDIUM] eval"]
+    assert parse_ruff("a.py:1:1: E302 texte\n\n", "", 1) == [
+        ToolIssue(None, 0, "", "a.py:1:1: E302 texte")
+    ]
+
+
+def test_unchanged_files_come_from_cache(project):
+    tools = FakeTools()
+
+    first = ToolRunner(project, run_command=tools).run(["ruff"])["ruff"]
+    (project / "b.py").write_text("import os\n")
+    second = ToolRunner(project, run_command=tools).run(["ruff"])["ruff"]
+
+    assert tools.linted() == [["a.py", "b.py"], ["b.py"]]
+    assert [str(issue) for issue in first.issues] == ["a.py:1: F401 unused import"]
+    assert [issue.path for issue in second.issues] == ["a.py", "b.py"]
+    assert (second.checked, second.cached) == (1, 1)
+
+
+def test_file_list_and_full_project_runs(project):
+    tools = FakeTools()
+    runner = ToolRunner(project, run_command=tools, use_cache=False)
+
+    runner.run(["ruff"], files=["b.py", project / "b.py", "absent.py"])
+    runner.run(["ruff"], incremental=False)
+
+    assert tools.linted() == [["b.py"], []]
+    assert tools.calls[-1][-1] == str(project)
+
+
+@pytest.mark.skipif(
+    not (shutil.which("ruff") and shutil.which("black")), reason="ruff/black absents"
+)
+def test_project_excludes_are_honored(project):
+    (project / "pyproject.toml").write_text(
+        '[tool.ruff]\nexclude = ["archive"]\n\n'
+        '[tool.black]\nextend-exclude = "^/archive/"\n'
+    )
+    (project / "archive").mkdir()
+    (project / "archive" / "old.py").write_text("import os\nx=1\n")
+    runner = ToolRunner(project, run_command=subprocess.run, use_cache=False)
+
+    results = runner.run(["ruff", "black"])
+
+    assert [result.error for result in results.values()] == [None, None]
+    assert {issue.path for issue in results["ruff"].issues} == {"a.py"}
+    assert results["black"].issues == []
+
+
+def test_black_runs_on_project_without_file_list(project):
+    tools = FakeTools()
+    runner = ToolRunner(project, run_command=tools, use_cache=False)
+
+    runner.run(["ruff", "black"])
+    runner.run(["black"], files=["b.py"])
+
+    assert tools.linted() == [["a.py", "b.py"]]
+    assert tools.linted("black") == [[], ["b.py"]]
+    assert all("--force-exclude" in call for call in tools.calls if call[0] == "ruff")
+
+
+def test_unattributed_output_and_failures_are_not_cached(project):
+    tools = FakeTools(returncode=2)
+    runner = ToolRunner(project, run_command=tools)
+
+    failed = runner.run(["ruff"])["ruff"]
+    text = ToolSpec(
+        "texte",
+        lambda targets: ["texte", *targets],
+        lambda stdout, stderr, returncode: [ToolIssue(None, 0, "", stdout)],
+    )
+    runner.run([text])
+    runner.run([text])
+
+    assert failed.error.startswith("code de sortie 2")
+    assert runner.cache.store.query("SELECT COUNT(*) FROM tool_results")[0][0] == 0
+    assert len(tools.linted("texte")) == 2
+
+
+def test_tools_run_concurrently(project):
+    # Chaque outil attend l'autre : une exécution séquentielle échouerait
+    barrier = threading.Barrier(2, timeout=5)
+
+    def run_command(command, **kwargs):
+        barrier.wait()
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    results = ToolRunner(project, run_command=run_command).run(
+        ["mypy", "bandit"], incremental=False
+    )
+
+    assert [result.error for result in results.values()] == [None, None]
+
+
+def test_linter_reports_runner_results(project, monkeypatch):
+    tools = FakeTools()
+    monkeypatch.setattr(code_linter, "validate_and_run", tools)
+
+    report = CodeLinter(str(project)).run(files=["a.py"])
+
+    assert report["errors"] == ["Ruff: a.py:1: F401 unused import"]
+    assert report["warnings"] == []
+    assert tools.linted() == [["a.py"]]
+    assert {call[0] for call in tools.calls} == set(code_linter.LINT_TOOLS)
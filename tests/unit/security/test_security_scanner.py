@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests pour le module security_scanner.py
+"""
+
+from click.testing import CliRunner
+
+from athalia_core import security_scanner
+from athalia_core.cli import cli
+from athalia_core.security_auditor import SecurityAuditor
+from athalia_core.security_scanner import SecurityScanner, analyze_source
+
+SOURCE = '''import os as system_tools
+import subprocess
+import yaml
+from pickle import loads
+
+
+def run(data, x):
+    system_tools.system("ls")
+    loads(data)
+    yaml.load(data, Loader=yaml.SafeLoader)
+    yaml.load(data)
+    subprocess.run("ls", shell=True)
+    subprocess.run(["ls"])
+    value = ast.literal_eval(data)
+    password = "hunter2"
+    TOKEN = "token"
+    placeholder = {"api_key": "<your-key>"}
+    config = {"api_key": "k3yV4lue99"}
+    connect(password="zebra42x")
+    url = f"https://api/?k=AKIAIOSFODNN7EXAMPLEXQ2&u={x}"
+    return value
+'''
+
+
+def rules(findings):
+    return [(f.line, f.rule_id) for f in findings]
+
+
+def test_ast_detection():
+    findings, suppressed = analyze_source(SOURCE)
+
+    assert rules(findings) == [
+        (8, "os_system"),
+        (9, "pickle_loads"),
+        (11, "yaml_load"),
+        (12, "subprocess_shell"),
+        (15, "hardcoded_secret"),
+        (18, "hardcoded_secret"),
+        (19, "hardcoded_secret"),
+        (20, "high_entropy_string"),
+    ]
+    assert findings[0].symbol == "os.system"
+    assert suppressed == 0
+
+
+def test_inline_suppressions():
+    source = (
+        "eval(x)  # nosec\n"
+        "exec(\n    x,\n)  # athalia: ignore[exec]\n"
+        "eval(y)  # athalia: ignore[exec]\n"
+        'password = "hunter2"  # athalia: ignore[secret]\n'
+    )
+
+    findings, suppressed = analyze_source(source)
+
+    assert rules(findings) == [(5, "eval")]
+    assert suppressed == 3
+
+
+def test_invalid_syntax_falls_back_to_regex_rules():
+    findings, _ = analyze_source("def broken(:\n    eval(x)\n")
+
+    assert rules(findings) == [(2, "eval")]
+
+
+def test_index_skips_unchanged_files(tmp_path, monkeypatch):
+    (tmp_path / "app.py").write_text(SOURCE)
+    (tmp_path / "other.py").write_text("eval(x)\n")
+    analyzed = []
+    original = security_scanner.analyze_source
+    monkeypatch.setattr(
+        security_scanner,
+        "analyze_source",
+        lambda text, *args: analyzed.append(text) or original(text, *args),
+    )
+
+    first = SecurityScanner(tmp_path).scan()
+    (tmp_path / "other.py").write_text("\nexec(x)\n")
+    second = SecurityScanner(tmp_path).scan()
+
+    assert (first.analyzed, first.reused) == (2, 0)
+    assert (second.analyzed, second.reused) == (1, 1)
+    assert analyzed[-1] == "\nexec(x)\n"
+    assert rules(second.findings)[-1] == (2, "exec")
+    assert second.findings[-1].path == "other.py"
+
+
+def test_secrets_in_test_fixtures_are_ignored(tmp_path):
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "conftest.py").write_text('password = "hunter2"\neval(x)\n')
+
+    report = SecurityScanner(tmp_path).scan()
+
+    assert rules(report.findings) == [(2, "eval")]
+
+
+def test_baseline_survives_line_shifts(tmp_path):
+    app = tmp_path / "app.py"
+    app.write_text('eval(x)\npassword = "hunter2"\n')
+    scanner = SecurityScanner(tmp_path)
+    scanner.write_baseline(scanner.scan())
+
+    app.write_text('import os\n\neval(x)\npassword = "hunter2"\nexec(y)\n')
+    scanner.snapshot.invalidate()
+    report = scanner.scan()
+
+    assert rules(report.findings) == [(5, "exec")]
+    assert report.baselined == 2
+
+
+def test_auditor_reports_ast_findings(tmp_path):
+    (tmp_path / "app.py").write_text(SOURCE)
+    auditor = SecurityAuditor(str(tmp_path))
+
+    auditor._check_code_vulnerabilities()
+    auditor._check_secrets()
+
+    vulnerabilities = auditor.report["vulnerabilities"]
+    assert vulnerabilities[:2] == [
+        "Pattern dangereux os.system dans app.py:8",
+        "Pattern dangereux pickle.loads dans app.py:9",
+    ]
+    assert vulnerabilities[4:] == [
+        f"Secret potentiel dans app.py:{line}" for line in (15, 18, 19, 20)
+    ]
+
+
+def test_security_cli_exit_code_and_baseline(tmp_path):
+    (tmp_path / "app.py").write_text("eval(x)\n")
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["security", str(tmp_path)])
+    assert result.exit_code == 1
+    assert "app.py:1: [eval]" in result.output
+
+    runner.invoke(cli, ["security", str(tmp_path), "--update-baseline"])
+    result = runner.invoke(cli, ["security", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "1 en baseline" in result.output
@@ -1,6 +1,11 @@
 # Template de test pour athalia_core/logger_advanced.py
 # Fichier: tests/test_logger_advanced.py
 
+import json
+import logging
+
+import pytest
+
 import athalia_core.logger_advanced as module
 
 
@@ -26,3 +31,98 @@ def test_module_integration():
     """Test d'intégration du module"""
     # TODO: Ajouter les tests d'intégration
     pass
+
+
+LOGGER_NAMES = [
+    "athalia.athalia",
+    "athalia.validation",
+    "athalia.correction",
+    "athalia.performance",
+    "athalia.errors",
+]
+
+
+@pytest.fixture
+def isolated_loggers():
+    """Loggers nommés sans les handlers de l'instance globale"""
+    saved = {}
+    for name in LOGGER_NAMES:
+        logger = logging.getLogger(name)
+        saved[name] = logger.handlers[:]
+        logger.handlers.clear()
+    created = []
+    yield created
+    for instance in created:
+        instance.close()
+    for name, handlers in saved.items():
+        logging.getLogger(name).handlers[:] = handlers
+
+
+def test_async_logging_is_batched_and_flushed(tmp_path, isolated_loggers):
+    athalia = module.AthaliaLogger(str(tmp_path), batch_size=50)
+    isolated_loggers.append(athalia)
+
+    for index in range(120):
+        athalia.log_performance(f"op_{index}", 0.01)
+    assert athalia.flush()
+
+    lines = (tmp_path / "performance.log").read_text().splitlines()
+    assert len(lines) == 120
+    assert "PERFORMANCE | op_0 | 0.01s" in lines[0]
+    assert athalia.writer.stats["written"] >= 120
+    assert athalia.writer.stats["batches"] < 120
+
+
+def test_json_lines_with_hashed_content(tmp_path, isolated_loggers):
+    athalia = module.AthaliaLogger(
+        str(tmp_path), json_lines=True, content_mode="hash"
+    )
+    isolated_loggers.append(athalia)
+
+    old, new = "x = 1\n" * 1000, "x = 2\n" * 1000
+    athalia.log_correction("a.py", "syntax", False, old, new, 0.5)
+    athalia.log_main("démarrage", mode="test")
+    athalia.close()
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "correction.jsonl").read_text().splitlines()
+    ]
+    assert [record["level"] for record in records] == ["INFO", "WARNING"]
+    assert records[0]["file_path"] == "a.py"
+    assert records[0]["old_content"]["size"] == len(old)
+    assert len(records[0]["new_content"]["blake2b"]) == 32
+    assert "x = 2" not in (tmp_path / "correction.jsonl").read_text()
+    assert '| {"mode": "test"}' in (tmp_path / "athalia.log").read_text()
+
+
+def test_sync_mode_and_truncation(tmp_path, isolated_loggers):
+    athalia = module.AthaliaLogger(str(tmp_path), async_mode=False)
+
+    athalia.log_validation("test_x", {"success": True}, 1.25)
+
+    assert athalia.writer is None
+    assert "VALIDATION | test_x" in (tmp_path / "validation.log").read_text()
+    truncated = module.summarize_content("abcdef", "truncate", limit=3)
+    assert truncated.startswith("abc…[+3")
+    with pytest.raises(ValueError):
+        module.AthaliaLogger(str(tmp_path), content_mode="gzip")
+
+
+def test_stats_come_from_rolling_aggregates(tmp_path, isolated_loggers):
+    athalia = module.AthaliaLogger(str(tmp_path), async_mode=False)
+
+    for index in range(50):
+        athalia.log_correction("a.py", "syntax", index % 5 != 0, "", "", index / 10)
+    athalia.log_performance("audit", 2.0)
+    athalia.log_error(ValueError("boom"), "test")
+
+    stats = athalia.get_correction_stats(hours=1)
+    assert stats["total"] == 50
+    assert stats["success_rate"] == 80
+    assert stats["type_stats"]["syntax"]["count"] == 50
+    assert stats["p99_duration"] >= stats["p50_duration"]
+    assert len(stats["recent_corrections"]) == 10
+    assert athalia.get_performance_stats()["operation_stats"]["audit"]["count"] == 1
+    assert athalia.get_error_stats()["error_types"] == {"ValueError": 1}
+    assert athalia.get_validation_stats()["total"] == 0